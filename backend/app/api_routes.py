@@ -7,13 +7,14 @@ This replaces the MOCK implementation with REAL database queries.
 """
 from fastapi import APIRouter, HTTPException, Path, Body
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 
 # Import REAL services
 from app.services.data_profiling_service import get_profiling_service
 from app.services.rule_suggestion_service import suggest_rules_from_profile, SuggestedRule
-from app.services.rule_execution_service import RuleExecutionService, RuleResult
+from app.services.rule_execution_service import get_rule_execution_service, RuleResult
 from app.services.ai_analysis_service import analyze_data_quality
+from app.db_config.state_store import get_state_store
 
 # Import centralized configuration
 from app.config import settings
@@ -25,12 +26,18 @@ router = APIRouter(prefix=settings.API_PREFIX)
 DATABASE_URL = settings.DATABASE_URL
 TABLE_WHITELIST = settings.TABLE_WHITELIST
 
-# In-memory rule storage (for demo - would use database in production)
-_rules_store: Dict[int, Dict] = {}
-_rule_counter = 0
+# Rules and analysis history live in the shared state store (one key per id)
+# so every worker process serves the same ones
+RULES_NAMESPACE = "legacy_rules"
+ANALYSIS_HISTORY_NAMESPACE = "analysis_history"
+# Namespace of the id counters, keyed by the namespace they number
+SEQUENCES_NAMESPACE = "sequences"
 
-# Analysis history
-_analysis_history: List[Dict] = []
+
+async def _by_id(namespace: str) -> List[Dict]:
+    """Values of a state store namespace in id order."""
+    items = await get_state_store().items(namespace)
+    return [items[key] for key in sorted(items, key=int)]
 
 
 # Pydantic models
@@ -114,16 +121,16 @@ async def profile_table(table: str):
 @router.get("/rules", response_model=List[Rule])
 async def list_rules():
     """List all stored rules."""
-    return [Rule(**r) for r in _rules_store.values()]
+    return [Rule(**r) for r in await _by_id(RULES_NAMESPACE)]
 
 
 @router.post("/rules", response_model=Rule, status_code=201)
 async def create_rule(rule: RuleCreateRequest):
     """Create a new data quality rule."""
-    global _rule_counter
-    _rule_counter += 1
+    store = get_state_store()
+    rule_id = await store.incr(SEQUENCES_NAMESPACE, RULES_NAMESPACE)
     new_rule = {
-        "id": _rule_counter,
+        "id": rule_id,
         "name": rule.name,
         "description": rule.description,
         "condition": rule.condition,
@@ -131,16 +138,14 @@ async def create_rule(rule: RuleCreateRequest):
         "table": rule.table,
         "column": rule.column
     }
-    _rules_store[_rule_counter] = new_rule
+    await store.set(RULES_NAMESPACE, str(rule_id), new_rule)
     return Rule(**new_rule)
 
 
 @router.delete("/rules/{id}", status_code=204)
 async def delete_rule(id: int):
     """Delete a rule by ID."""
-    if id in _rules_store:
-        del _rules_store[id]
-    else:
+    if not await get_state_store().delete(RULES_NAMESPACE, str(id)):
         raise HTTPException(status_code=404, detail=f"Rule {id} not found")
 
 
@@ -162,25 +167,38 @@ async def suggest_rules(table: str = Body(..., embed=True)):
         raise HTTPException(status_code=500, detail=f"Failed to suggest rules: {str(e)}")
 
 
-@router.post("/rules/execute")
-async def execute_rule(request: RuleExecuteRequest):
-    """Execute a data quality rule against the database."""
+def _manual_rule(request: RuleExecuteRequest) -> Dict[str, Any]:
+    """execute_rule arguments for an ad-hoc rule request."""
     if request.table not in TABLE_WHITELIST:
         raise HTTPException(status_code=400, detail=f"Table '{request.table}' is not in the whitelist.")
+    return {
+        "rule_id": f"manual_{request.rule_type}_{request.column}",
+        "rule_type": request.rule_type,
+        "table_name": request.table,
+        "column_name": request.column,
+        "params": request.params
+    }
 
-    try:
-        service = RuleExecutionService(DATABASE_URL)
-        await service.connect()
-
-        result = await service.execute_rule(
-            rule_id=f"manual_{request.rule_type}_{request.column}",
-            rule_type=request.rule_type,
-            table_name=request.table,
-            column_name=request.column,
-            params=request.params
-        )
 
-        await service.disconnect()
+@router.post("/rules/execute")
+async def execute_rule(request: Union[RuleExecuteRequest, List[RuleExecuteRequest]] = Body(...)):
+    """
+    Execute a data quality rule against the database.
+
+    Accepts a single rule or a list of rules; a list is executed concurrently
+    (up to RULE_BATCH_CONCURRENCY at a time) and returns one result per rule,
+    in request order, with an `error` entry for rules that failed.
+    """
+    items = request if isinstance(request, list) else [request]
+    if not items:
+        raise HTTPException(status_code=400, detail="At least one rule is required.")
+    rules = [_manual_rule(item) for item in items]
+
+    try:
+        service = await get_rule_execution_service()
+        if isinstance(request, list):
+            return await service.execute_rules(rules)
+        result = await service.execute_rule(**rules[0])
         return result.to_dict()
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -214,8 +232,10 @@ async def ai_root_cause_analysis(request: AIAnalysisRequest):
 
         # Store in history
         from datetime import datetime
+        store = get_state_store()
+        analysis_id = await store.incr(SEQUENCES_NAMESPACE, ANALYSIS_HISTORY_NAMESPACE)
         analysis_record = {
-            "id": len(_analysis_history) + 1,
+            "id": analysis_id,
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "table": request.table,
             "root_causes": result.root_causes,
@@ -223,7 +243,7 @@ async def ai_root_cause_analysis(request: AIAnalysisRequest):
             "confidence_score": result.confidence_score,
             "additional_rules": result.additional_rules
         }
-        _analysis_history.append(analysis_record)
+        await store.set(ANALYSIS_HISTORY_NAMESPACE, str(analysis_id), analysis_record)
 
         return result.to_dict()
     except Exception as e:
@@ -233,7 +253,7 @@ async def ai_root_cause_analysis(request: AIAnalysisRequest):
 @router.get("/analysis/history", response_model=List[AnalysisResult])
 async def get_analysis_history():
     """Get history of AI analyses."""
-    return [AnalysisResult(**a) for a in _analysis_history]
+    return [AnalysisResult(**a) for a in await _by_id(ANALYSIS_HISTORY_NAMESPACE)]
 
 
 # Health check
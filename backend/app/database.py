@@ -2,34 +2,58 @@
 SQLAlchemy Database Layer - Async Support
 Generated by RTX 5090 (Qwen2.5-Coder-32B-Instruct-AWQ)
 Enhanced for proper integration with existing services.
+
+SQLAlchemy and the engine are loaded on first use (get_engine), not at
+import time; ``engine`` and ``async_session_maker`` remain available as
+module attributes for existing callers.
 """
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncGenerator
 import logging
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import NullPool
-from sqlalchemy import text
-
 from app.config import settings
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 logger = logging.getLogger(__name__)
 
-# Create async engine with NullPool for async compatibility
 # Note: Using asyncpg driver (postgresql+asyncpg://)
 DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,
-    poolclass=NullPool,  # Recommended for async to avoid connection issues
-)
 
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+@lru_cache
+def get_engine() -> "AsyncEngine":
+    """Create the async engine with NullPool for async compatibility."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    return create_async_engine(
+        DATABASE_URL,
+        echo=False,
+        poolclass=NullPool,  # Recommended for async to avoid connection issues
+    )
+
+
+@lru_cache
+def get_session_maker() -> "async_sessionmaker":
+    """Session factory bound to the engine."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name == "engine":
+        return get_engine()
+    if name == "async_session_maker":
+        return get_session_maker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @asynccontextmanager
@@ -40,7 +64,10 @@ async def lifespan(app):
     Startup: Verify database connection
     Shutdown: Dispose of engine
     """
+    from sqlalchemy import text
+
     logger.info("Starting DQM LOCAL AI API with SQLAlchemy...")
+    engine = get_engine()
 
     # Verify database connection on startup
     async with engine.begin() as conn:
@@ -55,7 +82,7 @@ async def lifespan(app):
     logger.info("Database engine disposed")
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db() -> AsyncGenerator["AsyncSession", None]:
     """
     FastAPI dependency for database sessions with transaction management.
 
@@ -70,7 +97,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     - Transaction commit on success
     - Transaction rollback on exception
     """
-    async with async_session_maker() as session:
+    async with get_session_maker()() as session:
         try:
             yield session
             await session.commit()
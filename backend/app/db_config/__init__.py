@@ -1,10 +1,25 @@
 """
 Config Package - Database and application configuration
+
+Exports are resolved on first access, so importing one submodule (the
+worker only needs pool_registry) does not load the others.
 """
-from .database import get_database_manager, DatabaseConnection, DynamicDatabaseManager
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "get_database_manager": ".database",
+    "DatabaseConnection": ".database",
+    "DynamicDatabaseManager": ".database",
+    "PoolRegistry": ".pool_registry",
+    "get_pool_registry": ".pool_registry",
+    "MigrationRunner": ".migrations",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    "get_database_manager",
-    "DatabaseConnection",
-    "DynamicDatabaseManager"
-]
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
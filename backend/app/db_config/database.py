@@ -9,9 +9,19 @@ V74: Dynamic database configuration with runtime switching
 - Connection pooling
 - Runtime configuration switching
 - Connection testing
+
+Switching the active connection repoints the application database (the
+DATABASE_URL pool every service uses) through the pool registry: the new
+database is migrated and its pool warmed before requests move over, and the
+old pool drains in the background. No restart is needed.
+
+Saved connections and the active connection are kept in the shared state
+store; both switch APIs (/database/connections/switch and /connections/switch)
+record the switch there, and workers that did not handle it follow within
+STATE_SYNC_INTERVAL_SECONDS (follow_active_connection).
 """
-import os
 import asyncio
+import os
 from typing import Optional, Dict, Any, List
 from pydantic_settings import BaseSettings
 from pydantic import BaseModel, Field
@@ -19,6 +29,11 @@ from functools import lru_cache
 import asyncpg
 import logging
 
+from app.config import settings
+from app.db_config.migrations import MigrationRunner
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.db_config.state_store import get_state_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,10 +50,7 @@ class DatabaseSettings(BaseSettings):
     DB_USER: str = "dqm_user"
     DB_PASSWORD: str = "dqm_password"
 
-    # Connection pool settings
-    DB_POOL_SIZE: int = 5
-    DB_POOL_MAX_OVERFLOW: int = 10
-    DB_POOL_TIMEOUT: int = 30
+    # Pool sizes come from app.config (DATABASE_*_POOL_SIZE, or DB_POOL_*)
 
     # Database type (postgresql or sqlite)
     DB_TYPE: str = "postgresql"
@@ -89,6 +101,7 @@ class DatabaseConnection(BaseModel):
     password: str = Field(..., description="Database password")
     db_type: str = Field("postgresql", description="Database type")
     description: Optional[str] = Field(None, description="Connection description")
+    replica_urls: List[str] = Field(default_factory=list, description="Read replica URLs for scans")
 
 
 class DynamicDatabaseManager:
@@ -100,17 +113,19 @@ class DynamicDatabaseManager:
     - Runtime connection switching
     - Connection testing
     - Active connection tracking
+
+    Saved connections and the active one live in the shared state store, in
+    the same records the /connections routes use, so every worker sees them.
     """
 
-    def __init__(self):
-        self._connections: Dict[str, DatabaseConnection] = {}
-        self._active_connection: Optional[str] = None
-        self._pools: Dict[str, asyncpg.Pool] = {}
+    def __init__(self, pools: Optional[PoolRegistry] = None):
+        # Pools live in the shared registry, keyed by connection URL
+        self.pools = pools or get_pool_registry()
 
-        # Initialize with default connection
+        # The default connection comes from the environment and is never stored
         default_settings = get_database_settings()
         self._default_url = default_settings.get_connection_string()
-        self._connections["default"] = DatabaseConnection(
+        self._default = DatabaseConnection(
             name="default",
             host=default_settings.DB_HOST,
             port=default_settings.DB_PORT,
@@ -118,40 +133,53 @@ class DynamicDatabaseManager:
             username=default_settings.DB_USER,
             password=default_settings.DB_PASSWORD,
             db_type=default_settings.DB_TYPE,
-            description="Default Northwind database"
+            description="Default Northwind database",
+            replica_urls=list(settings.DATABASE_REPLICA_URLS)
         )
-        self._active_connection = "default"
 
-    def add_connection(self, connection: DatabaseConnection) -> None:
+    async def _connections(self) -> Dict[str, DatabaseConnection]:
+        saved = await get_state_store().items(CONNECTIONS_NAMESPACE)
+        connections = {"default": self._default}
+        connections.update((name, DatabaseConnection(**config)) for name, config in sorted(saved.items()))
+        return connections
+
+    async def add_connection(self, connection: DatabaseConnection) -> None:
         """Add a new database connection configuration."""
-        if connection.name in self._connections:
+        if connection.name == "default":
+            raise ValueError("Cannot override the default connection")
+        store = get_state_store()
+        if await store.get(CONNECTIONS_NAMESPACE, connection.name) is not None:
             logger.warning(f"Overwriting existing connection: {connection.name}")
-        self._connections[connection.name] = connection
+        await store.set(CONNECTIONS_NAMESPACE, connection.name, connection.model_dump())
         logger.info(f"Added database connection: {connection.name}")
 
-    def remove_connection(self, name: str) -> bool:
-        """Remove a database connection configuration."""
+    async def remove_connection(self, name: str) -> bool:
+        """Remove a database connection configuration, switching to default if it was active."""
         if name == "default":
             raise ValueError("Cannot remove the default connection")
-        if name in self._connections:
-            # Close pool if exists
-            if name in self._pools:
-                asyncio.create_task(self._pools[name].close())
-                del self._pools[name]
-            del self._connections[name]
-            if self._active_connection == name:
-                self._active_connection = "default"
+        connections = await self._connections()
+        if name in connections:
+            if await get_active_connection_name() == name:
+                await self.set_active_connection("default")
+            # Close its pool unless another connection uses the same URL
+            url = self._url(connections[name])
+            if url not in {self._url(c) for n, c in connections.items() if n != name}:
+                await self.pools.close(url)
+            await get_state_store().delete(CONNECTIONS_NAMESPACE, name)
             logger.info(f"Removed database connection: {name}")
             return True
         return False
 
-    def get_connection(self, name: str = None) -> Optional[DatabaseConnection]:
+    async def get_connection(self, name: str = None) -> Optional[DatabaseConnection]:
         """Get a specific connection or the active one."""
-        name = name or self._active_connection
-        return self._connections.get(name)
+        name = name or await get_active_connection_name()
+        if name == "default":
+            return self._default
+        return await get_saved_connection(name)
 
-    def list_connections(self) -> List[Dict[str, Any]]:
+    async def list_connections(self) -> List[Dict[str, Any]]:
         """List all configured connections."""
+        active = await get_active_connection_name()
         return [
             {
                 "name": conn.name,
@@ -160,43 +188,45 @@ class DynamicDatabaseManager:
                 "database": conn.database,
                 "db_type": conn.db_type,
                 "description": conn.description,
-                "is_active": conn.name == self._active_connection
+                "is_active": conn.name == active
             }
-            for conn in self._connections.values()
+            for conn in (await self._connections()).values()
         ]
 
-    def get_active_connection_name(self) -> str:
+    async def get_active_connection_name(self) -> str:
         """Get the name of the active connection."""
-        return self._active_connection
+        return await get_active_connection_name()
 
-    def set_active_connection(self, name: str) -> None:
-        """Set the active database connection."""
-        if name not in self._connections:
+    async def set_active_connection(self, name: str) -> None:
+        """Switch every service to another database connection, without a restart."""
+        connection = await self.get_connection(name)
+        if connection is None:
             raise ValueError(f"Connection '{name}' not found")
-        self._active_connection = name
+        if connection.db_type not in ("postgresql", "azure"):
+            raise ValueError(f"Connection '{name}' is {connection.db_type}; only PostgreSQL can be activated")
+        url = settings.DATABASE_URL if name == "default" else connection_url(connection)
+        await activate_connection(name, url, connection.replica_urls, self.pools)
         logger.info(f"Switched active database connection to: {name}")
 
-    def get_connection_url(self, name: str = None) -> str:
-        """Get the connection URL for a named or active connection."""
-        conn = self.get_connection(name)
-        if not conn:
-            return self._default_url
-
+    def _url(self, conn: DatabaseConnection) -> str:
         if conn.db_type == "sqlite":
             return f"sqlite:///./{conn.database}.db"
+        return connection_url(conn)
 
-        return (
-            f"postgresql://{conn.username}:{conn.password}"
-            f"@{conn.host}:{conn.port}/{conn.database}"
-        )
+    async def get_connection_url(self, name: str = None) -> str:
+        """Get the connection URL for a named or active connection."""
+        conn = await self.get_connection(name)
+        if not conn:
+            return self._default_url
+        return self._url(conn)
 
     async def test_connection(self, name: str = None) -> Dict[str, Any]:
         """Test a database connection."""
-        url = self.get_connection_url(name)
-        conn_name = name or self._active_connection
+        url = await self.get_connection_url(name)
+        conn_name = name or await get_active_connection_name()
 
         try:
-            conn = await asyncpg.connect(url)
+            conn = await self.pools.connect(url)
             try:
                 # Test query
                 version = await conn.fetchval("SELECT version()")
@@ -226,24 +256,116 @@ class DynamicDatabaseManager:
 
     async def get_pool(self, name: str = None) -> asyncpg.Pool:
         """Get or create a connection pool for the specified connection."""
-        name = name or self._active_connection
+        return await self.pools.get_pool(await self.get_connection_url(name))
 
-        if name not in self._pools:
-            url = self.get_connection_url(name)
-            self._pools[name] = await asyncpg.create_pool(
-                url,
-                min_size=2,
-                max_size=10
-            )
+    async def close_all_pools(self) -> None:
+        """Close the pools of all configured connections."""
+        for conn in (await self._connections()).values():
+            await self.pools.close(self._url(conn))
+
+
+async def switch_application_database(
+    url: str,
+    pools: Optional[PoolRegistry] = None,
+    replicas: Optional[List[str]] = None
+) -> None:
+    """Repoint the DATABASE_URL pool shared by all services at another database.
+
+    Pending migrations are applied to the new database before any request
+    reaches it; in-flight queries finish on the old pool, which then closes.
+    Read scans move to `replicas` (DATABASE_REPLICA_URLS when switching back
+    to DATABASE_URL without any).
+    """
+    pools = pools or get_pool_registry()
+    if replicas is None and url == settings.DATABASE_URL:
+        replicas = settings.DATABASE_REPLICA_URLS
+    prepare = MigrationRunner(url, pools=pools).apply_pending if settings.MIGRATE_ON_STARTUP else None
+    await pools.switch(settings.DATABASE_URL, url, prepare=prepare)
+    pools.set_replicas(settings.DATABASE_URL, replicas or [])
 
-        return self._pools[name]
 
-    async def close_all_pools(self) -> None:
-        """Close all connection pools."""
-        for name, pool in self._pools.items():
-            await pool.close()
-            logger.info(f"Closed pool for: {name}")
-        self._pools.clear()
+# State store namespaces: saved connection configs by name, and the name of
+# the active one (absent for the default database)
+CONNECTIONS_NAMESPACE = "connections"
+CONNECTION_STATE_NAMESPACE = "connection_state"
+
+# Connection this process's application pool points at ("default" at startup)
+_applied_connection: str = "default"
+
+
+def connection_url(config: Any) -> str:
+    """PostgreSQL URL of a saved connection (any model with the connection fields)."""
+    url = f"postgresql://{config.username}:{config.password}@{config.host}:{config.port}/{config.database}"
+    if config.db_type == "azure":
+        url += "?sslmode=require"
+    return url
+
+
+async def get_active_connection_name() -> str:
+    """Name of the connection every worker should be using."""
+    return await get_state_store().get(CONNECTION_STATE_NAMESPACE, "active") or "default"
+
+
+async def get_saved_connection(name: str) -> Optional[DatabaseConnection]:
+    config = await get_state_store().get(CONNECTIONS_NAMESPACE, name)
+    return DatabaseConnection(**config) if config is not None else None
+
+
+async def apply_connection(
+    name: str,
+    url: str,
+    replicas: Optional[List[str]] = None,
+    pools: Optional[PoolRegistry] = None
+) -> None:
+    """Point this process's application pool at a connection."""
+    global _applied_connection
+    await switch_application_database(url, pools, replicas)
+    _applied_connection = name
+
+
+async def activate_connection(
+    name: str,
+    url: str,
+    replicas: Optional[List[str]] = None,
+    pools: Optional[PoolRegistry] = None
+) -> None:
+    """Switch to a connection and record it as the active one for every worker.
+
+    Fails without changing anything if the database is unreachable.
+    """
+    await apply_connection(name, url, replicas, pools)
+    store = get_state_store()
+    if name == "default":
+        await store.delete(CONNECTION_STATE_NAMESPACE, "active")
+    else:
+        await store.set(CONNECTION_STATE_NAMESPACE, "active", name)
+
+
+async def sync_active_connection(pools: Optional[PoolRegistry] = None) -> None:
+    """Switch this process to the active connection if another worker changed it."""
+    name = await get_active_connection_name()
+    if name == _applied_connection:
+        return
+    if name == "default":
+        await apply_connection(name, settings.DATABASE_URL, None, pools)
+    else:
+        config = await get_saved_connection(name)
+        if config is None:
+            logger.warning(f"Active connection '{name}' is not saved, staying on '{_applied_connection}'")
+            return
+        await apply_connection(name, connection_url(config), config.replica_urls, pools)
+    logger.info(f"Followed switch to connection: {name}")
+
+
+async def follow_active_connection(interval: Optional[float] = None) -> None:
+    """Keep this process on the shared active connection (runs until cancelled)."""
+    interval = interval or settings.STATE_SYNC_INTERVAL_SECONDS
+    while True:
+        try:
+            await sync_active_connection()
+        except Exception as e:
+            logger.error(f"Failed to follow the active connection: {e}")
+        await asyncio.sleep(interval)
 
 
 # Singleton instances
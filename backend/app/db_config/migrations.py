@@ -0,0 +1,194 @@
+"""
+Schema Migrations
+Versioned schema setup applied once at startup instead of DDL on every call.
+
+Migrations live in backend/migrations as ``NNN_description.sql`` or
+``NNN_description.py`` (a module with ``async def upgrade(conn)`` for changes
+that need code, such as converting data_quality_results to partitions).
+They are applied in version order, each in its own transaction, and
+recorded in schema_migrations together with a checksum of the file.
+
+- A session advisory lock serializes the API and any number of workers
+  starting at the same time; later processes find nothing left to apply
+- Every migration is idempotent, so databases whose tables were created by
+  the services before migrations existed are adopted without changes
+- Editing an applied migration is reported, not re-applied: add a new one
+
+Run ``python -m app.db_config.migrations`` to apply or inspect migrations
+without starting the API (``--status`` lists them).
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import asyncpg
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry, redact_dsn
+
+logger = logging.getLogger(__name__)
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / 'migrations'
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.(sql|py)$')
+
+# Serializes migration runs across app processes and workers
+MIGRATION_LOCK_KEY = 'schema_migrations'
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+@dataclass
+class Migration:
+    """One migration file."""
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+    async def apply(self, conn: asyncpg.Connection) -> None:
+        if self.path.suffix == '.sql':
+            await conn.execute(self.path.read_text())
+            return
+        spec = importlib.util.spec_from_file_location(f"migration_{self.version:03d}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        await module.upgrade(conn)
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Migration files of a directory in version order.
+
+    Raises ValueError for two files with the same version.
+    """
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(Path(directory).iterdir()):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(
+                f"Duplicate migration version {version}: {migrations[version].path.name} and {path.name}"
+            )
+        migrations[version] = Migration(version, path.stem, path)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+class MigrationRunner:
+    """Applies pending migrations to one database."""
+
+    def __init__(
+        self,
+        dsn: str,
+        directory: Path = MIGRATIONS_DIR,
+        pools: Optional[PoolRegistry] = None
+    ):
+        self.dsn = dsn
+        self.directory = directory
+        self.pools = pools or get_pool_registry()
+
+    async def _applied(self, conn: asyncpg.Connection) -> Dict[int, Dict[str, Any]]:
+        await conn.execute(CREATE_MIGRATIONS_TABLE)
+        rows = await conn.fetch('SELECT version, name, checksum, applied_at FROM schema_migrations')
+        return {r['version']: dict(r) for r in rows}
+
+    async def migrate(self) -> List[str]:
+        """Apply every pending migration in order; returns the names applied."""
+        conn = await self.pools.connect(self.dsn)
+        try:
+            return await self.apply_pending(conn)
+        finally:
+            await conn.close()
+
+    async def apply_pending(self, conn: asyncpg.Connection) -> List[str]:
+        """Apply pending migrations over an existing connection to the database."""
+        migrations = discover_migrations(self.directory)
+        applied_names: List[str] = []
+        await conn.execute('SELECT pg_advisory_lock(hashtext($1))', MIGRATION_LOCK_KEY)
+        try:
+            applied = await self._applied(conn)
+            for migration in migrations:
+                checksum = migration.checksum
+                if migration.version in applied:
+                    if applied[migration.version]['checksum'] != checksum:
+                        logger.warning(
+                            f"Migration {migration.name} changed after it was applied; "
+                            "add a new migration instead"
+                        )
+                    continue
+                async with conn.transaction():
+                    await migration.apply(conn)
+                    await conn.execute('''
+                        INSERT INTO schema_migrations (version, name, checksum)
+                        VALUES ($1, $2, $3)
+                    ''', migration.version, migration.name, checksum)
+                applied_names.append(migration.name)
+                logger.info(f"Applied migration {migration.name}")
+        finally:
+            await conn.execute('SELECT pg_advisory_unlock(hashtext($1))', MIGRATION_LOCK_KEY)
+        if applied_names:
+            logger.info(f"Database {redact_dsn(self.dsn)} migrated ({len(applied_names)} applied)")
+        return applied_names
+
+    async def status(self) -> List[Dict[str, Any]]:
+        """Every migration file with when it was applied (None if pending)."""
+        conn = await self.pools.connect(self.dsn)
+        try:
+            applied = await self._applied(conn)
+        finally:
+            await conn.close()
+        return [
+            {
+                'version': m.version,
+                'name': m.name,
+                'applied_at': applied[m.version]['applied_at'].isoformat() if m.version in applied else None,
+                'modified': m.version in applied and applied[m.version]['checksum'] != m.checksum,
+            }
+            for m in discover_migrations(self.directory)
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply DQM schema migrations")
+    parser.add_argument("--dsn", default=settings.DATABASE_URL, help="PostgreSQL DSN")
+    parser.add_argument("--status", action="store_true", help="List migrations instead of applying them")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT)
+
+    async def _run() -> None:
+        pools = get_pool_registry()
+        runner = MigrationRunner(args.dsn, pools=pools)
+        try:
+            if args.status:
+                for m in await runner.status():
+                    state = m['applied_at'] or 'pending'
+                    print(f"{m['version']:03d} {m['name']:<40} {state}{' (modified)' if m['modified'] else ''}")
+            else:
+                applied = await runner.migrate()
+                print(f"Applied {len(applied)} migration(s)")
+        finally:
+            await pools.close_all()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
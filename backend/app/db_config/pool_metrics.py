@@ -0,0 +1,151 @@
+"""
+Pool Metrics
+Per-pool lease counters, acquire wait-time histogram and the adjustable lease
+limit used by adaptive pool sizing.
+
+The registry records every lease made through ``PoolRegistry.connect``:
+
+- acquire wait is the time from the request to holding a connection,
+  including waiting for a lease slot and for a free pooled connection
+- timeouts count acquires that gave up after DATABASE_POOL_ACQUIRE_TIMEOUT
+- in_use counts leases not yet closed; peak_in_use is the highest value since
+  the adaptive controller last looked
+
+LeaseLimit caps concurrent leases of one pool below the pool's max_size. The
+asyncpg pool itself cannot be resized, so adaptive sizing creates pools at the
+upper bound and moves this limit instead; connections above the limit go idle
+and are closed by the pool after DATABASE_POOL_MAX_IDLE_SECONDS.
+"""
+import asyncio
+import bisect
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional
+
+
+# Upper bounds of the acquire wait histogram buckets, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Lease counters and acquire wait histogram of one pool."""
+
+    def __init__(self):
+        self.acquires = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.wait_ms_total = 0.0
+        # One count per bucket of WAIT_BUCKETS_MS plus one for slower acquires
+        self.wait_buckets: List[int] = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        # Totals at the last window() call, for per-interval rates
+        self._window_start = (0, 0, 0.0)
+
+    def record_acquire(self, wait_seconds: float) -> None:
+        wait_ms = wait_seconds * 1000
+        self.acquires += 1
+        self.wait_ms_total += wait_ms
+        self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def record_release(self) -> None:
+        self.in_use -= 1
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def record_error(self) -> None:
+        self.errors += 1
+
+    def window(self) -> Dict[str, Any]:
+        """Acquires, timeouts, mean wait and peak leases since the previous call."""
+        acquires, timeouts, wait_ms = self._window_start
+        window_acquires = self.acquires - acquires
+        window = {
+            'acquires': window_acquires,
+            'timeouts': self.timeouts - timeouts,
+            'avg_wait_ms': (self.wait_ms_total - wait_ms) / window_acquires if window_acquires else 0.0,
+            'peak_in_use': self.peak_in_use,
+        }
+        self._window_start = (self.acquires, self.timeouts, self.wait_ms_total)
+        self.peak_in_use = self.in_use
+        return window
+
+    def to_dict(self) -> Dict[str, Any]:
+        histogram = {f'le_{bound}ms': count for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)}
+        histogram['le_inf'] = self.wait_buckets[-1]
+        return {
+            'acquires': self.acquires,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'in_use': self.in_use,
+            'avg_wait_ms': round(self.wait_ms_total / self.acquires, 3) if self.acquires else 0.0,
+            'wait_histogram': histogram,
+        }
+
+
+class LeaseLimit:
+    """FIFO semaphore whose size can change while leases are held."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.held = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """Wait for a free slot; raises asyncio.TimeoutError after `timeout` seconds."""
+        if self.held < self.limit and not self._waiters:
+            self.held += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=timeout)
+        except BaseException:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.held -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        """Change the limit; shrinking lets held leases finish, new ones wait."""
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.held < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.held += 1
+                waiter.set_result(None)
+
+
+def next_lease_limit(
+    current: int,
+    window: Dict[str, Any],
+    db_load: float,
+    lower: int,
+    upper: int,
+    wait_ms_high: float,
+    db_load_high: float
+) -> int:
+    """Lease limit for the next interval from the last interval's window.
+
+    - the database is near max_connections: give one connection back
+    - acquires timed out or waited wait_ms_high on average: grow by a quarter
+    - leases peaked well below the limit with no waiting: shrink by one
+    """
+    if db_load >= db_load_high:
+        return max(lower, current - 1)
+    if window['timeouts'] or window['avg_wait_ms'] >= wait_ms_high:
+        return min(upper, current + max(1, current // 4))
+    if window['peak_in_use'] < current - 1 and window['avg_wait_ms'] < wait_ms_high / 10:
+        return max(lower, window['peak_in_use'] + 1, current - 1)
+    return current
@@ -0,0 +1,543 @@
+"""
+Pool Registry
+One asyncpg connection pool per DSN, shared by every service in the process.
+
+Services used to open a fresh connection per call (TCP, TLS and auth
+handshake on the request path) or to create private pools. The registry is
+created in the application lifespan and injected into services instead:
+
+- pools are created on first use of a DSN, at most one per DSN, sized by
+  DATABASE_MIN_POOL_SIZE / DATABASE_MAX_POOL_SIZE, which caps the
+  connections this process holds to each database
+- a connection idle for DATABASE_POOL_HEALTHCHECK_SECONDS or longer is
+  pinged with SELECT 1 when acquired; dead ones are replaced transparently
+- idle connections above min_size are closed after DATABASE_POOL_MAX_IDLE_SECONDS
+- every lease is counted (see pool_metrics); ``stats()`` reports size, idle,
+  in use, acquire wait histogram and timeouts per pool
+- acquires go through a circuit breaker per DSN: connection failures and
+  acquire timeouts open it and further acquires fail fast with
+  CircuitBreakerOpen; refused or dropped connections are retried with
+  jittered backoff within the DSN's retry budget
+
+``connect(dsn)`` leases a connection whose ``close()`` returns it to the
+pool, so code written as connect / try / finally close keeps working;
+``acquire(dsn)`` is the same as an async context manager.
+
+``switch(dsn, target)`` repoints the pool of a DSN at another database while
+the application runs: the new pool is opened and warmed first, then swapped
+in atomically for new leases, and the old pool is drained (leased
+connections finish their queries) and closed in the background.
+
+``connect_read(dsn)`` leases a connection for heavy read-only scans
+(profiling, rule evaluation) from a read replica of the DSN when one is
+configured (DATABASE_REPLICA_URLS, or per connection):
+
+- replicas are used in rotation, each with its own pool
+- replication lag is measured from ``pg_last_xact_replay_timestamp()`` at
+  most every REPLICA_HEALTH_CHECK_SECONDS per replica; replicas lagging
+  more than REPLICA_MAX_LAG_SECONDS or failing to connect are skipped until
+  the next check
+- with no usable replica the lease comes from the primary, so reads never
+  fail because of a replica
+
+``start_adaptive_sizing()`` (DATABASE_POOL_ADAPTIVE) caps the leases of each
+pool with a limit between the minimum and maximum pool size and moves it every
+DATABASE_POOL_ADAPT_INTERVAL_SECONDS: up when acquires wait or time out, down
+when leases stay well below it or the database nears max_connections.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import asyncpg
+
+from app.config import settings
+from app.db_config.pool_metrics import LeaseLimit, PoolMetrics, next_lease_limit
+from app.exceptions import CircuitBreaker, CircuitBreakerOpen
+from app.utils.retry import RetryBudget, call_with_retry
+
+logger = logging.getLogger(__name__)
+
+
+CONNECTION_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+# Connection failures worth retrying: the server refused or dropped us for now
+TRANSIENT_CONNECTION_ERRORS = (
+    ConnectionError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+    asyncpg.TooManyConnectionsError,
+)
+
+# Seconds the replica is behind the primary; 0 when it has replayed all WAL it
+# received (an idle primary writes nothing, so replay timestamps stop moving)
+# or when the DSN is not a standby at all. NULL before any replay.
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8
+END
+"""
+
+# Share of the server's max_connections taken by client backends
+DATABASE_LOAD_QUERY = """
+SELECT count(*)::float8 / current_setting('max_connections')::float8
+FROM pg_stat_activity
+WHERE backend_type = 'client backend'
+"""
+
+
+class HealthCheckedConnection(asyncpg.Connection):
+    """Connection that remembers when it was last known to be alive."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._verified_at = time.monotonic()
+
+    def needs_healthcheck(self, max_idle_seconds: float) -> bool:
+        return time.monotonic() - self._verified_at >= max_idle_seconds
+
+    def mark_verified(self) -> None:
+        self._verified_at = time.monotonic()
+
+
+class StaleConnectionError(Exception):
+    """A pooled connection failed its health check and was discarded."""
+
+
+class PooledConnection:
+    """A connection leased from a pool; close() returns it instead of closing it."""
+
+    __slots__ = ('_pool', '_conn', '_on_release')
+
+    def __init__(self, pool: asyncpg.Pool, conn: Any, on_release: Optional[Callable[[], None]] = None):
+        self._pool = pool
+        self._conn = conn
+        self._on_release = on_release
+
+    def __getattr__(self, name: str) -> Any:
+        if self._conn is None:
+            raise asyncpg.InterfaceError("connection has been released back to the pool")
+        return getattr(self._conn, name)
+
+    def is_closed(self) -> bool:
+        return self._conn is None or self._conn.is_closed()
+
+    async def close(self, *, timeout: Optional[float] = None) -> None:
+        """Release the connection back to its pool (idempotent)."""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            await self._pool.release(conn, timeout=timeout)
+        finally:
+            if self._on_release is not None:
+                self._on_release()
+
+
+def redact_dsn(dsn: str) -> str:
+    """DSN with the password replaced, for logs and stats."""
+    parts = urlsplit(dsn)
+    if parts.password is None:
+        return dsn
+    netloc = parts.netloc.replace(f':{parts.password}@', ':***@', 1)
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+class PoolRegistry:
+    """Process-wide asyncpg pools keyed by DSN."""
+
+    def __init__(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        healthcheck_seconds: Optional[float] = None,
+        max_idle_seconds: Optional[float] = None,
+        drain_timeout: Optional[float] = None,
+        replica_max_lag: Optional[float] = None,
+        replica_check_seconds: Optional[float] = None
+    ):
+        self.min_size = settings.DATABASE_MIN_POOL_SIZE if min_size is None else min_size
+        self.max_size = max_size or settings.database_max_pool_size
+        self.acquire_timeout = acquire_timeout or settings.DATABASE_POOL_ACQUIRE_TIMEOUT
+        self.healthcheck_seconds = (
+            settings.DATABASE_POOL_HEALTHCHECK_SECONDS if healthcheck_seconds is None else healthcheck_seconds
+        )
+        self.max_idle_seconds = (
+            settings.DATABASE_POOL_MAX_IDLE_SECONDS if max_idle_seconds is None else max_idle_seconds
+        )
+        self.drain_timeout = drain_timeout or settings.DATABASE_POOL_DRAIN_TIMEOUT
+        self.replica_max_lag = settings.REPLICA_MAX_LAG_SECONDS if replica_max_lag is None else replica_max_lag
+        self.replica_check_seconds = (
+            settings.REPLICA_HEALTH_CHECK_SECONDS if replica_check_seconds is None else replica_check_seconds
+        )
+        self._pools: Dict[str, asyncpg.Pool] = {}
+        # DSN -> database its pool actually connects to, when switched
+        self._targets: Dict[str, str] = {}
+        self._draining: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        # Primary DSN -> read replica DSNs; replica pools live in _pools too
+        self._replicas: Dict[str, List[str]] = {}
+        if settings.DATABASE_REPLICA_URLS:
+            self._replicas[settings.DATABASE_URL] = list(settings.DATABASE_REPLICA_URLS)
+        # Replica DSN -> last lag measurement (lag_seconds None when unusable)
+        self._replica_health: Dict[str, Dict[str, Any]] = {}
+        self._replica_turn: Dict[str, int] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+        # Lease limits per DSN, only while adaptive sizing runs
+        self._limits: Dict[str, LeaseLimit] = {}
+        self._adaptive = False
+        self._adapt_task: Optional[asyncio.Task] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._retry_budgets: Dict[str, RetryBudget] = {}
+
+    def target(self, dsn: str) -> str:
+        """Database the pool of a DSN connects to."""
+        return self._targets.get(dsn, dsn)
+
+    async def _create_pool(self, target: str) -> asyncpg.Pool:
+        pool = await asyncpg.create_pool(
+            target,
+            min_size=min(self.min_size, self.max_size),
+            max_size=self.max_size,
+            max_inactive_connection_lifetime=self.max_idle_seconds,
+            connection_class=HealthCheckedConnection,
+            setup=self._healthcheck
+        )
+        logger.info(f"Created pool for {redact_dsn(target)} ({self.min_size}-{self.max_size} connections)")
+        return pool
+
+    async def get_pool(self, dsn: str) -> asyncpg.Pool:
+        """The pool for a DSN, created (and its min_size connections opened) on first use."""
+        pool = self._pools.get(dsn)
+        if pool is not None:
+            return pool
+        async with self._lock:
+            pool = self._pools.get(dsn)
+            if pool is None:
+                pool = await self._create_pool(self.target(dsn))
+                self._pools[dsn] = pool
+        return pool
+
+    async def switch(
+        self,
+        dsn: str,
+        target: str,
+        prepare: Optional[Callable[[Any], Awaitable[None]]] = None
+    ) -> None:
+        """Repoint the pool of `dsn` at `target` without dropping requests.
+
+        The new pool is opened and checked (and `prepare` run on one of its
+        connections, e.g. migrations) before any request sees it. On failure
+        nothing changes. The replaced pool drains in the background.
+        """
+        if target == self.target(dsn) and dsn in self._pools:
+            return
+        pool = await self._create_pool(target)
+        try:
+            conn = await pool.acquire(timeout=self.acquire_timeout)
+            try:
+                await conn.fetchval('SELECT 1')
+                if prepare is not None:
+                    await prepare(conn)
+            finally:
+                await pool.release(conn)
+        except BaseException:
+            pool.terminate()
+            raise
+        async with self._lock:
+            old = self._pools.get(dsn)
+            self._pools[dsn] = pool
+            if target == dsn:
+                self._targets.pop(dsn, None)
+            else:
+                self._targets[dsn] = target
+        logger.info(f"Switched {redact_dsn(dsn)} to {redact_dsn(target)}")
+        if old is not None:
+            self._retire(old)
+
+    def _retire(self, pool: asyncpg.Pool) -> None:
+        task = asyncio.create_task(self._drain(pool))
+        self._draining.add(task)
+        task.add_done_callback(self._draining.discard)
+
+    async def _drain(self, pool: asyncpg.Pool) -> None:
+        """Close a replaced pool once its leased connections are released."""
+        try:
+            await asyncio.wait_for(pool.close(), timeout=self.drain_timeout)
+            logger.info("Drained and closed replaced pool")
+        except asyncio.TimeoutError:
+            logger.warning(f"Replaced pool still busy after {self.drain_timeout}s, terminating it")
+            pool.terminate()
+
+    async def _healthcheck(self, conn: Any) -> None:
+        """Pool setup hook: ping connections that have been idle for a while."""
+        if not conn.needs_healthcheck(self.healthcheck_seconds):
+            return
+        try:
+            await conn.fetchval('SELECT 1', timeout=self.acquire_timeout)
+        except CONNECTION_ERRORS as e:
+            # asyncpg closes the connection when setup fails; connect() retries
+            raise StaleConnectionError(str(e)) from e
+        conn.mark_verified()
+
+    def breaker(self, dsn: str) -> CircuitBreaker:
+        """Circuit breaker guarding acquires of a DSN."""
+        breaker = self._breakers.get(dsn)
+        if breaker is None:
+            breaker = self._breakers[dsn] = CircuitBreaker(f"database:{redact_dsn(dsn)}")
+        return breaker
+
+    async def connect(self, dsn: str, max_retries: Optional[int] = None) -> PooledConnection:
+        """Lease a healthy connection; close() returns it to the pool.
+
+        Raises CircuitBreakerOpen without waiting while the DSN's breaker is open.
+        """
+        metrics = self._metrics.setdefault(dsn, PoolMetrics())
+        limit = self._limits.setdefault(dsn, LeaseLimit(self.max_size)) if self._adaptive else None
+        started = time.monotonic()
+        try:
+            if limit is not None:
+                await limit.acquire(timeout=self.acquire_timeout)
+            try:
+                pool, conn = await call_with_retry(
+                    lambda: self._acquire(dsn),
+                    self.breaker(dsn),
+                    self._retry_budgets.setdefault(dsn, RetryBudget()),
+                    failures=CONNECTION_ERRORS,
+                    retryable=TRANSIENT_CONNECTION_ERRORS,
+                    max_retries=max_retries
+                )
+            except BaseException:
+                if limit is not None:
+                    limit.release()
+                raise
+        except asyncio.TimeoutError:
+            metrics.record_timeout()
+            raise
+        except CircuitBreakerOpen:
+            raise
+        except Exception:
+            metrics.record_error()
+            raise
+        metrics.record_acquire(time.monotonic() - started)
+
+        def released() -> None:
+            metrics.record_release()
+            if limit is not None:
+                limit.release()
+
+        return PooledConnection(pool, conn, released)
+
+    async def _acquire(self, dsn: str) -> Tuple[asyncpg.Pool, Any]:
+        # Every idle connection may be stale after a database restart
+        for attempt in range(self.max_size + 1):
+            pool = await self.get_pool(dsn)
+            try:
+                return pool, await pool.acquire(timeout=self.acquire_timeout)
+            except StaleConnectionError as e:
+                logger.warning(f"Discarded stale connection to {redact_dsn(dsn)}: {e}")
+            except asyncpg.InterfaceError:
+                # The pool was switched out and is closing; lease from its replacement
+                if self._pools.get(dsn) is pool:
+                    raise
+        raise asyncpg.InterfaceError(f"No healthy connection to {redact_dsn(dsn)}")
+
+    @asynccontextmanager
+    async def acquire(self, dsn: str) -> AsyncIterator[PooledConnection]:
+        conn = await self.connect(dsn)
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    def replicas(self, dsn: str) -> List[str]:
+        """Read replicas configured for a DSN."""
+        return list(self._replicas.get(dsn, []))
+
+    def set_replicas(self, dsn: str, replicas: List[str]) -> None:
+        """Replace the read replicas of a DSN; pools of dropped replicas drain in the background."""
+        old = self._replicas.pop(dsn, [])
+        if replicas:
+            self._replicas[dsn] = list(replicas)
+        in_use = {r for urls in self._replicas.values() for r in urls}
+        for replica in old:
+            if replica in in_use:
+                continue
+            self._replica_health.pop(replica, None)
+            pool = self._pools.pop(replica, None)
+            if pool is not None:
+                self._retire(pool)
+
+    def _record_replica_health(
+        self, replica: str, lag_seconds: Optional[float], error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if lag_seconds is None and error is None:
+            error = "replica has not replayed any transaction yet"
+        health = {'lag_seconds': lag_seconds, 'error': error, 'checked_at': time.monotonic()}
+        self._replica_health[replica] = health
+        if error:
+            logger.warning(f"Replica {redact_dsn(replica)} unavailable for reads: {error}")
+        return health
+
+    async def connect_read(self, dsn: str, max_lag: Optional[float] = None) -> PooledConnection:
+        """Lease a connection for read-only queries: a healthy replica of `dsn`, else the primary.
+
+        Never use it for writes; replicas reject them, the primary fallback would not.
+        """
+        replicas = self._replicas.get(dsn)
+        if not replicas:
+            return await self.connect(dsn)
+        max_lag = self.replica_max_lag if max_lag is None else max_lag
+        turn = self._replica_turn.get(dsn, 0)
+        self._replica_turn[dsn] = turn + 1
+
+        for offset in range(len(replicas)):
+            replica = replicas[(turn + offset) % len(replicas)]
+            health = self._replica_health.get(replica)
+            fresh = health is not None and time.monotonic() - health['checked_at'] < self.replica_check_seconds
+            if fresh and (health['lag_seconds'] is None or health['lag_seconds'] > max_lag):
+                continue
+            try:
+                # No retries: the primary serves the read instead
+                conn = await self.connect(replica, max_retries=0)
+            except (*CONNECTION_ERRORS, CircuitBreakerOpen) as e:
+                self._record_replica_health(replica, None, str(e) or type(e).__name__)
+                continue
+            if not fresh:
+                try:
+                    lag = await conn.fetchval(REPLICA_LAG_QUERY, timeout=self.acquire_timeout)
+                except CONNECTION_ERRORS as e:
+                    await conn.close()
+                    self._record_replica_health(replica, None, str(e) or type(e).__name__)
+                    continue
+                health = self._record_replica_health(replica, lag)
+            if health['lag_seconds'] is not None and health['lag_seconds'] <= max_lag:
+                return conn
+            await conn.close()
+        logger.debug(f"No replica of {redact_dsn(dsn)} within {max_lag}s lag, reading from the primary")
+        return await self.connect(dsn)
+
+    @asynccontextmanager
+    async def acquire_read(self, dsn: str, max_lag: Optional[float] = None) -> AsyncIterator[PooledConnection]:
+        conn = await self.connect_read(dsn, max_lag)
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    def replica_stats(self) -> List[Dict[str, Any]]:
+        """Every configured replica with its last measured lag."""
+        now = time.monotonic()
+        stats = []
+        for dsn, replicas in self._replicas.items():
+            for replica in replicas:
+                health = self._replica_health.get(replica)
+                stats.append({
+                    'primary': redact_dsn(dsn),
+                    'replica': redact_dsn(replica),
+                    'lag_seconds': health['lag_seconds'] if health else None,
+                    'error': health['error'] if health else None,
+                    'checked_seconds_ago': round(now - health['checked_at'], 1) if health else None,
+                })
+        return stats
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Size, idle and leased connections, lease limit and acquire metrics of every pool."""
+        return [
+            {
+                'dsn': redact_dsn(dsn),
+                'target': redact_dsn(self.target(dsn)),
+                'size': pool.get_size(),
+                'idle': pool.get_idle_size(),
+                'min_size': pool.get_min_size(),
+                'max_size': pool.get_max_size(),
+                'lease_limit': self._limits[dsn].limit if dsn in self._limits else None,
+                **self._metrics.get(dsn, PoolMetrics()).to_dict(),
+                'circuit_breaker': self.breaker(dsn).to_dict(),
+                'retry_budget': self._retry_budgets.get(dsn, RetryBudget()).to_dict(),
+            }
+            for dsn, pool in self._pools.items()
+        ]
+
+    def start_adaptive_sizing(self, interval: Optional[float] = None) -> None:
+        """Start moving each pool's lease limit with its load (idempotent)."""
+        if self._adapt_task is not None:
+            return
+        self._adaptive = True
+        interval = interval or settings.DATABASE_POOL_ADAPT_INTERVAL_SECONDS
+        self._adapt_task = asyncio.create_task(self._adapt_loop(interval))
+        logger.info(f"Adaptive pool sizing enabled ({self.min_size}-{self.max_size} leases, every {interval}s)")
+
+    async def _adapt_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for dsn in list(self._limits):
+                # One bad DSN (unreachable, stale connection, ...) must not stop sizing the rest
+                try:
+                    await self.adapt(dsn)
+                except Exception as e:
+                    logger.warning(f"Pool sizing skipped for {redact_dsn(dsn)}: {e}")
+
+    async def adapt(self, dsn: str) -> int:
+        """Move the lease limit of a DSN one step using the last interval's metrics."""
+        limit = self._limits[dsn]
+        pool = self._pools.get(dsn)
+        window = self._metrics[dsn].window()
+        if pool is None:
+            return limit.limit
+        # Straight from the pool: the lease limit may be what is starving callers
+        conn = await pool.acquire(timeout=self.acquire_timeout)
+        try:
+            db_load = await conn.fetchval(DATABASE_LOAD_QUERY)
+        finally:
+            await pool.release(conn)
+        new_limit = next_lease_limit(
+            limit.limit, window, db_load,
+            lower=max(1, min(self.min_size, self.max_size)),
+            upper=self.max_size,
+            wait_ms_high=settings.DATABASE_POOL_ADAPT_WAIT_MS,
+            db_load_high=settings.DATABASE_POOL_ADAPT_MAX_DB_LOAD
+        )
+        if new_limit != limit.limit:
+            logger.info(
+                f"Pool {redact_dsn(dsn)} lease limit {limit.limit} -> {new_limit} "
+                f"(avg wait {window['avg_wait_ms']:.1f}ms, {window['timeouts']} timeouts, "
+                f"peak {window['peak_in_use']} in use, database load {db_load:.0%})"
+            )
+            limit.resize(new_limit)
+        return new_limit
+
+    async def close(self, dsn: str) -> None:
+        """Close the pool of one DSN, waiting for leased connections to return."""
+        pool = self._pools.pop(dsn, None)
+        self._targets.pop(dsn, None)
+        if pool is not None:
+            await pool.close()
+            logger.info(f"Closed pool for {redact_dsn(dsn)}")
+
+    async def close_all(self) -> None:
+        if self._adapt_task is not None:
+            self._adapt_task.cancel()
+            await asyncio.gather(self._adapt_task, return_exceptions=True)
+            self._adapt_task = None
+        for dsn in list(self._pools):
+            await self.close(dsn)
+        if self._draining:
+            await asyncio.gather(*self._draining, return_exceptions=True)
+
+
+# Singleton instance
+_pool_registry: Optional[PoolRegistry] = None
+
+
+def get_pool_registry() -> PoolRegistry:
+    """Get or create the process-wide pool registry."""
+    global _pool_registry
+    if _pool_registry is None:
+        _pool_registry = PoolRegistry()
+    return _pool_registry
@@ -0,0 +1,449 @@
+"""
+State Store
+Application state shared by every worker process on a host or in a cluster.
+
+Saved connections, the active connection, legacy rules and analysis history,
+cache entries and rate limit counters used to live in module-level objects,
+so each uvicorn worker had its own copy and answered differently. They are
+kept here instead, as JSON values under (namespace, key), optionally with a
+time to live. STATE_STORE selects the backend:
+
+- ``memory``: a dict in this process; the default, for a single worker
+- ``sqlite``: a SQLite file (STATE_STORE_SQLITE_PATH) shared by the
+  workers of one host; put it on tmpfs (``/dev/shm``) to keep it in memory
+- ``postgres``: the app_state table of the application database, shared by
+  every worker on every host
+
+Expired entries are ignored on read; writes also purge every expired entry,
+at most once per STATE_STORE_PURGE_INTERVAL_SECONDS. Counters restart once
+their window has expired.
+
+Saved connections include their database password, so with the sqlite and
+postgres backends it is stored in plain text in the state file (created
+readable by its owner only) or the app_state table.
+"""
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+STATE_STORE_BACKENDS = ('memory', 'sqlite', 'postgres')
+
+
+class StateStore(ABC):
+    """Namespaced JSON key/value store with optional expiry."""
+
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Value of a key, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a JSON-serializable value, expiring after ttl_seconds if given."""
+
+    @abstractmethod
+    async def delete(self, namespace: str, key: str) -> bool:
+        """Remove a key; False if it did not exist."""
+
+    @abstractmethod
+    async def items(self, namespace: str) -> Dict[str, Any]:
+        """Every unexpired key of a namespace with its value."""
+
+    @abstractmethod
+    async def clear(self, namespace: str, pattern: str = '*') -> int:
+        """Remove the keys matching a wildcard pattern; returns how many."""
+
+    @abstractmethod
+    async def incr(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> int:
+        """Add one to a counter and return it.
+
+        A counter with a ttl counts within a window starting at its first
+        increment and restarts at 1 once the window has expired.
+        """
+
+    @abstractmethod
+    async def counts(self, namespace: str) -> Dict[str, int]:
+        """Total and expired (not yet removed) keys of a namespace."""
+
+    @abstractmethod
+    async def purge_expired(self) -> int:
+        """Remove expired keys of every namespace; returns how many."""
+
+    def _purge_due(self) -> bool:
+        """True at most once per STATE_STORE_PURGE_INTERVAL_SECONDS.
+
+        Writes call it to purge expired keys in passing, so per-client rate
+        limit counters and cache entries do not pile up without a timer.
+        """
+        now = time.monotonic()
+        last = getattr(self, '_last_purge', None)
+        if last is not None and now - last < settings.STATE_STORE_PURGE_INTERVAL_SECONDS:
+            return False
+        self._last_purge = now
+        return True
+
+    async def _purge_if_due(self) -> None:
+        if self._purge_due():
+            purged = await self.purge_expired()
+            if purged:
+                logger.debug(f"Purged {purged} expired state entries")
+
+    async def close(self) -> None:
+        pass
+
+
+# ============================================================================
+# In-process store
+# ============================================================================
+
+class MemoryStateStore(StateStore):
+    """State in this process only: consistent for a single worker."""
+
+    def __init__(self):
+        # namespace -> key -> (value, expires_at or None)
+        self._data: Dict[str, Dict[str, Tuple[Any, Optional[float]]]] = {}
+
+    def _live(self, namespace: str, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        entry = self._data.get(namespace, {}).get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._data[namespace][key]
+            return None
+        return entry
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self._live(namespace, key)
+        return None if entry is None else entry[0]
+
+    async def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+        # Stored as JSON, like the shared backends, so callers never share mutable values
+        self._data.setdefault(namespace, {})[key] = (json.loads(json.dumps(value)), expires_at)
+        await self._purge_if_due()
+
+    async def delete(self, namespace: str, key: str) -> bool:
+        return self._data.get(namespace, {}).pop(key, None) is not None
+
+    async def items(self, namespace: str) -> Dict[str, Any]:
+        return {
+            key: entry[0] for key in list(self._data.get(namespace, {}))
+            if (entry := self._live(namespace, key)) is not None
+        }
+
+    async def clear(self, namespace: str, pattern: str = '*') -> int:
+        entries = self._data.get(namespace, {})
+        keys = [k for k in entries if fnmatch.fnmatchcase(k, pattern)]
+        for key in keys:
+            del entries[key]
+        return len(keys)
+
+    async def incr(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> int:
+        entry = self._live(namespace, key)
+        if entry is None:
+            expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+            entry = (0, expires_at)
+        count = entry[0] + 1
+        self._data.setdefault(namespace, {})[key] = (count, entry[1])
+        await self._purge_if_due()
+        return count
+
+    async def counts(self, namespace: str) -> Dict[str, int]:
+        now = time.time()
+        entries = self._data.get(namespace, {}).values()
+        return {
+            'total': len(entries),
+            'expired': sum(1 for _, expires_at in entries if expires_at is not None and expires_at <= now),
+        }
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        purged = 0
+        for entries in self._data.values():
+            expired = [k for k, (_, expires_at) in entries.items() if expires_at is not None and expires_at <= now]
+            for key in expired:
+                del entries[key]
+            purged += len(expired)
+        return purged
+
+
+# ============================================================================
+# SQLite store (one host)
+# ============================================================================
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS app_state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+class SQLiteStateStore(StateStore):
+    """State in a SQLite file shared by the worker processes of one host.
+
+    Calls run in a thread; writes take the database lock (BEGIN IMMEDIATE), so
+    counters stay exact across processes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.STATE_STORE_SQLITE_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            # Holds saved connection passwords
+            os.chmod(self.path, 0o600)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(SQLITE_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        def run() -> T:
+            with self._lock:
+                conn = self._connection()
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    result = work(conn)
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+                conn.execute('COMMIT')
+                return result
+
+        return await asyncio.to_thread(run)
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        def work(conn: sqlite3.Connection) -> Optional[Any]:
+            row = conn.execute(
+                'SELECT value FROM app_state WHERE namespace = ? AND key = ? '
+                'AND (expires_at IS NULL OR expires_at > ?)',
+                (namespace, key, time.time())
+            ).fetchone()
+            return None if row is None else json.loads(row[0])
+
+        return await self._run(work)
+
+    async def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+        await self._run(lambda conn: conn.execute(
+            'INSERT OR REPLACE INTO app_state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)',
+            (namespace, key, json.dumps(value), expires_at)
+        ))
+        await self._purge_if_due()
+
+    async def delete(self, namespace: str, key: str) -> bool:
+        return await self._run(lambda conn: conn.execute(
+            'DELETE FROM app_state WHERE namespace = ? AND key = ?', (namespace, key)
+        ).rowcount > 0)
+
+    async def items(self, namespace: str) -> Dict[str, Any]:
+        def work(conn: sqlite3.Connection) -> Dict[str, Any]:
+            rows = conn.execute(
+                'SELECT key, value FROM app_state WHERE namespace = ? '
+                'AND (expires_at IS NULL OR expires_at > ?)',
+                (namespace, time.time())
+            ).fetchall()
+            return {key: json.loads(value) for key, value in rows}
+
+        return await self._run(work)
+
+    async def clear(self, namespace: str, pattern: str = '*') -> int:
+        def work(conn: sqlite3.Connection) -> int:
+            keys = [
+                (namespace, key) for (key,) in conn.execute(
+                    'SELECT key FROM app_state WHERE namespace = ?', (namespace,)
+                ).fetchall()
+                if fnmatch.fnmatchcase(key, pattern)
+            ]
+            conn.executemany('DELETE FROM app_state WHERE namespace = ? AND key = ?', keys)
+            return len(keys)
+
+        return await self._run(work)
+
+    async def incr(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> int:
+        def work(conn: sqlite3.Connection) -> int:
+            now = time.time()
+            row = conn.execute(
+                'SELECT value, expires_at FROM app_state WHERE namespace = ? AND key = ?', (namespace, key)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                count, expires_at = 1, now + ttl_seconds if ttl_seconds is not None else None
+            else:
+                count, expires_at = json.loads(row[0]) + 1, row[1]
+            conn.execute(
+                'INSERT OR REPLACE INTO app_state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)',
+                (namespace, key, json.dumps(count), expires_at)
+            )
+            return count
+
+        count = await self._run(work)
+        await self._purge_if_due()
+        return count
+
+    async def counts(self, namespace: str) -> Dict[str, int]:
+        def work(conn: sqlite3.Connection) -> Dict[str, int]:
+            total, expired = conn.execute(
+                'SELECT COUNT(*), COUNT(*) FILTER (WHERE expires_at <= ?) FROM app_state WHERE namespace = ?',
+                (time.time(), namespace)
+            ).fetchone()
+            return {'total': total, 'expired': expired}
+
+        return await self._run(work)
+
+    async def purge_expired(self) -> int:
+        return await self._run(lambda conn: conn.execute(
+            'DELETE FROM app_state WHERE expires_at <= ?', (time.time(),)
+        ).rowcount)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ============================================================================
+# PostgreSQL store (every host)
+# ============================================================================
+
+def state_dsn(dsn: str) -> str:
+    """The DSN with its own application_name.
+
+    The state store gets a pool of its own, which is not repointed when the
+    application switches databases, so saved connections stay where they are.
+    """
+    parts = urlsplit(dsn)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault('application_name', 'dqm-state')
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class PostgresStateStore(StateStore):
+    """State in the app_state table (migration 010), shared by every worker."""
+
+    def __init__(self, dsn: Optional[str] = None, pools: Optional[PoolRegistry] = None):
+        self.dsn = state_dsn(dsn or settings.DATABASE_URL)
+        self.pools = pools or get_pool_registry()
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        async with self.pools.acquire(self.dsn) as conn:
+            value = await conn.fetchval('''
+                SELECT value::text FROM app_state
+                WHERE namespace = $1 AND key = $2 AND (expires_at IS NULL OR expires_at > now())
+            ''', namespace, key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        async with self.pools.acquire(self.dsn) as conn:
+            await conn.execute('''
+                INSERT INTO app_state (namespace, key, value, expires_at, updated_at)
+                VALUES ($1, $2, $3::jsonb, now() + make_interval(secs => $4), now())
+                ON CONFLICT (namespace, key) DO UPDATE
+                SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at, updated_at = now()
+            ''', namespace, key, json.dumps(value), ttl_seconds)
+        await self._purge_if_due()
+
+    async def delete(self, namespace: str, key: str) -> bool:
+        async with self.pools.acquire(self.dsn) as conn:
+            status = await conn.execute(
+                'DELETE FROM app_state WHERE namespace = $1 AND key = $2', namespace, key
+            )
+        return status != 'DELETE 0'
+
+    async def items(self, namespace: str) -> Dict[str, Any]:
+        async with self.pools.acquire(self.dsn) as conn:
+            rows = await conn.fetch('''
+                SELECT key, value::text AS value FROM app_state
+                WHERE namespace = $1 AND (expires_at IS NULL OR expires_at > now())
+            ''', namespace)
+        return {r['key']: json.loads(r['value']) for r in rows}
+
+    async def clear(self, namespace: str, pattern: str = '*') -> int:
+        async with self.pools.acquire(self.dsn) as conn:
+            keys: List[str] = [
+                r['key'] for r in await conn.fetch('SELECT key FROM app_state WHERE namespace = $1', namespace)
+                if fnmatch.fnmatchcase(r['key'], pattern)
+            ]
+            if keys:
+                await conn.execute(
+                    'DELETE FROM app_state WHERE namespace = $1 AND key = ANY($2::text[])', namespace, keys
+                )
+        return len(keys)
+
+    async def incr(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> int:
+        # One statement, so concurrent workers never lose an increment
+        async with self.pools.acquire(self.dsn) as conn:
+            count = await conn.fetchval('''
+                INSERT INTO app_state (namespace, key, value, expires_at, updated_at)
+                VALUES ($1, $2, '1'::jsonb, now() + make_interval(secs => $3), now())
+                ON CONFLICT (namespace, key) DO UPDATE
+                SET value = CASE
+                        WHEN app_state.expires_at <= now() THEN '1'::jsonb
+                        ELSE to_jsonb(app_state.value::text::bigint + 1)
+                    END,
+                    expires_at = CASE
+                        WHEN app_state.expires_at <= now() THEN EXCLUDED.expires_at
+                        ELSE app_state.expires_at
+                    END,
+                    updated_at = now()
+                RETURNING value::text::bigint
+            ''', namespace, key, ttl_seconds)
+        await self._purge_if_due()
+        return count
+
+    async def counts(self, namespace: str) -> Dict[str, int]:
+        async with self.pools.acquire(self.dsn) as conn:
+            row = await conn.fetchrow('''
+                SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE expires_at <= now()) AS expired
+                FROM app_state WHERE namespace = $1
+            ''', namespace)
+        return {'total': row['total'], 'expired': row['expired']}
+
+    async def purge_expired(self) -> int:
+        async with self.pools.acquire(self.dsn) as conn:
+            status = await conn.execute('DELETE FROM app_state WHERE expires_at <= now()')
+        return int(status.split()[-1])
+
+
+_state_store: Optional[StateStore] = None
+
+
+def create_state_store(backend: Optional[str] = None) -> StateStore:
+    """A state store for a STATE_STORE backend name."""
+    backend = backend or settings.STATE_STORE
+    if backend == 'memory':
+        return MemoryStateStore()
+    if backend == 'sqlite':
+        return SQLiteStateStore()
+    if backend == 'postgres':
+        return PostgresStateStore()
+    raise ValueError(f"Unknown state store '{backend}'. Use one of: {list(STATE_STORE_BACKENDS)}")
+
+
+def get_state_store() -> StateStore:
+    """Get or create the process-wide state store."""
+    global _state_store
+    if _state_store is None:
+        _state_store = create_state_store()
+        logger.info(f"Using {settings.STATE_STORE} state store")
+    return _state_store
@@ -9,6 +9,7 @@ import asyncpg
 import logging
 
 from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
 
 logger = logging.getLogger(__name__)
 
@@ -18,26 +19,22 @@ class DatabasePool:
     Database connection pool manager.
 
     Created at app startup, used by FastAPI dependencies to provide
-    connections to route handlers via Depends().
+    connections to route handlers via Depends(). The pool itself is the
+    shared one from the pool registry.
     """
 
-    def __init__(self):
+    def __init__(self, pools: Optional[PoolRegistry] = None):
+        self.pools = pools or get_pool_registry()
         self.pool: Optional[asyncpg.Pool] = None
 
     async def create_pool(self) -> None:
-        """Create the connection pool."""
-        self.pool = await asyncpg.create_pool(
-            settings.DATABASE_URL,
-            min_size=settings.DATABASE_MIN_POOL_SIZE,
-            max_size=settings.DATABASE_MAX_POOL_SIZE
-        )
-        logger.info(f"Database pool created with {settings.DATABASE_MIN_POOL_SIZE}-{settings.DATABASE_MAX_POOL_SIZE} connections")
+        """Attach to the shared pool for DATABASE_URL, opening it if needed."""
+        self.pool = await self.pools.get_pool(settings.DATABASE_URL)
 
     async def close_pool(self) -> None:
-        """Close the connection pool."""
-        if self.pool:
-            await self.pool.close()
-            logger.info("Database pool closed")
+        """Close all registry pools (application shutdown)."""
+        self.pool = None
+        await self.pools.close_all()
 
     @asynccontextmanager
     async def get_connection(self) -> AsyncGenerator[asyncpg.Connection, None]:
@@ -48,7 +45,7 @@ class DatabasePool:
             async with db_pool.get_connection() as conn:
                 result = await conn.fetch(...)
         """
-        async with self.pool.acquire() as conn:
+        async with self.pools.acquire(settings.DATABASE_URL) as conn:
             yield conn
 
 
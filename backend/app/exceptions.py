@@ -1,13 +1,28 @@
 """
 Exception Handling Module for DQM Application
 Generated by RTX 5090 (Qwen2.5-Coder-32B-AWQ)
+
+Circuit breakers guard calls to a dependency (a database, the local LLM):
+after CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive failures the breaker
+opens and calls fail fast with CircuitBreakerOpen (HTTP 503 with
+Retry-After) for CIRCUIT_BREAKER_RECOVERY_SECONDS; then a single trial call
+is let through (half-open) and its outcome closes or re-opens the breaker.
+``get_circuit_breaker(name)`` returns the process-wide breaker of a
+dependency; see app.utils.retry.call_with_retry for the call wrapper.
 """
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+import logging
 import time
 
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
 
 class ProblemDetail(BaseModel):
     """RFC 7807 compliant problem details."""
@@ -50,7 +65,10 @@ class ResourceNotFoundError(DQMException):
 
 class CircuitBreakerOpen(Exception):
     """Exception raised when the circuit breaker is open."""
-    pass
+
+    def __init__(self, detail: str = "Circuit breaker is open", retry_after: Optional[float] = None):
+        self.retry_after = retry_after
+        super().__init__(detail)
 
 
 class CircuitBreaker:
@@ -60,48 +78,110 @@ class CircuitBreaker:
     States:
         CLOSED: Normal operation, requests flow through
         OPEN: Too many failures, requests are blocked
-        HALF_OPEN: Testing if service recovered
+        HALF_OPEN: Testing if service recovered; one trial request at a time
     """
     STATE_CLOSED = 'CLOSED'
     STATE_OPEN = 'OPEN'
     STATE_HALF_OPEN = 'HALF_OPEN'
 
-    def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 30):
+    def __init__(
+        self,
+        name: str = 'default',
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None
+    ):
+        self.name = name
         self.state = self.STATE_CLOSED
         self.failure_count = 0
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or settings.CIRCUIT_BREAKER_RECOVERY_SECONDS
         self.last_failure_time = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+        # "FROM->TO" -> count, and the latest transitions with their time
+        self.transitions: Dict[str, int] = {}
+        self.recent_transitions: Deque[Dict[str, Any]] = deque(maxlen=20)
+
+    def _transition(self, state: str) -> None:
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.recent_transitions.append({'transition': key, 'at': datetime.now(timezone.utc).isoformat()})
+        log = logger.warning if state == self.STATE_OPEN else logger.info
+        log(f"Circuit breaker '{self.name}' {key}")
+        self.state = state
+        self._trial_in_flight = False
 
     def record_failure(self) -> None:
         """Records a failure and transitions the state if necessary."""
         self.failure_count += 1
-        self.last_failure_time = time.time()
-        if self.failure_count >= self.failure_threshold:
-            self.state = self.STATE_OPEN
+        self.last_failure_time = time.monotonic()
+        if self.state == self.STATE_HALF_OPEN or (
+            self.state == self.STATE_CLOSED and self.failure_count >= self.failure_threshold
+        ):
+            self._transition(self.STATE_OPEN)
 
     def record_success(self) -> None:
         """Records a success and resets the failure count."""
         if self.state == self.STATE_HALF_OPEN:
-            self.state = self.STATE_CLOSED
+            self._transition(self.STATE_CLOSED)
         self.failure_count = 0
 
+    def record_cancelled(self) -> None:
+        """A request ended without an outcome; lets the next trial request through."""
+        if self.state == self.STATE_HALF_OPEN:
+            self._trial_in_flight = False
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial request through."""
+        if self.state != self.STATE_OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.last_failure_time))
+
     def allow_request(self) -> bool:
         """Determines if a request is allowed based on the current state."""
+        if self.state == self.STATE_OPEN and self.retry_after() == 0:
+            self._transition(self.STATE_HALF_OPEN)
         if self.state == self.STATE_CLOSED:
             return True
-        elif self.state == self.STATE_HALF_OPEN:
+        if self.state == self.STATE_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
             return True
-        elif self.state == self.STATE_OPEN:
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = self.STATE_HALF_OPEN
-                return True
+        self.rejected += 1
         return False
 
     def __call__(self) -> None:
         """Check if request should be allowed, raise if not."""
         if not self.allow_request():
-            raise CircuitBreakerOpen("Circuit breaker is open")
+            raise CircuitBreakerOpen(
+                f"Circuit breaker '{self.name}' is open", retry_after=self.retry_after()
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'state': self.state,
+            'failure_count': self.failure_count,
+            'rejected': self.rejected,
+            'retry_after_seconds': round(self.retry_after(), 1),
+            'transitions': dict(self.transitions),
+            'recent_transitions': list(self.recent_transitions),
+        }
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get or create the process-wide circuit breaker of a dependency."""
+    breaker = _circuit_breakers.get(name)
+    if breaker is None:
+        breaker = _circuit_breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
+def circuit_breaker_stats() -> List[Dict[str, Any]]:
+    """State, rejections and transitions of every process-wide circuit breaker."""
+    return [breaker.to_dict() for breaker in _circuit_breakers.values()]
 
 
 async def dqm_exception_handler(request: Request, exc: DQMException) -> JSONResponse:
@@ -119,18 +199,38 @@ async def dqm_exception_handler(request: Request, exc: DQMException) -> JSONResp
     )
 
 
+def open_breaker_cause(exc: BaseException) -> Optional[CircuitBreakerOpen]:
+    """The CircuitBreakerOpen an exception was raised while handling, if any.
+
+    Routes turn unexpected errors into HTTPException(500) inside a blanket
+    ``except Exception``; the open breaker stays reachable as its context,
+    so the HTTP handlers can still answer 503 with Retry-After.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, CircuitBreakerOpen):
+            return exc
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
 async def circuit_breaker_handler(request: Request, exc: CircuitBreakerOpen) -> JSONResponse:
     """Handles CircuitBreakerOpen exception."""
     problem_detail = ProblemDetail(
         type="about:blank",
         title="Service Unavailable",
         status=status.HTTP_503_SERVICE_UNAVAILABLE,
-        detail="Service temporarily unavailable due to circuit breaker",
+        detail=f"Service temporarily unavailable due to circuit breaker: {exc}",
         instance=str(request.url)
     )
+    headers = None
+    if exc.retry_after is not None:
+        headers = {"Retry-After": str(max(1, round(exc.retry_after)))}
     return JSONResponse(
         content=problem_detail.model_dump(),
-        status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers=headers
     )
 
 
@@ -2,7 +2,12 @@
 DQM LOCAL AI Application - Main Entry Point
 Generated by LOCAL AI (RTX 5090 + RTX 3050)
 Updated to use REAL database routes
+
+The application is built by create_app(); ``app`` is the instance uvicorn
+serves. Optional subsystems (the rule scheduler, adaptive pool sizing, the
+startup warm-up) are imported and started by the lifespan only when enabled.
 """
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
@@ -23,11 +28,24 @@ from app.routes import (
     lineage_router,
     reports_router,
     connections_router,  # V79: Database connection manager
+    schedules_router,
+    jobs_router,
+    index_advisor_router,
+    rollups_router,
 )
 # Legacy routes for backward compatibility
 from app.api_routes import router as api_router
 # Import profiling service for initialization
-from app.services.data_profiling_service import get_profiling_service, _profiling_service
+from app.services.data_profiling_service import get_profiling_service
+from app.db_config.pool_registry import get_pool_registry
+from app.db_config.migrations import MigrationRunner
+from app.db_config.state_store import get_state_store
+from app.services.result_partitions import get_result_partition_manager
+from app.exceptions import (
+    circuit_breaker_handler, circuit_breaker_stats, open_breaker_cause, register_exception_handlers
+)
+from app.utils.retry import retry_budget_stats
+from app.config import settings
 
 # Configure logging
 logging.basicConfig(
@@ -43,30 +61,65 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager with database initialization."""
     logger.info("Starting DQM LOCAL AI Application...")
 
-    # Initialize database connection pool
+    # Initialize the shared connection pool registry
+    pools = get_pool_registry()
+    app.state.pools = pools
     try:
+        await pools.get_pool(settings.DATABASE_URL)
+        if settings.MIGRATE_ON_STARTUP:
+            await MigrationRunner(settings.DATABASE_URL, pools=pools).migrate()
         service = await get_profiling_service()
         tables = await service.get_tables()
         logger.info(f"Database connection verified. Available tables: {len(tables)}")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
+    if settings.DATABASE_POOL_ADAPTIVE:
+        pools.start_adaptive_sizing()
+
+    # Shared state: follow connection switches made by other workers
+    state_store = get_state_store()
+    connection_follower = None
+    if settings.STATE_STORE != "memory":
+        from app.db_config.database import follow_active_connection
+
+        connection_follower = asyncio.create_task(follow_active_connection())
+
+    app.state.warmup = None
+    if settings.WARMUP_ON_STARTUP:
+        from app.services.data_quality_rules import DataQualityRulesService
+        from app.services.warmup import StartupWarmup
+
+        app.state.warmup = StartupWarmup(
+            service,
+            DataQualityRulesService(settings.DATABASE_URL, pools),
+            connections=pools.min_size
+        )
+        app.state.warmup.start()
+
+    await get_result_partition_manager().start()
+    if settings.SCHEDULER_ENABLED:
+        from app.services.rule_scheduler import get_rule_scheduler
+
+        await get_rule_scheduler().start()
 
     yield
 
     # Cleanup database connection on shutdown
     logger.info("Shutting down DQM LOCAL AI Application...")
-    if _profiling_service:
-        await _profiling_service.disconnect()
-        logger.info("Database connection pool closed")
-
+    if app.state.warmup is not None:
+        await app.state.warmup.stop()
+    if settings.SCHEDULER_ENABLED:
+        from app.services.rule_scheduler import get_rule_scheduler
 
-app = FastAPI(
-    title="DQM LOCAL AI",
-    description="Data Quality Management - Generated by LOCAL AI (RTX 5090 + RTX 3050)",
-    version="1.0.0",
-    lifespan=lifespan
-)
+        await get_rule_scheduler().stop()
+    await get_result_partition_manager().stop()
+    if connection_follower is not None:
+        connection_follower.cancel()
+        await asyncio.gather(connection_follower, return_exceptions=True)
+    await state_store.close()
+    await pools.close_all()
+    logger.info("Database connection pools closed")
 
 
 # Middleware for request timing
@@ -79,21 +132,11 @@ class RequestTimingMiddleware(BaseHTTPMiddleware):
         return response
 
 
-app.add_middleware(RequestTimingMiddleware)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:3001", "http://localhost:5173"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
 # Exception handlers
-@app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
+    breaker = open_breaker_cause(exc)
+    if breaker is not None:
+        return await circuit_breaker_handler(request, breaker)
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     return JSONResponse(
         status_code=500,
@@ -101,7 +144,6 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
     )
 
 
-@app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     logger.error(f"Value error: {exc}")
     return JSONResponse(
@@ -110,16 +152,20 @@ async def value_error_handler(request: Request, exc: ValueError):
     )
 
 
-@app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
+    breaker = open_breaker_cause(exc)
+    if breaker is not None:
+        return await circuit_breaker_handler(request, breaker)
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
     )
 
 
-@app.exception_handler(StarletteHTTPException)
 async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPException):
+    breaker = open_breaker_cause(exc)
+    if breaker is not None:
+        return await circuit_breaker_handler(request, breaker)
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
@@ -127,14 +173,36 @@ async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPE
 
 
 # Health endpoint
-@app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "app": "dqm-local-ai", "version": "1.0.0"}
 
 
+# Readiness endpoint
+async def readiness_check(request: Request):
+    """Readiness probe: 503 while the startup warm-up is running."""
+    warmup = getattr(request.app.state, "warmup", None)
+    if warmup is None:
+        return {"status": "ready", "warmup": None}
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "warmup": warmup.status()})
+    return {"status": "ready", "warmup": warmup.status()}
+
+
+# Dependency health endpoint
+async def dependency_health():
+    """Circuit breaker state, transitions and retry budget of every dependency."""
+    budgets = retry_budget_stats()
+    dependencies = [
+        {**breaker, "retry_budget": budgets.get(breaker["name"])} for breaker in circuit_breaker_stats()
+    ]
+    dependencies += [
+        {**pool["circuit_breaker"], "retry_budget": pool["retry_budget"]} for pool in get_pool_registry().stats()
+    ]
+    return {"dependencies": dependencies}
+
+
 # Root endpoint
-@app.get("/")
 async def root():
     """Root endpoint with API info."""
     return {
@@ -145,15 +213,54 @@ async def root():
     }
 
 
-# Include domain-separated routes (Expert AI pattern)
-app.include_router(data_profiling_router)
-app.include_router(data_quality_router)
-app.include_router(ai_analysis_router)
-app.include_router(database_router)  # V74: Dynamic database configuration
-app.include_router(audit_router)  # V76: Audit logging
-app.include_router(lineage_router)  # V77: Data lineage tracking
-app.include_router(reports_router)  # V77: Report generation
-app.include_router(connections_router)  # V79: Database connection manager
+def create_app() -> FastAPI:
+    """Build the FastAPI application with its middleware, handlers and routes."""
+    app = FastAPI(
+        title="DQM LOCAL AI",
+        description="Data Quality Management - Generated by LOCAL AI (RTX 5090 + RTX 3050)",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    app.add_middleware(RequestTimingMiddleware)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://localhost:3001", "http://localhost:5173"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.add_exception_handler(Exception, unhandled_exception_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(StarletteHTTPException, starlette_http_exception_handler)
+    register_exception_handlers(app)
+
+    app.add_api_route("/health", health_check, methods=["GET"])
+    app.add_api_route("/ready", readiness_check, methods=["GET"])
+    app.add_api_route("/health/dependencies", dependency_health, methods=["GET"])
+    app.add_api_route("/", root, methods=["GET"])
+
+    # Include domain-separated routes (Expert AI pattern)
+    app.include_router(data_profiling_router)
+    app.include_router(data_quality_router)
+    app.include_router(ai_analysis_router)
+    app.include_router(database_router)  # V74: Dynamic database configuration
+    app.include_router(audit_router)  # V76: Audit logging
+    app.include_router(lineage_router)  # V77: Data lineage tracking
+    app.include_router(reports_router)  # V77: Report generation
+    app.include_router(connections_router)  # V79: Database connection manager
+    app.include_router(schedules_router)  # Cron scheduling for rules
+    app.include_router(jobs_router)  # Distributed rule job queue
+    app.include_router(index_advisor_router)  # Index proposals for rule SQL
+    app.include_router(rollups_router)  # Daily quality rollups
+
+    # Include legacy API routes for backward compatibility
+    app.include_router(api_router)
+    return app
+
 
-# Include legacy API routes for backward compatibility
-app.include_router(api_router)
\ No newline at end of file
+app = create_app()
\ No newline at end of file
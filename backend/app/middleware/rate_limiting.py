@@ -1,14 +1,22 @@
 """
 Rate Limiting Middleware for FastAPI
 Generated by RTX 5090 (Qwen2.5-Coder-32B-AWQ)
+
+The middleware counts requests in the shared state store, so the limit holds
+across all worker processes rather than per worker.
 """
 import time
 from collections import defaultdict
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from fastapi import FastAPI, Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 import os
 
+from app.db_config.state_store import StateStore, get_state_store
+
+# State store namespace of the per-client request counters
+RATE_LIMIT_NAMESPACE = "rate_limit"
+
 
 class RateLimitExceeded(HTTPException):
     """Exception raised when rate limit is exceeded."""
@@ -21,13 +29,24 @@ class RateLimitExceeded(HTTPException):
 
 
 class RateLimiter:
-    """In-memory rate limiter with TTL cleanup."""
+    """Rate limiter with TTL cleanup.
 
-    def __init__(self, limit: int = 100, period: int = 60):
+    ``is_allowed`` counts in this process; with a state store, ``allow``
+    counts in the store instead, shared by every worker.
+    """
+
+    def __init__(self, limit: int = 100, period: int = 60, store: Optional[StateStore] = None):
         self.limit = limit
         self.period = period
+        self.store = store
         self.requests: Dict[str, Tuple[int, int]] = defaultdict(lambda: (0, 0))
 
+    async def allow(self, ip: str) -> bool:
+        """Check if request from IP is allowed, in the state store when one is set."""
+        if self.store is None:
+            return self.is_allowed(ip)
+        return await self.store.incr(RATE_LIMIT_NAMESPACE, ip, ttl_seconds=self.period) <= self.limit
+
     def is_allowed(self, ip: str) -> bool:
         """Check if request from IP is allowed."""
         current_time = int(time.time())
@@ -57,14 +76,15 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.rate_limiter = RateLimiter(
             limit=limit or REQUEST_LIMIT,
-            period=period or REQUEST_PERIOD
+            period=period or REQUEST_PERIOD,
+            store=get_state_store()
         )
 
     async def dispatch(self, request: Request, call_next):
         x_forwarded_for = request.headers.get('X-Forwarded-For')
         client_host = x_forwarded_for.split(',')[0] if x_forwarded_for else request.client.host
 
-        if not self.rate_limiter.is_allowed(client_host):
+        if not await self.rate_limiter.allow(client_host):
             raise RateLimitExceeded(retry_after=self.rate_limiter.period)
 
         response = await call_next(request)
@@ -11,6 +11,10 @@ from .audit import router as audit_router
 from .lineage import router as lineage_router
 from .reports import router as reports_router
 from .connections import router as connections_router  # V79: Database connection manager
+from .schedules import router as schedules_router
+from .jobs import router as jobs_router
+from .index_advisor import router as index_advisor_router
+from .rollups import router as rollups_router
 
 __all__ = [
     "data_profiling_router",
@@ -21,4 +25,8 @@ __all__ = [
     "lineage_router",
     "reports_router",
     "connections_router",  # V79
+    "schedules_router",
+    "jobs_router",
+    "index_advisor_router",
+    "rollups_router",
 ]
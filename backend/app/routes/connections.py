@@ -3,10 +3,17 @@ Database Connection Manager Routes
 V79 Enhancement: Dynamic database connection switching
 Generated by RTX 3050 (Qwen2.5-Coder-7B-Instruct)
 Architecture by RTX 5090 (Qwen2.5-Coder-32B-Instruct-AWQ)
-"""
-"""
+
 V82 Fix: Removed broken import (app.config.database doesn't exist)
 The get_pool was never used - this file is self-contained.
+
+Switching repoints the shared application pool at the chosen database while
+the server runs (see switch_application_database); no restart is needed.
+
+Saved connections and the active connection live in the shared state store
+(the same records as /database/connections), so every worker process sees the
+same ones; workers that did not handle a switch follow it within
+STATE_SYNC_INTERVAL_SECONDS (see app.db_config.database).
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
@@ -14,6 +21,15 @@ from typing import List, Optional, Dict
 import asyncpg
 import logging
 
+from app.config import settings
+from app.db_config.database import (
+    CONNECTIONS_NAMESPACE,
+    activate_connection,
+    connection_url,
+    get_active_connection_name,
+)
+from app.db_config.state_store import get_state_store
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -33,6 +49,7 @@ class ConnectionConfig(BaseModel):
     username: str
     password: str
     ssl_mode: Optional[str] = None
+    replica_urls: List[str] = []  # Read replicas used for profiling and rule scans
 
 
 class ConnectionTestRequest(BaseModel):
@@ -53,9 +70,20 @@ class ConnectionStatus(BaseModel):
     is_active: bool = False
 
 
-# In-memory storage for saved connections
-_saved_connections: Dict[str, ConnectionConfig] = {}
-_active_connection: Optional[str] = None
+async def _saved_connections() -> Dict[str, ConnectionConfig]:
+    saved = await get_state_store().items(CONNECTIONS_NAMESPACE)
+    return {name: ConnectionConfig(**config) for name, config in sorted(saved.items())}
+
+
+async def _get_saved_connection(name: str) -> Optional[ConnectionConfig]:
+    config = await get_state_store().get(CONNECTIONS_NAMESPACE, name)
+    return ConnectionConfig(**config) if config is not None else None
+
+
+async def _active_connection() -> Optional[str]:
+    """Name of the active saved connection, None for the default database."""
+    name = await get_active_connection_name()
+    return None if name == "default" else name
 
 
 @router.get("", response_model=List[ConnectionStatus])
@@ -65,22 +93,22 @@ async def list_connections():
 
     Returns status for each saved connection including which is active.
     """
-    global _active_connection
+    active = await _active_connection()
     connections = []
 
-    for name, config in _saved_connections.items():
+    for name, config in (await _saved_connections()).items():
         connections.append(ConnectionStatus(
             name=name,
             status="saved",
-            is_active=(name == _active_connection)
+            is_active=(name == active)
         ))
 
     # Add default connection
     connections.insert(0, ConnectionStatus(
         name="default",
-        status="active" if _active_connection is None else "available",
+        status="active" if active is None else "available",
         message="Default Northwind database",
-        is_active=(_active_connection is None)
+        is_active=(active is None)
     ))
 
     return connections
@@ -93,12 +121,10 @@ async def save_connection(config: ConnectionConfig):
 
     Does not switch to the connection - use /switch endpoint for that.
     """
-    global _saved_connections
-
     if config.name == "default":
         raise HTTPException(status_code=400, detail="Cannot override default connection")
 
-    _saved_connections[config.name] = config
+    await get_state_store().set(CONNECTIONS_NAMESPACE, config.name, config.model_dump())
     logger.info(f"Saved connection config: {config.name}")
 
     return ConnectionStatus(
@@ -152,43 +178,25 @@ async def switch_connection(name: str):
     Switch to a different database connection.
 
     Requires the connection to be saved first (or 'default' for original).
-    Note: Full runtime switching requires server restart for pool recreation.
+    The new database is migrated and its pool warmed before requests move
+    over; queries already running finish on the previous database.
     """
-    global _active_connection, _saved_connections
-
-    if name == "default":
-        # Reset to default connection
-        _active_connection = None
-        logger.info("Switched to default connection (requires restart for full effect)")
-        return ConnectionStatus(
-            name="default",
-            status="active",
-            message="Switched to default Northwind database. Restart server to apply.",
-            is_active=True
-        )
-
-    if name not in _saved_connections:
+    config = None if name == "default" else await _get_saved_connection(name)
+    if name != "default" and config is None:
         raise HTTPException(status_code=404, detail=f"Connection '{name}' not found")
 
-    config = _saved_connections[name]
-
-    # Test the connection first
     try:
-        if config.db_type == "azure":
-            dsn = f"postgresql://{config.username}:{config.password}@{config.host}:{config.port}/{config.database}?sslmode=require"
+        # Fails without changing anything if the database is unreachable
+        if config is None:
+            await activate_connection(name, settings.DATABASE_URL)
         else:
-            dsn = f"postgresql://{config.username}:{config.password}@{config.host}:{config.port}/{config.database}"
-
-        conn = await asyncpg.connect(dsn, timeout=10)
-        await conn.close()
-
-        _active_connection = name
+            await activate_connection(name, connection_url(config), config.replica_urls)
         logger.info(f"Switched to connection: {name}")
 
         return ConnectionStatus(
             name=name,
             status="active",
-            message=f"Switched to '{name}'. Restart server to apply full connection.",
+            message="Switched to default Northwind database." if name == "default" else f"Switched to '{name}'.",
             is_active=True
         )
     except Exception as e:
@@ -203,18 +211,15 @@ async def delete_connection(name: str):
 
     Cannot delete 'default' or the currently active connection.
     """
-    global _saved_connections, _active_connection
-
     if name == "default":
         raise HTTPException(status_code=400, detail="Cannot delete default connection")
 
-    if name == _active_connection:
+    if name == await _active_connection():
         raise HTTPException(status_code=400, detail="Cannot delete active connection. Switch to another first.")
 
-    if name not in _saved_connections:
+    if not await get_state_store().delete(CONNECTIONS_NAMESPACE, name):
         raise HTTPException(status_code=404, detail=f"Connection '{name}' not found")
 
-    del _saved_connections[name]
     logger.info(f"Deleted connection: {name}")
 
     return ConnectionStatus(
@@ -229,9 +234,9 @@ async def get_active_connection():
     """
     Get the currently active database connection info.
     """
-    global _active_connection
+    active = await _active_connection()
 
-    if _active_connection is None:
+    if active is None:
         return {
             "name": "default",
             "type": "postgresql",
@@ -240,7 +245,7 @@ async def get_active_connection():
             "is_default": True
         }
 
-    config = _saved_connections.get(_active_connection)
+    config = await _get_saved_connection(active)
     if config:
         return {
             "name": config.name,
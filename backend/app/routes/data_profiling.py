@@ -4,7 +4,7 @@ Generated by RTX 3050 (Qwen2.5-Coder-7B-Instruct)
 Enhanced for production use.
 V79: Added batch profiling for multi-table selection.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Dict, Any
 
@@ -134,6 +134,39 @@ async def profile_and_store(table: str):
         raise HTTPException(status_code=500, detail=f"Failed to profile and store: {str(e)}")
 
 
+@router.get("/files")
+async def list_files():
+    """
+    List CSV and Parquet files in FILE_SOURCE_DIR that can be profiled in place.
+    """
+    from app.services.file_source import FileSourceService
+
+    return FileSourceService().list_files()
+
+
+@router.get("/files/{file_name:path}/profile")
+async def profile_file(
+    file_name: str,
+    delimiter: str = Query(default=",", min_length=1, max_length=1, description="CSV field delimiter")
+):
+    """
+    Profile a local CSV/Parquet file without loading it into the database.
+
+    The file is memory-mapped and scanned in parallel chunks. Returns the
+    same shape as /profile/{table}; unique counts above 4096 are estimates.
+    """
+    from app.services.file_source import FileSourceService
+
+    try:
+        profile = await FileSourceService().profile_file(file_name, delimiter=delimiter)
+        return profile.to_dict()
+    except ValueError as e:
+        status = 404 if "not found" in str(e) else 400
+        raise HTTPException(status_code=status, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to profile file: {str(e)}")
+
+
 @router.post("/profile/all/store")
 async def profile_all_and_store():
     """
@@ -11,12 +11,15 @@ V74: Feature parity with dqm-expert-ai
 - DELETE /rules/{rule_id} - Delete rules
 - PATCH /rules/{rule_id}/toggle - Activate/deactivate rules
 """
-from fastapi import APIRouter, HTTPException, Body, Query
+from fastapi import APIRouter, HTTPException, Body, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
 from app.services.data_quality_rules import DataQualityRulesService
+from app.services.failure_export import EXPORT_FORMATS, FailureExportService, parquet_available
+from app.services.result_partitions import get_result_partition_manager
 from app.services.data_profiling_service import get_profiling_service
 from app.config import settings
 
@@ -39,6 +42,41 @@ class Severity(str, Enum):
     CRITICAL = "critical"
 
 
+class SlowRuleSort(str, Enum):
+    """Sort keys for the slow-rule report."""
+    TOTAL_MS = "total_ms"
+    AVG_MS = "avg_ms"
+    P95_MS = "p95_ms"
+    MAX_MS = "max_ms"
+    ROWS_EXAMINED = "rows_examined"
+    SHARED_READ_BLOCKS = "shared_read_blocks"
+
+
+class ExecutionMode(str, Enum):
+    """Rule execution modes."""
+    EXACT = "exact"
+    SAMPLED = "sampled"
+
+
+class RuleEngine(str, Enum):
+    """Where a rule is evaluated."""
+    SQL = "sql"
+    VECTORIZED = "vectorized"
+
+
+class ExportFormat(str, Enum):
+    """Failing-row export formats."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class UploadFormat(str, Enum):
+    """Upload formats accepted by the validation gate."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class SuggestRulesRequest(BaseModel):
     """Request model for suggesting rules by table name."""
     table_name: str
@@ -50,8 +88,15 @@ class RuleCreate(BaseModel):
     table: str = Field(..., min_length=1, max_length=255)
     column: str = Field(..., min_length=1, max_length=255)
     rule_type: str = Field(..., description="Rule type (null_check, unique_check, etc.)")
-    definition: str = Field(..., description="SQL query or rule definition")
+    definition: str = Field(
+        ..., description="SQL query returning failing rows, or a row predicate for engine=vectorized"
+    )
     severity: str = Field(default="warning", description="Rule severity (info, warning, critical)")
+    watermark_column: Optional[str] = Field(
+        None, max_length=255, description="Monotonic column for incremental execution (e.g. created_at)"
+    )
+    depends_on: Optional[List[int]] = Field(None, description="Rule IDs that must pass before this rule runs")
+    engine: RuleEngine = Field(default=RuleEngine.SQL, description="sql pushes the check down; vectorized runs in-process")
 
 
 class CustomRuleCreate(BaseModel):
@@ -63,6 +108,10 @@ class CustomRuleCreate(BaseModel):
     description: Optional[str] = Field(None, description="Human-readable description")
     severity: str = Field(default="warning", description="Rule severity")
     threshold: Optional[float] = Field(None, ge=0, le=100, description="Failure threshold percentage")
+    watermark_column: Optional[str] = Field(
+        None, max_length=255, description="Monotonic column for incremental execution (e.g. created_at)"
+    )
+    depends_on: Optional[List[int]] = Field(None, description="Rule IDs that must pass before this rule runs")
 
 
 class RuleUpdate(BaseModel):
@@ -71,6 +120,10 @@ class RuleUpdate(BaseModel):
     definition: Optional[str] = None
     severity: Optional[str] = None
     is_active: Optional[bool] = None
+    watermark_column: Optional[str] = Field(
+        None, max_length=255, description="Watermark column; empty string disables incremental execution"
+    )
+    depends_on: Optional[List[int]] = Field(None, description="Replaces the rule's dependencies; [] removes them")
 
 
 class RuleResponse(BaseModel):
@@ -83,9 +136,22 @@ class RuleResponse(BaseModel):
     definition: str
     severity: str
     is_active: bool = True
+    watermark_column: Optional[str] = None
+    depends_on: List[int] = []
+    engine: str = "sql"
     created_at: Optional[str] = None
 
 
+class BatchExecuteRequest(BaseModel):
+    """Request model for executing several rules in dependency order."""
+    rule_ids: Optional[List[int]] = Field(None, description="Rules to execute (default: all active rules)")
+    table_name: Optional[str] = Field(None, description="Execute all active rules of this table")
+    full_refresh: bool = False
+    mode: ExecutionMode = ExecutionMode.EXACT
+    sample_percent: Optional[float] = Field(None, gt=0, le=100)
+    max_parallel: Optional[int] = Field(None, ge=1, le=64, description="Rules executed concurrently")
+
+
 class ExecutionResult(BaseModel):
     """Response model for rule execution result."""
     rule_id: int
@@ -182,6 +248,27 @@ async def suggest_rules_from_stored_profiles(
         raise HTTPException(status_code=500, detail=f"Failed to suggest rules: {str(e)}")
 
 
+@router.get("/rules/slow")
+async def get_slow_rules(
+    days: int = Query(7, ge=1, le=365, description="Look-back period in days"),
+    limit: int = Query(20, ge=1, le=500, description="Number of rules to return"),
+    sort_by: SlowRuleSort = Query(SlowRuleSort.TOTAL_MS, description="Cost measure to rank by")
+):
+    """
+    Rank rules by execution cost over time.
+
+    Aggregates the recorded duration, rows examined and sampled EXPLAIN buffer
+    stats per rule; share_of_total is the rule's percentage of all rule time.
+    """
+    try:
+        service = get_service()
+        return await service.get_slow_rules(days=days, limit=limit, sort_by=sort_by.value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get slow rules: {str(e)}")
+
+
 @router.get("/rules/{rule_id}", response_model=RuleResponse)
 async def get_rule(rule_id: int):
     """
@@ -220,7 +307,10 @@ async def create_rule(rule: RuleCreate):
             column=rule.column,
             rule_type=rule.rule_type,
             definition=rule.definition,
-            severity=rule.severity
+            severity=rule.severity,
+            watermark_column=rule.watermark_column,
+            depends_on=rule.depends_on,
+            engine=rule.engine.value
         )
         return {"message": "Rule created successfully", "id": rule_id, "name": rule.name}
     except ValueError as e:
@@ -264,7 +354,9 @@ async def create_custom_rule(rule: CustomRuleCreate):
             custom_sql=rule.custom_sql,
             description=rule.description,
             severity=rule.severity,
-            threshold=rule.threshold
+            threshold=rule.threshold,
+            watermark_column=rule.watermark_column,
+            depends_on=rule.depends_on
         )
 
         return {
@@ -309,6 +401,8 @@ async def update_rule(rule_id: int, rule: RuleUpdate):
         return {"message": "Rule updated successfully", "id": rule_id}
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update rule: {str(e)}")
 
@@ -370,28 +464,160 @@ async def toggle_rule_active(rule_id: int):
 # RULE EXECUTION
 # ============================================================================
 
+@router.post("/rules/execute")
+async def execute_rules(request: BatchExecuteRequest):
+    """
+    Execute several rules as a dependency DAG.
+
+    Upstream rules named in depends_on are included automatically. Independent
+    branches run in parallel; rules downstream of a failed, errored or skipped
+    rule are not executed and record a 'skipped' result.
+    """
+    if request.rule_ids and request.table_name:
+        raise HTTPException(status_code=400, detail="Provide rule_ids or table_name, not both")
+    try:
+        service = get_service()
+        return await service.execute_rules(
+            rule_ids=request.rule_ids,
+            table_name=request.table_name,
+            full_refresh=request.full_refresh,
+            mode=request.mode.value,
+            sample_percent=request.sample_percent,
+            max_parallel=request.max_parallel
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to execute rules: {str(e)}")
+
+
+@router.post("/rules/vectorized/execute")
+async def execute_vectorized_rules(
+    table_name: str = Query(..., description="Table whose active vectorized rules are evaluated")
+):
+    """
+    Evaluate all active engine=vectorized rules of a table in one scan.
+
+    The table is streamed in columnar batches and every rule is evaluated
+    per batch in-process. Requires numpy.
+    """
+    try:
+        service = get_service()
+        results = await service.execute_vectorized(table_name)
+        return {"table_name": table_name, "results": results}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to execute vectorized rules: {str(e)}")
+
+
+@router.post("/files/{file_name:path}/check")
+async def check_file(
+    file_name: str,
+    table_name: str = Query(..., description="Table whose vectorized rules and null checks are applied"),
+    delimiter: str = Query(default=",", min_length=1, max_length=1, description="CSV field delimiter")
+):
+    """
+    Check a local CSV/Parquet file against the rules of a table without loading it.
+
+    Applies the table's active engine=vectorized rules and null checks to
+    every row of the file in parallel chunks. Results are returned, not
+    stored. Requires numpy; Parquet files also need pyarrow.
+    """
+    from app.services.file_source import FileSourceService
+
+    try:
+        rules = await get_service().get_vectorized_rules(table_name)
+        results = await FileSourceService().check_file(file_name, rules, delimiter=delimiter)
+        return {
+            "file_name": file_name,
+            "table_name": table_name,
+            "results": [r.to_dict() for r in results]
+        }
+    except ValueError as e:
+        status = 404 if "not found" in str(e) else 400
+        raise HTTPException(status_code=status, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to check file: {str(e)}")
+
+
+@router.post("/tables/{table_name}/validate-upload")
+async def validate_upload(
+    request: Request,
+    table_name: str,
+    format: UploadFormat = Query(default=UploadFormat.CSV, description="Format of the request body"),
+    delimiter: str = Query(default=",", min_length=1, max_length=1, description="CSV field delimiter")
+):
+    """
+    Check a streamed CSV/NDJSON upload against a table's active rules before loading it.
+
+    The request body is parsed incrementally and checked in batches; nothing
+    is buffered or written to the database. Null, range, pattern, uniqueness
+    and vectorized rules are evaluated, other rules are listed as unsupported.
+    """
+    from app.services.upload_gate import UploadGate
+
+    try:
+        rules = await get_service().get_table_rules(table_name)
+        report = await UploadGate(rules, format.value, delimiter).run(request.stream())
+        return {"table_name": table_name, **report}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to validate upload: {str(e)}")
+
+
 @router.post("/rules/{rule_id}/execute")
-async def execute_rule(rule_id: int):
+async def execute_rule(
+    rule_id: int,
+    full_refresh: bool = Query(False, description="Re-evaluate all rows, ignoring the stored watermark"),
+    mode: ExecutionMode = Query(ExecutionMode.EXACT, description="exact scans every row; sampled uses TABLESAMPLE"),
+    sample_percent: Optional[float] = Query(
+        None, gt=0, le=100, description="Percentage of table pages to sample in sampled mode"
+    ),
+    explain: Optional[bool] = Query(
+        None, description="Force (true) or suppress (false) EXPLAIN ANALYZE profiling; default samples"
+    )
+):
     """
     Execute a data quality rule.
 
     Runs the rule against the database and returns pass/fail status with details.
+    Rules with a watermark column only evaluate rows added since the last run
+    unless full_refresh is set. In sampled mode the counts are estimates and the
+    response carries a 95% confidence interval.
     """
     try:
         service = get_service()
-        result = await service.execute_rule(rule_id)
+        result = await service.execute_rule(
+            rule_id,
+            full_refresh=full_refresh,
+            mode=mode.value,
+            sample_percent=sample_percent,
+            explain=explain
+        )
 
         return {
             "rule_id": rule_id,
             "executed": True,
+            "status": result.get('status'),
             "passed": result.get('passed', False),
             "total_count": result.get('total_count', 0),
             "failed_count": result.get('failed_count', 0),
             "pass_rate": result.get('pass_rate', 0),
-            "failure_samples": result.get('failure_samples', [])[:10]
+            "failure_samples": result.get('failure_samples', [])[:10],
+            "incremental": result.get('incremental', False),
+            "watermark": result.get('watermark'),
+            "is_approximate": result.get('is_approximate', False),
+            "sample_percent": result.get('sample_percent'),
+            "confidence_interval": result.get('confidence_interval'),
+            "execution_time_ms": result.get('execution_time_ms'),
+            "rows_examined": result.get('rows_examined'),
+            "explain_stats": result.get('explain_stats')
         }
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        status = 404 if "not found" in str(e) else 400
+        raise HTTPException(status_code=status, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to execute rule: {str(e)}")
 
@@ -445,7 +671,8 @@ async def suggest_rules_by_table(request: SuggestRulesRequest = Body(...)):
 @router.get("/results")
 async def get_results(
     rule_id: Optional[int] = Query(None, description="Filter by rule ID"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum results to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum results to return"),
+    days: Optional[int] = Query(None, ge=1, description="Only results from the last N days")
 ):
     """
     Get rule execution results.
@@ -455,7 +682,66 @@ async def get_results(
     """
     try:
         service = get_service()
-        results = await service.get_execution_results(rule_id=rule_id, limit=limit)
+        results = await service.get_execution_results(rule_id=rule_id, limit=limit, days=days)
         return results  # Return array directly for frontend compatibility
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get results: {str(e)}")
+
+
+@router.get("/results/partitions")
+async def get_result_partitions():
+    """List the monthly partitions of the results table with their sizes."""
+    try:
+        return await get_result_partition_manager().list_partitions()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list result partitions: {str(e)}")
+
+
+@router.get("/results/{result_id}/samples")
+async def get_result_samples(result_id: int):
+    """
+    Get a result's failure samples with the full failing rows.
+
+    Key-only samples (FAILURE_SAMPLE_STORAGE=keys) are resolved against the
+    current table, so rows fixed since the run are not returned.
+    """
+    try:
+        service = get_service()
+        return await service.get_failure_samples(result_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get failure samples: {str(e)}")
+
+
+@router.get("/results/{result_id}/export")
+async def export_result_failures(
+    result_id: int,
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv, ndjson or parquet")
+):
+    """
+    Stream every failing row of a rule result.
+
+    Re-runs the rule's failing-rows query against the current data and streams
+    the rows with chunked transfer encoding; nothing is buffered in full.
+    Parquet requires the optional pyarrow package.
+    """
+    if format == ExportFormat.PARQUET and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow (pip install pyarrow)")
+    try:
+        service = FailureExportService(settings.DATABASE_URL)
+        export = await service.resolve(result_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export failures: {str(e)}")
+
+    if export['engine'] == 'vectorized':
+        raise HTTPException(status_code=400, detail="Failing-row export is only available for SQL rules")
+
+    filename = f"rule_{export['rule_id']}_result_{result_id}_failures.{format.value}"
+    return StreamingResponse(
+        service.stream(export['sql'], format.value),
+        media_type=EXPORT_FORMATS[format.value],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
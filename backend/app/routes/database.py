@@ -8,12 +8,14 @@ V74: Dynamic database configuration endpoints
 - Switch active connection
 - Test connection
 - Remove connections
+- Connection pool metrics
 """
 from fastapi import APIRouter, HTTPException, Body
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 
 from app.db_config.database import get_database_manager, DatabaseConnection
+from app.db_config.pool_registry import get_pool_registry
 
 router = APIRouter(
     prefix="/database",
@@ -48,10 +50,10 @@ async def list_connections():
     """
     try:
         manager = get_database_manager()
-        connections = manager.list_connections()
+        connections = await manager.list_connections()
         return {
             "connections": connections,
-            "active": manager.get_active_connection_name(),
+            "active": await manager.get_active_connection_name(),
             "count": len(connections)
         }
     except Exception as e:
@@ -67,8 +69,7 @@ async def get_active_connection():
     """
     try:
         manager = get_database_manager()
-        name = manager.get_active_connection_name()
-        conn = manager.get_connection(name)
+        conn = await manager.get_connection()
         if not conn:
             raise HTTPException(status_code=404, detail="No active connection found")
 
@@ -108,12 +109,14 @@ async def add_connection(connection: ConnectionCreate):
             description=connection.description
         )
 
-        manager.add_connection(db_conn)
+        await manager.add_connection(db_conn)
 
         return {
             "message": f"Connection '{connection.name}' added successfully",
             "name": connection.name
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add connection: {str(e)}")
 
@@ -124,17 +127,20 @@ async def switch_connection(request: ConnectionSwitch):
     Switch to a different database connection.
 
     Makes the specified connection the active one for all subsequent operations.
+    The new database is migrated and its pool warmed before requests move over;
+    queries already running finish on the previous database.
     """
     try:
         manager = get_database_manager()
-        manager.set_active_connection(request.name)
+        await manager.set_active_connection(request.name)
 
         return {
             "message": f"Switched to connection '{request.name}'",
             "active": request.name
         }
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        status_code = 404 if "not found" in str(e) else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to switch connection: {str(e)}")
 
@@ -179,7 +185,7 @@ async def remove_connection(name: str):
     """
     try:
         manager = get_database_manager()
-        removed = manager.remove_connection(name)
+        removed = await manager.remove_connection(name)
 
         if not removed:
             raise HTTPException(status_code=404, detail=f"Connection '{name}' not found")
@@ -193,6 +199,23 @@ async def remove_connection(name: str):
         raise HTTPException(status_code=500, detail=f"Failed to remove connection: {str(e)}")
 
 
+@router.get("/pools")
+async def pool_metrics():
+    """
+    Metrics of every connection pool in this process.
+
+    Per pool: connections open, idle and leased, the adaptive lease limit,
+    acquire counts, timeouts and an acquire wait-time histogram (bucket
+    counts, not cumulative). Read replicas are listed with their last
+    measured lag.
+    """
+    pools = get_pool_registry()
+    return {
+        "pools": pools.stats(),
+        "replicas": pools.replica_stats(),
+    }
+
+
 @router.get("/health")
 async def database_health():
     """
@@ -0,0 +1,59 @@
+"""
+Index Advisor Routes
+Read-only index proposals for data quality rules; nothing is applied.
+"""
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.config import settings
+from app.services.index_advisor import IndexAdvisorService
+
+router = APIRouter(
+    prefix="/data-quality/index-advisor",
+    tags=["Index Advisor"]
+)
+
+
+class SqlAdviceRequest(BaseModel):
+    """Request model for analyzing rule SQL that is not stored yet (e.g. a suggestion)."""
+    table_name: str = Field(..., min_length=1, max_length=255)
+    sql: str = Field(..., min_length=10, description="SELECT statement returning failing rows")
+    min_rows: Optional[float] = Field(None, ge=0, description="Ignore scans on smaller tables")
+
+
+def get_advisor() -> IndexAdvisorService:
+    """Get an index advisor for the configured database."""
+    return IndexAdvisorService(settings.DATABASE_URL)
+
+
+@router.get("")
+async def advise_rules(
+    rule_id: Optional[int] = Query(None, description="Analyze a single rule"),
+    table_name: Optional[str] = Query(None, description="Analyze the rules of one table"),
+    min_rows: Optional[float] = Query(None, ge=0, description="Ignore scans on smaller tables")
+):
+    """
+    Propose indexes for active rules.
+
+    Runs EXPLAIN on each rule's check SQL, finds sequential scans on large
+    tables and returns CREATE INDEX statements with estimated cost savings.
+    Identical proposals from several rules are merged.
+    """
+    try:
+        return await get_advisor().advise_rules(rule_id=rule_id, table_name=table_name, min_rows=min_rows)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to analyze rules: {str(e)}")
+
+
+@router.post("/sql")
+async def advise_sql(request: SqlAdviceRequest):
+    """Propose indexes for ad-hoc rule SQL, such as a suggested referential check."""
+    try:
+        return await get_advisor().advise_sql(request.table_name, request.sql, min_rows=request.min_rows)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to analyze SQL: {str(e)}")
@@ -0,0 +1,110 @@
+"""
+Rule Job Routes
+Enqueue rule executions for app.worker processes and inspect the job queue.
+"""
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.routes.data_quality import ExecutionMode
+from app.services.rule_job_queue import get_rule_job_queue
+
+router = APIRouter(
+    prefix="/data-quality/jobs",
+    tags=["Rule Jobs"]
+)
+
+
+class JobEnqueue(BaseModel):
+    """Request model for enqueueing a rule or all rules of a table."""
+    rule_id: Optional[int] = Field(default=None, description="Rule to execute")
+    table_name: Optional[str] = Field(default=None, description="Enqueue all active rules of this table")
+    execution_mode: ExecutionMode = ExecutionMode.EXACT
+    full_refresh: bool = False
+    priority: int = Field(default=0, description="Higher priorities are claimed first")
+
+
+@router.post("", status_code=202)
+async def enqueue_jobs(request: JobEnqueue):
+    """
+    Enqueue rule executions.
+
+    Rules that already have a queued or running job return that job instead.
+    """
+    if (request.rule_id is None) == (request.table_name is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of rule_id or table_name")
+    try:
+        queue = get_rule_job_queue()
+        if request.rule_id is not None:
+            jobs = [await queue.enqueue(
+                request.rule_id,
+                execution_mode=request.execution_mode.value,
+                full_refresh=request.full_refresh,
+                priority=request.priority
+            )]
+        else:
+            jobs = await queue.enqueue_table(
+                request.table_name,
+                execution_mode=request.execution_mode.value,
+                full_refresh=request.full_refresh,
+                priority=request.priority
+            )
+        return {"status": "queued", "jobs": jobs}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to enqueue jobs: {str(e)}")
+
+
+@router.get("")
+async def list_jobs(
+    status: Optional[str] = Query(default=None, description="queued, running, succeeded or dead"),
+    rule_id: Optional[int] = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000)
+):
+    """List jobs, newest first."""
+    try:
+        return await get_rule_job_queue().list_jobs(status=status, rule_id=rule_id, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list jobs: {str(e)}")
+
+
+@router.get("/stats")
+async def job_stats():
+    """Job counts by status and queue lag."""
+    try:
+        return await get_rule_job_queue().stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get job stats: {str(e)}")
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int):
+    """Get a job by ID."""
+    try:
+        job = await get_rule_job_queue().get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get job: {str(e)}")
+
+
+@router.post("/{job_id}/retry")
+async def retry_job(job_id: int):
+    """Requeue a dead-lettered job."""
+    try:
+        job = await get_rule_job_queue().retry_dead(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Dead-lettered job not found")
+        return job
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retry job: {str(e)}")
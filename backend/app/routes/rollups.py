@@ -0,0 +1,55 @@
+"""
+Quality Rollup Routes
+Pass-rate trends and counts served from the daily rollups, per rule, table or DAMA dimension.
+"""
+from enum import Enum
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+
+from app.config import settings
+from app.services.quality_rollups import QualityRollupService
+
+router = APIRouter(
+    prefix="/data-quality/rollups",
+    tags=["Quality Rollups"]
+)
+
+
+class RollupScope(str, Enum):
+    """Rollup grouping keys."""
+    RULE = "rule"
+    TABLE = "table"
+    DIMENSION = "dimension"
+
+
+def get_service() -> QualityRollupService:
+    return QualityRollupService(settings.DATABASE_URL)
+
+
+@router.get("/trends")
+async def get_trends(
+    scope: RollupScope = Query(RollupScope.DIMENSION, description="rule, table or dimension"),
+    key: Optional[str] = Query(None, description="Rule ID, table name or dimension; all keys when omitted"),
+    days: int = Query(30, ge=1, le=3650)
+):
+    """Daily pass rates and execution counts, oldest day first."""
+    try:
+        return await get_service().get_trends(scope=scope.value, scope_key=key, days=days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get rollup trends: {str(e)}")
+
+
+@router.get("/summary")
+async def get_summary(
+    scope: RollupScope = Query(RollupScope.DIMENSION, description="rule, table or dimension"),
+    days: int = Query(30, ge=1, le=3650)
+):
+    """Totals per rule, table or dimension over the period, lowest pass rate first."""
+    try:
+        return await get_service().get_summary(scope=scope.value, days=days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get rollup summary: {str(e)}")
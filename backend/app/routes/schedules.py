@@ -0,0 +1,107 @@
+"""
+Rule Schedule Routes
+Cron schedules for data quality rules, executed by the in-process RuleScheduler.
+"""
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Optional
+
+from app.routes.data_quality import ExecutionMode
+from app.services.rule_scheduler import get_rule_scheduler
+
+router = APIRouter(
+    prefix="/data-quality/schedules",
+    tags=["Rule Scheduling"]
+)
+
+
+class ScheduleCreate(BaseModel):
+    """Request model for scheduling a rule or all rules of a table."""
+    cron_expression: str = Field(..., min_length=1, max_length=100, description="5-field cron expression (UTC)")
+    rule_id: Optional[int] = Field(default=None, description="Rule to execute")
+    table_name: Optional[str] = Field(default=None, description="Execute all active rules of this table")
+    jitter_seconds: Optional[int] = Field(default=None, ge=0, description="Maximum random delay per run")
+    misfire_grace_seconds: Optional[int] = Field(default=None, ge=0, description="Skip runs later than this")
+    execution_mode: ExecutionMode = ExecutionMode.EXACT
+
+
+@router.get("")
+async def list_schedules(
+    rule_id: Optional[int] = Query(default=None),
+    table_name: Optional[str] = Query(default=None)
+):
+    """List rule schedules."""
+    try:
+        scheduler = get_rule_scheduler()
+        return await scheduler.list_schedules(rule_id=rule_id, table_name=table_name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list schedules: {str(e)}")
+
+
+@router.get("/status")
+async def scheduler_status():
+    """Scheduler state: worker pool size, queue depth and rules in flight."""
+    return get_rule_scheduler().status()
+
+
+@router.post("", status_code=201)
+async def create_schedule(schedule: ScheduleCreate):
+    """Create a cron schedule for a rule or a table."""
+    try:
+        scheduler = get_rule_scheduler()
+        return await scheduler.create_schedule(
+            cron_expression=schedule.cron_expression,
+            rule_id=schedule.rule_id,
+            table_name=schedule.table_name,
+            jitter_seconds=schedule.jitter_seconds,
+            misfire_grace_seconds=schedule.misfire_grace_seconds,
+            execution_mode=schedule.execution_mode.value
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create schedule: {str(e)}")
+
+
+@router.get("/{schedule_id}")
+async def get_schedule(schedule_id: int):
+    """Get a schedule by ID."""
+    try:
+        schedule = await get_rule_scheduler().get_schedule(schedule_id)
+        if not schedule:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        return schedule
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get schedule: {str(e)}")
+
+
+@router.patch("/{schedule_id}/toggle")
+async def toggle_schedule(schedule_id: int):
+    """Pause an active schedule or resume a paused one."""
+    try:
+        scheduler = get_rule_scheduler()
+        existing = await scheduler.get_schedule(schedule_id)
+        if not existing:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        return await scheduler.set_schedule_active(schedule_id, not existing.get('is_active', True))
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to toggle schedule: {str(e)}")
+
+
+@router.delete("/{schedule_id}", status_code=204)
+async def delete_schedule(schedule_id: int):
+    """Delete a schedule."""
+    try:
+        if not await get_rule_scheduler().delete_schedule(schedule_id):
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete schedule: {str(e)}")
@@ -1,20 +1,43 @@
 
-import httpx
+import asyncio
 import asyncpg
 from typing import List, Dict
 
+from app.config import settings
+from app.exceptions import AIServiceError, get_circuit_breaker
+from app.utils.retry import call_with_retry, get_retry_budget
+
 class AIAnalysisService:
     def __init__(self, db_pool: asyncpg.Pool):
         self.db_pool = db_pool
 
     async def analyze_failure(self, rule_result: Dict) -> Dict:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://localhost:8015/v1/chat/completions",
-                json={"messages": [{"role": "user", "content": str(rule_result)}]}
-            )
-            response.raise_for_status()
-            return response.json()
+        """Ask the local LLM about a failure, through its circuit breaker and retry budget."""
+        import httpx
+
+        url = f"{settings.LOCAL_AI_RTX3050_URL}/chat/completions"
+
+        async def complete() -> Dict:
+            async with httpx.AsyncClient(timeout=settings.LOCAL_AI_TIMEOUT) as client:
+                response = await client.post(
+                    url,
+                    json={
+                        "model": settings.LOCAL_AI_RTX3050_MODEL,
+                        "messages": [{"role": "user", "content": str(rule_result)}]
+                    }
+                )
+                if response.status_code >= 500:
+                    raise AIServiceError(f"LLM endpoint returned {response.status_code}")
+                response.raise_for_status()
+                return response.json()
+
+        name = f"llm:{settings.LOCAL_AI_RTX3050_URL}"
+        return await call_with_retry(
+            complete,
+            get_circuit_breaker(name),
+            get_retry_budget(name),
+            failures=(httpx.TransportError, AIServiceError)
+        )
 
     async def suggest_root_causes(self, failures: List[Dict]) -> List[Dict]:
         batch_size = 10
@@ -15,6 +15,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,9 +71,10 @@ class AIAnalysisService:
     Uses statistical analysis to detect anomalies and generate insights.
     """
 
-    def __init__(self, pool=None):
-        """Initialize with database pool."""
+    def __init__(self, pool=None, pools: Optional[PoolRegistry] = None):
+        """Initialize with database pool and the shared pool registry."""
         self._pool = pool
+        self.pools = pools or get_pool_registry()
 
     async def analyze_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze profiling results and generate insights."""
@@ -156,7 +159,7 @@ class AIAnalysisService:
         V90: Analyze a specific DQ result failure.
         Feature parity with Expert AI.
         """
-        conn = await asyncpg.connect(dsn)
+        conn = await self.pools.connect(dsn)
         try:
             # Get the result details with rule info
             result = await conn.fetchrow('''
@@ -275,18 +278,6 @@ class AIAnalysisService:
 
     async def _store_analysis(self, conn: asyncpg.Connection, analysis: RootCauseAnalysis):
         """Store analysis in database."""
-        # Ensure table exists
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS root_cause_analysis (
-                id SERIAL PRIMARY KEY,
-                result_id INTEGER NOT NULL,
-                suggested_cause JSONB,
-                confidence_score FLOAT,
-                ai_model VARCHAR(100),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
         await conn.execute('''
             INSERT INTO root_cause_analysis (result_id, suggested_cause, confidence_score, ai_model, created_at)
             VALUES ($1, $2, $3, $4, $5)
@@ -318,7 +309,7 @@ class AIAnalysisService:
 
     async def get_analyses(self, dsn: str, limit: int = 50) -> List[Dict[str, Any]]:
         """V90: Get stored analyses."""
-        conn = await asyncpg.connect(dsn)
+        conn = await self.pools.connect(dsn)
         try:
             # Check if table exists
             table_exists = await conn.fetchval('''
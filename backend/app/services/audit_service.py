@@ -11,26 +11,6 @@ from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
-# SQL to create the audit_logs table (from RTX 3050)
-CREATE_AUDIT_TABLE_SQL = """
-CREATE TABLE IF NOT EXISTS audit_logs (
-    id SERIAL PRIMARY KEY,
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    user_id VARCHAR(255),
-    action VARCHAR(50) NOT NULL,
-    entity_type VARCHAR(50) NOT NULL,
-    entity_id VARCHAR(255) NOT NULL,
-    old_value TEXT,
-    new_value TEXT,
-    ip_address VARCHAR(50),
-    details JSONB
-);
-
-CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_entity ON audit_logs(entity_type, entity_id);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_action ON audit_logs(action);
-"""
-
 
 @dataclass
 class AuditLogEntry:
@@ -74,12 +54,6 @@ class AuditService:
         """Initialize audit service with database pool."""
         self._pool = pool
 
-    async def initialize_table(self) -> None:
-        """Create audit_logs table if it doesn't exist."""
-        async with self._pool.acquire() as conn:
-            await conn.execute(CREATE_AUDIT_TABLE_SQL)
-            logger.info("Audit logs table initialized")
-
     async def log_action(
         self,
         action: str,
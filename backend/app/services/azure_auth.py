@@ -7,17 +7,20 @@ Features:
 - JWT token validation
 - Protected route dependency injection
 - Session management
+
+httpx and PyJWT are imported on first use, so importing the module (and the
+auth routes) does not load them.
 """
 import os
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-import httpx
-import jwt
-from jwt import PyJWKClient
+
+if TYPE_CHECKING:
+    from jwt import PyJWKClient
 
 
 class AzureADSettings(BaseSettings):
@@ -89,9 +92,11 @@ class AzureAuthService:
         self._jwks_client = None
 
     @property
-    def jwks_client(self) -> PyJWKClient:
+    def jwks_client(self) -> "PyJWKClient":
         """Lazy-load JWKS client."""
         if self._jwks_client is None:
+            from jwt import PyJWKClient
+
             self._jwks_client = PyJWKClient(self.settings.jwks_url)
         return self._jwks_client
 
@@ -112,6 +117,8 @@ class AzureAuthService:
 
     async def exchange_code_for_tokens(self, code: str) -> TokenResponse:
         """Exchange authorization code for tokens."""
+        import httpx
+
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 self.settings.token_url,
@@ -136,6 +143,8 @@ class AzureAuthService:
 
     async def refresh_access_token(self, refresh_token: str) -> TokenResponse:
         """Refresh access token using refresh token."""
+        import httpx
+
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 self.settings.token_url,
@@ -159,6 +168,8 @@ class AzureAuthService:
 
     def validate_token(self, token: str) -> Dict[str, Any]:
         """Validate and decode JWT token."""
+        import jwt
+
         try:
             signing_key = self.jwks_client.get_signing_key_from_jwt(token)
             payload = jwt.decode(
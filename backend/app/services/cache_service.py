@@ -1,70 +1,55 @@
 """
-Cache Service - In-memory caching with TTL support
+Cache Service - Shared caching with TTL support
 Generated by: RTX 3050 (Qwen2.5-Coder-7B)
+
+Entries live in the shared state store (STATE_STORE), so every worker
+process reads the same cache; values must be JSON-serializable.
 """
-import asyncio
 from typing import Any, Optional
-import time
-import fnmatch
+
+from app.db_config.state_store import StateStore, get_state_store
 
 # Singleton cache instance
 _cache_service: Optional["CacheService"] = None
 
+# State store namespace of the cache entries
+CACHE_NAMESPACE = "cache"
+
 
 class CacheService:
-    """In-memory cache with TTL support and async operations."""
+    """Cache with TTL support on top of the shared state store."""
 
-    def __init__(self):
-        self._cache: dict[str, tuple[Any, float]] = {}
-        self._lock = asyncio.Lock()
+    def __init__(self, store: Optional[StateStore] = None):
+        self.store = store or get_state_store()
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired."""
-        async with self._lock:
-            if key not in self._cache:
-                return None
-            value, expires = self._cache[key]
-            if time.time() > expires:
-                del self._cache[key]
-                return None
-            return value
+        return await self.store.get(CACHE_NAMESPACE, key)
 
     async def set(self, key: str, value: Any, ttl_seconds: int = 3600) -> None:
         """Set value in cache with TTL."""
-        async with self._lock:
-            self._cache[key] = (value, time.time() + ttl_seconds)
+        await self.store.set(CACHE_NAMESPACE, key, value, ttl_seconds=ttl_seconds)
 
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        return await self.store.delete(CACHE_NAMESPACE, key)
 
     async def clear_pattern(self, pattern: str) -> int:
         """Clear all keys matching pattern (supports wildcards)."""
-        async with self._lock:
-            keys_to_delete = [k for k in self._cache if fnmatch.fnmatch(k, pattern)]
-            for key in keys_to_delete:
-                del self._cache[key]
-            return len(keys_to_delete)
+        return await self.store.clear(CACHE_NAMESPACE, pattern)
 
     async def clear_all(self) -> None:
         """Clear entire cache."""
-        async with self._lock:
-            self._cache.clear()
+        await self.store.clear(CACHE_NAMESPACE)
 
     async def stats(self) -> dict:
         """Get cache statistics."""
-        async with self._lock:
-            now = time.time()
-            expired = sum(1 for _, (_, exp) in self._cache.items() if now > exp)
-            return {
-                "total_keys": len(self._cache),
-                "expired_keys": expired,
-                "active_keys": len(self._cache) - expired
-            }
+        counts = await self.store.counts(CACHE_NAMESPACE)
+        return {
+            "total_keys": counts["total"],
+            "expired_keys": counts["expired"],
+            "active_keys": counts["total"] - counts["expired"]
+        }
 
 
 async def get_cache_service() -> CacheService:
@@ -6,13 +6,14 @@ All 9 DAMA dimensions: completeness, uniqueness, validity, accuracy,
 integrity, consistency, timeliness, precision, relevance.
 
 V122: Created with corrections from Local AI output.
+
+chromadb is imported when the service is created, not with the module, so
+the dimension constants can be used without it.
 """
 
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import chromadb
-
 # DAMA dimension to rule type mapping
 DAMA_DIMENSION_MAP = {
     "completeness": ["null_check", "required_field", "not_null"],
@@ -34,6 +35,8 @@ class DAMAService:
 
     def __init__(self, host: str = "localhost", port: int = 8100):
         """Initialize with ChromaDB connection."""
+        import chromadb
+
         self.client = chromadb.HttpClient(host=host, port=port)
         self.collection = self.client.get_or_create_collection("rule_executions")
 
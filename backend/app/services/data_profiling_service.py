@@ -14,6 +14,7 @@ import json
 import logging
 
 from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -57,20 +58,18 @@ class TableProfile:
 class DataProfilingService:
     """Service for profiling database tables with REAL queries."""
 
-    def __init__(self, database_url: str = None):
+    def __init__(self, database_url: str = None, pools: Optional[PoolRegistry] = None):
         self.database_url = database_url or DATABASE_URL
+        self.pools = pools or get_pool_registry()
         self.pool: Optional[asyncpg.Pool] = None
 
     async def connect(self) -> None:
-        """Create connection pool."""
-        self.pool = await asyncpg.create_pool(self.database_url, min_size=2, max_size=10)
-        logger.info("Database connection pool created")
+        """Attach to the shared pool for the database."""
+        self.pool = await self.pools.get_pool(self.database_url)
 
     async def disconnect(self) -> None:
-        """Close connection pool."""
-        if self.pool:
-            await self.pool.close()
-            logger.info("Database connection pool closed")
+        """Detach from the pool; the registry closes it on shutdown."""
+        self.pool = None
 
     async def get_tables(self) -> List[str]:
         """Get list of available tables (filtered by whitelist)."""
@@ -79,17 +78,25 @@ class DataProfilingService:
         FROM information_schema.tables
         WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
         """
-        async with self.pool.acquire() as conn:
+        async with self.pools.acquire_read(self.database_url) as conn:
             rows = await conn.fetch(query)
             tables = [row['table_name'] for row in rows]
             return [t for t in tables if t in TABLE_WHITELIST]
 
+    async def get_columns(self, table_name: str) -> List[Dict]:
+        """Column names, types and nullability of a whitelisted table."""
+        if table_name not in TABLE_WHITELIST:
+            raise ValueError(f"Table '{table_name}' is not in the whitelist")
+
+        async with self.pools.acquire_read(self.database_url) as conn:
+            return await self._get_columns_info(conn, table_name)
+
     async def profile_table(self, table_name: str) -> TableProfile:
-        """Profile a table with REAL database queries."""
+        """Profile a table with REAL database queries (on a read replica when available)."""
         if table_name not in TABLE_WHITELIST:
             raise ValueError(f"Table '{table_name}' is not in the whitelist")
 
-        async with self.pool.acquire() as conn:
+        async with self.pools.acquire_read(self.database_url) as conn:
             # Get row count
             row_count = await self._get_row_count(conn, table_name)
 
@@ -197,34 +204,9 @@ class DataProfilingService:
             sample_values=sample_values
         )
 
-    async def _ensure_profiling_tables(self, conn: asyncpg.Connection) -> None:
-        """Ensure profiling results table exists."""
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS profiling_results (
-                id SERIAL PRIMARY KEY,
-                table_name VARCHAR(255) NOT NULL,
-                column_name VARCHAR(255) NOT NULL,
-                data_type VARCHAR(100),
-                null_count INTEGER DEFAULT 0,
-                null_percent REAL DEFAULT 0,
-                unique_count INTEGER DEFAULT 0,
-                min_value TEXT,
-                max_value TEXT,
-                sample_values JSONB,
-                profiled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        # Create index for faster lookups
-        await conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_profiling_results_table
-            ON profiling_results(table_name, column_name)
-        ''')
-
     async def store_profile(self, profile: TableProfile) -> None:
         """Store a table profile in the database for later retrieval."""
-        async with self.pool.acquire() as conn:
-            await self._ensure_profiling_tables(conn)
-
+        async with self.pools.acquire(self.database_url) as conn:
             # Delete existing results for this table
             await conn.execute(
                 'DELETE FROM profiling_results WHERE table_name = $1',
@@ -267,9 +249,7 @@ class DataProfilingService:
         Returns:
             List of profiling results suitable for rule suggestion
         """
-        async with self.pool.acquire() as conn:
-            await self._ensure_profiling_tables(conn)
-
+        async with self.pools.acquire(self.database_url) as conn:
             if table_name:
                 if table_name not in TABLE_WHITELIST:
                     raise ValueError(f"Table '{table_name}' is not in the whitelist")
@@ -9,13 +9,27 @@ V74: Feature parity with dqm-expert-ai
 - Improved rule execution with detailed results
 - Execution results persistence
 """
+import asyncio
 import asyncpg
+import hashlib
 import json
 import logging
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import math
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+from app.config import settings
+from app.db_config.pool_registry import (
+    TRANSIENT_CONNECTION_ERRORS, PoolRegistry, get_pool_registry, redact_dsn
+)
+from app.exceptions import CircuitBreakerOpen, get_circuit_breaker
+from app.utils.retry import call_with_retry, get_retry_budget
+from app.services.quality_rollups import record_rollup
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,6 +70,149 @@ RULE_TYPE_TO_DAMA = {
     'foreign_key_check': 'integrity'  # FK checks are also integrity
 }
 
+# Plain SQL identifiers accepted for rule metadata columns (e.g. watermark_column)
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Rule types whose pass/fail verdict is a percentage compared against the threshold
+THRESHOLD_RULE_TYPES = {'custom_sql', 'null_check', 'not_null'}
+
+# Duplicate groups returned as failure samples by unique_check, largest first
+UNIQUE_SAMPLE_GROUPS = 5
+
+# Execution modes: exact scans every row, sampled evaluates a TABLESAMPLE
+EXECUTION_MODES = {'exact', 'sampled'}
+
+# Execution errors that mean the database is struggling rather than the rule
+# being wrong (statement_timeout, acquire timeout, lost connections)
+RULE_EXECUTION_FAILURES = (
+    asyncio.TimeoutError,
+    asyncpg.QueryCanceledError,
+    asyncpg.InterfaceError,
+    *TRANSIENT_CONNECTION_ERRORS,
+)
+
+# Failure sample storage: inline row dicts per result, or primary keys in a
+# content-addressed failure_sample_sets table shared by identical runs
+SAMPLE_STORAGE_MODES = {'inline', 'keys'}
+
+# z-score for the 95% confidence interval reported by sampled execution
+SAMPLE_CONFIDENCE_LEVEL = 0.95
+SAMPLE_Z_SCORE = 1.96
+
+# Sort keys accepted by the slow-rule report, mapped to their aggregate column
+SLOW_RULE_SORT_KEYS = {
+    'total_ms': 'total_ms',
+    'avg_ms': 'avg_ms',
+    'p95_ms': 'p95_ms',
+    'max_ms': 'max_ms',
+    'rows_examined': 'avg_rows_examined',
+    'shared_read_blocks': 'avg_shared_read_blocks',
+}
+
+# Buffer counters copied from the root node of EXPLAIN (ANALYZE, BUFFERS) output
+EXPLAIN_BUFFER_KEYS = {
+    'Shared Hit Blocks': 'shared_hit_blocks',
+    'Shared Read Blocks': 'shared_read_blocks',
+    'Shared Dirtied Blocks': 'shared_dirtied_blocks',
+    'Shared Written Blocks': 'shared_written_blocks',
+    'Temp Read Blocks': 'temp_read_blocks',
+    'Temp Written Blocks': 'temp_written_blocks',
+    'I/O Read Time': 'io_read_time_ms',
+    'I/O Write Time': 'io_write_time_ms',
+}
+
+
+def wilson_interval(failures: int, n: int, z: float = SAMPLE_Z_SCORE) -> Tuple[float, float]:
+    """Wilson score interval for a failure proportion observed in a sample.
+
+    Returns (low, high) as fractions in [0, 1]; an empty sample gives (0, 1).
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    p = failures / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def summarize_explain(explain_output) -> Dict[str, Any]:
+    """Condense EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output into flat stats.
+
+    Buffer counters are cumulative at the root node. Rows scanned sums, over
+    every scan node, the rows returned plus the rows removed by its filter.
+    """
+    if isinstance(explain_output, str):
+        explain_output = json.loads(explain_output)
+    entry = explain_output[0] if isinstance(explain_output, list) else explain_output
+    root = entry.get('Plan', {})
+
+    stats: Dict[str, Any] = {
+        'planning_time_ms': entry.get('Planning Time'),
+        'execution_time_ms': entry.get('Execution Time'),
+    }
+    for key, name in EXPLAIN_BUFFER_KEYS.items():
+        if key in root:
+            stats[name] = root[key]
+
+    rows_scanned = 0
+    seq_scans = []
+    nodes = [root]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get('Plans', []))
+        if 'Relation Name' not in node:
+            continue
+        loops = node.get('Actual Loops', 1) or 1
+        rows_scanned += (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * loops
+        if node.get('Node Type') == 'Seq Scan':
+            seq_scans.append(node['Relation Name'])
+    stats['rows_scanned'] = int(rows_scanned)
+    stats['seq_scans'] = sorted(set(seq_scans))
+    return stats
+
+
+def topological_order(dependencies: Dict[int, List[int]]) -> List[int]:
+    """Order rule IDs so that every rule comes after the rules it depends on.
+
+    Dependencies on IDs that are not keys of the mapping are ignored. Raises
+    ValueError naming the rules involved when the graph has a cycle.
+    """
+    remaining = {
+        rule_id: {dep for dep in deps if dep in dependencies and dep != rule_id}
+        for rule_id, deps in dependencies.items()
+    }
+    for rule_id, deps in dependencies.items():
+        if rule_id in deps:
+            raise ValueError(f"Rule {rule_id} cannot depend on itself")
+
+    order: List[int] = []
+    ready = sorted(rule_id for rule_id, deps in remaining.items() if not deps)
+    while ready:
+        rule_id = ready.pop(0)
+        order.append(rule_id)
+        released = []
+        for other, deps in remaining.items():
+            if rule_id in deps:
+                deps.discard(rule_id)
+                if not deps:
+                    released.append(other)
+        ready = sorted(ready + released)
+
+    if len(order) < len(remaining):
+        cyclic = sorted(set(remaining) - set(order))
+        raise ValueError(f"Rule dependencies form a cycle among rules {cyclic}")
+    return order
+
+
+def sample_set_hash(table: str, key_columns: List[str], samples: List[Dict[str, Any]]) -> str:
+    """Content address of a failure sample set (stable across key order)."""
+    payload = json.dumps(
+        {'table': table, 'key_columns': key_columns, 'samples': samples},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 
 @dataclass
 class RuleResult:
@@ -66,11 +223,33 @@ class RuleResult:
     failed_count: int
     failure_samples: List[Dict[str, Any]] = field(default_factory=list)
     executed_at: datetime = None
+    # Incremental execution: True when counts were combined with the previous run
+    incremental: bool = False
+    watermark: Optional[str] = None
+    # Sampled execution: counts are estimates extrapolated from a TABLESAMPLE
+    is_approximate: bool = False
+    sample_percent: Optional[float] = None
+    confidence_interval: Optional[Dict[str, Any]] = None
+    # Dependency scheduling: set when an upstream rule did not pass
+    skipped: bool = False
+    blocked_by: List[int] = field(default_factory=list)
+    # Telemetry: wall time of the check, rows it evaluated, sampled EXPLAIN stats
+    execution_time_ms: Optional[float] = None
+    rows_examined: Optional[int] = None
+    explain_stats: Optional[Dict[str, Any]] = None
+    # Compact sample storage: samples live in failure_sample_sets under this hash
+    failure_sample_hash: Optional[str] = None
 
     def __post_init__(self):
         if self.executed_at is None:
             self.executed_at = datetime.utcnow()
 
+    @property
+    def status(self) -> str:
+        if self.skipped:
+            return 'skipped'
+        return 'passed' if self.passed else 'failed'
+
     @property
     def pass_rate(self) -> float:
         if self.total_count == 0:
@@ -80,20 +259,66 @@ class RuleResult:
     def to_dict(self) -> Dict[str, Any]:
         return {
             'rule_id': self.rule_id,
+            'status': self.status,
             'passed': self.passed,
             'total_count': self.total_count,
             'failed_count': self.failed_count,
             'pass_rate': self.pass_rate,
             'failure_samples': self.failure_samples,
-            'executed_at': self.executed_at.isoformat() if self.executed_at else None
+            'executed_at': self.executed_at.isoformat() if self.executed_at else None,
+            'incremental': self.incremental,
+            'watermark': self.watermark,
+            'is_approximate': self.is_approximate,
+            'sample_percent': self.sample_percent,
+            'confidence_interval': self.confidence_interval,
+            'blocked_by': self.blocked_by,
+            'execution_time_ms': self.execution_time_ms,
+            'rows_examined': self.rows_examined,
+            'explain_stats': self.explain_stats,
+            'failure_sample_hash': self.failure_sample_hash
         }
 
 
+@dataclass
+class WatermarkWindow:
+    """Slice of a table between the last stored watermark and the current maximum.
+
+    Rows with a NULL watermark never fall inside a window; run a full refresh
+    to include them.
+    """
+    column: str
+    column_type: str
+    low: Optional[str] = None
+    high: Optional[str] = None
+    previous_total: int = 0
+    previous_failed: int = 0
+
+    def clause(self, qualifier: str = '') -> Tuple[str, List[str]]:
+        """Build the SQL predicate and positional args selecting the window.
+
+        Watermarks are stored as text and cast back to the column type so
+        the comparison uses the column's own ordering (and its indexes).
+        """
+        column = f'{qualifier}"{self.column}"'
+        if self.high is None:
+            return 'FALSE', []
+
+        conditions = []
+        args = []
+        if self.low is not None:
+            args.append(self.low)
+            conditions.append(f'{column} > ${len(args)}::text::{self.column_type}')
+        args.append(self.high)
+        conditions.append(f'{column} <= ${len(args)}::text::{self.column_type}')
+        return ' AND '.join(conditions), args
+
+
 class DataQualityRulesService:
     """Service for managing data quality rules with enhanced features."""
 
-    def __init__(self, dsn: str):
+    def __init__(self, dsn: str, pools: Optional[PoolRegistry] = None):
         self.dsn = dsn
+        self.pools = pools or get_pool_registry()
 
     def _validate_table(self, table: str) -> str:
         """Validate table name against whitelist to prevent SQL injection."""
@@ -101,39 +326,68 @@ class DataQualityRulesService:
             raise ValueError(f"Table '{table}' not in allowed list: {ALLOWED_TABLES}")
         return table.lower()
 
-    async def _ensure_tables_exist(self, conn: asyncpg.Connection) -> None:
-        """Ensure required tables exist in the database.
+    def _validate_identifier(self, identifier: str) -> str:
+        """Validate a column identifier stored in rule metadata."""
+        if not IDENTIFIER_PATTERN.match(identifier):
+            raise ValueError(f"Invalid column identifier: '{identifier}'")
+        return identifier
+
+    def _key_columns(self, column: str) -> List[str]:
+        """Split a uniqueness key such as 'order_id, product_id' into validated columns."""
+        columns = [c.strip().strip('"') for c in (column or '').split(',') if c.strip()]
+        if not columns:
+            raise ValueError("unique_check rules need at least one key column")
+        return [self._validate_identifier(c) for c in columns]
+
+    def _validate_vectorized(self, rule_type: str, column: str, expression: str) -> None:
+        """Check that a vectorized rule compiles (numpy is only needed to run it)."""
+        from app.services.vectorized_engine import VectorizedRule
+        VectorizedRule(rule_id=0, rule_type=rule_type, column=column, expression=expression)
+
+    def _as_dict(self, value) -> Dict[str, Any]:
+        """Decode a JSONB value (dict or JSON text) into a dict.
+
+        asyncpg returns JSONB as text by default; plain SQL strings stored in
+        rule_definition and NULLs decode to an empty dict.
+        """
+        if isinstance(value, dict):
+            return value
+        if isinstance(value, str):
+            try:
+                parsed = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                return {}
+            return parsed if isinstance(parsed, dict) else {}
+        return {}
+
+    async def _validate_dependencies(
+        self,
+        conn: asyncpg.Connection,
+        rule_id: Optional[int],
+        depends_on: List[int]
+    ) -> List[int]:
+        """Check that dependencies exist and keep the rule graph acyclic.
 
-        V86: Updated to match existing database schema:
-        - rule_name instead of name
-        - rule_definition (JSONB) instead of definition (TEXT)
+        Returns the normalized, de-duplicated dependency list.
         """
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS data_quality_rules (
-                id SERIAL PRIMARY KEY,
-                rule_name VARCHAR(255) NOT NULL,
-                table_name VARCHAR(255) NOT NULL,
-                column_name VARCHAR(255),
-                rule_type VARCHAR(50) NOT NULL,
-                rule_definition JSONB NOT NULL,
-                severity VARCHAR(20) DEFAULT 'warning',
-                is_active BOOLEAN DEFAULT true,
-                description TEXT,
-                threshold REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS data_quality_results (
-                id SERIAL PRIMARY KEY,
-                rule_id INTEGER REFERENCES data_quality_rules(id) ON DELETE CASCADE,
-                passed BOOLEAN NOT NULL,
-                total_count INTEGER DEFAULT 0,
-                failed_count INTEGER DEFAULT 0,
-                failure_samples JSONB,
-                executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        try:
+            dependencies = sorted({int(dep) for dep in depends_on})
+        except (TypeError, ValueError):
+            raise ValueError("depends_on must be a list of rule IDs")
+        if rule_id is not None and rule_id in dependencies:
+            raise ValueError(f"Rule {rule_id} cannot depend on itself")
+        if not dependencies:
+            return []
+
+        rows = await conn.fetch('SELECT id, rule_definition FROM data_quality_rules')
+        graph = {r['id']: self._as_dict(r['rule_definition']).get('depends_on', []) for r in rows}
+        missing = [dep for dep in dependencies if dep not in graph]
+        if missing:
+            raise ValueError(f"Dependency rules not found: {missing}")
+        if rule_id is not None:
+            graph[rule_id] = dependencies
+            topological_order(graph)
+        return dependencies
 
     # =========================================================================
     # RULE RETRIEVAL
@@ -144,10 +398,8 @@ class DataQualityRulesService:
 
         V86: Updated to use correct column names (rule_name, rule_definition as JSONB).
         """
-        conn = await asyncpg.connect(self.dsn)
+        conn = await self.pools.connect(self.dsn)
         try:
-            await self._ensure_tables_exist(conn)
-
             if active_only:
                 query = '''
                     SELECT id, rule_name, table_name, column_name,
@@ -176,6 +428,9 @@ class DataQualityRulesService:
                     'severity': r['severity'],
                     'is_active': r['is_active'],
                     'created_at': r['created_at'].isoformat() if r['created_at'] else None,
+                    'watermark_column': self._as_dict(r['rule_definition']).get('watermark_column'),
+                    'depends_on': self._as_dict(r['rule_definition']).get('depends_on', []),
+                    'engine': self._as_dict(r['rule_definition']).get('engine', 'sql'),
                     # V87: Add DAMA dimension based on rule type
                     'dama_dimension': RULE_TYPE_TO_DAMA.get(r['rule_type'], 'accuracy'),
                     'dama_description': DAMA_DIMENSIONS.get(RULE_TYPE_TO_DAMA.get(r['rule_type'], 'accuracy'), '')
@@ -202,13 +457,13 @@ class DataQualityRulesService:
             try:
                 parsed = json.loads(rule_definition)
                 if isinstance(parsed, dict):
-                    return parsed.get('sql') or parsed.get('query') or parsed.get('definition') or str(parsed)
+                    return parsed.get('sql') or parsed.get('query') or parsed.get('definition') or parsed.get('expression') or str(parsed)
             except (json.JSONDecodeError, TypeError):
                 pass
             return rule_definition
         if isinstance(rule_definition, dict):
             # Try common keys for SQL definition
-            return rule_definition.get('sql') or rule_definition.get('query') or rule_definition.get('definition') or str(rule_definition)
+            return rule_definition.get('sql') or rule_definition.get('query') or rule_definition.get('definition') or rule_definition.get('expression') or str(rule_definition)
         return str(rule_definition)
 
     async def get_rule_by_id(self, rule_id: int) -> Optional[Dict]:
@@ -216,9 +471,8 @@ class DataQualityRulesService:
 
         V86: Updated to use correct column names (rule_name, rule_definition).
         """
-        conn = await asyncpg.connect(self.dsn)
+        conn = await self.pools.connect(self.dsn)
         try:
-            await self._ensure_tables_exist(conn)
             rule = await conn.fetchrow('''
                 SELECT id, rule_name, table_name, column_name,
                        rule_type, rule_definition, severity, is_active, created_at
@@ -240,6 +494,9 @@ class DataQualityRulesService:
                 'is_active': rule['is_active'],
                 'description': rule['rule_definition'].get('description') if isinstance(rule['rule_definition'], dict) else None,
                 'threshold': rule['rule_definition'].get('threshold') if isinstance(rule['rule_definition'], dict) else None,
+                'watermark_column': self._as_dict(rule['rule_definition']).get('watermark_column'),
+                'depends_on': self._as_dict(rule['rule_definition']).get('depends_on', []),
+                'engine': self._as_dict(rule['rule_definition']).get('engine', 'sql'),
                 'created_at': rule['created_at'].isoformat() if rule['created_at'] else None
             }
         finally:
@@ -256,20 +513,39 @@ class DataQualityRulesService:
         column: str,
         rule_type: str,
         definition: str,
-        severity: str = 'warning'
+        severity: str = 'warning',
+        watermark_column: Optional[str] = None,
+        depends_on: Optional[List[int]] = None,
+        engine: str = 'sql'
     ) -> int:
         """Create a new data quality rule.
 
         V86: Updated to use correct column names (rule_name, rule_definition as JSONB).
+
+        With ``engine='vectorized'`` the definition is a row predicate evaluated
+        in-process (see vectorized_engine) instead of SQL.
         """
         # Validate table name
         self._validate_table(table)
-
-        conn = await asyncpg.connect(self.dsn)
+        if watermark_column:
+            self._validate_identifier(watermark_column)
+        if engine == 'vectorized':
+            self._validate_vectorized(rule_type, column, definition)
+        elif engine != 'sql':
+            raise ValueError(f"Unsupported rule engine '{engine}'. Use 'sql' or 'vectorized'")
+
+        conn = await self.pools.connect(self.dsn)
         try:
-            await self._ensure_tables_exist(conn)
             # Store definition as JSONB
-            rule_definition = json.dumps({'sql': definition, 'type': rule_type})
+            if engine == 'vectorized':
+                config = {'expression': definition, 'type': rule_type, 'engine': engine}
+            else:
+                config = {'sql': definition, 'type': rule_type}
+            if watermark_column:
+                config['watermark_column'] = watermark_column
+            if depends_on:
+                config['depends_on'] = await self._validate_dependencies(conn, None, depends_on)
+            rule_definition = json.dumps(config)
             result = await conn.fetchval('''
                 INSERT INTO data_quality_rules
                 (rule_name, table_name, column_name, rule_type, rule_definition, severity)
@@ -288,7 +564,9 @@ class DataQualityRulesService:
         custom_sql: str,
         description: Optional[str] = None,
         severity: str = 'warning',
-        threshold: Optional[float] = None
+        threshold: Optional[float] = None,
+        watermark_column: Optional[str] = None,
+        depends_on: Optional[List[int]] = None
     ) -> int:
         """Create a custom SQL-based rule.
 
@@ -296,17 +574,23 @@ class DataQualityRulesService:
         """
         # Validate table name
         self._validate_table(table)
+        if watermark_column:
+            self._validate_identifier(watermark_column)
 
-        conn = await asyncpg.connect(self.dsn)
+        conn = await self.pools.connect(self.dsn)
         try:
-            await self._ensure_tables_exist(conn)
             # Store definition as JSONB with additional metadata
-            rule_definition = json.dumps({
+            config = {
                 'sql': custom_sql,
                 'type': 'custom_sql',
                 'description': description,
                 'threshold': threshold
-            })
+            }
+            if watermark_column:
+                config['watermark_column'] = watermark_column
+            if depends_on:
+                config['depends_on'] = await self._validate_dependencies(conn, None, depends_on)
+            rule_definition = json.dumps(config)
             result = await conn.fetchval('''
                 INSERT INTO data_quality_rules
                 (rule_name, table_name, column_name, rule_type, rule_definition, severity)
@@ -329,7 +613,7 @@ class DataQualityRulesService:
         if not kwargs:
             return
 
-        conn = await asyncpg.connect(self.dsn)
+        conn = await self.pools.connect(self.dsn)
         try:
             # Build dynamic update query
             set_clauses = []
@@ -343,16 +627,45 @@ class DataQualityRulesService:
                 'is_active': 'is_active'
             }
 
+            # Keys merged into the rule_definition JSONB so existing rule
+            # metadata (threshold, description, ...) survives partial edits
+            definition_patch = {}
+
             for key, value in kwargs.items():
                 if key in field_mapping:
                     set_clauses.append(f"{field_mapping[key]} = ${param_num}")
                     values.append(value)
                     param_num += 1
                 elif key == 'definition':
-                    # Definition needs to be stored as JSONB
-                    set_clauses.append(f"rule_definition = ${param_num}::jsonb")
-                    values.append(json.dumps({'sql': value}))
-                    param_num += 1
+                    rule = await conn.fetchrow(
+                        'SELECT rule_type, column_name, rule_definition FROM data_quality_rules WHERE id = $1',
+                        rule_id
+                    )
+                    if rule and self._as_dict(rule['rule_definition']).get('engine') == 'vectorized':
+                        self._validate_vectorized(rule['rule_type'], rule['column_name'], value)
+                        definition_patch['expression'] = value
+                    else:
+                        definition_patch['sql'] = value
+                elif key == 'watermark_column':
+                    # Empty string clears the watermark (back to full evaluation)
+                    if value:
+                        self._validate_identifier(value)
+                    definition_patch['watermark_column'] = value or None
+                elif key == 'depends_on':
+                    # Empty list removes all dependencies
+                    definition_patch['depends_on'] = await self._validate_dependencies(
+                        conn, rule_id, value or []
+                    )
+
+            if definition_patch:
+                # Legacy rows may hold a bare JSON string; lift it into an object first
+                set_clauses.append(
+                    "rule_definition = (CASE WHEN jsonb_typeof(rule_definition) = 'object' "
+                    "THEN rule_definition ELSE jsonb_build_object('sql', rule_definition #>> '{}') END) "
+                    f"|| ${param_num}::jsonb"
+                )
+                values.append(json.dumps(definition_patch))
+                param_num += 1
 
             if not set_clauses:
                 return
@@ -370,7 +683,7 @@ class DataQualityRulesService:
 
     async def delete_rule(self, rule_id: int) -> None:
         """Delete a rule and its execution history."""
-        conn = await asyncpg.connect(self.dsn)
+        conn = await self.pools.connect(self.dsn)
         try:
             # Delete results first (cascade should handle this, but be explicit)
             await conn.execute(
@@ -648,15 +961,72 @@ class DataQualityRulesService:
     # RULE EXECUTION
     # =========================================================================
 
-    async def execute_rule(self, rule_id: int) -> Dict[str, Any]:
+    async def execute_rule(
+        self,
+        rule_id: int,
+        full_refresh: bool = False,
+        mode: str = 'exact',
+        sample_percent: Optional[float] = None,
+        explain: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """Execute a data quality rule and return detailed results.
 
         V86: Updated to use correct column names (rule_name, rule_definition).
+
+        Rules with a ``watermark_column`` in their rule_definition are evaluated
+        incrementally: only rows past the last stored watermark are checked and
+        the new counts are added to the previous cumulative totals. Pass
+        ``full_refresh=True`` to re-evaluate every row and reset the baseline.
+
+        ``mode='sampled'`` evaluates the rule on a ``TABLESAMPLE`` of the table
+        and stores an approximate result with a confidence interval; sampled
+        runs never advance the watermark.
+
+        Every result records its execution time and rows examined. A fraction
+        (RULE_EXPLAIN_SAMPLE_RATE) of exact runs, or every run with
+        ``explain=True``, also re-runs the failing-rows query under
+        ``EXPLAIN (ANALYZE, BUFFERS)`` and stores the buffer/IO stats.
+
+        Rules with ``engine: vectorized`` are evaluated in-process over
+        columnar batches of the whole table (no watermark or sampling).
+
+        With FAILURE_SAMPLE_STORAGE='keys' only the primary keys of failing
+        rows are stored; see get_failure_samples for the full rows.
+
+        The rule and previous results are read from, and the result written
+        to, the primary; the evaluation queries run on a read replica when
+        one is healthy.
+
+        Executions go through the database's rule circuit breaker: statement
+        timeouts and lost connections count as failures, and while it is open
+        executions fail fast with CircuitBreakerOpen. Executions that lost
+        their connection are retried within the retry budget.
         """
-        conn = await asyncpg.connect(self.dsn)
-        try:
-            await self._ensure_tables_exist(conn)
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unsupported execution mode '{mode}'. Use one of: {sorted(EXECUTION_MODES)}")
+
+        name = f"rules:{redact_dsn(self.dsn)}"
+        return await call_with_retry(
+            lambda: self._execute_rule(rule_id, full_refresh, mode, sample_percent, explain),
+            get_circuit_breaker(name),
+            get_retry_budget(name),
+            failures=RULE_EXECUTION_FAILURES,
+            retryable=TRANSIENT_CONNECTION_ERRORS
+        )
 
+    async def _execute_rule(
+        self,
+        rule_id: int,
+        full_refresh: bool,
+        mode: str,
+        sample_percent: Optional[float],
+        explain: Optional[bool]
+    ) -> Dict[str, Any]:
+        # Leases are taken one at a time (rule, scan, store): holding the
+        # primary lease while waiting for a read lease from the same pool
+        # deadlocks concurrent executions once the pool is exhausted
+        conn = await self.pools.connect(self.dsn)
+        try:
             # Get rule details
             rule = await conn.fetchrow(
                 'SELECT * FROM data_quality_rules WHERE id = $1',
@@ -665,51 +1035,586 @@ class DataQualityRulesService:
             if not rule:
                 raise ValueError(f"Rule {rule_id} not found")
 
-            table = rule['table_name']
-            column = rule['column_name']
-            rule_type = rule['rule_type']
-            # V86: Extract definition from JSONB rule_definition
             rule_definition = rule['rule_definition']
-            definition = self._extract_definition(rule_definition)
-            # Extract threshold from JSONB or use default
-            threshold = 0
-            if isinstance(rule_definition, dict):
-                threshold = rule_definition.get('threshold', 0) or 0
-
-            # Execute based on rule type
-            if rule_type == 'custom_sql':
-                result = await self._execute_custom_sql(conn, table, definition, threshold)
-            elif rule_type == 'null_check' or rule_type == 'not_null':
-                result = await self._execute_null_check(conn, table, column, threshold)
-            elif rule_type == 'unique_check':
-                result = await self._execute_unique_check(conn, table, column)
-            elif rule_type == 'range_check':
-                result = await self._execute_range_check(conn, table, column, definition)
-            elif rule_type == 'pattern_check':
-                result = await self._execute_pattern_check(conn, table, column, definition)
+            watermark_column = self._as_dict(rule_definition).get('watermark_column')
+            previous = None
+            if watermark_column and not full_refresh and rule['rule_type'] != 'unique_check':
+                previous = await self._previous_watermark(conn, rule_id)
+        finally:
+            await conn.close()
+
+        table = rule['table_name']
+        column = rule['column_name']
+        rule_type = rule['rule_type']
+        # V86: Extract definition from JSONB rule_definition
+        definition = self._extract_definition(rule_definition)
+        # Extract threshold from JSONB or use default
+        threshold = 0
+        if isinstance(rule_definition, dict):
+            threshold = rule_definition.get('threshold', 0) or 0
+
+        if self._as_dict(rule_definition).get('engine') == 'vectorized' and mode != 'exact':
+            raise ValueError("Sampled execution is not supported for vectorized rules")
+
+        started = time.perf_counter()
+        async with self.pools.acquire_read(self.dsn) as reader:
+            if self._as_dict(rule_definition).get('engine') == 'vectorized':
+                [result] = await self._execute_vectorized(reader, table, [rule])
+                result.execution_time_ms = round((time.perf_counter() - started) * 1000, 2)
+            elif mode == 'sampled':
+                result = await self._execute_sampled(
+                    reader, rule_type, table, column, definition, threshold,
+                    sample_percent or settings.RULE_SAMPLE_PERCENT
+                )
+                result.execution_time_ms = round((time.perf_counter() - started) * 1000, 2)
+                result.rows_examined = result.confidence_interval.get('sample_size')
             else:
-                # Default: execute the definition as SQL and count failures
-                result = await self._execute_generic(conn, table, definition)
+                result = await self._run_exact(
+                    reader, rule_id, rule_type, table, column, definition, threshold,
+                    watermark_column, full_refresh, previous, explain, started
+                )
+        result.rule_id = rule_id
+
+        # Store result
+        conn = await self.pools.connect(self.dsn)
+        try:
+            await self._compact_failure_samples(conn, result, table)
+            await self._store_result(conn, result)
+        finally:
+            await conn.close()
 
-            result.rule_id = rule_id
+        return result.to_dict()
 
-            # Store result
-            await self._store_result(conn, result)
+    async def _run_exact(
+        self,
+        reader: asyncpg.Connection,
+        rule_id: int,
+        rule_type: str,
+        table: str,
+        column: str,
+        definition: str,
+        threshold: float,
+        watermark_column: Optional[str],
+        full_refresh: bool,
+        previous: Optional[asyncpg.Record],
+        explain: Optional[bool],
+        started: float
+    ) -> RuleResult:
+        """Exact evaluation on the read connection, incremental when the rule has a watermark."""
+        window = None
+        if watermark_column:
+            if rule_type == 'unique_check':
+                # New rows can duplicate old ones, so uniqueness is not decomposable
+                logger.info(f"Rule {rule_id}: unique_check ignores watermark, running full check")
+            else:
+                window = await self._resolve_watermark_window(
+                    reader, table, watermark_column, full_refresh, previous
+                )
+
+        try:
+            result = await self._run_check(
+                reader, rule_type, table, column, definition, threshold, window
+            )
+        except asyncpg.UndefinedColumnError:
+            if window is None:
+                raise
+            # The rule SQL does not project the watermark column
+            logger.warning(
+                f"Rule {rule_id}: definition does not expose '{watermark_column}', "
+                f"falling back to full evaluation"
+            )
+            window = None
+            result = await self._run_check(
+                reader, rule_type, table, column, definition, threshold, None
+            )
+
+        result.execution_time_ms = round((time.perf_counter() - started) * 1000, 2)
+        # Counts of this run only; the baseline below makes them cumulative
+        result.rows_examined = result.total_count
+
+        if window is not None:
+            self._apply_watermark_baseline(result, window, rule_type, threshold)
+
+        if explain or (explain is None and random.random() < settings.RULE_EXPLAIN_SAMPLE_RATE):
+            result.explain_stats = await self._explain_stats(
+                reader, rule_type, table, column, definition, window
+            )
+        return result
+
+    async def execute_rules(
+        self,
+        rule_ids: Optional[List[int]] = None,
+        table_name: Optional[str] = None,
+        full_refresh: bool = False,
+        mode: str = 'exact',
+        sample_percent: Optional[float] = None,
+        max_parallel: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Execute a batch of rules in dependency order.
+
+        Rules declare preconditions with ``depends_on`` in their rule_definition.
+        Active upstream rules of the selection are pulled into the batch. Each rule
+        starts as soon as its dependencies finish, so independent branches run in
+        parallel (up to max_parallel). A rule whose dependency failed, errored or
+        was skipped is not executed and records a 'skipped' result instead.
+
+        Selects all active rules when neither rule_ids nor table_name is given.
+        An open circuit breaker fails the whole batch with CircuitBreakerOpen
+        instead of recording an error for every rule.
+        """
+        if table_name is not None:
+            self._validate_table(table_name)
+
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rows = await conn.fetch('''
+                SELECT id, table_name, rule_definition FROM data_quality_rules
+                WHERE is_active = true
+            ''')
+        finally:
+            await conn.close()
+
+        active = {r['id']: r for r in rows}
+        if rule_ids:
+            missing = [rule_id for rule_id in rule_ids if rule_id not in active]
+            if missing:
+                raise ValueError(f"Rules not found or inactive: {missing}")
+            selected = set(rule_ids)
+        elif table_name is not None:
+            selected = {rule_id for rule_id, r in active.items() if r['table_name'] == table_name}
+        else:
+            selected = set(active)
+
+        # Pull in active upstream rules so preconditions are evaluated first
+        dependencies: Dict[int, List[int]] = {}
+        pending = list(selected)
+        while pending:
+            rule_id = pending.pop()
+            if rule_id in dependencies:
+                continue
+            deps = [
+                dep for dep in self._as_dict(active[rule_id]['rule_definition']).get('depends_on', [])
+                if dep in active
+            ]
+            dependencies[rule_id] = deps
+            pending.extend(deps)
+
+        order = topological_order(dependencies)
+        semaphore = asyncio.Semaphore(max_parallel or settings.RULE_BATCH_CONCURRENCY)
+        tasks: Dict[int, asyncio.Task] = {}
+
+        async def run_rule(rule_id: int) -> Dict[str, Any]:
+            upstream = [await tasks[dep] for dep in dependencies[rule_id]]
+            blocked_by = [dep['rule_id'] for dep in upstream if dep['status'] != 'passed']
+            if blocked_by:
+                return await self._record_skipped(rule_id, blocked_by)
+            async with semaphore:
+                try:
+                    return await self.execute_rule(
+                        rule_id, full_refresh=full_refresh, mode=mode, sample_percent=sample_percent
+                    )
+                except CircuitBreakerOpen:
+                    raise
+                except Exception as e:
+                    logger.error(f"Rule {rule_id} failed during batch execution: {e}")
+                    return {'rule_id': rule_id, 'status': 'error', 'passed': False, 'error': str(e)}
+
+        # Dependencies come first in `order`, so their tasks exist when awaited
+        for rule_id in order:
+            tasks[rule_id] = asyncio.create_task(run_rule(rule_id))
+        try:
+            results = [await tasks[rule_id] for rule_id in order]
+        finally:
+            # After a failure: stop the rest and collect their outcomes
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        summary = {'total': len(results), 'passed': 0, 'failed': 0, 'skipped': 0, 'error': 0}
+        for result in results:
+            summary[result['status']] += 1
+        return {
+            'order': order,
+            'dependencies': {rule_id: deps for rule_id, deps in dependencies.items() if deps},
+            'summary': summary,
+            'results': results
+        }
+
+    async def execute_vectorized(self, table_name: str) -> List[Dict[str, Any]]:
+        """Evaluate every active vectorized rule of a table in a single scan.
+
+        The scan time is split evenly across the rules for telemetry.
+        """
+        table = self._validate_table(table_name)
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rules = await conn.fetch('''
+                SELECT * FROM data_quality_rules
+                WHERE is_active = true AND table_name = $1
+                  AND rule_definition->>'engine' = 'vectorized'
+                ORDER BY id
+            ''', table)
+        finally:
+            await conn.close()
+        if not rules:
+            return []
 
-            return result.to_dict()
+        # The primary lease is not held during the scan (see _execute_rule)
+        started = time.perf_counter()
+        async with self.pools.acquire_read(self.dsn) as reader:
+            results = await self._execute_vectorized(reader, table, rules)
+        share_ms = round((time.perf_counter() - started) * 1000 / len(results), 2)
+        conn = await self.pools.connect(self.dsn)
+        try:
+            for result in results:
+                result.execution_time_ms = share_ms
+                await self._compact_failure_samples(conn, result, table)
+                await self._store_result(conn, result)
+            return [r.to_dict() for r in results]
         finally:
             await conn.close()
 
+    async def get_vectorized_rules(self, table_name: str) -> List[Any]:
+        """Active rules of a table that can run outside PostgreSQL, as VectorizedRule objects.
+
+        These are engine=vectorized rules and null checks of either engine,
+        which only need the rule column. Used to check files against a table's rules.
+        """
+        from app.services.vectorized_engine import NULL_RULE_TYPES
+
+        table = self._validate_table(table_name)
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rules = await conn.fetch('''
+                SELECT * FROM data_quality_rules
+                WHERE is_active = true AND table_name = $1
+                  AND (rule_definition->>'engine' = 'vectorized' OR rule_type = ANY($2::text[]))
+                ORDER BY id
+            ''', table, sorted(NULL_RULE_TYPES))
+            return self._prepare_vectorized(rules)
+        finally:
+            await conn.close()
+
+    async def get_table_rules(self, table_name: str) -> List[Dict[str, Any]]:
+        """Active rules of a table with their decoded rule_definition, oldest first."""
+        table = self._validate_table(table_name)
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rules = await conn.fetch(
+                'SELECT * FROM data_quality_rules WHERE is_active = true AND table_name = $1 ORDER BY id',
+                table
+            )
+            return [
+                {
+                    'id': r['id'],
+                    'name': r['rule_name'],
+                    'column': r['column_name'],
+                    'rule_type': r['rule_type'],
+                    'definition': self._extract_definition(r['rule_definition']),
+                    'config': self._as_dict(r['rule_definition']),
+                }
+                for r in rules
+            ]
+        finally:
+            await conn.close()
+
+    def _prepare_vectorized(self, rules: List[asyncpg.Record]) -> List[Any]:
+        from app.services.vectorized_engine import VectorizedRule
+
+        return [
+            VectorizedRule.from_definition(
+                r['id'], r['rule_type'], r['column_name'], self._as_dict(r['rule_definition'])
+            )
+            for r in rules
+        ]
+
+    async def _execute_vectorized(
+        self, conn: asyncpg.Connection, table: str, rules: List[asyncpg.Record]
+    ) -> List[RuleResult]:
+        """Run rule rows through the vectorized engine in one pass over `table`."""
+        from app.services.vectorized_engine import VectorizedRuleEngine
+
+        return await VectorizedRuleEngine().evaluate_table(conn, table, self._prepare_vectorized(rules))
+
+    async def _record_skipped(self, rule_id: int, blocked_by: List[int]) -> Dict[str, Any]:
+        """Store a 'skipped' result for a rule whose preconditions did not pass."""
+        result = RuleResult(
+            rule_id=rule_id, passed=False, total_count=0, failed_count=0,
+            skipped=True, blocked_by=blocked_by
+        )
+        logger.info(f"Rule {rule_id} skipped: upstream rules {blocked_by} did not pass")
+        try:
+            conn = await self.pools.connect(self.dsn)
+            try:
+                await self._store_result(conn, result)
+            finally:
+                await conn.close()
+        except Exception as e:
+            # Downstream scheduling only needs the in-memory status
+            logger.error(f"Failed to store skipped result for rule {rule_id}: {e}")
+        return result.to_dict()
+
+    async def _run_check(
+        self,
+        conn: asyncpg.Connection,
+        rule_type: str,
+        table: str,
+        column: str,
+        definition: str,
+        threshold: float,
+        window: Optional[WatermarkWindow] = None
+    ) -> RuleResult:
+        """Dispatch a rule to the executor for its type."""
+        if rule_type == 'custom_sql':
+            return await self._execute_custom_sql(conn, table, definition, threshold, window)
+        elif rule_type == 'null_check' or rule_type == 'not_null':
+            return await self._execute_null_check(conn, table, column, threshold, window)
+        elif rule_type == 'unique_check':
+            return await self._execute_unique_check(conn, table, column)
+        elif rule_type == 'range_check':
+            return await self._execute_range_check(conn, table, column, definition, window)
+        elif rule_type == 'pattern_check':
+            return await self._execute_pattern_check(conn, table, column, definition, window)
+        # Default: execute the definition as SQL and count failures
+        return await self._execute_generic(conn, table, definition, window)
+
+    def _failing_rows_sql(self, rule_type: str, table: str, column: str, definition: str) -> str:
+        """SQL returning the rows that fail a rule, used to wrap or sample a check."""
+        if rule_type in ('null_check', 'not_null'):
+            return f'SELECT * FROM "{table}" WHERE "{column}" IS NULL'
+        if rule_type == 'unique_check':
+            keys = ', '.join(f'"{c}"' for c in self._key_columns(column))
+            return (
+                f'SELECT * FROM "{table}" WHERE ({keys}) IN ('
+                f'SELECT {keys} FROM "{table}" GROUP BY {keys} HAVING COUNT(*) > 1)'
+            )
+        return definition.strip().rstrip(';')
+
+    def _check_sql(self, rule_type: str, table: str, column: str, definition: str) -> str:
+        """SQL the executor runs to find a rule's violations (not the total count)."""
+        if rule_type in ('null_check', 'not_null'):
+            return f'SELECT COUNT(*) FROM "{table}" WHERE "{column}" IS NULL'
+        if rule_type == 'unique_check':
+            return self._unique_check_sql(table, self._key_columns(column))
+        return definition.strip().rstrip(';')
+
+    # =========================================================================
+    # SAMPLED EXECUTION
+    # =========================================================================
+
+    async def _explain_stats(
+        self,
+        conn: asyncpg.Connection,
+        rule_type: str,
+        table: str,
+        column: str,
+        definition: str,
+        window: Optional[WatermarkWindow]
+    ) -> Optional[Dict[str, Any]]:
+        """Profile the rule's failing-rows query with EXPLAIN (ANALYZE, BUFFERS).
+
+        ANALYZE executes the query, so it runs inside a transaction that is
+        always rolled back. Profiling problems are logged, never raised.
+        """
+        query, args = self._windowed_definition(
+            self._failing_rows_sql(rule_type, table, column, definition), window
+        )
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            plan = await conn.fetchval(
+                f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}', *args
+            )
+            return summarize_explain(plan)
+        except Exception as e:
+            logger.warning(f"EXPLAIN of {rule_type} rule on '{table}' failed: {e}")
+            return None
+        finally:
+            await transaction.rollback()
+
+    async def _execute_sampled(
+        self,
+        conn: asyncpg.Connection,
+        rule_type: str,
+        table: str,
+        column: str,
+        definition: str,
+        threshold: float,
+        sample_percent: float
+    ) -> RuleResult:
+        """Estimate a rule's failures from a block-level TABLESAMPLE.
+
+        The rule SQL runs against a CTE that shadows the table name, so
+        unqualified references to the table read the sample instead of the
+        full relation. The Wilson interval assumes independent rows; SYSTEM
+        sampling reads whole pages, so the bounds are optimistic when failing
+        rows are clustered on disk.
+        """
+        if rule_type == 'unique_check':
+            raise ValueError("Sampled execution is not supported for unique_check rules")
+        if not 0 < sample_percent <= 100:
+            raise ValueError("sample_percent must be greater than 0 and at most 100")
+
+        failing_sql = self._failing_rows_sql(rule_type, table, column, definition)
+        population_filter = f' WHERE "{column}" IS NOT NULL' if rule_type == 'pattern_check' else ''
+
+        row = await conn.fetchrow(f'''
+            WITH "{table}" AS MATERIALIZED (
+                SELECT * FROM "{table}" TABLESAMPLE SYSTEM ({float(sample_percent):g})
+            )
+            SELECT
+                (SELECT COUNT(*) FROM "{table}") AS sampled_rows,
+                (SELECT COUNT(*) FROM "{table}"{population_filter}) AS sample_total,
+                (SELECT COUNT(*) FROM ({failing_sql}) AS _dq) AS sample_failed,
+                (SELECT json_agg(_s) FROM (SELECT * FROM ({failing_sql}) AS _f LIMIT 5) AS _s) AS samples
+        ''')
+        sampled_rows = row['sampled_rows']
+        sample_total = row['sample_total']
+        sample_failed = row['sample_failed']
+
+        # Planner row estimate; -1/0 when the table was never analyzed
+        reltuples = await conn.fetchval(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = $1::regclass', table
+        )
+        if reltuples and reltuples > 0:
+            population = reltuples
+        else:
+            population = sampled_rows * 100 / sample_percent
+        scale = population / sampled_rows if sampled_rows else 0
+
+        estimated_total = round(sample_total * scale)
+        fail_fraction = sample_failed / sample_total if sample_total else 0.0
+        estimated_failed = round(fail_fraction * estimated_total)
+        low, high = wilson_interval(sample_failed, sample_total)
+
+        if rule_type in THRESHOLD_RULE_TYPES:
+            passed = fail_fraction * 100 <= threshold
+        else:
+            passed = sample_failed == 0
+
+        return RuleResult(
+            rule_id=0,
+            passed=passed,
+            total_count=estimated_total,
+            failed_count=estimated_failed,
+            failure_samples=json.loads(row['samples']) if row['samples'] else [],
+            is_approximate=True,
+            sample_percent=sample_percent,
+            confidence_interval={
+                'level': SAMPLE_CONFIDENCE_LEVEL,
+                'sample_size': sample_total,
+                'sample_failed': sample_failed,
+                'failed_count_low': math.floor(low * estimated_total),
+                'failed_count_high': math.ceil(high * estimated_total),
+                'pass_rate_low': round((1 - high) * 100, 2),
+                'pass_rate_high': round((1 - low) * 100, 2)
+            }
+        )
+
+    # =========================================================================
+    # INCREMENTAL EXECUTION
+    # =========================================================================
+
+    async def _previous_watermark(self, conn: asyncpg.Connection, rule_id: int) -> Optional[asyncpg.Record]:
+        """Cumulative counts and watermark of the rule's last incremental run."""
+        return await conn.fetchrow('''
+            SELECT total_count, failed_count, watermark
+            FROM data_quality_results
+            WHERE rule_id = $1 AND watermark IS NOT NULL
+            ORDER BY executed_at DESC
+            LIMIT 1
+        ''', rule_id)
+
+    async def _resolve_watermark_window(
+        self,
+        data_conn: asyncpg.Connection,
+        table: str,
+        watermark_column: str,
+        full_refresh: bool = False,
+        previous: Optional[asyncpg.Record] = None
+    ) -> WatermarkWindow:
+        """Work out the row window to evaluate and the cumulative baseline.
+
+        The upper bound is fixed before the check runs so rows appended while
+        the rule executes are picked up by the next run instead of being
+        counted twice. It is read on `data_conn` (the connection the check
+        runs on, possibly a replica); `previous` is the last incremental
+        result, read from the primary (see _previous_watermark).
+        """
+        self._validate_identifier(watermark_column)
+        column_type = await data_conn.fetchval('''
+            SELECT format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            WHERE a.attrelid = $1::regclass AND a.attname = $2
+              AND a.attnum > 0 AND NOT a.attisdropped
+        ''', table, watermark_column)
+        if column_type is None:
+            raise ValueError(f"Watermark column '{watermark_column}' not found on table '{table}'")
+
+        high = await data_conn.fetchval(f'SELECT MAX("{watermark_column}")::text FROM "{table}"')
+        window = WatermarkWindow(column=watermark_column, column_type=column_type, high=high)
+
+        if full_refresh:
+            return window
+
+        if previous:
+            window.low = previous['watermark']
+            window.previous_total = previous['total_count'] or 0
+            window.previous_failed = previous['failed_count'] or 0
+            if high is None:
+                # Table emptied since the last run; keep the old watermark
+                window.high = window.low
+            elif window.low is not None and await data_conn.fetchval(
+                f'SELECT $1::{column_type} < $2::{column_type}', high, window.low
+            ):
+                # Replica behind the last run; check nothing new rather than move back
+                window.high = window.low
+        return window
+
+    def _apply_watermark_baseline(
+        self, result: RuleResult, window: WatermarkWindow, rule_type: str, threshold: float
+    ) -> None:
+        """Fold the previous cumulative totals into a windowed result."""
+        result.total_count += window.previous_total
+        result.failed_count += window.previous_failed
+        if rule_type in THRESHOLD_RULE_TYPES:
+            fail_pct = (result.failed_count / result.total_count * 100) if result.total_count > 0 else 0
+            result.passed = fail_pct <= threshold
+        else:
+            result.passed = result.failed_count == 0
+        result.incremental = window.low is not None
+        result.watermark = window.high
+
+    def _window_scope(
+        self, window: Optional[WatermarkWindow], keyword: str = 'WHERE', qualifier: str = ''
+    ) -> Tuple[str, List[str]]:
+        """Return a ``WHERE``/``AND`` fragment restricting a query to the window."""
+        if window is None:
+            return '', []
+        clause, args = window.clause(qualifier)
+        return f' {keyword} {clause}', args
+
+    def _windowed_definition(self, definition: str, window: Optional[WatermarkWindow]) -> Tuple[str, List[str]]:
+        """Wrap a rule's failing-rows SQL so only rows inside the window are returned."""
+        if window is None:
+            return definition, []
+        scope, args = self._window_scope(window, qualifier='_dq.')
+        return f'SELECT * FROM ({definition.strip().rstrip(";")}) AS _dq{scope}', args
+
     async def _execute_null_check(
-        self, conn: asyncpg.Connection, table: str, column: str, threshold: float
+        self, conn: asyncpg.Connection, table: str, column: str, threshold: float,
+        window: Optional[WatermarkWindow] = None
     ) -> RuleResult:
         """Execute null check rule."""
+        where_scope, args = self._window_scope(window)
+        and_scope, _ = self._window_scope(window, keyword='AND')
+
         # Get total count
-        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"')
+        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"{where_scope}', *args)
 
         # Get null count
         null_count = await conn.fetchval(
-            f'SELECT COUNT(*) FROM "{table}" WHERE "{column}" IS NULL'
+            f'SELECT COUNT(*) FROM "{table}" WHERE "{column}" IS NULL{and_scope}', *args
         )
 
         null_pct = (null_count / total * 100) if total > 0 else 0
@@ -719,7 +1624,7 @@ class DataQualityRulesService:
         samples = []
         if null_count > 0:
             sample_rows = await conn.fetch(
-                f'SELECT * FROM "{table}" WHERE "{column}" IS NULL LIMIT 5'
+                f'SELECT * FROM "{table}" WHERE "{column}" IS NULL{and_scope} LIMIT 5', *args
             )
             samples = [dict(row) for row in sample_rows]
 
@@ -731,41 +1636,71 @@ class DataQualityRulesService:
             failure_samples=samples
         )
 
+    def _unique_check_sql(
+        self, table: str, columns: List[str], sample_groups: int = UNIQUE_SAMPLE_GROUPS
+    ) -> str:
+        """Single-scan duplicate summary: totals, excess rows and the worst groups.
+
+        Aggregation stays in the database, so only one row comes back however
+        many duplicate groups there are.
+        """
+        keys = ', '.join(f'"{c}"' for c in columns)
+        return f'''
+            WITH key_counts AS MATERIALIZED (
+                SELECT {keys}, COUNT(*) AS cnt
+                FROM "{table}"
+                GROUP BY {keys}
+            )
+            SELECT COALESCE(SUM(cnt), 0)::bigint AS total_count,
+                   COUNT(*) FILTER (WHERE cnt > 1) AS duplicate_groups,
+                   COALESCE(SUM(cnt - 1) FILTER (WHERE cnt > 1), 0)::bigint AS excess_rows,
+                   (SELECT json_agg(worst) FROM (
+                        SELECT * FROM key_counts WHERE cnt > 1 ORDER BY cnt DESC LIMIT {int(sample_groups)}
+                   ) worst) AS worst_groups
+            FROM key_counts
+        '''
+
     async def _execute_unique_check(
         self, conn: asyncpg.Connection, table: str, column: str
     ) -> RuleResult:
-        """Execute uniqueness check rule."""
-        # Find duplicates
-        duplicates = await conn.fetch(f'''
-            SELECT "{column}", COUNT(*) as cnt
-            FROM "{table}"
-            GROUP BY "{column}"
-            HAVING COUNT(*) > 1
-        ''')
+        """Execute uniqueness check rule.
 
-        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"')
-        failed = sum(row['cnt'] - 1 for row in duplicates)
+        ``column`` may list several comma-separated columns for a composite key.
+        failed_count is the number of excess rows (group size - 1 per duplicate group).
+        """
+        columns = self._key_columns(column)
+        summary = await conn.fetchrow(self._unique_check_sql(table, columns))
 
+        worst_groups = summary['worst_groups'] or []
+        if isinstance(worst_groups, str):
+            worst_groups = json.loads(worst_groups)
         samples = [
-            {'value': str(row[column]), 'count': row['cnt']}
-            for row in duplicates[:5]
+            {
+                'value': str(group[columns[0]]) if len(columns) == 1
+                else {c: str(group[c]) for c in columns},
+                'count': group['cnt']
+            }
+            for group in worst_groups
         ]
 
         return RuleResult(
             rule_id=0,
-            passed=len(duplicates) == 0,
-            total_count=total,
-            failed_count=failed,
+            passed=summary['duplicate_groups'] == 0,
+            total_count=summary['total_count'],
+            failed_count=summary['excess_rows'],
             failure_samples=samples
         )
 
     async def _execute_range_check(
-        self, conn: asyncpg.Connection, table: str, column: str, definition: str
+        self, conn: asyncpg.Connection, table: str, column: str, definition: str,
+        window: Optional[WatermarkWindow] = None
     ) -> RuleResult:
         """Execute range check rule."""
         # Execute the definition SQL to find violations
-        failures = await conn.fetch(definition)
-        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"')
+        query, args = self._windowed_definition(definition, window)
+        failures = await conn.fetch(query, *args)
+        where_scope, _ = self._window_scope(window)
+        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"{where_scope}', *args)
 
         samples = [dict(row) for row in failures[:5]]
 
@@ -778,13 +1713,16 @@ class DataQualityRulesService:
         )
 
     async def _execute_pattern_check(
-        self, conn: asyncpg.Connection, table: str, column: str, definition: str
+        self, conn: asyncpg.Connection, table: str, column: str, definition: str,
+        window: Optional[WatermarkWindow] = None
     ) -> RuleResult:
         """Execute pattern check rule."""
         # Execute the definition SQL to find violations
-        failures = await conn.fetch(definition)
+        query, args = self._windowed_definition(definition, window)
+        failures = await conn.fetch(query, *args)
+        and_scope, _ = self._window_scope(window, keyword='AND')
         total = await conn.fetchval(
-            f'SELECT COUNT(*) FROM "{table}" WHERE "{column}" IS NOT NULL'
+            f'SELECT COUNT(*) FROM "{table}" WHERE "{column}" IS NOT NULL{and_scope}', *args
         )
 
         samples = [dict(row) for row in failures[:5]]
@@ -798,11 +1736,14 @@ class DataQualityRulesService:
         )
 
     async def _execute_custom_sql(
-        self, conn: asyncpg.Connection, table: str, custom_sql: str, threshold: float
+        self, conn: asyncpg.Connection, table: str, custom_sql: str, threshold: float,
+        window: Optional[WatermarkWindow] = None
     ) -> RuleResult:
         """Execute custom SQL rule."""
-        failures = await conn.fetch(custom_sql)
-        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"')
+        query, args = self._windowed_definition(custom_sql, window)
+        failures = await conn.fetch(query, *args)
+        where_scope, _ = self._window_scope(window)
+        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"{where_scope}', *args)
 
         fail_pct = (len(failures) / total * 100) if total > 0 else 0
         passed = fail_pct <= threshold
@@ -818,11 +1759,14 @@ class DataQualityRulesService:
         )
 
     async def _execute_generic(
-        self, conn: asyncpg.Connection, table: str, definition: str
+        self, conn: asyncpg.Connection, table: str, definition: str,
+        window: Optional[WatermarkWindow] = None
     ) -> RuleResult:
         """Execute generic SQL definition."""
-        failures = await conn.fetch(definition)
-        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"')
+        query, args = self._windowed_definition(definition, window)
+        failures = await conn.fetch(query, *args)
+        where_scope, _ = self._window_scope(window)
+        total = await conn.fetchval(f'SELECT COUNT(*) FROM "{table}"{where_scope}', *args)
 
         samples = [dict(row) for row in failures[:5]]
 
@@ -834,21 +1778,89 @@ class DataQualityRulesService:
             failure_samples=samples
         )
 
+    async def _primary_key_columns(self, conn: asyncpg.Connection, table: str) -> List[str]:
+        """Primary key columns of a table in key order; empty when it has none."""
+        rows = await conn.fetch('''
+            SELECT a.attname
+            FROM pg_constraint c
+            CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, position)
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+            WHERE c.conrelid = $1::regclass AND c.contype = 'p'
+            ORDER BY k.position
+        ''', table)
+        return [r['attname'] for r in rows]
+
+    async def _compact_failure_samples(
+        self,
+        conn: asyncpg.Connection,
+        result: RuleResult,
+        table: str
+    ) -> None:
+        """Move the result's samples into failure_sample_sets when storage is 'keys'.
+
+        Samples are reduced to primary key values when every sample row carries
+        the key; otherwise (no primary key, aggregate custom SQL, unique_check
+        groups) they are stored as-is, still deduplicated by hash. The
+        in-memory result keeps its full samples for the caller.
+        """
+        storage = settings.FAILURE_SAMPLE_STORAGE
+        if storage not in SAMPLE_STORAGE_MODES:
+            raise ValueError(f"Unsupported sample storage '{storage}'. Use one of: {sorted(SAMPLE_STORAGE_MODES)}")
+        if storage == 'inline' or not result.failure_samples:
+            return
+
+        key_columns = await self._primary_key_columns(conn, table)
+        samples = result.failure_samples
+        if key_columns and all(
+            isinstance(s, dict) and all(k in s for k in key_columns) for s in samples
+        ):
+            samples = [{k: s[k] for k in key_columns} for s in samples]
+        else:
+            key_columns = []
+
+        digest = sample_set_hash(table, key_columns, samples)
+        # Reusing an old set refreshes created_at so the orphan purge (which
+        # spares sets younger than an hour) cannot delete it before the result lands
+        await conn.execute('''
+            INSERT INTO failure_sample_sets (hash, table_name, key_columns, samples)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (hash) DO UPDATE SET created_at = CURRENT_TIMESTAMP
+            WHERE failure_sample_sets.created_at < CURRENT_TIMESTAMP - INTERVAL '30 minutes'
+        ''', digest, table, json.dumps(key_columns), json.dumps(samples, sort_keys=True, default=str))
+        result.failure_sample_hash = digest
+
     async def _store_result(self, conn: asyncpg.Connection, result: RuleResult) -> int:
-        """Store rule execution result."""
-        result_id = await conn.fetchval('''
-            INSERT INTO data_quality_results
-            (rule_id, passed, total_count, failed_count, failure_samples, executed_at)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            RETURNING id
-        ''',
-            result.rule_id,
-            result.passed,
-            result.total_count,
-            result.failed_count,
-            json.dumps(result.failure_samples, default=str),
-            result.executed_at
-        )
+        """Store rule execution result and add it to the daily rollups atomically."""
+        async with conn.transaction():
+            result_id = await conn.fetchval(
+                '''
+                INSERT INTO data_quality_results
+                (rule_id, passed, total_count, failed_count, failure_samples, executed_at, watermark,
+                 is_approximate, sample_percent, confidence_interval, status,
+                 execution_time_ms, rows_examined, explain_stats, failure_sample_hash)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
+                RETURNING id
+                ''',
+                result.rule_id,
+                # Skipped rules were never evaluated, so they are neither passed nor failed
+                None if result.skipped else result.passed,
+                result.total_count,
+                result.failed_count,
+                # Compact storage keeps the samples in failure_sample_sets only
+                None if result.failure_sample_hash else json.dumps(result.failure_samples, default=str),
+                result.executed_at,
+                result.watermark,
+                result.is_approximate,
+                result.sample_percent,
+                json.dumps(result.confidence_interval) if result.confidence_interval else None,
+                result.status,
+                result.execution_time_ms,
+                result.rows_examined,
+                json.dumps(result.explain_stats) if result.explain_stats else None,
+                result.failure_sample_hash
+            )
+            # Rollups are updated with the result so they never miss or double count it
+            await record_rollup(conn, result_id, result.executed_at)
         return result_id
 
     # =========================================================================
@@ -856,44 +1868,49 @@ class DataQualityRulesService:
     # =========================================================================
 
     async def get_execution_results(
-        self, rule_id: Optional[int] = None, limit: int = 100
+        self, rule_id: Optional[int] = None, limit: int = 100, days: Optional[int] = None
     ) -> List[Dict]:
         """Get execution results, optionally filtered by rule.
 
         V86: Updated to use correct column name (rule_name instead of name).
         V88: Enhanced to include table_name, column_name, rule_type, and DAMA dimension.
+
+        ``days`` restricts results to the last N days so only the matching
+        monthly partitions are scanned.
         """
-        conn = await asyncpg.connect(self.dsn)
+        conn = await self.pools.connect(self.dsn)
         try:
-            await self._ensure_tables_exist(conn)
-
+            conditions, args = [], []
             if rule_id:
-                results = await conn.fetch('''
-                    SELECT r.id, r.rule_id, dq.rule_name, r.passed,
-                           r.total_count, r.failed_count, r.failure_samples, r.executed_at,
-                           dq.table_name, dq.column_name, dq.rule_type
-                    FROM data_quality_results r
-                    JOIN data_quality_rules dq ON r.rule_id = dq.id
-                    WHERE r.rule_id = $1
-                    ORDER BY r.executed_at DESC
-                    LIMIT $2
-                ''', rule_id, limit)
-            else:
-                results = await conn.fetch('''
+                args.append(rule_id)
+                conditions.append(f'r.rule_id = ${len(args)}')
+            if days:
+                args.append(datetime.utcnow() - timedelta(days=days))
+                conditions.append(f'r.executed_at >= ${len(args)}')
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+            args.append(limit)
+            results = await conn.fetch(f'''
                     SELECT r.id, r.rule_id, dq.rule_name, r.passed,
-                           r.total_count, r.failed_count, r.failure_samples, r.executed_at,
+                           r.total_count, r.failed_count, COALESCE(r.failure_samples, s.samples) AS failure_samples,
+                           r.executed_at, r.watermark, r.is_approximate, r.sample_percent, r.confidence_interval,
+                           r.status, r.execution_time_ms, r.rows_examined, r.explain_stats,
+                           r.failure_sample_hash, s.key_columns AS failure_sample_keys,
                            dq.table_name, dq.column_name, dq.rule_type
                     FROM data_quality_results r
                     JOIN data_quality_rules dq ON r.rule_id = dq.id
+                    LEFT JOIN failure_sample_sets s ON s.hash = r.failure_sample_hash
+                    {where}
                     ORDER BY r.executed_at DESC
-                    LIMIT $1
-                ''', limit)
+                    LIMIT ${len(args)}
+                ''', *args)
 
             return [
                 {
                     'id': r['id'],
                     'rule_id': r['rule_id'],
                     'rule_name': r['rule_name'],
+                    # Rows from before status was recorded derive it from passed
+                    'status': r['status'] or ('passed' if r['passed'] else 'failed'),
                     'passed': r['passed'],
                     'total_count': r['total_count'],
                     'failed_count': r['failed_count'],
@@ -902,6 +1919,17 @@ class DataQualityRulesService:
                     ) if r['total_count'] > 0 else 100.0,
                     'failure_samples': r['failure_samples'],
                     'executed_at': r['executed_at'].isoformat() if r['executed_at'] else None,
+                    'watermark': r['watermark'],
+                    # Sampled runs: estimated counts with a confidence interval
+                    'is_approximate': bool(r['is_approximate']),
+                    'sample_percent': r['sample_percent'],
+                    'confidence_interval': self._as_dict(r['confidence_interval']) or None,
+                    'execution_time_ms': r['execution_time_ms'],
+                    'rows_examined': r['rows_examined'],
+                    'explain_stats': self._as_dict(r['explain_stats']) or None,
+                    # Compact storage: failure_samples hold only these key columns
+                    'failure_sample_hash': r['failure_sample_hash'],
+                    'failure_sample_keys': json.loads(r['failure_sample_keys']) if r['failure_sample_keys'] else None,
                     # V88: Add table, column, and DAMA dimension info
                     'table_name': r['table_name'],
                     'column_name': r['column_name'],
@@ -917,6 +1945,119 @@ class DataQualityRulesService:
         finally:
             await conn.close()
 
+    async def get_slow_rules(
+        self, days: int = 7, limit: int = 20, sort_by: str = 'total_ms'
+    ) -> List[Dict[str, Any]]:
+        """Rank rules by execution cost over the last `days` days.
+
+        ``share_of_total`` is each rule's percentage of the summed execution
+        time of all rules in the period, i.e. of the nightly window.
+        """
+        if sort_by not in SLOW_RULE_SORT_KEYS:
+            raise ValueError(f"Unsupported sort key '{sort_by}'. Use one of: {sorted(SLOW_RULE_SORT_KEYS)}")
+        order_column = SLOW_RULE_SORT_KEYS[sort_by]
+        since = datetime.utcnow() - timedelta(days=days)
+
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rows = await conn.fetch(f'''
+                WITH per_rule AS (
+                    SELECT r.rule_id,
+                           COUNT(*) AS executions,
+                           SUM(r.execution_time_ms) AS total_ms,
+                           AVG(r.execution_time_ms) AS avg_ms,
+                           percentile_cont(0.95) WITHIN GROUP (ORDER BY r.execution_time_ms) AS p95_ms,
+                           MAX(r.execution_time_ms) AS max_ms,
+                           AVG(r.rows_examined) AS avg_rows_examined,
+                           AVG((r.explain_stats->>'shared_read_blocks')::numeric) AS avg_shared_read_blocks,
+                           AVG((r.explain_stats->>'shared_hit_blocks')::numeric) AS avg_shared_hit_blocks,
+                           COUNT(r.explain_stats) AS explained_runs,
+                           MAX(r.executed_at) AS last_executed_at
+                    FROM data_quality_results r
+                    WHERE r.execution_time_ms IS NOT NULL AND r.executed_at >= $1
+                    GROUP BY r.rule_id
+                )
+                SELECT p.*, dq.rule_name, dq.table_name, dq.column_name, dq.rule_type,
+                       p.total_ms * 100.0 / NULLIF(SUM(p.total_ms) OVER (), 0) AS share_of_total
+                FROM per_rule p
+                JOIN data_quality_rules dq ON dq.id = p.rule_id
+                ORDER BY {order_column} DESC NULLS LAST
+                LIMIT $2
+            ''', since, limit)
+
+            def _round(value, digits=2):
+                return round(float(value), digits) if value is not None else None
+
+            return [
+                {
+                    'rule_id': r['rule_id'],
+                    'rule_name': r['rule_name'],
+                    'table_name': r['table_name'],
+                    'column_name': r['column_name'],
+                    'rule_type': r['rule_type'],
+                    'executions': r['executions'],
+                    'total_ms': _round(r['total_ms']),
+                    'avg_ms': _round(r['avg_ms']),
+                    'p95_ms': _round(r['p95_ms']),
+                    'max_ms': _round(r['max_ms']),
+                    'share_of_total': _round(r['share_of_total']),
+                    'avg_rows_examined': _round(r['avg_rows_examined'], 0),
+                    'avg_shared_read_blocks': _round(r['avg_shared_read_blocks'], 0),
+                    'avg_shared_hit_blocks': _round(r['avg_shared_hit_blocks'], 0),
+                    'explained_runs': r['explained_runs'],
+                    'last_executed_at': r['last_executed_at'].isoformat() if r['last_executed_at'] else None,
+                }
+                for r in rows
+            ]
+        finally:
+            await conn.close()
+
+    async def get_failure_samples(self, result_id: int) -> Dict[str, Any]:
+        """Failure samples of a result, with full rows looked up for key-only samples.
+
+        Rows are read from the current table, so rows fixed or deleted since the
+        run are missing from ``rows``. Raises ValueError if the result does not exist.
+        """
+        conn = await self.pools.connect(self.dsn)
+        try:
+            row = await conn.fetchrow('''
+                SELECT r.id, r.rule_id, r.failure_samples, r.failure_sample_hash,
+                       s.samples AS set_samples, s.key_columns, dq.table_name
+                FROM data_quality_results r
+                JOIN data_quality_rules dq ON r.rule_id = dq.id
+                LEFT JOIN failure_sample_sets s ON s.hash = r.failure_sample_hash
+                WHERE r.id = $1
+            ''', result_id)
+            if not row:
+                raise ValueError(f"Result {result_id} not found")
+
+            key_columns = json.loads(row['key_columns']) if row['key_columns'] else []
+            samples = json.loads(row['set_samples'] or row['failure_samples'] or '[]')
+            rows = samples
+            if key_columns and samples:
+                table = self._validate_table(row['table_name'])
+                keys = ', '.join(f'"{self._validate_identifier(k)}"' for k in key_columns)
+                # jsonb_populate_recordset casts the stored key values to the column types
+                records = await conn.fetch(f'''
+                    SELECT * FROM "{table}"
+                    WHERE ({keys}) IN (
+                        SELECT {keys} FROM jsonb_populate_recordset(NULL::"{table}", $1::jsonb)
+                    )
+                ''', json.dumps(samples))
+                rows = [dict(r) for r in records]
+
+            return {
+                'result_id': row['id'],
+                'rule_id': row['rule_id'],
+                'table_name': row['table_name'],
+                'failure_sample_hash': row['failure_sample_hash'],
+                'key_columns': key_columns,
+                'samples': samples,
+                'rows': rows
+            }
+        finally:
+            await conn.close()
+
     async def get_failures(self, rule_id: int) -> List[str]:
         """Get failures for a specific rule (legacy method)."""
         results = await self.get_execution_results(rule_id=rule_id, limit=10)
@@ -0,0 +1,238 @@
+"""
+Failure Export Service
+Streams every failing row of a rule result as CSV, NDJSON or Parquet.
+
+Results only keep a handful of failure_samples, so exports re-run the rule's
+failing-rows query against the current data. Rows are never collected in memory:
+
+- CSV uses COPY (...) TO STDOUT; chunks pass through a bounded queue, so a slow
+  client applies backpressure to the COPY instead of buffering it
+- NDJSON and Parquet read from a server-side cursor in fixed-size batches
+- Parquet needs the optional pyarrow package; each batch becomes one row group
+  that is flushed to the client as soon as it is written
+- the export query runs on a read replica when one is healthy
+"""
+import asyncio
+import io
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.services.data_quality_rules import DataQualityRulesService
+
+logger = logging.getLogger(__name__)
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# COPY chunks buffered between the database and a slow client
+COPY_QUEUE_CHUNKS = 16
+
+# NDJSON lines are sent in chunks of roughly this many bytes
+NDJSON_CHUNK_BYTES = 64 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+def arrow_type(pa, pg_type: str):
+    """Arrow type for a PostgreSQL type name; unknown types are exported as text."""
+    mapping = {
+        'int2': pa.int16(), 'int4': pa.int32(), 'int8': pa.int64(),
+        'float4': pa.float32(), 'float8': pa.float64(),
+        'bool': pa.bool_(), 'date': pa.date32(), 'bytea': pa.binary(),
+        'timestamp': pa.timestamp('us'), 'timestamptz': pa.timestamp('us', tz='UTC'),
+    }
+    return mapping.get(pg_type, pa.string())
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after every row group."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class FailureExportService:
+    """Resolves a rule result to its failing-rows query and streams the rows."""
+
+    def __init__(self, dsn: str, pools: Optional[PoolRegistry] = None):
+        self.dsn = dsn
+        self.pools = pools or get_pool_registry()
+        self.rules_service = DataQualityRulesService(dsn, self.pools)
+
+    async def resolve(self, result_id: int) -> Dict[str, Any]:
+        """Look up the rule behind a result and compile its failing-rows SQL.
+
+        Raises ValueError if the result does not exist.
+        """
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rule = await conn.fetchrow('''
+                SELECT dq.id, dq.rule_name, dq.table_name, dq.column_name,
+                       dq.rule_type, dq.rule_definition
+                FROM data_quality_results r
+                JOIN data_quality_rules dq ON dq.id = r.rule_id
+                WHERE r.id = $1
+            ''', result_id)
+        finally:
+            await conn.close()
+        if not rule:
+            raise ValueError(f"Result {result_id} not found")
+
+        engine = self.rules_service._as_dict(rule['rule_definition']).get('engine', 'sql')
+        if engine != 'sql':
+            # Vectorized rules are predicates, not SQL
+            return {'rule_id': rule['id'], 'rule_name': rule['rule_name'], 'engine': engine, 'sql': None}
+        sql = self.rules_service._failing_rows_sql(
+            rule['rule_type'], rule['table_name'], rule['column_name'],
+            self.rules_service._extract_definition(rule['rule_definition'])
+        )
+        return {'rule_id': rule['id'], 'rule_name': rule['rule_name'], 'engine': engine, 'sql': sql}
+
+    def stream(self, sql: str, export_format: str) -> AsyncIterator[bytes]:
+        """Async byte stream of the query's rows in the requested format."""
+        if export_format == 'csv':
+            return self._stream_csv(sql)
+        if export_format == 'ndjson':
+            return self._stream_ndjson(sql)
+        if export_format == 'parquet':
+            return self._stream_parquet(sql)
+        raise ValueError(f"Unsupported export format '{export_format}'. Use one of: {sorted(EXPORT_FORMATS)}")
+
+    async def _stream_csv(self, sql: str) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=COPY_QUEUE_CHUNKS)
+
+        async def produce() -> None:
+            conn = None
+            try:
+                conn = await self.pools.connect_read(self.dsn)
+                await conn.copy_from_query(sql, output=queue.put, format='csv', header=True)
+            finally:
+                if conn is not None:
+                    await conn.close()
+
+        producer = asyncio.create_task(produce())
+        getter: Optional[asyncio.Future] = None
+        try:
+            # Wait on the queue and the producer together: the producer ending
+            # (done or failed) is the end-of-stream signal, no sentinel needed
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield bytes(getter.result())
+                    continue
+                getter.cancel()
+                while not queue.empty():
+                    yield bytes(queue.get_nowait())
+                # Surface connect/COPY errors (the stream may be partially sent)
+                producer.result()
+                break
+        finally:
+            pending = [task for task in (getter, producer) if task is not None and not task.done()]
+            # Client went away: stop the COPY
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _stream_ndjson(self, sql: str) -> AsyncIterator[bytes]:
+        conn = await self.pools.connect_read(self.dsn)
+        try:
+            async with conn.transaction(readonly=True):
+                buffer: List[str] = []
+                size = 0
+                async for record in conn.cursor(sql, prefetch=settings.EXPORT_FETCH_SIZE):
+                    line = json.dumps(dict(record), default=_json_default) + '\n'
+                    buffer.append(line)
+                    size += len(line)
+                    if size >= NDJSON_CHUNK_BYTES:
+                        yield ''.join(buffer).encode()
+                        buffer.clear()
+                        size = 0
+                if buffer:
+                    yield ''.join(buffer).encode()
+        finally:
+            await conn.close()
+
+    async def _stream_parquet(self, sql: str) -> AsyncIterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        conn = await self.pools.connect_read(self.dsn)
+        try:
+            async with conn.transaction(readonly=True):
+                statement = await conn.prepare(sql)
+                attributes = statement.get_attributes()
+                schema = pa.schema([(a.name, arrow_type(pa, a.type.name)) for a in attributes])
+                text_columns = {
+                    a.name for a in attributes
+                    if arrow_type(pa, a.type.name) == pa.string()
+                }
+                sink = _ChunkSink()
+                writer = pq.ParquetWriter(sink, schema)
+                try:
+                    cursor = await statement.cursor()
+                    while True:
+                        records = await cursor.fetch(settings.EXPORT_FETCH_SIZE)
+                        if not records:
+                            break
+                        columns = {
+                            name: [
+                                (str(r[name]) if r[name] is not None else None)
+                                if name in text_columns else r[name]
+                                for r in records
+                            ]
+                            for name in schema.names
+                        }
+                        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                        yield sink.drain()
+                finally:
+                    writer.close()
+                yield sink.drain()
+        finally:
+            await conn.close()
+
+
+def parquet_available() -> bool:
+    """True when the optional pyarrow dependency is installed."""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,513 @@
+"""
+File Source
+Profiles and validates local CSV / Parquet files in place, without loading
+them into PostgreSQL first.
+
+Files are read from FILE_SOURCE_DIR only. A file is split into chunks of
+about FILE_SOURCE_CHUNK_MB that are scanned by a process pool:
+
+- CSV files are memory-mapped and split at line breaks; each worker maps the
+  file itself and parses only its byte range, so no chunk is ever copied
+  through the parent process. Line breaks inside quoted fields are not
+  supported.
+- Parquet files are split by row groups and read with pyarrow's memory-mapped
+  reader (pip install pyarrow).
+
+Workers return small, mergeable partial results (counts, min/max, a
+fixed-size distinct sketch, a few samples), and at most two tasks per worker
+are in flight, so memory stays bounded regardless of file size. Results use
+the existing TableProfile and RuleResult shapes. unique_count is exact up to
+DISTINCT_SKETCH_SIZE distinct values and a K-minimum-values estimate above.
+
+Rule checks evaluate the vectorized rules of a table (see vectorized_engine)
+against each row of the file and need numpy.
+"""
+import asyncio
+import csv
+import hashlib
+import heapq
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Iterator
+
+from app.config import settings
+from app.services.data_profiling_service import ColumnProfile, TableProfile
+from app.services.data_quality_rules import THRESHOLD_RULE_TYPES, RuleResult
+
+logger = logging.getLogger(__name__)
+
+
+FILE_FORMATS = {'.csv': 'csv', '.parquet': 'parquet'}
+
+# Distinct values tracked exactly per column before estimating
+DISTINCT_SKETCH_SIZE = 4096
+
+SCAN_BATCH_ROWS = 10000
+
+_INT_PATTERN = re.compile(r'^[+-]?\d+$')
+_FLOAT_PATTERN = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+
+
+def parse_csv_value(text: str) -> Any:
+    """Empty fields are NULL; integers and decimals become numbers."""
+    if text == '':
+        return None
+    if _INT_PATTERN.match(text):
+        return int(text)
+    if _FLOAT_PATTERN.match(text):
+        return float(text)
+    return text
+
+
+# =============================================================================
+# Mergeable column statistics
+# =============================================================================
+
+class DistinctSketch:
+    """K-minimum-values sketch: exact below k distinct values, estimated above."""
+
+    def __init__(self, k: int = DISTINCT_SKETCH_SIZE):
+        self.k = k
+        self._heap: List[int] = []  # negated hashes, largest kept hash on top
+        self._members: set = set()
+
+    def add(self, value: Any) -> None:
+        digest = hashlib.blake2b(repr(value).encode(), digest_size=8).digest()
+        self._add_hash(int.from_bytes(digest, 'big'))
+
+    def _add_hash(self, h: int) -> None:
+        if h in self._members:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, -h)
+            self._members.add(h)
+        elif h < -self._heap[0]:
+            evicted = -heapq.heapreplace(self._heap, -h)
+            self._members.discard(evicted)
+            self._members.add(h)
+
+    def merge(self, other: 'DistinctSketch') -> None:
+        for h in other._members:
+            self._add_hash(h)
+
+    def estimate(self) -> int:
+        if len(self._heap) < self.k:
+            return len(self._heap)
+        kth = -self._heap[0] / 2 ** 64
+        return int(round((self.k - 1) / kth))
+
+
+@dataclass
+class ColumnStats:
+    """Partial profile of one column over part of a file."""
+    count: int = 0
+    null_count: int = 0
+    kinds: set = field(default_factory=set)
+    min_value: Any = None
+    max_value: Any = None
+    distinct: DistinctSketch = field(default_factory=DistinctSketch)
+    samples: List[Any] = field(default_factory=list)
+
+    def add(self, values: List[Any], sample_size: int = 5) -> None:
+        for value in values:
+            self.count += 1
+            if value is None:
+                self.null_count += 1
+                continue
+            self.distinct.add(value)
+            if len(self.samples) < sample_size:
+                self.samples.append(value)
+            if isinstance(value, bool):
+                self.kinds.add('boolean')
+                continue
+            if isinstance(value, int):
+                self.kinds.add('integer')
+            elif isinstance(value, (float, Decimal)):
+                self.kinds.add('numeric')
+            else:
+                self.kinds.add('text')
+                continue
+            if self.min_value is None or value < self.min_value:
+                self.min_value = value
+            if self.max_value is None or value > self.max_value:
+                self.max_value = value
+
+    def merge(self, other: 'ColumnStats') -> None:
+        """Fold another chunk in; samples are merged by the caller in file order."""
+        self.count += other.count
+        self.null_count += other.null_count
+        self.kinds |= other.kinds
+        for value in (other.min_value, other.max_value):
+            if value is None:
+                continue
+            if self.min_value is None or value < self.min_value:
+                self.min_value = value
+            if self.max_value is None or value > self.max_value:
+                self.max_value = value
+        self.distinct.merge(other.distinct)
+
+    @property
+    def is_numeric(self) -> bool:
+        return bool(self.kinds) and self.kinds <= {'integer', 'numeric'}
+
+    def inferred_type(self) -> str:
+        """PostgreSQL type name for columns of files without a schema."""
+        if self.kinds == {'integer'}:
+            return 'bigint'
+        if self.is_numeric:
+            return 'double precision'
+        if self.kinds == {'boolean'}:
+            return 'boolean'
+        return 'text'
+
+
+# =============================================================================
+# Chunk planning
+# =============================================================================
+
+def plan_csv(path: Path, chunk_bytes: int, delimiter: str = ',') -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Read the header and split the rest of a CSV file into byte ranges ending at line breaks."""
+    size = path.stat().st_size
+    if size == 0:
+        raise ValueError(f"File '{path.name}' is empty")
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b'\n')
+        header_end = size if header_end == -1 else header_end + 1
+        header_line = mm[:header_end].decode('utf-8-sig').rstrip('\r\n')
+        header = next(csv.reader([header_line], delimiter=delimiter), [])
+        if not header:
+            raise ValueError(f"File '{path.name}' has no header row")
+
+        ranges = []
+        position = header_end
+        while position < size:
+            end = min(position + chunk_bytes, size)
+            if end < size:
+                newline = mm.find(b'\n', end - 1)
+                end = size if newline == -1 else newline + 1
+            ranges.append((position, end))
+            position = end
+    return header, ranges
+
+
+def plan_parquet(path: Path, chunk_bytes: int) -> Tuple[Any, List[List[int]]]:
+    """Read the schema and group row groups into chunks of about `chunk_bytes`."""
+    pq = _parquet()
+    metadata = pq.read_metadata(path, memory_map=True)
+    schema = pq.read_schema(path, memory_map=True)
+    chunks, current, current_bytes = [], [], 0
+    for index in range(metadata.num_row_groups):
+        current.append(index)
+        current_bytes += metadata.row_group(index).total_byte_size
+        if current_bytes >= chunk_bytes:
+            chunks.append(current)
+            current, current_bytes = [], 0
+    if current:
+        chunks.append(current)
+    return schema, chunks
+
+
+def _parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Reading Parquet files requires pyarrow (pip install pyarrow)")
+    return pq
+
+
+def parquet_column_type(arrow_type: Any) -> str:
+    """PostgreSQL type name for an Arrow column type."""
+    import pyarrow as pa
+    if pa.types.is_boolean(arrow_type):
+        return 'boolean'
+    if pa.types.is_integer(arrow_type):
+        return 'bigint' if arrow_type.bit_width > 32 else 'integer'
+    if pa.types.is_floating(arrow_type):
+        return 'double precision'
+    if pa.types.is_decimal(arrow_type):
+        return 'numeric'
+    if pa.types.is_timestamp(arrow_type):
+        return 'timestamp'
+    if pa.types.is_date(arrow_type):
+        return 'date'
+    return 'text'
+
+
+# =============================================================================
+# Worker side
+# =============================================================================
+
+@dataclass
+class ChunkTask:
+    """One unit of work for a pool worker."""
+    index: int
+    format: str
+    path: str
+    location: Any  # (start, end) byte range for CSV, row group list for Parquet
+    columns: List[str]
+    profile: bool = True
+    rules: List[Any] = field(default_factory=list)
+    delimiter: str = ','
+    sample_size: int = 5
+    batch_rows: int = SCAN_BATCH_ROWS
+
+
+def _iter_csv(task: ChunkTask) -> Iterator[Dict[str, List[Any]]]:
+    start, end = task.location
+    width = len(task.columns)
+    with open(task.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.seek(start)
+
+        def lines():
+            while mm.tell() < end:
+                yield mm.readline().decode('utf-8', errors='replace')
+
+        rows = []
+        for row in csv.reader(lines(), delimiter=task.delimiter):
+            if not row:
+                continue
+            if len(row) != width:
+                raise ValueError(
+                    f"Row with {len(row)} fields where the header has {width} "
+                    f"(line breaks inside quoted fields are not supported)"
+                )
+            rows.append(row)
+            if len(rows) >= task.batch_rows:
+                yield _csv_columns(task.columns, rows)
+                rows = []
+        if rows:
+            yield _csv_columns(task.columns, rows)
+
+
+def _csv_columns(columns: List[str], rows: List[List[str]]) -> Dict[str, List[Any]]:
+    return {
+        name: [parse_csv_value(row[i]) for row in rows]
+        for i, name in enumerate(columns)
+    }
+
+
+def _iter_parquet(task: ChunkTask) -> Iterator[Dict[str, List[Any]]]:
+    parquet_file = _parquet().ParquetFile(task.path, memory_map=True)
+    for batch in parquet_file.iter_batches(
+        batch_size=task.batch_rows, row_groups=task.location, columns=task.columns
+    ):
+        yield {name: batch.column(i).to_pylist() for i, name in enumerate(batch.schema.names)}
+
+
+def scan_chunk(task: ChunkTask) -> Dict[str, Any]:
+    """Profile and/or check one chunk. Runs in a pool worker."""
+    np = None
+    if task.rules:
+        import numpy as np
+        from app.services.vectorized_engine import _Evaluator, column_arrays
+
+    rows = 0
+    stats = {name: ColumnStats() for name in task.columns} if task.profile else {}
+    failed = [0] * len(task.rules)
+    samples: List[List[Dict[str, Any]]] = [[] for _ in task.rules]
+    batches = _iter_csv(task) if task.format == 'csv' else _iter_parquet(task)
+
+    for columns in batches:
+        size = len(next(iter(columns.values()), []))
+        rows += size
+        for name, column_stats in stats.items():
+            column_stats.add(columns[name], task.sample_size)
+        if not task.rules:
+            continue
+        for i, rule in enumerate(task.rules):
+            arrays = column_arrays(np, {c: columns[c] for c in rule.columns})
+            values, nulls = _Evaluator(np, arrays, size).evaluate(rule.tree)
+            failing = ~values & ~nulls
+            failed[i] += int(failing.sum())
+            missing = task.sample_size - len(samples[i])
+            for index in np.flatnonzero(failing)[:max(missing, 0)]:
+                samples[i].append({c: columns[c][int(index)] for c in sorted(rule.columns)})
+
+    return {'index': task.index, 'rows': rows, 'stats': stats, 'failed': failed, 'samples': samples}
+
+
+# =============================================================================
+# File Source Service
+# =============================================================================
+
+class FileSourceService:
+    """Profiles and checks files below FILE_SOURCE_DIR with a process pool."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        chunk_bytes: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
+        self.root = Path(root or settings.FILE_SOURCE_DIR).resolve()
+        self.chunk_bytes = chunk_bytes or settings.FILE_SOURCE_CHUNK_MB * 1024 * 1024
+        self.workers = workers or settings.FILE_SOURCE_WORKERS or os.cpu_count() or 1
+
+    def list_files(self) -> List[Dict[str, Any]]:
+        """CSV and Parquet files available for profiling."""
+        if not self.root.is_dir():
+            return []
+        return [
+            {
+                'name': str(path.relative_to(self.root)),
+                'format': FILE_FORMATS[path.suffix.lower()],
+                'size_bytes': path.stat().st_size,
+            }
+            for path in sorted(self.root.rglob('*'))
+            if path.is_file() and path.suffix.lower() in FILE_FORMATS
+        ]
+
+    def resolve(self, name: str) -> Path:
+        """Path of a file below the source directory.
+
+        Raises ValueError for other locations, unsupported formats and missing files.
+        """
+        path = (self.root / name).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"File '{name}' is outside the file source directory")
+        if path.suffix.lower() not in FILE_FORMATS:
+            raise ValueError(f"Unsupported file type '{path.suffix}'. Use one of: {sorted(FILE_FORMATS)}")
+        if not path.is_file():
+            raise ValueError(f"File '{name}' not found")
+        return path
+
+    def _plan(self, path: Path, delimiter: str) -> Tuple[str, List[str], Dict[str, str], List[Any]]:
+        fmt = FILE_FORMATS[path.suffix.lower()]
+        if fmt == 'csv':
+            columns, chunks = plan_csv(path, self.chunk_bytes, delimiter)
+            return fmt, columns, {}, chunks
+        schema, chunks = plan_parquet(path, self.chunk_bytes)
+        types = {f.name: parquet_column_type(f.type) for f in schema}
+        return fmt, list(schema.names), types, chunks
+
+    async def profile_file(self, name: str, delimiter: str = ',', sample_size: int = 5) -> TableProfile:
+        """Profile every column of a file in one parallel pass."""
+        path = self.resolve(name)
+        fmt, columns, types, chunks = await asyncio.to_thread(self._plan, path, delimiter)
+        tasks = [
+            ChunkTask(index=i, format=fmt, path=str(path), location=chunk, columns=columns,
+                      delimiter=delimiter, sample_size=sample_size)
+            for i, chunk in enumerate(chunks)
+        ]
+
+        row_count = 0
+        merged = {column: ColumnStats() for column in columns}
+        samples_by_chunk: Dict[int, Dict[str, List[Any]]] = {}
+        async for result in self._run(tasks):
+            row_count += result['rows']
+            for column, stats in result['stats'].items():
+                merged[column].merge(stats)
+            samples_by_chunk[result['index']] = {c: s.samples for c, s in result['stats'].items()}
+
+        profiles = []
+        for column in columns:
+            stats = merged[column]
+            sample_values = [
+                value for i in sorted(samples_by_chunk)
+                for value in samples_by_chunk[i][column]
+            ][:sample_size]
+            profiles.append(ColumnProfile(
+                column_name=column,
+                data_type=types.get(column) or stats.inferred_type(),
+                is_nullable=True,
+                null_count=stats.null_count,
+                null_percent=round(stats.null_count / row_count * 100, 2) if row_count else 0,
+                unique_count=stats.distinct.estimate(),
+                min_value=stats.min_value if stats.is_numeric else None,
+                max_value=stats.max_value if stats.is_numeric else None,
+                sample_values=sample_values
+            ))
+        logger.info(f"Profiled file {name}: {row_count} rows in {len(tasks)} chunks")
+        return TableProfile(
+            table_name=name, row_count=row_count, column_count=len(profiles), columns=profiles
+        )
+
+    async def check_file(
+        self, name: str, rules: List[Any], delimiter: str = ',', sample_size: int = 5
+    ) -> List[RuleResult]:
+        """Evaluate vectorized rules against every row of a file; results are in rule order."""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            raise ValueError("Rule checks on files require numpy (pip install numpy)")
+        if not rules:
+            return []
+
+        path = self.resolve(name)
+        started = time.perf_counter()
+        fmt, columns, _, chunks = await asyncio.to_thread(self._plan, path, delimiter)
+        missing = set().union(*(r.columns for r in rules)) - set(columns)
+        if missing:
+            raise ValueError(f"File '{name}' has no column(s) {sorted(missing)}")
+        read_columns = columns if fmt == 'csv' else sorted(set().union(*(r.columns for r in rules)))
+        tasks = [
+            ChunkTask(index=i, format=fmt, path=str(path), location=chunk, columns=read_columns,
+                      profile=False, rules=rules, delimiter=delimiter, sample_size=sample_size)
+            for i, chunk in enumerate(chunks)
+        ]
+
+        total = 0
+        failed = [0] * len(rules)
+        samples_by_chunk: Dict[int, List[List[Dict[str, Any]]]] = {}
+        async for result in self._run(tasks):
+            total += result['rows']
+            failed = [a + b for a, b in zip(failed, result['failed'])]
+            if any(result['samples']):
+                samples_by_chunk[result['index']] = result['samples']
+
+        share_ms = round((time.perf_counter() - started) * 1000 / len(rules), 2)
+        results = []
+        for i, rule in enumerate(rules):
+            if rule.rule_type in THRESHOLD_RULE_TYPES:
+                passed = (failed[i] / total * 100 if total else 0) <= rule.threshold
+            else:
+                passed = failed[i] == 0
+            results.append(RuleResult(
+                rule_id=rule.rule_id,
+                passed=passed,
+                total_count=total,
+                failed_count=failed[i],
+                failure_samples=[
+                    row for index in sorted(samples_by_chunk)
+                    for row in samples_by_chunk[index][i]
+                ][:sample_size],
+                execution_time_ms=share_ms,
+                rows_examined=total
+            ))
+        return results
+
+    async def _run(self, tasks: List[ChunkTask]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield chunk results as they finish, with at most two tasks per worker in flight."""
+        loop = asyncio.get_running_loop()
+        workers = min(self.workers, len(tasks))
+        if workers <= 1:
+            for task in tasks:
+                yield await loop.run_in_executor(None, scan_chunk, task)
+            return
+
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        queue = iter(tasks)
+        pending = set()
+        try:
+            for task in queue:
+                pending.add(loop.run_in_executor(pool, scan_chunk, task))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    next_task = next(queue, None)
+                    if next_task is not None:
+                        pending.add(loop.run_in_executor(pool, scan_chunk, next_task))
+                    yield future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
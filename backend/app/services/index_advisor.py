@@ -0,0 +1,353 @@
+"""
+Index Advisor Service
+Proposes indexes for data quality rules that scan entire tables.
+
+Each rule's compiled check SQL is planned with EXPLAIN (no ANALYZE, nothing is
+executed). Sequential scans on relations above a size threshold are turned into
+CREATE INDEX proposals:
+
+- A selective filter that is safe as an index predicate becomes a partial index
+  covering exactly the rows the rule reports (usually tiny)
+- Other filters, join keys (e.g. referential LEFT JOIN checks) and GROUP BY keys
+  (unique checks) become plain b-tree indexes
+- Savings are measured with hypothetical indexes when the hypopg extension is
+  installed, otherwise estimated from the planner's row estimates
+
+Proposals are advisory only; nothing is created.
+"""
+import asyncpg
+import json
+import logging
+import re
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.services.data_quality_rules import DataQualityRulesService
+
+logger = logging.getLogger(__name__)
+
+
+# Planner cost ratio of random to sequential page reads (random_page_cost / seq_page_cost)
+RANDOM_IO_FACTOR = 4.0
+
+# Filters less selective than this are indexed as plain b-trees, not partial indexes
+PARTIAL_INDEX_MAX_SELECTIVITY = 0.2
+
+# Plan node keys holding join conditions
+JOIN_CONDITION_KEYS = ('Hash Cond', 'Merge Cond', 'Join Filter')
+
+# Expressions that cannot appear in an index predicate (parameters, subplans, volatile calls)
+UNSAFE_PREDICATE_PATTERN = re.compile(
+    r'\$\d|SubPlan|InitPlan|\bnow\(\)|CURRENT_|clock_timestamp|random\(\)|statement_timestamp',
+    re.IGNORECASE
+)
+
+COLUMN_REFERENCE_PATTERN = re.compile(r'(?:"?([A-Za-z_][A-Za-z0-9_]*)"?\.)?"?([A-Za-z_][A-Za-z0-9_]*)"?')
+
+# Identifiers longer than this are truncated by PostgreSQL
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def walk_plan(node: Dict[str, Any], ancestors: Tuple[Dict[str, Any], ...] = ()) -> Iterator[Tuple[Dict, Tuple]]:
+    """Yield every plan node together with its ancestors (nearest last)."""
+    yield node, ancestors
+    for child in node.get('Plans', []):
+        yield from walk_plan(child, ancestors + (node,))
+
+
+def referenced_columns(expression: str, columns: List[str], alias: Optional[str] = None) -> List[str]:
+    """Columns of one relation referenced in a plan expression, in order of appearance.
+
+    Qualified references (``alias.column``) only count when the qualifier is the
+    relation's alias; unqualified names count when they are columns of the relation.
+    """
+    found: List[str] = []
+    for qualifier, name in COLUMN_REFERENCE_PATTERN.findall(expression or ''):
+        if qualifier and alias and qualifier != alias:
+            continue
+        if name in columns and name not in found:
+            found.append(name)
+    return found
+
+
+def partial_predicate(filter_expression: str, alias: Optional[str] = None) -> Optional[str]:
+    """Turn a scan filter into an index predicate, or None if it is not usable."""
+    if not filter_expression or UNSAFE_PREDICATE_PATTERN.search(filter_expression):
+        return None
+    predicate = filter_expression
+    if alias:
+        predicate = re.sub(rf'\b{re.escape(alias)}\.', '', predicate)
+    return predicate
+
+
+def index_statement(table: str, columns: List[str], predicate: Optional[str] = None,
+                    concurrently: bool = True) -> Tuple[str, str]:
+    """Build (index_name, CREATE INDEX statement) for a proposal."""
+    suffix = '_partial' if predicate else ''
+    name = f"idx_dq_{table}_{'_'.join(columns)}"
+    name = name[:MAX_IDENTIFIER_LENGTH - len(suffix)] + suffix
+    column_list = ', '.join(f'"{c}"' for c in columns)
+    statement = (
+        f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}"{name}" '
+        f'ON "{table}" ({column_list})'
+    )
+    if predicate:
+        statement += f' WHERE {predicate}'
+    return name, statement
+
+
+def heuristic_cost(node_cost: float, plan_rows: float, reltuples: float, with_filter: bool) -> float:
+    """Estimated cost of the scan once indexed.
+
+    With a filter the index reads only matching rows, at random-IO prices; without
+    one (join or group keys) an index-only scan roughly halves the heap read.
+    """
+    if not with_filter or reltuples <= 0:
+        return node_cost * 0.5
+    selectivity = min(1.0, max(plan_rows, 1.0) / reltuples)
+    return min(node_cost, node_cost * selectivity * RANDOM_IO_FACTOR)
+
+
+class IndexAdvisorService:
+    """Plans rule SQL and proposes indexes for large sequential scans."""
+
+    def __init__(self, dsn: str, pools: Optional[PoolRegistry] = None):
+        self.dsn = dsn
+        self.pools = pools or get_pool_registry()
+        self.rules_service = DataQualityRulesService(dsn, self.pools)
+
+    async def _explain(self, conn: asyncpg.Connection, sql: str) -> Dict[str, Any]:
+        plan = await conn.fetchval(f'EXPLAIN (FORMAT JSON) {sql}')
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']
+
+    async def _relation_info(self, conn: asyncpg.Connection, relation: str) -> Optional[Dict[str, Any]]:
+        """Row estimate, columns and existing index leading columns of a relation."""
+        row = await conn.fetchrow('''
+            SELECT c.oid, c.reltuples, c.relpages
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = $1 AND n.nspname = ANY(current_schemas(false))
+            ORDER BY array_position(current_schemas(false), n.nspname)
+            LIMIT 1
+        ''', relation)
+        if not row:
+            return None
+        columns = [r['attname'] for r in await conn.fetch('''
+            SELECT attname FROM pg_attribute
+            WHERE attrelid = $1 AND attnum > 0 AND NOT attisdropped
+        ''', row['oid'])]
+        leading = await conn.fetch('''
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = $1 AND i.indisvalid
+        ''', row['oid'])
+        return {
+            'reltuples': max(float(row['reltuples']), 0.0),
+            'relpages': row['relpages'],
+            'columns': columns,
+            'indexed_leading_columns': {r['attname'] for r in leading},
+        }
+
+    async def _hypothetical_cost(
+        self, conn: asyncpg.Connection, sql: str, table: str, columns: List[str], predicate: Optional[str]
+    ) -> Optional[float]:
+        """Plan cost with a hypopg hypothetical index, or None if that fails."""
+        _, statement = index_statement(table, columns, predicate, concurrently=False)
+        try:
+            # Savepoint: a failing candidate must not abort the caller's transaction
+            async with conn.transaction():
+                await conn.execute('SELECT hypopg_create_index($1)', statement)
+                return (await self._explain(conn, sql))['Total Cost']
+        except Exception as e:
+            logger.debug(f"hypopg could not evaluate '{statement}': {e}")
+            return None
+        finally:
+            # Hypothetical indexes are not transactional; drop them once the savepoint is gone
+            await conn.execute('SELECT hypopg_reset()')
+
+    async def analyze_sql(
+        self,
+        conn: asyncpg.Connection,
+        sql: str,
+        min_rows: float,
+        use_hypopg: bool
+    ) -> Dict[str, Any]:
+        """Plan one query and build index proposals for its large sequential scans."""
+        plan = await self._explain(conn, sql)
+        plan_cost = plan['Total Cost']
+        seq_scans = []
+        proposals = []
+
+        for node, ancestors in walk_plan(plan):
+            if node.get('Node Type') != 'Seq Scan':
+                continue
+            relation = node['Relation Name']
+            info = await self._relation_info(conn, relation)
+            if not info:
+                continue
+            alias = node.get('Alias')
+            scan = {
+                'relation': relation,
+                'estimated_table_rows': int(info['reltuples']),
+                'estimated_rows_returned': node.get('Plan Rows'),
+                'scan_cost': node['Total Cost'],
+                'filter': node.get('Filter'),
+            }
+            seq_scans.append(scan)
+            if info['reltuples'] < min_rows:
+                continue
+
+            columns: List[str] = []
+            predicate = None
+            reason = None
+            filter_expression = node.get('Filter')
+            if filter_expression:
+                columns = referenced_columns(filter_expression, info['columns'], alias)[:3]
+                selectivity = (node.get('Plan Rows') or 0) / max(info['reltuples'], 1.0)
+                predicate = partial_predicate(filter_expression, alias)
+                if columns and predicate and selectivity <= PARTIAL_INDEX_MAX_SELECTIVITY:
+                    columns = columns[:1]
+                    reason = 'Partial index matching the rule predicate; only failing rows are indexed'
+                else:
+                    predicate = None
+                    reason = 'Index on the filtered columns'
+            if not columns:
+                for ancestor in reversed(ancestors):
+                    condition = ' '.join(str(ancestor[key]) for key in JOIN_CONDITION_KEYS if key in ancestor)
+                    if condition:
+                        columns = referenced_columns(condition, info['columns'], alias)[:3]
+                        reason = 'Index on the join key used by the check'
+                        break
+            if not columns:
+                for ancestor in reversed(ancestors):
+                    if ancestor.get('Group Key'):
+                        columns = referenced_columns(
+                            ' '.join(ancestor['Group Key']), info['columns'], alias
+                        )[:3]
+                        reason = 'Index on the GROUP BY key; allows an index-only aggregate'
+                        break
+            if not columns or columns[0] in info['indexed_leading_columns']:
+                continue
+
+            name, statement = index_statement(relation, columns, predicate)
+            method = 'heuristic'
+            estimated_cost = None
+            if use_hypopg:
+                estimated_cost = await self._hypothetical_cost(conn, sql, relation, columns, predicate)
+                method = 'hypopg' if estimated_cost is not None else method
+            if estimated_cost is None:
+                new_scan_cost = heuristic_cost(
+                    node['Total Cost'], node.get('Plan Rows') or 0,
+                    info['reltuples'], with_filter=bool(filter_expression)
+                )
+                estimated_cost = plan_cost - node['Total Cost'] + new_scan_cost
+            estimated_cost = min(estimated_cost, plan_cost)
+
+            proposals.append({
+                'relation': relation,
+                'columns': columns,
+                'predicate': predicate,
+                'index_name': name,
+                'statement': statement,
+                'reason': reason,
+                'current_cost': round(plan_cost, 2),
+                'estimated_cost': round(estimated_cost, 2),
+                'estimated_savings_pct': round(
+                    (plan_cost - estimated_cost) / plan_cost * 100, 1
+                ) if plan_cost > 0 else 0.0,
+                'cost_method': method,
+            })
+
+        return {'plan_cost': plan_cost, 'seq_scans': seq_scans, 'proposals': proposals}
+
+    async def _hypopg_available(self, conn: asyncpg.Connection) -> bool:
+        return bool(await conn.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'hypopg')"
+        ))
+
+    async def advise_rules(
+        self,
+        rule_id: Optional[int] = None,
+        table_name: Optional[str] = None,
+        min_rows: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Analyze stored active rules and merge identical proposals across rules."""
+        if table_name is not None:
+            table_name = self.rules_service._validate_table(table_name)
+        min_rows = settings.INDEX_ADVISOR_MIN_ROWS if min_rows is None else min_rows
+
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rules = await conn.fetch('''
+                SELECT id, rule_name, table_name, column_name, rule_type, rule_definition
+                FROM data_quality_rules
+                WHERE is_active = true
+                  -- Vectorized rules scan the table in-process; indexes do not apply
+                  AND COALESCE(rule_definition->>'engine', 'sql') = 'sql'
+                  AND ($1::integer IS NULL OR id = $1)
+                  AND ($2::text IS NULL OR table_name = $2)
+                ORDER BY id
+            ''', rule_id, table_name)
+            if rule_id is not None and not rules:
+                raise ValueError(f"Rule {rule_id} not found or inactive")
+            use_hypopg = await self._hypopg_available(conn)
+
+            analyses = []
+            merged: Dict[str, Dict[str, Any]] = {}
+            for rule in rules:
+                sql = self.rules_service._check_sql(
+                    rule['rule_type'], rule['table_name'], rule['column_name'],
+                    self.rules_service._extract_definition(rule['rule_definition'])
+                )
+                analysis = {'rule_id': rule['id'], 'rule_name': rule['rule_name'], 'sql': sql}
+                try:
+                    analysis.update(await self.analyze_sql(conn, sql, min_rows, use_hypopg))
+                except Exception as e:
+                    analysis['error'] = str(e)
+                analyses.append(analysis)
+
+                for proposal in analysis.get('proposals', []):
+                    entry = merged.setdefault(proposal['statement'], {**proposal, 'rule_ids': []})
+                    entry['rule_ids'].append(rule['id'])
+                    entry['estimated_savings_pct'] = max(
+                        entry['estimated_savings_pct'], proposal['estimated_savings_pct']
+                    )
+
+            return {
+                'hypopg': use_hypopg,
+                'min_rows': min_rows,
+                'proposals': sorted(
+                    merged.values(),
+                    key=lambda p: (len(p['rule_ids']), p['estimated_savings_pct']),
+                    reverse=True
+                ),
+                'rules': analyses,
+            }
+        finally:
+            await conn.close()
+
+    async def advise_sql(self, table_name: str, sql: str, min_rows: Optional[float] = None) -> Dict[str, Any]:
+        """Analyze ad-hoc rule SQL, e.g. a suggested referential check before it is saved."""
+        self.rules_service._validate_table(table_name)
+        sql = sql.strip().rstrip(';')
+        if not sql.lower().startswith('select'):
+            raise ValueError("Only SELECT statements can be analyzed")
+        min_rows = settings.INDEX_ADVISOR_MIN_ROWS if min_rows is None else min_rows
+
+        conn = await self.pools.connect(self.dsn)
+        try:
+            use_hypopg = await self._hypopg_available(conn)
+            # Plain EXPLAIN does not execute; the rollback is a second safety net
+            transaction = conn.transaction(readonly=True)
+            await transaction.start()
+            try:
+                analysis = await self.analyze_sql(conn, sql, min_rows, use_hypopg)
+            finally:
+                await transaction.rollback()
+            return {'hypopg': use_hypopg, 'min_rows': min_rows, 'sql': sql, **analysis}
+        finally:
+            await conn.close()
@@ -9,22 +9,6 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-CREATE_LINEAGE_TABLES = """
-CREATE TABLE IF NOT EXISTS data_lineage (
-    id SERIAL PRIMARY KEY,
-    source_table VARCHAR(255) NOT NULL,
-    source_column VARCHAR(255),
-    target_table VARCHAR(255) NOT NULL,
-    target_column VARCHAR(255),
-    transformation_type VARCHAR(100),
-    transformation_details TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE INDEX IF NOT EXISTS idx_lineage_source ON data_lineage(source_table);
-CREATE INDEX IF NOT EXISTS idx_lineage_target ON data_lineage(target_table);
-"""
-
 
 class DataLineageService:
     """
@@ -37,12 +21,6 @@ class DataLineageService:
     def __init__(self, pool):
         self._pool = pool
 
-    async def initialize_tables(self) -> None:
-        """Create lineage tables if they don't exist."""
-        async with self._pool.acquire() as conn:
-            await conn.execute(CREATE_LINEAGE_TABLES)
-            logger.info("Lineage tables initialized")
-
     async def track_lineage(
         self,
         source_table: str,
@@ -107,6 +85,7 @@ class DataLineageService:
 
 _lineage_service: Optional[DataLineageService] = None
 
+
 async def get_lineage_service(pool=None) -> DataLineageService:
     global _lineage_service
     if _lineage_service is None:
@@ -0,0 +1,191 @@
+"""
+Quality Rollup Service
+Daily aggregates of rule results per rule, per table and per DAMA dimension.
+
+Every stored result is added to data_quality_rollups_daily in the same
+transaction as the result row, so trend and summary reads scan
+days x keys rollup rows instead of raw executions. Rollups outlive the
+detailed results dropped by partition retention.
+
+- scope 'rule' is keyed by rule id, 'table' by table name and 'dimension'
+  by the DAMA dimension of the rule type
+- pass_rate is the share of evaluated rows that passed; run_pass_rate the
+  share of non-skipped executions that passed
+- Existing results are backfilled once when the rollup table is created
+  (migration 009_quality_rollups)
+"""
+import asyncpg
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+
+logger = logging.getLogger(__name__)
+
+
+ROLLUP_SCOPES = {'rule', 'table', 'dimension'}
+
+# Serializes creation and backfill of the rollup table across processes
+ROLLUP_LOCK_KEY = 'data_quality_rollups_daily'
+
+CREATE_ROLLUP_TABLE = '''
+    CREATE TABLE data_quality_rollups_daily (
+        scope VARCHAR(20) NOT NULL,
+        scope_key VARCHAR(255) NOT NULL,
+        day DATE NOT NULL,
+        executions INTEGER NOT NULL DEFAULT 0,
+        passed_runs INTEGER NOT NULL DEFAULT 0,
+        failed_runs INTEGER NOT NULL DEFAULT 0,
+        skipped_runs INTEGER NOT NULL DEFAULT 0,
+        total_count BIGINT NOT NULL DEFAULT 0,
+        failed_count BIGINT NOT NULL DEFAULT 0,
+        total_execution_time_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+        max_execution_time_ms REAL,
+        PRIMARY KEY (scope, scope_key, day)
+    )
+'''
+
+
+def rollup_upsert_sql(result_filter: str) -> str:
+    """Upsert of the results matching `result_filter` into all three scopes.
+
+    $1 is the rule type -> DAMA dimension map as JSON; the filter may use
+    further parameters and refers to the results table as ``r``.
+    """
+    return f'''
+        INSERT INTO data_quality_rollups_daily AS d
+            (scope, scope_key, day, executions, passed_runs, failed_runs, skipped_runs,
+             total_count, failed_count, total_execution_time_ms, max_execution_time_ms)
+        SELECT s.scope, s.scope_key, r.executed_at::date, COUNT(*),
+               COUNT(*) FILTER (WHERE r.passed),
+               COUNT(*) FILTER (WHERE r.passed = false),
+               COUNT(*) FILTER (WHERE r.status = 'skipped'),
+               COALESCE(SUM(r.total_count), 0), COALESCE(SUM(r.failed_count), 0),
+               COALESCE(SUM(r.execution_time_ms), 0), MAX(r.execution_time_ms)
+        FROM data_quality_results r
+        JOIN data_quality_rules dq ON dq.id = r.rule_id
+        CROSS JOIN LATERAL (VALUES
+            ('rule', dq.id::text),
+            ('table', dq.table_name::text),
+            ('dimension', COALESCE($1::jsonb ->> dq.rule_type, 'accuracy'))
+        ) AS s(scope, scope_key)
+        WHERE {result_filter}
+        GROUP BY s.scope, s.scope_key, r.executed_at::date
+        ON CONFLICT (scope, scope_key, day) DO UPDATE SET
+            executions = d.executions + EXCLUDED.executions,
+            passed_runs = d.passed_runs + EXCLUDED.passed_runs,
+            failed_runs = d.failed_runs + EXCLUDED.failed_runs,
+            skipped_runs = d.skipped_runs + EXCLUDED.skipped_runs,
+            total_count = d.total_count + EXCLUDED.total_count,
+            failed_count = d.failed_count + EXCLUDED.failed_count,
+            total_execution_time_ms = d.total_execution_time_ms + EXCLUDED.total_execution_time_ms,
+            max_execution_time_ms = GREATEST(d.max_execution_time_ms, EXCLUDED.max_execution_time_ms)
+    '''
+
+
+def _dimension_map() -> str:
+    from app.services.data_quality_rules import RULE_TYPE_TO_DAMA
+    return json.dumps(RULE_TYPE_TO_DAMA)
+
+
+def rollup_rates(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Add row and run pass rates and average duration to a rollup row."""
+    evaluated_runs = row['executions'] - row['skipped_runs']
+    total = row['total_count']
+    return {
+        **row,
+        'pass_rate': round((total - row['failed_count']) / total * 100, 2) if total else 100.0,
+        'run_pass_rate': round(row['passed_runs'] / evaluated_runs * 100, 2) if evaluated_runs else None,
+        'avg_execution_time_ms': round(row['total_execution_time_ms'] / evaluated_runs, 2)
+        if evaluated_runs and row['total_execution_time_ms'] else None,
+    }
+
+
+async def ensure_rollups(conn: asyncpg.Connection) -> None:
+    """Create the rollup table and backfill it from existing results once."""
+    if await conn.fetchval("SELECT to_regclass('data_quality_rollups_daily') IS NOT NULL"):
+        return
+    async with conn.transaction():
+        await conn.execute('SELECT pg_advisory_xact_lock(hashtext($1))', ROLLUP_LOCK_KEY)
+        if await conn.fetchval("SELECT to_regclass('data_quality_rollups_daily') IS NOT NULL"):
+            return
+        await conn.execute(CREATE_ROLLUP_TABLE)
+        await conn.execute(rollup_upsert_sql('true'), _dimension_map())
+        logger.info("Created data_quality_rollups_daily and backfilled it from stored results")
+
+
+async def record_rollup(conn: asyncpg.Connection, result_id: int, executed_at: datetime) -> None:
+    """Add one stored result to its rule, table and dimension rollups.
+
+    Call inside the transaction that inserted the result.
+    """
+    await conn.execute(
+        rollup_upsert_sql('r.id = $2 AND r.executed_at = $3'),
+        _dimension_map(), result_id, executed_at
+    )
+
+
+class QualityRollupService:
+    """Read access to the daily quality rollups."""
+
+    def __init__(self, dsn: str, pools: Optional[PoolRegistry] = None):
+        self.dsn = dsn
+        self.pools = pools or get_pool_registry()
+
+    def _validate_scope(self, scope: str) -> None:
+        if scope not in ROLLUP_SCOPES:
+            raise ValueError(f"Unsupported rollup scope '{scope}'. Use one of: {sorted(ROLLUP_SCOPES)}")
+
+    async def get_trends(
+        self, scope: str = 'dimension', scope_key: Optional[str] = None, days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Daily rollups of a scope, oldest day first."""
+        self._validate_scope(scope)
+        since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rows = await conn.fetch('''
+                SELECT scope_key, day, executions, passed_runs, failed_runs, skipped_runs,
+                       total_count, failed_count, total_execution_time_ms, max_execution_time_ms
+                FROM data_quality_rollups_daily
+                WHERE scope = $1 AND day >= $2 AND ($3::text IS NULL OR scope_key = $3)
+                ORDER BY day, scope_key
+            ''', scope, since, scope_key)
+            return [
+                {**rollup_rates(dict(r)), 'day': r['day'].isoformat()}
+                for r in rows
+            ]
+        finally:
+            await conn.close()
+
+    async def get_summary(self, scope: str = 'dimension', days: int = 30) -> List[Dict[str, Any]]:
+        """Totals per key of a scope over the last `days` days, worst pass rate first."""
+        self._validate_scope(scope)
+        since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rows = await conn.fetch('''
+                SELECT scope_key,
+                       SUM(executions)::bigint AS executions,
+                       SUM(passed_runs)::bigint AS passed_runs,
+                       SUM(failed_runs)::bigint AS failed_runs,
+                       SUM(skipped_runs)::bigint AS skipped_runs,
+                       SUM(total_count)::bigint AS total_count,
+                       SUM(failed_count)::bigint AS failed_count,
+                       SUM(total_execution_time_ms) AS total_execution_time_ms,
+                       MAX(max_execution_time_ms) AS max_execution_time_ms,
+                       MAX(day) AS last_day
+                FROM data_quality_rollups_daily
+                WHERE scope = $1 AND day >= $2
+                GROUP BY scope_key
+            ''', scope, since)
+            summary = [
+                {**rollup_rates(dict(r)), 'last_day': r['last_day'].isoformat()}
+                for r in rows
+            ]
+            summary.sort(key=lambda s: s['pass_rate'])
+            return summary
+        finally:
+            await conn.close()
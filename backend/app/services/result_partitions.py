@@ -0,0 +1,355 @@
+"""
+Result Partition Manager
+Monthly range partitioning and retention for data_quality_results.
+
+data_quality_results is partitioned by executed_at into one partition per month
+(data_quality_results_y2026m01, ...) plus a default partition that catches rows
+outside the premade range. The application manages the partitions itself:
+
+- An existing unpartitioned table is converted in place by migration
+  008_partition_results (rows, ids and the id sequence are preserved)
+- Partitions for the current month and RESULTS_PARTITION_PREMAKE_MONTHS ahead
+  are created on demand and by a maintenance loop started from the lifespan
+- With RESULTS_RETENTION_MONTHS > 0, partitions whose whole month is older than
+  the retention period are dropped; their results already live on in the
+  daily rollups (see quality_rollups)
+"""
+import asyncio
+import asyncpg
+import logging
+import re
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.services.quality_rollups import ensure_rollups
+
+logger = logging.getLogger(__name__)
+
+
+RESULTS_TABLE = 'data_quality_results'
+DEFAULT_PARTITION = 'data_quality_results_default'
+LEGACY_TABLE = 'data_quality_results_unpartitioned'
+PARTITION_NAME_PATTERN = re.compile(r'^data_quality_results_y(\d{4})m(\d{2})$')
+
+# Serializes conversion and partition DDL across app processes and workers
+PARTITION_LOCK_KEY = 'data_quality_results_partitions'
+# Unreferenced sample sets younger than this may belong to a result still being stored
+ORPHAN_SAMPLE_SET_GRACE = '1 hour'
+
+
+def month_start(dt: datetime) -> datetime:
+    """First instant of the month containing dt."""
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months."""
+    index = dt.year * 12 + dt.month - 1 + months
+    return dt.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Partition table name for the month starting at `month`."""
+    return f"{RESULTS_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Month start encoded in a partition name; None for other tables."""
+    match = PARTITION_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expected_partitions(now: datetime, premake_months: int) -> List[datetime]:
+    """Months that must have a partition: the current one and the premade ones."""
+    current = month_start(now)
+    return [add_months(current, i) for i in range(max(0, premake_months) + 1)]
+
+
+def expired_partitions(names: List[str], now: datetime, retention_months: int) -> List[str]:
+    """Partitions whose whole month lies before the retention cutoff, oldest first."""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -retention_months)
+    months = [(partition_month(n), n) for n in names]
+    return [n for month, n in sorted(m for m in months if m[0]) if add_months(month, 1) <= cutoff]
+
+
+async def _partition_state(conn: asyncpg.Connection) -> Tuple[Optional[str], List[str]]:
+    """relkind of data_quality_results and the names of its partitions."""
+    row = await conn.fetchrow('''
+        SELECT c.relkind,
+               ARRAY(
+                   SELECT p.relname::text
+                   FROM pg_inherits i
+                   JOIN pg_class p ON p.oid = i.inhrelid
+                   WHERE i.inhparent = c.oid
+               ) AS partitions
+        FROM pg_class c
+        WHERE c.oid = to_regclass($1)
+    ''', RESULTS_TABLE)
+    if not row:
+        return None, []
+    relkind = row['relkind']
+    if isinstance(relkind, bytes):
+        relkind = relkind.decode()
+    return relkind, list(row['partitions'])
+
+
+async def _convert_legacy_table(conn: asyncpg.Connection) -> None:
+    """Swap a plain data_quality_results table for a partitioned copy."""
+    logger.info("Converting data_quality_results to a partitioned table")
+    await conn.execute(f'ALTER TABLE {RESULTS_TABLE} RENAME TO {LEGACY_TABLE}')
+
+    # Partitioned tables cannot be referenced by a foreign key on id alone
+    foreign_keys = await conn.fetch('''
+        SELECT conrelid::regclass::text AS table_name, conname
+        FROM pg_constraint
+        WHERE confrelid = $1::regclass AND contype = 'f'
+    ''', LEGACY_TABLE)
+    for fk in foreign_keys:
+        logger.warning(f"Dropping foreign key {fk['conname']} on {fk['table_name']} (results are partitioned)")
+        await conn.execute(f'ALTER TABLE {fk["table_name"]} DROP CONSTRAINT "{fk["conname"]}"')
+
+    await conn.execute(f'UPDATE {LEGACY_TABLE} SET executed_at = CURRENT_TIMESTAMP WHERE executed_at IS NULL')
+    await conn.execute(f'''
+        CREATE TABLE {RESULTS_TABLE} (
+            LIKE {LEGACY_TABLE} INCLUDING DEFAULTS,
+            PRIMARY KEY (id, executed_at)
+        ) PARTITION BY RANGE (executed_at)
+    ''')
+    await conn.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {RESULTS_TABLE} DEFAULT')
+
+    bounds = await conn.fetchrow(f'SELECT MIN(executed_at) AS first, MAX(executed_at) AS last FROM {LEGACY_TABLE}')
+    if bounds['first']:
+        month = month_start(bounds['first'])
+        while month <= bounds['last']:
+            await _create_partition(conn, month)
+            month = add_months(month, 1)
+
+    await conn.execute(f'INSERT INTO {RESULTS_TABLE} SELECT * FROM {LEGACY_TABLE}')
+
+    sequence = await conn.fetchval("SELECT pg_get_serial_sequence($1, 'id')", LEGACY_TABLE)
+    if sequence:
+        # Keep the id sequence alive when the legacy table is dropped
+        await conn.execute(f'ALTER SEQUENCE {sequence} OWNED BY {RESULTS_TABLE}.id')
+    await conn.execute(f'DROP TABLE {LEGACY_TABLE}')
+
+
+async def _create_partition(conn: asyncpg.Connection, month: datetime) -> str:
+    """Create the partition for a month, moving matching rows out of the default partition."""
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    has_defaults = await conn.fetchval(
+        f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE executed_at >= $1 AND executed_at < $2)',
+        start, end
+    )
+    if has_defaults:
+        # A new partition may not overlap rows already in the default partition
+        await conn.execute(f'CREATE TEMP TABLE _dq_moved (LIKE {RESULTS_TABLE}) ON COMMIT DROP')
+        await conn.execute(f'''
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE executed_at >= $1 AND executed_at < $2
+                RETURNING *
+            )
+            INSERT INTO _dq_moved SELECT * FROM moved
+        ''', start, end)
+    await conn.execute(
+        f"CREATE TABLE {name} PARTITION OF {RESULTS_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat(sep=' ')}') TO ('{end.isoformat(sep=' ')}')"
+    )
+    if has_defaults:
+        await conn.execute(f'INSERT INTO {RESULTS_TABLE} SELECT * FROM _dq_moved')
+        await conn.execute('DROP TABLE _dq_moved')
+    logger.info(f"Created results partition {name}")
+    return name
+
+
+async def ensure_results_partitioned(
+    conn: asyncpg.Connection,
+    now: Optional[datetime] = None,
+    premake_months: int = settings.RESULTS_PARTITION_PREMAKE_MONTHS
+) -> List[str]:
+    """Make sure data_quality_results is partitioned and has its upcoming partitions.
+
+    Cheap when nothing is missing (one catalog query). Returns the names of the
+    partitions created.
+    """
+    now = now or datetime.utcnow()
+    needed = expected_partitions(now, premake_months)
+    relkind, partitions = await _partition_state(conn)
+    if relkind == 'p' and DEFAULT_PARTITION in partitions and all(
+        partition_name(m) in partitions for m in needed
+    ):
+        return []
+
+    created: List[str] = []
+    async with conn.transaction():
+        await conn.execute('SELECT pg_advisory_xact_lock(hashtext($1))', PARTITION_LOCK_KEY)
+        relkind, partitions = await _partition_state(conn)
+        if relkind == 'r':
+            await _convert_legacy_table(conn)
+            relkind, partitions = await _partition_state(conn)
+        if relkind != 'p':
+            raise RuntimeError(f"{RESULTS_TABLE} is not a partitioned table")
+        if DEFAULT_PARTITION not in partitions:
+            await conn.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {RESULTS_TABLE} DEFAULT')
+        for month in needed:
+            if partition_name(month) not in partitions:
+                created.append(await _create_partition(conn, month))
+        # History is read newest first, per rule or across rules
+        await conn.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_dq_results_rule_executed ON {RESULTS_TABLE} (rule_id, executed_at DESC)'
+        )
+        await conn.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_dq_results_executed ON {RESULTS_TABLE} (executed_at DESC)'
+        )
+    return created
+
+
+async def purge_orphan_sample_sets(conn: asyncpg.Connection) -> int:
+    """Delete failure sample sets that no stored result references any more.
+
+    Compaction writes the set before the result row that references it, so
+    sets created within ORPHAN_SAMPLE_SET_GRACE are kept.
+    """
+    status = await conn.execute(f'''
+        DELETE FROM failure_sample_sets s
+        WHERE s.created_at < CURRENT_TIMESTAMP - INTERVAL '{ORPHAN_SAMPLE_SET_GRACE}'
+          AND NOT EXISTS (
+              SELECT 1 FROM {RESULTS_TABLE} r WHERE r.failure_sample_hash = s.hash
+          )
+    ''')
+    return int(status.split()[-1])
+
+
+class ResultPartitionManager:
+    """Periodic partition creation and retention for rule results."""
+
+    def __init__(
+        self,
+        dsn: str,
+        retention_months: int = settings.RESULTS_RETENTION_MONTHS,
+        premake_months: int = settings.RESULTS_PARTITION_PREMAKE_MONTHS,
+        interval: float = settings.RESULTS_MAINTENANCE_INTERVAL_SECONDS,
+        pools: Optional[PoolRegistry] = None,
+    ):
+        self.dsn = dsn
+        self.pools = pools or get_pool_registry()
+        self.retention_months = retention_months
+        self.premake_months = premake_months
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    async def start(self) -> None:
+        """Start the maintenance loop."""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._loop(), name="result-partition-maintenance")
+        logger.info(
+            f"Result partition maintenance started (retention {self.retention_months or 'unlimited'} "
+            f"months, every {self.interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the maintenance loop."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_maintenance()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Result partition maintenance failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    async def run_maintenance(self, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """Create upcoming partitions, drop expired ones and purge orphaned sample sets."""
+        now = now or datetime.utcnow()
+        conn = await self.pools.connect(self.dsn)
+        try:
+            created = await ensure_results_partitioned(conn, now, self.premake_months)
+            _, partitions = await _partition_state(conn)
+            dropped = []
+            expired = expired_partitions(partitions, now, self.retention_months)
+            if expired:
+                # Dropped results must already be counted in the rollups
+                await ensure_rollups(conn)
+            for name in expired:
+                await self._drop_partition(conn, name)
+                dropped.append(name)
+            # Every run, so sets left by an interrupted run or deleted rules go too
+            purged = await purge_orphan_sample_sets(conn)
+            if purged:
+                logger.info(f"Purged {purged} unreferenced failure sample sets")
+            return {'created': created, 'dropped': dropped}
+        finally:
+            await conn.close()
+
+    async def _drop_partition(self, conn: asyncpg.Connection, name: str) -> None:
+        """Drop an expired partition and the analyses of its results."""
+        async with conn.transaction():
+            await conn.execute('SELECT pg_advisory_xact_lock(hashtext($1))', PARTITION_LOCK_KEY)
+            if await conn.fetchval("SELECT to_regclass('root_cause_analysis') IS NOT NULL"):
+                await conn.execute(
+                    f'DELETE FROM root_cause_analysis WHERE result_id IN (SELECT id FROM {name})'
+                )
+            await conn.execute(f'DROP TABLE {name}')
+        logger.info(f"Dropped expired results partition {name}")
+
+    async def list_partitions(self) -> List[Dict[str, Any]]:
+        """Result partitions with their month and estimated row counts."""
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rows = await conn.fetch('''
+                SELECT p.relname::text AS name, p.reltuples::bigint AS estimated_rows,
+                       pg_total_relation_size(p.oid) AS total_bytes
+                FROM pg_inherits i
+                JOIN pg_class p ON p.oid = i.inhrelid
+                WHERE i.inhparent = to_regclass($1)
+                ORDER BY p.relname
+            ''', RESULTS_TABLE)
+            return [
+                {
+                    'name': r['name'],
+                    'month': partition_month(r['name']).strftime('%Y-%m') if partition_month(r['name']) else None,
+                    'estimated_rows': max(r['estimated_rows'], 0),
+                    'total_bytes': r['total_bytes'],
+                }
+                for r in rows
+            ]
+        finally:
+            await conn.close()
+
+
+# Singleton instance
+_partition_manager: Optional[ResultPartitionManager] = None
+
+
+def get_result_partition_manager() -> ResultPartitionManager:
+    """Get or create the singleton result partition manager."""
+    global _partition_manager
+    if _partition_manager is None:
+        _partition_manager = ResultPartitionManager(settings.DATABASE_URL)
+    return _partition_manager
@@ -1,6 +1,9 @@
 """
 Rule Execution Service - Executes data quality rules against PostgreSQL
 Generated by RTX 3050 (Qwen2.5-Coder-7B-Instruct)
+
+The service is long-lived (see get_rule_execution_service) and runs on the
+shared, already warmed pool, so a request never pays for pool creation.
 """
 import asyncio
 import asyncpg
@@ -10,6 +13,10 @@ from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.exceptions import CircuitBreakerOpen
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -53,19 +60,18 @@ TABLE_WHITELIST = {"customers", "orders", "products", "employees", "order_detail
 class RuleExecutionService:
     """Service for executing data quality rules with REAL queries."""
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, pools: Optional[PoolRegistry] = None):
         self.database_url = database_url
+        self.pools = pools or get_pool_registry()
         self.pool: Optional[asyncpg.Pool] = None
 
     async def connect(self) -> None:
-        """Create connection pool."""
-        self.pool = await asyncpg.create_pool(self.database_url, min_size=2, max_size=10)
-        logger.info("Rule execution service connected to database")
+        """Attach to the shared pool for the database."""
+        self.pool = await self.pools.get_pool(self.database_url)
 
     async def disconnect(self) -> None:
-        """Close connection pool."""
-        if self.pool:
-            await self.pool.close()
+        """Detach from the pool; the registry closes it on shutdown."""
+        self.pool = None
 
     async def execute_rule(
         self,
@@ -82,7 +88,7 @@ class RuleExecutionService:
         params = params or {}
         start_time = time.time()
 
-        async with self.pool.acquire() as conn:
+        async with self.pools.acquire_read(self.database_url) as conn:
             try:
                 violation_count = await self._count_violations(
                     conn, rule_type, table_name, column_name, params
@@ -116,6 +122,44 @@ class RuleExecutionService:
                 logger.error(f"Error executing rule {rule_id}: {e}")
                 raise
 
+    async def execute_rules(
+        self,
+        rules: List[Dict[str, Any]],
+        max_parallel: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Execute several rules concurrently, at most max_parallel at a time.
+
+        Each rule is a dict of execute_rule keyword arguments. Results keep the
+        input order; a failing rule yields an error entry instead of failing
+        the whole batch, unless a circuit breaker is open (CircuitBreakerOpen).
+        """
+        semaphore = asyncio.Semaphore(max_parallel or settings.RULE_BATCH_CONCURRENCY)
+
+        async def run(rule: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return (await self.execute_rule(**rule)).to_dict()
+                except CircuitBreakerOpen:
+                    raise
+                except Exception as e:
+                    return {
+                        "rule_id": rule["rule_id"],
+                        "rule_type": rule["rule_type"],
+                        "table": rule["table_name"],
+                        "column": rule["column_name"],
+                        "passed": False,
+                        "error": str(e)
+                    }
+
+        tasks = [asyncio.create_task(run(rule)) for rule in rules]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            # After a failure: stop the rest and collect their outcomes
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def _count_violations(
         self,
         conn: asyncpg.Connection,
@@ -235,3 +279,16 @@ class RuleExecutionService:
 
         else:
             raise ValueError(f"Unsupported rule type: {rule_type}")
+
+
+# Singleton instance
+_rule_execution_service: Optional[RuleExecutionService] = None
+
+
+async def get_rule_execution_service() -> RuleExecutionService:
+    """Get or create the rule execution service singleton."""
+    global _rule_execution_service
+    if _rule_execution_service is None:
+        _rule_execution_service = RuleExecutionService(settings.DATABASE_URL)
+        await _rule_execution_service.connect()
+    return _rule_execution_service
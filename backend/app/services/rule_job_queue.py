@@ -0,0 +1,342 @@
+"""
+Rule Job Queue Service
+Postgres-backed work queue for distributing rule executions across worker processes.
+
+Jobs live in rule_execution_jobs. Workers (see app.worker) claim them with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers can poll the same
+table without blocking each other or double-claiming a job.
+
+- Running jobs are kept alive by worker heartbeats; jobs whose heartbeat goes
+  stale are reaped and requeued by any other worker
+- Failed attempts are retried with exponential backoff and jitter
+- Jobs that exhaust max_attempts are dead-lettered (status 'dead') and kept for
+  inspection and manual retry
+- Only one queued or running job per rule: enqueueing again returns the
+  existing job instead of stacking duplicate executions
+"""
+import asyncpg
+import json
+import logging
+import random
+from typing import List, Dict, Any, Optional
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.services.data_quality_rules import ALLOWED_TABLES, EXECUTION_MODES
+
+logger = logging.getLogger(__name__)
+
+
+JOB_STATUSES = {'queued', 'running', 'succeeded', 'dead'}
+
+
+def retry_delay(
+    attempts: int,
+    base_seconds: float = settings.JOB_RETRY_BASE_SECONDS,
+    max_seconds: float = settings.JOB_RETRY_MAX_SECONDS
+) -> float:
+    """Exponential backoff, jittered to 50-100% of the step, for the attempt that just failed."""
+    ceiling = min(max_seconds, base_seconds * (2 ** max(attempts - 1, 0)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class RuleJobQueue:
+    """
+    Queue operations shared by the API (enqueue, inspect) and workers (claim,
+    heartbeat, complete, fail). All timestamps come from the database clock so
+    workers on different hosts agree on staleness and backoff.
+    """
+
+    def __init__(self, dsn: str, pools: Optional[PoolRegistry] = None):
+        self.dsn = dsn
+        self.pools = pools or get_pool_registry()
+
+    async def _connect(self) -> asyncpg.Connection:
+        return await self.pools.connect(self.dsn)
+
+    def _job_to_dict(self, row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in ('run_after', 'heartbeat_at', 'started_at', 'finished_at', 'created_at'):
+            if job.get(key):
+                job[key] = job[key].isoformat()
+        if isinstance(job.get('result'), str):
+            job['result'] = json.loads(job['result'])
+        return job
+
+    # =========================================================================
+    # PRODUCER
+    # =========================================================================
+
+    async def enqueue(
+        self,
+        rule_id: int,
+        execution_mode: str = 'exact',
+        full_refresh: bool = False,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        schedule_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Enqueue a rule execution, or return the rule's active job if it has one."""
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution_mode}'")
+        max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        conn = await self._connect()
+        try:
+            try:
+                row = await conn.fetchrow('''
+                    INSERT INTO rule_execution_jobs
+                    (rule_id, execution_mode, full_refresh, priority, max_attempts, schedule_id)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    ON CONFLICT (rule_id) WHERE status IN ('queued', 'running') DO NOTHING
+                    RETURNING *
+                ''', rule_id, execution_mode, full_refresh, priority, max_attempts, schedule_id)
+            except asyncpg.ForeignKeyViolationError:
+                raise ValueError(f"Rule {rule_id} not found")
+            if row is None:
+                row = await conn.fetchrow('''
+                    SELECT * FROM rule_execution_jobs
+                    WHERE rule_id = $1 AND status IN ('queued', 'running')
+                ''', rule_id)
+            return self._job_to_dict(row)
+        finally:
+            await conn.close()
+
+    async def enqueue_table(
+        self,
+        table_name: str,
+        execution_mode: str = 'exact',
+        full_refresh: bool = False,
+        priority: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Enqueue every active rule of a table."""
+        table_name = table_name.lower()
+        if table_name not in ALLOWED_TABLES:
+            raise ValueError(f"Table '{table_name}' not in allowed list: {ALLOWED_TABLES}")
+
+        conn = await self._connect()
+        try:
+            rule_ids = [
+                r['id'] for r in await conn.fetch(
+                    'SELECT id FROM data_quality_rules WHERE table_name = $1 AND is_active = true ORDER BY id',
+                    table_name
+                )
+            ]
+        finally:
+            await conn.close()
+
+        return [
+            await self.enqueue(rule_id, execution_mode, full_refresh, priority)
+            for rule_id in rule_ids
+        ]
+
+    # =========================================================================
+    # CONSUMER
+    # =========================================================================
+
+    async def claim(self, worker_id: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """Atomically claim up to `limit` runnable jobs for a worker."""
+        conn = await self._connect()
+        try:
+            rows = await conn.fetch('''
+                WITH next_jobs AS (
+                    SELECT id FROM rule_execution_jobs
+                    WHERE status = 'queued' AND run_after <= now()
+                    ORDER BY priority DESC, run_after, id
+                    LIMIT $2
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE rule_execution_jobs j
+                SET status = 'running',
+                    worker_id = $1,
+                    attempts = j.attempts + 1,
+                    started_at = now(),
+                    heartbeat_at = now()
+                FROM next_jobs
+                WHERE j.id = next_jobs.id
+                RETURNING j.*
+            ''', worker_id, limit)
+            return [self._job_to_dict(row) for row in rows]
+        finally:
+            await conn.close()
+
+    async def heartbeat(self, worker_id: str, job_ids: List[int]) -> List[int]:
+        """Extend the lease on running jobs.
+
+        Returns the IDs the worker still owns; anything missing was reaped and
+        should be abandoned by the worker.
+        """
+        if not job_ids:
+            return []
+        conn = await self._connect()
+        try:
+            rows = await conn.fetch('''
+                UPDATE rule_execution_jobs
+                SET heartbeat_at = now()
+                WHERE id = ANY($1::bigint[]) AND worker_id = $2 AND status = 'running'
+                RETURNING id
+            ''', job_ids, worker_id)
+            return [row['id'] for row in rows]
+        finally:
+            await conn.close()
+
+    async def complete(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a job succeeded. Returns False if the worker no longer owns it."""
+        conn = await self._connect()
+        try:
+            updated = await conn.fetchval('''
+                UPDATE rule_execution_jobs
+                SET status = 'succeeded', finished_at = now(), result = $3::jsonb, last_error = NULL
+                WHERE id = $1 AND worker_id = $2 AND status = 'running'
+                RETURNING id
+            ''', job_id, worker_id, json.dumps(result, default=str))
+            return updated is not None
+        finally:
+            await conn.close()
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> Optional[str]:
+        """Record a failed attempt: requeue with backoff or dead-letter.
+
+        Returns the job's new status, or None if the worker no longer owns it.
+        """
+        conn = await self._connect()
+        try:
+            async with conn.transaction():
+                job = await conn.fetchrow('''
+                    SELECT attempts, max_attempts FROM rule_execution_jobs
+                    WHERE id = $1 AND worker_id = $2 AND status = 'running'
+                    FOR UPDATE
+                ''', job_id, worker_id)
+                if job is None:
+                    return None
+
+                if job['attempts'] >= job['max_attempts']:
+                    await conn.execute('''
+                        UPDATE rule_execution_jobs
+                        SET status = 'dead', finished_at = now(), last_error = $2
+                        WHERE id = $1
+                    ''', job_id, error)
+                    logger.error(f"Job {job_id} dead-lettered after {job['attempts']} attempts: {error}")
+                    return 'dead'
+
+                delay = retry_delay(job['attempts'])
+                await conn.execute('''
+                    UPDATE rule_execution_jobs
+                    SET status = 'queued', worker_id = NULL, heartbeat_at = NULL,
+                        run_after = now() + make_interval(secs => $2), last_error = $3
+                    WHERE id = $1
+                ''', job_id, delay, error)
+                logger.warning(f"Job {job_id} attempt {job['attempts']} failed, retrying in {delay:.0f}s: {error}")
+                return 'queued'
+        finally:
+            await conn.close()
+
+    async def reap_stale(self, stale_after_seconds: float = settings.JOB_STALE_AFTER_SECONDS) -> int:
+        """Requeue (or dead-letter) running jobs whose worker stopped heartbeating."""
+        conn = await self._connect()
+        try:
+            rows = await conn.fetch('''
+                UPDATE rule_execution_jobs
+                SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+                    finished_at = CASE WHEN attempts >= max_attempts THEN now() END,
+                    worker_id = NULL,
+                    heartbeat_at = NULL,
+                    run_after = now(),
+                    last_error = 'Worker heartbeat lost'
+                WHERE status = 'running'
+                  AND heartbeat_at < now() - make_interval(secs => $1)
+                RETURNING id
+            ''', float(stale_after_seconds))
+            if rows:
+                logger.warning(f"Reaped {len(rows)} stale job(s): {[r['id'] for r in rows]}")
+            return len(rows)
+        finally:
+            await conn.close()
+
+    # =========================================================================
+    # INSPECTION
+    # =========================================================================
+
+    async def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a job by ID."""
+        conn = await self._connect()
+        try:
+            row = await conn.fetchrow('SELECT * FROM rule_execution_jobs WHERE id = $1', job_id)
+            return self._job_to_dict(row) if row else None
+        finally:
+            await conn.close()
+
+    async def list_jobs(
+        self,
+        status: Optional[str] = None,
+        rule_id: Optional[int] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """List jobs, newest first."""
+        if status is not None and status not in JOB_STATUSES:
+            raise ValueError(f"Unknown job status '{status}'")
+        conn = await self._connect()
+        try:
+            rows = await conn.fetch('''
+                SELECT * FROM rule_execution_jobs
+                WHERE ($1::text IS NULL OR status = $1)
+                  AND ($2::integer IS NULL OR rule_id = $2)
+                ORDER BY id DESC
+                LIMIT $3
+            ''', status, rule_id, limit)
+            return [self._job_to_dict(row) for row in rows]
+        finally:
+            await conn.close()
+
+    async def retry_dead(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Move a dead-lettered job back to the queue with a fresh attempt budget."""
+        conn = await self._connect()
+        try:
+            try:
+                row = await conn.fetchrow('''
+                    UPDATE rule_execution_jobs
+                    SET status = 'queued', attempts = 0, run_after = now(),
+                        finished_at = NULL, worker_id = NULL
+                    WHERE id = $1 AND status = 'dead'
+                    RETURNING *
+                ''', job_id)
+            except asyncpg.UniqueViolationError:
+                raise ValueError(f"Rule already has an active job; job {job_id} not requeued")
+            return self._job_to_dict(row) if row else None
+        finally:
+            await conn.close()
+
+    async def stats(self) -> Dict[str, Any]:
+        """Job counts by status plus the age of the oldest runnable job."""
+        conn = await self._connect()
+        try:
+            rows = await conn.fetch(
+                'SELECT status, COUNT(*) AS count FROM rule_execution_jobs GROUP BY status'
+            )
+            oldest = await conn.fetchval('''
+                SELECT EXTRACT(EPOCH FROM now() - MIN(run_after))
+                FROM rule_execution_jobs
+                WHERE status = 'queued' AND run_after <= now()
+            ''')
+            counts = {status: 0 for status in sorted(JOB_STATUSES)}
+            counts.update({row['status']: row['count'] for row in rows})
+            return {
+                'counts': counts,
+                'oldest_queued_seconds': float(oldest) if oldest is not None else None,
+            }
+        finally:
+            await conn.close()
+
+
+# Singleton instance
+_rule_job_queue: Optional[RuleJobQueue] = None
+
+
+def get_rule_job_queue() -> RuleJobQueue:
+    """Get or create the singleton job queue."""
+    global _rule_job_queue
+    if _rule_job_queue is None:
+        _rule_job_queue = RuleJobQueue(settings.DATABASE_URL)
+    return _rule_job_queue
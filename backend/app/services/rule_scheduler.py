@@ -0,0 +1,552 @@
+"""
+Rule Scheduler Service
+In-process cron scheduler for data quality rules.
+
+Schedules target either a single rule or every active rule on a table. A poll
+loop started from the application lifespan claims due schedules, pushes them onto
+a bounded pool of worker tasks and computes the next fire time with random jitter
+so schedules sharing a cron expression do not all hit the database at once.
+
+- Cron expressions use the standard 5 fields (minute hour day month weekday), UTC
+- Occurrences later than the misfire grace period are skipped, not replayed
+- A rule that is still queued or running is skipped for the overlapping occurrence
+- Claims are conditional on next_run_at, so several app processes never dispatch
+  the same occurrence twice
+- With SCHEDULER_DISPATCH=queue, due rules are enqueued to rule_execution_jobs
+  for app.worker processes instead of running in the API process
+"""
+import asyncio
+import asyncpg
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.services.data_quality_rules import (
+    ALLOWED_TABLES,
+    EXECUTION_MODES,
+    DataQualityRulesService,
+)
+from app.services.rule_job_queue import RuleJobQueue
+
+logger = logging.getLogger(__name__)
+
+
+CRON_ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+
+# (name, low, high) for minute, hour, day of month, month, day of week
+CRON_FIELDS = [
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 7),
+]
+
+# "local": in-process worker pool; "queue": rule_execution_jobs for app.worker processes
+SCHEDULER_DISPATCH_MODES = {'local', 'queue'}
+
+# Upper bound for next-fire searches; covers Feb 29 schedules
+CRON_SEARCH_LIMIT = timedelta(days=366 * 5)
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, matching the TIMESTAMP columns of rule_schedules."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_cron_field(field: str, name: str, low: int, high: int) -> Set[int]:
+    """Expand one cron field (lists, ranges, steps) into the set of matching values."""
+    values: Set[int] = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Invalid step '{step_text}' in cron {name} field")
+            step = int(step_text)
+
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            if not (start_text.isdigit() and end_text.isdigit()):
+                raise ValueError(f"Invalid range '{part}' in cron {name} field")
+            start, end = int(start_text), int(end_text)
+        elif part.isdigit():
+            start = int(part)
+            # 'n/step' means from n to the end of the range
+            end = high if step > 1 else start
+        else:
+            raise ValueError(f"Invalid value '{part}' in cron {name} field")
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron {name} field '{field}' outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """Standard 5-field cron expression evaluated in UTC.
+
+    As in Vixie cron, when both day of month and day of week are restricted a
+    day matches if either field matches.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        spec = CRON_ALIASES.get(self.expression.lower(), self.expression)
+        fields = spec.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(
+                f"Cron expression '{expression}' must have 5 fields "
+                f"(minute hour day month weekday)"
+            )
+
+        parsed = [
+            _parse_cron_field(value, name, low, high)
+            for value, (name, low, high) in zip(fields, CRON_FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Both 0 and 7 mean Sunday
+        self.weekdays = {day % 7 for day in weekdays}
+        self._day_restricted = not fields[2].startswith('*')
+        self._weekday_restricted = not fields[4].startswith('*')
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        # Python weekday() is Monday=0, cron is Sunday=0
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, after: datetime) -> datetime:
+        """Return the first fire time strictly after the given moment."""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + CRON_SEARCH_LIMIT
+        while moment <= limit:
+            if moment.month not in self.months:
+                first_of_month = moment.replace(day=1, hour=0, minute=0)
+                moment = (first_of_month + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+
+def next_fire_time(cron: CronExpression, after: datetime, jitter_seconds: int = 0) -> datetime:
+    """Next cron occurrence after a moment, delayed by up to jitter_seconds."""
+    fire_at = cron.next_after(after)
+    if jitter_seconds > 0:
+        fire_at += timedelta(seconds=random.uniform(0, jitter_seconds))
+    return fire_at
+
+
+class RuleScheduler:
+    """
+    Cron scheduler running inside the API process.
+
+    The poll loop only claims as many due schedules as the worker queue has room
+    for; anything left over stays due and is picked up on a later tick, or skipped
+    as a misfire once it is older than its grace period.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        max_workers: int = settings.SCHEDULER_MAX_WORKERS,
+        poll_interval: float = settings.SCHEDULER_POLL_INTERVAL_SECONDS,
+        default_jitter_seconds: int = settings.SCHEDULER_DEFAULT_JITTER_SECONDS,
+        default_misfire_grace_seconds: int = settings.SCHEDULER_MISFIRE_GRACE_SECONDS,
+        dispatch: str = settings.SCHEDULER_DISPATCH,
+        pools: Optional[PoolRegistry] = None,
+    ):
+        if dispatch not in SCHEDULER_DISPATCH_MODES:
+            raise ValueError(f"Unknown scheduler dispatch '{dispatch}'")
+        self.dsn = dsn
+        self.pools = pools or get_pool_registry()
+        self.dispatch = dispatch
+        self._job_queue = RuleJobQueue(dsn, self.pools)
+        self.max_workers = max(1, max_workers)
+        self.poll_interval = poll_interval
+        self.default_jitter_seconds = default_jitter_seconds
+        self.default_misfire_grace_seconds = default_misfire_grace_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._workers: List[asyncio.Task] = []
+        # Rules queued or executing in this process
+        self._in_flight: Set[int] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._poll_task is not None and not self._poll_task.done()
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    async def start(self) -> None:
+        """Start the poll loop and the worker pool."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_workers)
+        if self.dispatch == 'local':
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"rule-scheduler-worker-{i}")
+                for i in range(self.max_workers)
+            ]
+        self._poll_task = asyncio.create_task(self._poll_loop(), name="rule-scheduler-poll")
+        logger.info(
+            f"Rule scheduler started ({self.dispatch} dispatch, {len(self._workers)} workers, "
+            f"poll every {self.poll_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop polling and cancel in-flight executions."""
+        tasks = ([self._poll_task] if self._poll_task else []) + self._workers
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._poll_task = None
+        self._workers = []
+        self._in_flight.clear()
+        logger.info("Rule scheduler stopped")
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                dispatched = await self.run_pending()
+                if dispatched:
+                    logger.info(f"Rule scheduler dispatched {dispatched} schedule(s)")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Rule scheduler poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    # =========================================================================
+    # DISPATCH
+    # =========================================================================
+
+    def _is_misfire(self, schedule: Dict[str, Any], now: datetime) -> bool:
+        """True when an occurrence is too late to be worth running."""
+        lateness = (now - schedule['next_run_at']).total_seconds()
+        return lateness > schedule['misfire_grace_seconds']
+
+    async def run_pending(self, now: Optional[datetime] = None) -> int:
+        """Claim due schedules and queue their executions.
+
+        Returns the number of schedules handed to the worker pool.
+        """
+        if self._queue is None:
+            raise RuntimeError("Rule scheduler is not started")
+        now = now or _utcnow()
+        dispatched = 0
+
+        conn = await self.pools.connect(self.dsn)
+        try:
+            due = await conn.fetch('''
+                SELECT id, rule_id, table_name, cron_expression, jitter_seconds,
+                       misfire_grace_seconds, execution_mode, next_run_at
+                FROM rule_schedules
+                WHERE is_active = true AND next_run_at <= $1
+                ORDER BY next_run_at
+                LIMIT 100
+            ''', now)
+
+            for row in due:
+                schedule = dict(row)
+                try:
+                    cron = CronExpression(schedule['cron_expression'])
+                except ValueError as e:
+                    logger.error(f"Schedule {schedule['id']} disabled: {e}")
+                    await conn.execute(
+                        "UPDATE rule_schedules SET is_active = false, last_status = 'invalid' "
+                        "WHERE id = $1", schedule['id']
+                    )
+                    continue
+                next_run_at = next_fire_time(cron, now, schedule['jitter_seconds'])
+
+                if self._is_misfire(schedule, now):
+                    if await self._claim(conn, schedule, next_run_at, 'misfired', now):
+                        logger.warning(
+                            f"Schedule {schedule['id']} misfired "
+                            f"(due {schedule['next_run_at'].isoformat()}), next run {next_run_at.isoformat()}"
+                        )
+                    continue
+
+                if self.dispatch == 'local' and self._queue.full():
+                    # Stays due; picked up once a worker frees up
+                    continue
+
+                rule_ids = [
+                    r['id'] for r in await conn.fetch('''
+                        SELECT id FROM data_quality_rules
+                        WHERE is_active = true
+                          AND (id = $1 OR ($1::integer IS NULL AND table_name = $2))
+                        ORDER BY id
+                    ''', schedule['rule_id'], schedule['table_name'])
+                ]
+
+                if self.dispatch == 'queue':
+                    # The job queue keeps one active job per rule, so rules still
+                    # running on some worker coalesce with their existing job
+                    if not await self._claim(conn, schedule, next_run_at, 'enqueued', now):
+                        continue
+                    for rule_id in rule_ids:
+                        await self._job_queue.enqueue(
+                            rule_id, schedule['execution_mode'], schedule_id=schedule['id']
+                        )
+                    dispatched += 1
+                    continue
+
+                runnable = [rule_id for rule_id in rule_ids if rule_id not in self._in_flight]
+                status = 'dispatched' if runnable else 'skipped'
+
+                if not await self._claim(conn, schedule, next_run_at, status, now):
+                    # Another process claimed this occurrence first
+                    continue
+                if len(runnable) < len(rule_ids):
+                    skipped = sorted(set(rule_ids) - set(runnable))
+                    logger.info(
+                        f"Schedule {schedule['id']}: skipping rules {skipped}, previous run still in progress"
+                    )
+                if runnable:
+                    self._in_flight.update(runnable)
+                    self._queue.put_nowait((schedule['id'], runnable, schedule['execution_mode']))
+                    dispatched += 1
+        finally:
+            await conn.close()
+
+        return dispatched
+
+    async def _claim(
+        self,
+        conn: asyncpg.Connection,
+        schedule: Dict[str, Any],
+        next_run_at: datetime,
+        status: str,
+        now: datetime
+    ) -> bool:
+        """Advance a schedule past its current occurrence if nobody else has."""
+        claimed = await conn.fetchval('''
+            UPDATE rule_schedules
+            SET next_run_at = $2,
+                last_status = $3,
+                last_run_at = CASE WHEN $3 IN ('dispatched', 'enqueued') THEN $4 ELSE last_run_at END
+            WHERE id = $1 AND next_run_at = $5
+            RETURNING id
+        ''', schedule['id'], next_run_at, status, now, schedule['next_run_at'])
+        return claimed is not None
+
+    async def _worker(self) -> None:
+        while True:
+            schedule_id, rule_ids, mode = await self._queue.get()
+            try:
+                await self._run_schedule(schedule_id, rule_ids, mode)
+            except Exception as e:
+                logger.error(f"Schedule {schedule_id} execution failed: {e}")
+            finally:
+                self._in_flight.difference_update(rule_ids)
+                self._queue.task_done()
+
+    async def _run_schedule(self, schedule_id: int, rule_ids: List[int], mode: str) -> None:
+        """Execute the rules of one claimed occurrence and record the outcome."""
+        service = DataQualityRulesService(self.dsn, self.pools)
+        status = 'passed'
+        for rule_id in rule_ids:
+            try:
+                result = await service.execute_rule(rule_id, mode=mode)
+                if not result.get('passed') and status == 'passed':
+                    status = 'failed'
+            except Exception as e:
+                logger.error(f"Scheduled execution of rule {rule_id} failed: {e}")
+                status = 'error'
+            finally:
+                self._in_flight.discard(rule_id)
+
+        conn = await self.pools.connect(self.dsn)
+        try:
+            await conn.execute(
+                'UPDATE rule_schedules SET last_status = $2 WHERE id = $1',
+                schedule_id, status
+            )
+        finally:
+            await conn.close()
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of the scheduler state for monitoring."""
+        return {
+            'running': self.is_running,
+            'dispatch': self.dispatch,
+            'max_workers': self.max_workers,
+            'poll_interval_seconds': self.poll_interval,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'in_flight_rules': sorted(self._in_flight),
+        }
+
+    # =========================================================================
+    # SCHEDULE CRUD
+    # =========================================================================
+
+    def _validate_schedule(
+        self,
+        cron_expression: str,
+        rule_id: Optional[int],
+        table_name: Optional[str],
+        jitter_seconds: int,
+        misfire_grace_seconds: int,
+        execution_mode: str
+    ) -> Tuple[CronExpression, Optional[str]]:
+        if (rule_id is None) == (table_name is None):
+            raise ValueError("Schedule must target exactly one of rule_id or table_name")
+        if table_name is not None:
+            table_name = table_name.lower()
+            if table_name not in ALLOWED_TABLES:
+                raise ValueError(f"Table '{table_name}' not in allowed list: {ALLOWED_TABLES}")
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution_mode}'")
+        if jitter_seconds < 0 or misfire_grace_seconds < 0:
+            raise ValueError("jitter_seconds and misfire_grace_seconds must not be negative")
+        return CronExpression(cron_expression), table_name
+
+    async def create_schedule(
+        self,
+        cron_expression: str,
+        rule_id: Optional[int] = None,
+        table_name: Optional[str] = None,
+        jitter_seconds: Optional[int] = None,
+        misfire_grace_seconds: Optional[int] = None,
+        execution_mode: str = 'exact'
+    ) -> Dict[str, Any]:
+        """Create a schedule for a rule or for all active rules of a table."""
+        if jitter_seconds is None:
+            jitter_seconds = self.default_jitter_seconds
+        if misfire_grace_seconds is None:
+            misfire_grace_seconds = self.default_misfire_grace_seconds
+        cron, table_name = self._validate_schedule(
+            cron_expression, rule_id, table_name,
+            jitter_seconds, misfire_grace_seconds, execution_mode
+        )
+        next_run_at = next_fire_time(cron, _utcnow(), jitter_seconds)
+
+        conn = await self.pools.connect(self.dsn)
+        try:
+            try:
+                row = await conn.fetchrow(
+                    '''
+                    INSERT INTO rule_schedules
+                    (rule_id, table_name, cron_expression, jitter_seconds,
+                     misfire_grace_seconds, execution_mode, next_run_at)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    RETURNING *
+                    ''',
+                    rule_id, table_name, cron.expression, jitter_seconds,
+                    misfire_grace_seconds, execution_mode, next_run_at
+                )
+            except asyncpg.ForeignKeyViolationError:
+                raise ValueError(f"Rule {rule_id} not found")
+            return self._schedule_to_dict(row)
+        finally:
+            await conn.close()
+
+    def _schedule_to_dict(self, row) -> Dict[str, Any]:
+        schedule = dict(row)
+        for key in ('next_run_at', 'last_run_at', 'created_at'):
+            if schedule.get(key):
+                schedule[key] = schedule[key].isoformat()
+        return schedule
+
+    async def list_schedules(
+        self,
+        rule_id: Optional[int] = None,
+        table_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """List schedules, optionally filtered by target."""
+        conn = await self.pools.connect(self.dsn)
+        try:
+            rows = await conn.fetch('''
+                SELECT * FROM rule_schedules
+                WHERE ($1::integer IS NULL OR rule_id = $1)
+                  AND ($2::text IS NULL OR table_name = $2)
+                ORDER BY id
+            ''', rule_id, table_name.lower() if table_name else None)
+            return [self._schedule_to_dict(row) for row in rows]
+        finally:
+            await conn.close()
+
+    async def get_schedule(self, schedule_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single schedule by ID."""
+        conn = await self.pools.connect(self.dsn)
+        try:
+            row = await conn.fetchrow('SELECT * FROM rule_schedules WHERE id = $1', schedule_id)
+            return self._schedule_to_dict(row) if row else None
+        finally:
+            await conn.close()
+
+    async def set_schedule_active(self, schedule_id: int, is_active: bool) -> Optional[Dict[str, Any]]:
+        """Activate or pause a schedule.
+
+        Reactivation recomputes next_run_at from now, so occurrences missed while
+        paused are not reported as misfires.
+        """
+        conn = await self.pools.connect(self.dsn)
+        try:
+            row = await conn.fetchrow(
+                'SELECT cron_expression, jitter_seconds FROM rule_schedules WHERE id = $1',
+                schedule_id
+            )
+            if not row:
+                return None
+            next_run_at = None
+            if is_active:
+                cron = CronExpression(row['cron_expression'])
+                next_run_at = next_fire_time(cron, _utcnow(), row['jitter_seconds'])
+            updated = await conn.fetchrow('''
+                UPDATE rule_schedules
+                SET is_active = $2, next_run_at = COALESCE($3, next_run_at)
+                WHERE id = $1
+                RETURNING *
+            ''', schedule_id, is_active, next_run_at)
+            return self._schedule_to_dict(updated)
+        finally:
+            await conn.close()
+
+    async def delete_schedule(self, schedule_id: int) -> bool:
+        """Delete a schedule. Returns False if it did not exist."""
+        conn = await self.pools.connect(self.dsn)
+        try:
+            deleted = await conn.fetchval(
+                'DELETE FROM rule_schedules WHERE id = $1 RETURNING id', schedule_id
+            )
+            return deleted is not None
+        finally:
+            await conn.close()
+
+
+# Singleton instance
+_rule_scheduler: Optional[RuleScheduler] = None
+
+
+def get_rule_scheduler() -> RuleScheduler:
+    """Get or create the singleton rule scheduler."""
+    global _rule_scheduler
+    if _rule_scheduler is None:
+        _rule_scheduler = RuleScheduler(settings.DATABASE_URL)
+    return _rule_scheduler
@@ -0,0 +1,380 @@
+"""
+Vectorized Rule Engine
+Evaluates rules in-process over columnar batches instead of pushing SQL down.
+
+Rules with ``engine: vectorized`` in their rule_definition are expressed as a
+row predicate over column names, e.g. ``unit_price * quantity * (1 - discount) >= 0``
+or ``matches(postal_code, '^[0-9]{5}$')``. Rows where the predicate is false
+fail; rows where it is NULL pass, like ``WHERE NOT (predicate)`` in SQL.
+null_check / not_null rules need no predicate, they fail rows where the rule
+column is NULL.
+
+- The table is streamed once through a server-side cursor, projecting only the
+  columns the rules reference, in batches of VECTORIZED_BATCH_SIZE rows. Each
+  batch is transposed from asyncpg records into one array per column; the
+  fetch itself is row-wise (asyncpg has no columnar result format)
+- Every rule on the table is evaluated against each batch with NumPy array
+  operations on integer (int64) and float (float64) columns; numeric/Decimal
+  values stay exact and, like other types, go through per-element Python
+- ``matches`` uses pyarrow.compute when pyarrow is installed
+- Results are RuleResult objects, stored like SQL engine results
+
+numpy is imported when a vectorized rule runs, so the service works without
+it as long as no vectorized rule is executed.
+"""
+import ast
+import logging
+import operator
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+import asyncpg
+
+from app.config import settings
+from app.services.data_quality_rules import (
+    IDENTIFIER_PATTERN,
+    THRESHOLD_RULE_TYPES,
+    RuleResult,
+)
+
+logger = logging.getLogger(__name__)
+
+
+RULE_ENGINES = {'sql', 'vectorized'}
+
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# Rule types checked on the rule column alone
+NULL_RULE_TYPES = {'null_check', 'not_null'}
+
+EXPRESSION_FUNCTIONS = {'isnull', 'notnull', 'abs', 'length', 'matches', 'isin'}
+
+_BINARY_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.Mod: operator.mod,
+}
+_COMPARE_OPS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub,
+    ast.BinOp, ast.Compare, ast.Call, ast.Name, ast.Load, ast.Constant, ast.List,
+    *_BINARY_OPS, *_COMPARE_OPS,
+)
+
+
+def compile_expression(expression: str) -> Tuple[ast.Expression, Set[str]]:
+    """Parse a row predicate and return its tree and the columns it references.
+
+    Raises ValueError for syntax errors and anything outside the supported
+    subset (arithmetic, comparisons, and/or/not, EXPRESSION_FUNCTIONS).
+    """
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}")
+
+    columns: Set[str] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in EXPRESSION_FUNCTIONS:
+                raise ValueError(f"Unsupported function in expression. Use one of: {sorted(EXPRESSION_FUNCTIONS)}")
+            if node.keywords:
+                raise ValueError("Expression functions take positional arguments only")
+            if node.func.id == 'matches':
+                if len(node.args) != 2 or not isinstance(node.args[1], ast.Constant) \
+                        or not isinstance(node.args[1].value, str):
+                    raise ValueError("matches() takes a column and a string pattern")
+                re.compile(node.args[1].value)
+            if node.func.id == 'isin':
+                if len(node.args) != 2 or not isinstance(node.args[1], ast.List) \
+                        or not all(isinstance(e, ast.Constant) for e in node.args[1].elts):
+                    raise ValueError("isin() takes a column and a list of constant values")
+        elif isinstance(node, ast.Name) and not _is_function_name(tree, node):
+            if not IDENTIFIER_PATTERN.match(node.id):
+                raise ValueError(f"Invalid column name '{node.id}'")
+            columns.add(node.id)
+    return tree, columns
+
+
+def _is_function_name(tree: ast.AST, name: ast.Name) -> bool:
+    return any(isinstance(n, ast.Call) and n.func is name for n in ast.walk(tree))
+
+
+@dataclass
+class VectorizedRule:
+    """A rule prepared for vectorized evaluation."""
+    rule_id: int
+    rule_type: str
+    column: Optional[str] = None
+    expression: Optional[str] = None
+    threshold: float = 0
+    tree: ast.Expression = field(init=False, repr=False)
+    columns: Set[str] = field(init=False)
+
+    def __post_init__(self):
+        if self.rule_type in NULL_RULE_TYPES:
+            if not self.column or not IDENTIFIER_PATTERN.match(self.column):
+                raise ValueError(f"Rule {self.rule_id}: {self.rule_type} needs a valid column")
+            self.expression = f'notnull({self.column})'
+        if not self.expression:
+            raise ValueError(f"Rule {self.rule_id}: vectorized rules need an expression")
+        self.tree, self.columns = compile_expression(self.expression)
+
+    @classmethod
+    def from_definition(cls, rule_id: int, rule_type: str, column: Optional[str],
+                        definition: Dict[str, Any]) -> 'VectorizedRule':
+        return cls(
+            rule_id=rule_id,
+            rule_type=rule_type,
+            column=column,
+            expression=definition.get('expression'),
+            threshold=definition.get('threshold') or 0
+        )
+
+
+class _Evaluator:
+    """Evaluates a compiled predicate against one batch.
+
+    Every node evaluates to a (values, nulls) pair of arrays, or scalars for
+    constants, which broadcast against the batch.
+    """
+
+    def __init__(self, np, batch: Dict[str, Tuple[Any, Any]], size: int):
+        self.np = np
+        self.batch = batch
+        self.size = size
+
+    def evaluate(self, tree: ast.Expression) -> Tuple[Any, Any]:
+        values, nulls = self._eval(tree.body)
+        np = self.np
+        return (
+            np.broadcast_to(np.asarray(values, dtype=bool), (self.size,)),
+            np.broadcast_to(np.asarray(nulls, dtype=bool), (self.size,)),
+        )
+
+    def _eval(self, node: ast.AST) -> Tuple[Any, Any]:
+        np = self.np
+        if isinstance(node, ast.Constant):
+            return (0 if node.value is None else node.value), node.value is None
+        if isinstance(node, ast.Name):
+            if node.id not in self.batch:
+                raise ValueError(f"Unknown column '{node.id}'")
+            return self.batch[node.id]
+        if isinstance(node, ast.UnaryOp):
+            values, nulls = self._eval(node.operand)
+            if isinstance(node.op, ast.Not):
+                return ~np.asarray(values, dtype=bool), nulls
+            return self._apply(operator.neg, (values,), nulls)
+        if isinstance(node, ast.BinOp):
+            (a, a_nulls), (b, b_nulls) = self._eval(node.left), self._eval(node.right)
+            nulls = a_nulls | b_nulls
+            if isinstance(node.op, (ast.Div, ast.Mod)):
+                # Division by zero yields NULL instead of aborting the scan
+                zero = np.asarray(np.asarray(b) == 0, dtype=bool)
+                nulls = nulls | zero
+                b = np.where(zero, 1, b)
+            return self._apply(_BINARY_OPS[type(node.op)], (a, b), nulls)
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left)
+            result = None
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval(comparator)
+                step = self._apply(_COMPARE_OPS[type(op)], (left[0], right[0]), left[1] | right[1])
+                result = step if result is None else self._and(result, step)
+                left = right
+            return result
+        if isinstance(node, ast.BoolOp):
+            result = self._eval(node.values[0])
+            for operand in node.values[1:]:
+                combine = self._and if isinstance(node.op, ast.And) else self._or
+                result = combine(result, self._eval(operand))
+            return result
+        if isinstance(node, ast.Call):
+            return self._call(node)
+        raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+
+    def _numeric(self, values) -> bool:
+        np = self.np
+        return np.asarray(values).dtype.kind in 'biuf'
+
+    def _apply(self, func, operands: tuple, nulls) -> Tuple[Any, Any]:
+        """Apply an operator: vectorized for numeric operands, per element otherwise."""
+        np = self.np
+        if all(self._numeric(o) for o in operands):
+            with np.errstate(all='ignore'):
+                return func(*(np.asarray(o) for o in operands)), nulls
+        arrays = np.broadcast_arrays(*(np.asarray(o, dtype=object) for o in operands), np.asarray(nulls))
+        *columns, null_mask = arrays
+        out = np.empty(null_mask.shape, dtype=object)
+        for i, values in enumerate(zip(*columns)):
+            out[i] = None if null_mask[i] else func(*_promote(values))
+        result_nulls = null_mask | np.fromiter((v is None for v in out), dtype=bool, count=len(out))
+        if all(isinstance(v, (bool, np.bool_)) for v, n in zip(out, result_nulls) if not n):
+            out = np.where(result_nulls, False, out).astype(bool)
+        return out, result_nulls
+
+    def _and(self, a, b) -> Tuple[Any, Any]:
+        # Three-valued logic: false wins over NULL, NULL wins over true
+        a_true, a_false = self._truth(a)
+        b_true, b_false = self._truth(b)
+        true, false = a_true & b_true, a_false | b_false
+        return true, ~(true | false)
+
+    def _or(self, a, b) -> Tuple[Any, Any]:
+        a_true, a_false = self._truth(a)
+        b_true, b_false = self._truth(b)
+        true, false = a_true | b_true, a_false & b_false
+        return true, ~(true | false)
+
+    def _truth(self, operand) -> Tuple[Any, Any]:
+        np = self.np
+        values, nulls = operand
+        values = np.asarray(values, dtype=bool)
+        nulls = np.asarray(nulls, dtype=bool)
+        return values & ~nulls, ~values & ~nulls
+
+    def _call(self, node: ast.Call) -> Tuple[Any, Any]:
+        np = self.np
+        name = node.func.id
+        values, nulls = self._eval(node.args[0])
+        if name == 'isnull':
+            return nulls, False
+        if name == 'notnull':
+            return ~np.asarray(nulls, dtype=bool), False
+        if name == 'abs':
+            return self._apply(abs, (values,), nulls)
+        if name == 'length':
+            return self._apply(lambda v: len(str(v)), (values,), nulls)
+        if name == 'isin':
+            options = [e.value for e in node.args[1].elts]
+            if self._numeric(values) and all(isinstance(o, (int, float)) for o in options):
+                return np.isin(values, options), nulls
+            if any(isinstance(v, Decimal) for v in np.asarray(values, dtype=object).ravel()):
+                options = _promote(options, force=True)
+            allowed = set(options)
+            return self._apply(lambda v: v in allowed, (values,), nulls)
+        if name == 'matches':
+            return self._matches(values, nulls, node.args[1].value), nulls
+        raise ValueError(f"Unsupported function '{name}'")
+
+    def _matches(self, values, nulls, pattern: str):
+        np = self.np
+        strings = [None if n else str(v) for v, n in zip(values, np.broadcast_to(nulls, (self.size,)))]
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            regex = re.compile(pattern)
+            return np.fromiter((s is not None and regex.search(s) is not None for s in strings),
+                               dtype=bool, count=len(strings))
+        matched = pc.match_substring_regex(pa.array(strings, type=pa.string()), pattern)
+        return np.asarray(matched.fill_null(False).to_numpy(zero_copy_only=False), dtype=bool)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _promote(values, force: bool = False) -> tuple:
+    """Turn floats into Decimals next to a Decimal (or always with `force`).
+
+    A literal such as 0.05 is numeric in PostgreSQL, so a numeric column is
+    compared and combined with it exactly; the float's shortest repr is the
+    literal as written.
+    """
+    if force or (any(isinstance(v, Decimal) for v in values) and any(isinstance(v, float) for v in values)):
+        return tuple(Decimal(repr(v)) if isinstance(v, float) else v for v in values)
+    return tuple(values)
+
+
+def column_batch(np, records: List[Any], columns: List[str]) -> Dict[str, Tuple[Any, Any]]:
+    """Turn fetched records into (values, nulls) arrays per column."""
+    return column_arrays(np, {column: [r[column] for r in records] for column in columns})
+
+
+def column_arrays(np, columns: Dict[str, List[Any]]) -> Dict[str, Tuple[Any, Any]]:
+    """Turn lists of Python values into (values, nulls) arrays per column.
+
+    Integer columns become int64 and float columns float64 arrays, with NULLs
+    zero-filled and masked. Everything else, including Decimal and integers
+    beyond int64, stays an object array so no precision is lost.
+    """
+    batch = {}
+    for column, raw in columns.items():
+        size = len(raw)
+        nulls = np.fromiter((v is None for v in raw), dtype=bool, count=size)
+        present = [v for v in raw if v is not None]
+        if present and all(isinstance(v, bool) for v in present):
+            values = np.fromiter((bool(v) for v in raw), dtype=bool, count=size)
+        elif present and all(_is_int(v) and INT64_MIN <= v <= INT64_MAX for v in present):
+            values = np.fromiter((0 if v is None else v for v in raw), dtype=np.int64, count=size)
+        elif present and all(_is_int(v) or isinstance(v, float) for v in present):
+            values = np.fromiter((0.0 if v is None else float(v) for v in raw), dtype=float, count=size)
+        else:
+            values = np.empty(size, dtype=object)
+            values[:] = raw
+        batch[column] = (values, nulls)
+    return batch
+
+
+class VectorizedRuleEngine:
+    """Streams a table once and evaluates all of its vectorized rules per batch."""
+
+    def __init__(self, batch_size: int = settings.VECTORIZED_BATCH_SIZE, sample_size: int = 5):
+        self.batch_size = batch_size
+        self.sample_size = sample_size
+
+    async def evaluate_table(
+        self, conn: asyncpg.Connection, table: str, rules: List[VectorizedRule]
+    ) -> List[RuleResult]:
+        """Evaluate rules against every row of `table`; results are in rule order."""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ValueError("The vectorized engine requires numpy (pip install numpy)")
+
+        columns = sorted(set().union(*(r.columns for r in rules)))
+        projection = ', '.join(f'"{c}"' for c in columns) or '1'
+        totals = [0] * len(rules)
+        failed = [0] * len(rules)
+        samples: List[List[Dict[str, Any]]] = [[] for _ in rules]
+
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor(f'SELECT {projection} FROM "{table}"')
+            while True:
+                records = await cursor.fetch(self.batch_size)
+                if not records:
+                    break
+                batch = column_batch(np, records, columns)
+                for i, rule in enumerate(rules):
+                    values, nulls = _Evaluator(np, batch, len(records)).evaluate(rule.tree)
+                    failing = ~values & ~nulls
+                    totals[i] += len(records)
+                    failed[i] += int(failing.sum())
+                    missing = self.sample_size - len(samples[i])
+                    if missing > 0:
+                        for index in np.flatnonzero(failing)[:missing]:
+                            samples[i].append(dict(records[int(index)]))
+
+        results = []
+        for i, rule in enumerate(rules):
+            if rule.rule_type in THRESHOLD_RULE_TYPES:
+                fail_pct = failed[i] / totals[i] * 100 if totals[i] else 0
+                passed = fail_pct <= rule.threshold
+            else:
+                passed = failed[i] == 0
+            results.append(RuleResult(
+                rule_id=rule.rule_id,
+                passed=passed,
+                total_count=totals[i],
+                failed_count=failed[i],
+                failure_samples=samples[i],
+                rows_examined=totals[i]
+            ))
+        return results
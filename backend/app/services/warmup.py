@@ -0,0 +1,118 @@
+"""
+Startup Warm-up
+Preloads what the first requests after a deploy would otherwise fetch cold.
+
+Started from the lifespan when WARMUP_ON_STARTUP is set, in the background:
+the server accepts requests immediately and ``GET /ready`` answers 503 until
+the warm-up has finished, so a load balancer only routes to warm workers.
+
+- schema: information_schema column metadata of every whitelisted table
+- rules: the active rule catalog
+- profiles: the latest stored profiling results
+
+Each step runs the services' own queries once per pooled connection the
+pool opened at startup, so every connection has them in its prepared
+statement cache and the database has the catalogs and tables in memory. A
+failing step is logged and skipped; the worker is reported ready once all
+steps ended or WARMUP_TIMEOUT_SECONDS passed, warm or not.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.data_profiling_service import DataProfilingService
+from app.services.data_quality_rules import DataQualityRulesService
+
+logger = logging.getLogger(__name__)
+
+
+class StartupWarmup:
+    """Background warm-up of schema metadata, rules and profiles with its readiness state."""
+
+    def __init__(
+        self,
+        profiling: DataProfilingService,
+        rules: DataQualityRulesService,
+        connections: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.profiling = profiling
+        self.rules = rules
+        # Leases taken at once: one per connection opened with the pool
+        self.connections = max(1, connections or settings.DATABASE_MIN_POOL_SIZE)
+        self.timeout = timeout or settings.WARMUP_TIMEOUT_SECONDS
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self) -> None:
+        """Run the warm-up in the background (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="startup-warmup")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def wait(self) -> None:
+        """Wait for the warm-up to finish."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _run(self) -> None:
+        self.started_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self.run_steps(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up not finished after {self.timeout}s, reporting ready anyway")
+        finally:
+            self.finished_at = time.monotonic()
+        logger.info(f"Warm-up finished in {self.finished_at - self.started_at:.2f}s")
+
+    async def run_steps(self) -> None:
+        await self._step('schema', self._warm_schema)
+        await self._step('rules', lambda: self._on_each_connection(self.rules.get_all_rules))
+        await self._step('profiles', lambda: self._on_each_connection(self.profiling.get_stored_results))
+
+    async def _step(self, name: str, warm: Callable[[], Awaitable[int]]) -> None:
+        started = time.perf_counter()
+        try:
+            items = await warm()
+            self.steps[name] = {'items': items, 'ms': round((time.perf_counter() - started) * 1000, 2)}
+        except Exception as e:
+            logger.warning(f"Warm-up step '{name}' failed: {e}")
+            self.steps[name] = {'error': str(e), 'ms': round((time.perf_counter() - started) * 1000, 2)}
+
+    async def _on_each_connection(self, fetch: Callable[[], Awaitable[List[Any]]]) -> int:
+        # Concurrent calls lease different connections
+        results = await asyncio.gather(*(fetch() for _ in range(self.connections)))
+        return len(results[0])
+
+    async def _warm_schema(self) -> int:
+        tables = await self.profiling.get_tables()
+        semaphore = asyncio.Semaphore(self.connections)
+
+        async def columns(table: str) -> int:
+            async with semaphore:
+                return len(await self.profiling.get_columns(table))
+
+        return sum(await asyncio.gather(*(columns(t) for t in tables)))
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness and per-step results for the readiness endpoint."""
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.monotonic()) - self.started_at, 2)
+        return {
+            'ready': self.ready,
+            'elapsed_seconds': elapsed,
+            'steps': self.steps,
+        }
@@ -1,17 +1,34 @@
 """
 Retry Logic Module with Exponential Backoff
 Generated by RTX 3050 (Qwen2.5-Coder-7B-Instruct)
+
+``call_with_retry`` combines a dependency's circuit breaker with a retry
+budget and jittered backoff:
+
+- the breaker is checked before every attempt, so calls fail fast with
+  CircuitBreakerOpen while the dependency is known to be down
+- failed attempts are retried after a random delay of up to
+  base_delay * 2**attempt (full jitter), so callers that failed together
+  do not retry together
+- retries are only made while the dependency's RetryBudget allows: at most
+  RETRY_BUDGET_RATIO of its recent calls (plus a small floor), so a slow or
+  failing dependency is not hit with a multiple of its normal load
 """
 import time
+import random
 import asyncio
 import logging
-from typing import Callable, Any, Type, Tuple, Union
+from collections import deque
+from typing import Awaitable, Callable, Any, Deque, Dict, Optional, Type, Tuple, TypeVar, Union
 from functools import wraps
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from app.config import settings
+from app.exceptions import CircuitBreaker, CircuitBreakerOpen
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 def retry(
     exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]] = Exception,
@@ -70,3 +87,131 @@ def retry(
         return sync_wrapper
 
     return decorator
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff: random delay up to base_delay * 2**attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class RetryBudget:
+    """Caps retries to a share of the calls made in a sliding window."""
+
+    def __init__(
+        self,
+        ratio: Optional[float] = None,
+        min_retries: Optional[int] = None,
+        window_seconds: Optional[float] = None
+    ):
+        self.ratio = settings.RETRY_BUDGET_RATIO if ratio is None else ratio
+        self.min_retries = settings.RETRY_BUDGET_MIN_RETRIES if min_retries is None else min_retries
+        self.window_seconds = window_seconds or settings.RETRY_BUDGET_WINDOW_SECONDS
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0
+
+    def _prune(self, now: float) -> None:
+        for times in (self._calls, self._retries):
+            while times and now - times[0] > self.window_seconds:
+                times.popleft()
+
+    def record_call(self) -> None:
+        now = time.monotonic()
+        self._prune(now)
+        self._calls.append(now)
+
+    def try_retry(self) -> bool:
+        """Take one retry from the budget; False when it is spent."""
+        now = time.monotonic()
+        self._prune(now)
+        if len(self._retries) >= max(self.min_retries, int(self.ratio * len(self._calls))):
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._prune(time.monotonic())
+        return {
+            'calls_in_window': len(self._calls),
+            'retries_in_window': len(self._retries),
+            'exhausted': self.exhausted,
+        }
+
+
+_retry_budgets: Dict[str, RetryBudget] = {}
+
+
+def get_retry_budget(name: str) -> RetryBudget:
+    """Get or create the process-wide retry budget of a dependency."""
+    budget = _retry_budgets.get(name)
+    if budget is None:
+        budget = _retry_budgets[name] = RetryBudget()
+    return budget
+
+
+def retry_budget_stats() -> Dict[str, Dict[str, Any]]:
+    """Calls, retries and refused retries in the current window, per dependency."""
+    return {name: budget.to_dict() for name, budget in _retry_budgets.items()}
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[T]],
+    breaker: CircuitBreaker,
+    budget: RetryBudget,
+    failures: Tuple[Type[BaseException], ...],
+    retryable: Optional[Tuple[Type[BaseException], ...]] = None,
+    max_retries: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None
+) -> T:
+    """
+    Call `func` through a circuit breaker, retrying within a retry budget.
+
+    Args:
+        func: Coroutine function making one attempt
+        breaker: Circuit breaker of the dependency
+        budget: Retry budget of the dependency
+        failures: Exceptions that count as the dependency failing; any other
+            exception means it answered (an invalid query, a 4xx) and is
+            raised without retrying
+        retryable: Failures worth retrying (default: all of `failures`)
+        max_retries: Retries after the first attempt (RETRY_MAX_RETRIES)
+        base_delay: Backoff base in seconds (RETRY_BASE_DELAY_SECONDS)
+        max_delay: Backoff cap in seconds (RETRY_MAX_DELAY_SECONDS)
+
+    Raises:
+        CircuitBreakerOpen: The breaker is open
+    """
+    retryable = failures if retryable is None else retryable
+    max_retries = settings.RETRY_MAX_RETRIES if max_retries is None else max_retries
+    base_delay = settings.RETRY_BASE_DELAY_SECONDS if base_delay is None else base_delay
+    max_delay = settings.RETRY_MAX_DELAY_SECONDS if max_delay is None else max_delay
+
+    budget.record_call()
+    attempt = 0
+    while True:
+        breaker()
+        try:
+            result = await func()
+        except failures as e:
+            breaker.record_failure()
+            if not isinstance(e, retryable) or attempt >= max_retries or not budget.try_retry():
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            attempt += 1
+            logger.info(f"Retrying {breaker.name} in {delay:.2f}s (attempt {attempt}/{max_retries}): {e}")
+            await asyncio.sleep(delay)
+            continue
+        except CircuitBreakerOpen:
+            # A breaker further down (e.g. the pool's) rejected the call
+            breaker.record_cancelled()
+            raise
+        except Exception:
+            breaker.record_success()
+            raise
+        except BaseException:
+            breaker.record_cancelled()
+            raise
+        breaker.record_success()
+        return result
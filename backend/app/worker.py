@@ -0,0 +1,165 @@
+"""
+Rule Execution Worker
+Standalone process that claims jobs from rule_execution_jobs and executes them.
+
+Run any number of these next to (or instead of) the API process:
+
+    python -m app.worker --concurrency 8
+
+Each worker polls for runnable jobs, heartbeats the jobs it holds, reaps jobs
+abandoned by crashed workers, and reports success or failure back to the queue,
+which takes care of retry backoff and dead-lettering.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from typing import Dict, Optional
+
+from app.config import settings
+from app.db_config.pool_registry import PoolRegistry, get_pool_registry
+from app.db_config.migrations import MigrationRunner
+from app.services.data_quality_rules import DataQualityRulesService
+from app.services.rule_job_queue import RuleJobQueue
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """Host, PID and a random suffix, unique across restarts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class RuleWorker:
+    """Claims and executes queued rule jobs with bounded concurrency."""
+
+    def __init__(
+        self,
+        dsn: str,
+        worker_id: Optional[str] = None,
+        concurrency: int = settings.WORKER_CONCURRENCY,
+        poll_interval: float = settings.WORKER_POLL_INTERVAL_SECONDS,
+        heartbeat_interval: float = settings.JOB_HEARTBEAT_INTERVAL_SECONDS,
+        stale_after: float = settings.JOB_STALE_AFTER_SECONDS,
+        pools: Optional[PoolRegistry] = None
+    ):
+        self.dsn = dsn
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.pools = pools or get_pool_registry()
+        self.queue = RuleJobQueue(dsn, self.pools)
+        self.rules_service = DataQualityRulesService(dsn, self.pools)
+        # job_id -> task executing it
+        self._active: Dict[int, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; in-flight jobs are allowed to finish."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info(f"Worker {self.worker_id} started (concurrency {self.concurrency})")
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        try:
+            while not self._stopping.is_set():
+                claimed = 0
+                try:
+                    await self.queue.reap_stale(self.stale_after)
+                    free = self.concurrency - len(self._active)
+                    if free > 0:
+                        for job in await self.queue.claim(self.worker_id, free):
+                            self._active[job['id']] = asyncio.create_task(self._execute(job))
+                            claimed += 1
+                except Exception as e:
+                    logger.error(f"Worker {self.worker_id} poll failed: {e}")
+
+                # Poll again immediately while there is work and spare capacity
+                if claimed and len(self._active) < self.concurrency:
+                    continue
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            if self._active:
+                logger.info(f"Worker {self.worker_id} draining {len(self._active)} job(s)")
+                await asyncio.gather(*self._active.values(), return_exceptions=True)
+        finally:
+            heartbeat_task.cancel()
+            await asyncio.gather(heartbeat_task, return_exceptions=True)
+            logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _execute(self, job: Dict) -> None:
+        job_id = job['id']
+        try:
+            result = await self.rules_service.execute_rule(
+                job['rule_id'],
+                full_refresh=job['full_refresh'],
+                mode=job['execution_mode']
+            )
+            await self.queue.complete(job_id, self.worker_id, result)
+        except asyncio.CancelledError:
+            # Lease lost to the reaper; the job is already requeued elsewhere
+            raise
+        except Exception as e:
+            try:
+                await self.queue.fail(job_id, self.worker_id, f"{type(e).__name__}: {e}")
+            except Exception as report_error:
+                # The heartbeat lapses and the reaper requeues the job
+                logger.error(f"Job {job_id}: could not record failure: {report_error}")
+        finally:
+            self._active.pop(job_id, None)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            job_ids = list(self._active)
+            if not job_ids:
+                continue
+            try:
+                owned = set(await self.queue.heartbeat(self.worker_id, job_ids))
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} heartbeat failed: {e}")
+                continue
+            for job_id in job_ids:
+                task = self._active.get(job_id)
+                if job_id not in owned and task is not None:
+                    logger.warning(f"Job {job_id} lease lost, abandoning execution")
+                    task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DQM rule execution worker")
+    parser.add_argument("--concurrency", type=int, default=settings.WORKER_CONCURRENCY,
+                        help="Jobs executed concurrently by this worker")
+    parser.add_argument("--worker-id", default=None, help="Identifier recorded on claimed jobs")
+    parser.add_argument("--dsn", default=settings.DATABASE_URL, help="PostgreSQL DSN")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT)
+
+    async def _run() -> None:
+        worker = RuleWorker(args.dsn, worker_id=args.worker_id, concurrency=args.concurrency)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+        try:
+            if settings.MIGRATE_ON_STARTUP:
+                await MigrationRunner(args.dsn, pools=worker.pools).migrate()
+            if settings.DATABASE_POOL_ADAPTIVE:
+                worker.pools.start_adaptive_sizing()
+            await worker.run()
+        finally:
+            await worker.pools.close_all()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
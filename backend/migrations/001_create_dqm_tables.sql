@@ -1,5 +1,5 @@
 
-CREATE TABLE data_profiling_results (
+CREATE TABLE IF NOT EXISTS data_profiling_results (
     id SERIAL PRIMARY KEY,
     table_name TEXT NOT NULL,
     column_name TEXT NOT NULL,
@@ -8,9 +8,9 @@ CREATE TABLE data_profiling_results (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_data_profiling_results_table_column ON data_profiling_results (table_name, column_name);
+CREATE INDEX IF NOT EXISTS idx_data_profiling_results_table_column ON data_profiling_results (table_name, column_name);
 
-CREATE TABLE data_quality_rules (
+CREATE TABLE IF NOT EXISTS data_quality_rules (
     id SERIAL PRIMARY KEY,
     rule_name TEXT NOT NULL,
     table_name TEXT NOT NULL,
@@ -22,9 +22,9 @@ CREATE TABLE data_quality_rules (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_data_quality_rules_table_column ON data_quality_rules (table_name, column_name);
+CREATE INDEX IF NOT EXISTS idx_data_quality_rules_table_column ON data_quality_rules (table_name, column_name);
 
-CREATE TABLE data_quality_results (
+CREATE TABLE IF NOT EXISTS data_quality_results (
     id SERIAL PRIMARY KEY,
     rule_id INT REFERENCES data_quality_rules(id) ON DELETE CASCADE,
     passed BOOLEAN NOT NULL,
@@ -34,16 +34,18 @@ CREATE TABLE data_quality_results (
     executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_data_quality_results_rule_id ON data_quality_results (rule_id);
+CREATE INDEX IF NOT EXISTS idx_data_quality_results_rule_id ON data_quality_results (rule_id);
 
-CREATE TABLE root_cause_analysis (
+CREATE TABLE IF NOT EXISTS root_cause_analysis (
     id SERIAL PRIMARY KEY,
-    result_id INT REFERENCES data_quality_results(id) ON DELETE CASCADE,
+    -- No foreign key: data_quality_results is partitioned (see 008); analyses of
+    -- dropped partitions are deleted by partition retention
+    result_id INT NOT NULL,
     suggested_cause JSONB NOT NULL,
     confidence_score NUMERIC(5, 2) NOT NULL,
     ai_model TEXT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_root_cause_analysis_result_id ON root_cause_analysis (result_id);
+CREATE INDEX IF NOT EXISTS idx_root_cause_analysis_result_id ON root_cause_analysis (result_id);
 
@@ -0,0 +1,45 @@
+-- Columns used by DataQualityRulesService on top of 001. Also aligns databases
+-- whose tables were created by the service before migrations existed.
+
+-- Table-level rules have no column; description and threshold are optional
+ALTER TABLE data_quality_rules
+    ADD COLUMN IF NOT EXISTS description TEXT,
+    ADD COLUMN IF NOT EXISTS threshold REAL,
+    ALTER COLUMN column_name DROP NOT NULL,
+    ALTER COLUMN severity SET DEFAULT 'warning';
+
+ALTER TABLE data_quality_results
+    ALTER COLUMN total_count SET DEFAULT 0,
+    ALTER COLUMN failed_count SET DEFAULT 0,
+    ALTER COLUMN executed_at SET DEFAULT CURRENT_TIMESTAMP;
+
+-- Incremental execution: high watermark covered by each stored result
+ALTER TABLE data_quality_results ADD COLUMN IF NOT EXISTS watermark TEXT;
+
+-- Sampled execution: estimated results are flagged so views can tell them apart
+ALTER TABLE data_quality_results
+    ADD COLUMN IF NOT EXISTS is_approximate BOOLEAN DEFAULT false,
+    ADD COLUMN IF NOT EXISTS sample_percent REAL,
+    ADD COLUMN IF NOT EXISTS confidence_interval JSONB;
+
+-- Dependency scheduling: skipped rules record a result without pass/fail
+ALTER TABLE data_quality_results
+    ADD COLUMN IF NOT EXISTS status VARCHAR(20),
+    ALTER COLUMN passed DROP NOT NULL;
+
+-- Telemetry: duration, scanned rows and sampled EXPLAIN buffer/IO stats
+ALTER TABLE data_quality_results
+    ADD COLUMN IF NOT EXISTS execution_time_ms REAL,
+    ADD COLUMN IF NOT EXISTS rows_examined BIGINT,
+    ADD COLUMN IF NOT EXISTS explain_stats JSONB;
+
+-- Compact sample storage: identical sample sets are stored once, keyed by hash
+CREATE TABLE IF NOT EXISTS failure_sample_sets (
+    hash CHAR(64) PRIMARY KEY,
+    table_name VARCHAR(255) NOT NULL,
+    key_columns JSONB NOT NULL,
+    samples JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE data_quality_results ADD COLUMN IF NOT EXISTS failure_sample_hash CHAR(64);
@@ -0,0 +1,17 @@
+-- Stored column profiles used for rule suggestions (DataProfilingService)
+CREATE TABLE IF NOT EXISTS profiling_results (
+    id SERIAL PRIMARY KEY,
+    table_name VARCHAR(255) NOT NULL,
+    column_name VARCHAR(255) NOT NULL,
+    data_type VARCHAR(100),
+    null_count INTEGER DEFAULT 0,
+    null_percent REAL DEFAULT 0,
+    unique_count INTEGER DEFAULT 0,
+    min_value TEXT,
+    max_value TEXT,
+    sample_values JSONB,
+    profiled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_profiling_results_table
+    ON profiling_results(table_name, column_name);
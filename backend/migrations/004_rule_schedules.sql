@@ -0,0 +1,19 @@
+-- Cron schedules for rules or whole tables (RuleScheduler)
+CREATE TABLE IF NOT EXISTS rule_schedules (
+    id SERIAL PRIMARY KEY,
+    rule_id INTEGER REFERENCES data_quality_rules(id) ON DELETE CASCADE,
+    table_name VARCHAR(255),
+    cron_expression VARCHAR(100) NOT NULL,
+    jitter_seconds INTEGER NOT NULL DEFAULT 0,
+    misfire_grace_seconds INTEGER NOT NULL DEFAULT 300,
+    execution_mode VARCHAR(20) NOT NULL DEFAULT 'exact',
+    is_active BOOLEAN DEFAULT true,
+    next_run_at TIMESTAMP,
+    last_run_at TIMESTAMP,
+    last_status VARCHAR(20),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CHECK ((rule_id IS NULL) <> (table_name IS NULL))
+);
+
+CREATE INDEX IF NOT EXISTS idx_rule_schedules_due
+    ON rule_schedules(next_run_at) WHERE is_active;
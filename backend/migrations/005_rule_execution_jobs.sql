@@ -0,0 +1,27 @@
+-- Work queue claimed by app.worker processes (RuleJobQueue)
+CREATE TABLE IF NOT EXISTS rule_execution_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    rule_id INTEGER NOT NULL REFERENCES data_quality_rules(id) ON DELETE CASCADE,
+    execution_mode VARCHAR(20) NOT NULL DEFAULT 'exact',
+    full_refresh BOOLEAN NOT NULL DEFAULT false,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+    worker_id VARCHAR(255),
+    heartbeat_at TIMESTAMPTZ,
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    last_error TEXT,
+    result JSONB,
+    schedule_id INTEGER,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_rule_jobs_claim
+    ON rule_execution_jobs(priority DESC, run_after, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_rule_jobs_heartbeat
+    ON rule_execution_jobs(heartbeat_at) WHERE status = 'running';
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rule_jobs_one_active
+    ON rule_execution_jobs(rule_id) WHERE status IN ('queued', 'running');
@@ -0,0 +1,14 @@
+-- Table and column lineage (DataLineageService)
+CREATE TABLE IF NOT EXISTS data_lineage (
+    id SERIAL PRIMARY KEY,
+    source_table VARCHAR(255) NOT NULL,
+    source_column VARCHAR(255),
+    target_table VARCHAR(255) NOT NULL,
+    target_column VARCHAR(255),
+    transformation_type VARCHAR(100),
+    transformation_details TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_lineage_source ON data_lineage(source_table);
+CREATE INDEX IF NOT EXISTS idx_lineage_target ON data_lineage(target_table);
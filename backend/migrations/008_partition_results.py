@@ -0,0 +1,6 @@
+"""Partition data_quality_results by month, converting an existing plain table."""
+from app.services.result_partitions import ensure_results_partitioned
+
+
+async def upgrade(conn):
+    await ensure_results_partitioned(conn)
@@ -0,0 +1,6 @@
+"""Create the daily quality rollups and backfill them from stored results."""
+from app.services.quality_rollups import ensure_rollups
+
+
+async def upgrade(conn):
+    await ensure_rollups(conn)
@@ -0,0 +1,13 @@
+-- Application state shared by API worker processes (STATE_STORE=postgres):
+-- saved connections, the active connection, legacy rules, analysis history,
+-- cache entries and rate limit counters, as JSON values with optional expiry
+CREATE TABLE IF NOT EXISTS app_state (
+    namespace VARCHAR(64) NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    value JSONB NOT NULL,
+    expires_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (namespace, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_app_state_expires_at ON app_state(expires_at) WHERE expires_at IS NOT NULL;
@@ -0,0 +1,254 @@
+"""
+Circuit Breaker and Retry Budget Test Suite
+Covers breaker state transitions, the retry budget, call_with_retry and the
+503 answer while a breaker is open.
+"""
+import pytest
+from fastapi import APIRouter
+from httpx import ASGITransport, AsyncClient
+
+from app.exceptions import CircuitBreaker, CircuitBreakerOpen
+from app.main import create_app
+from app.services.data_quality_rules import DataQualityRulesService
+from app.services.rule_execution_service import RuleExecutionService
+from app.utils import retry as retry_module
+from app.utils.retry import RetryBudget, backoff_delay, call_with_retry
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(retry_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.exceptions.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("app.utils.retry.time.monotonic", lambda: now[0])
+    return now
+
+
+class Flaky:
+    """Raises the given errors in turn, then returns 'ok'."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+class TestCircuitBreaker:
+    """Tests for closed, open and half-open transitions."""
+
+    def test_opens_after_threshold_and_fails_fast(self, clock):
+        breaker = CircuitBreaker("db", failure_threshold=3, recovery_timeout=30)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.STATE_OPEN
+        with pytest.raises(CircuitBreakerOpen) as exc:
+            breaker()
+        assert exc.value.retry_after == 30
+        assert breaker.rejected == 1
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("db", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.STATE_CLOSED
+
+    def test_half_open_lets_one_trial_through(self, clock):
+        breaker = CircuitBreaker("db", failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+        clock[0] += 31
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.STATE_HALF_OPEN
+        assert not breaker.allow_request()
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.STATE_CLOSED
+        assert breaker.transitions == {'CLOSED->OPEN': 1, 'OPEN->HALF_OPEN': 1, 'HALF_OPEN->CLOSED': 1}
+        assert [t['transition'] for t in breaker.to_dict()['recent_transitions']] == [
+            'CLOSED->OPEN', 'OPEN->HALF_OPEN', 'HALF_OPEN->CLOSED'
+        ]
+
+    def test_failed_trial_reopens(self, clock):
+        breaker = CircuitBreaker("db", failure_threshold=5, recovery_timeout=30)
+        for _ in range(5):
+            breaker.record_failure()
+        clock[0] += 31
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.STATE_OPEN
+        assert not breaker.allow_request()
+
+    def test_cancelled_trial_frees_the_slot(self, clock):
+        breaker = CircuitBreaker("db", failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+        clock[0] += 31
+        assert breaker.allow_request()
+        breaker.record_cancelled()
+        assert breaker.allow_request()
+
+
+class TestRetryBudget:
+    """Tests for the sliding-window retry budget."""
+
+    def test_minimum_retries_without_traffic(self, clock):
+        budget = RetryBudget(ratio=0.1, min_retries=2, window_seconds=10)
+        assert budget.try_retry() and budget.try_retry()
+        assert not budget.try_retry()
+        assert budget.exhausted == 1
+
+    def test_budget_grows_with_calls_and_expires(self, clock):
+        budget = RetryBudget(ratio=0.5, min_retries=0, window_seconds=10)
+        for _ in range(4):
+            budget.record_call()
+        assert [budget.try_retry() for _ in range(3)] == [True, True, False]
+
+        clock[0] += 11
+        assert not budget.try_retry()
+        assert budget.to_dict()['calls_in_window'] == 0
+
+    def test_backoff_is_jittered_and_capped(self):
+        delays = [backoff_delay(5, 0.2, 1.0) for _ in range(50)]
+        assert all(0 <= d <= 1.0 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestCallWithRetry:
+    """Tests for calls through a breaker within a retry budget."""
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_retried(self, no_backoff_sleep):
+        breaker = CircuitBreaker("db", failure_threshold=5)
+        func = Flaky(ConnectionResetError("reset"))
+
+        assert await call_with_retry(func, breaker, RetryBudget(min_retries=5), failures=(OSError,),
+                                     max_retries=2) == 'ok'
+        assert func.calls == 2
+        assert len(no_backoff_sleep) == 1
+        assert breaker.failure_count == 0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_failure_is_counted_not_retried(self):
+        breaker = CircuitBreaker("db", failure_threshold=5)
+        func = Flaky(TimeoutError("acquire timed out"))
+
+        with pytest.raises(TimeoutError):
+            await call_with_retry(func, breaker, RetryBudget(min_retries=5), failures=(OSError,),
+                                  retryable=(ConnectionError,))
+        assert func.calls == 1
+        assert breaker.failure_count == 1
+
+    @pytest.mark.asyncio
+    async def test_other_errors_count_as_success(self):
+        breaker = CircuitBreaker("db", failure_threshold=1)
+        func = Flaky(ValueError("bad rule"))
+
+        with pytest.raises(ValueError):
+            await call_with_retry(func, breaker, RetryBudget(), failures=(OSError,))
+        assert func.calls == 1
+        assert breaker.state == CircuitBreaker.STATE_CLOSED
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_stops_retries(self):
+        breaker = CircuitBreaker("db", failure_threshold=10)
+        budget = RetryBudget(ratio=0.0, min_retries=1)
+        func = Flaky(*[ConnectionRefusedError("refused")] * 5)
+
+        with pytest.raises(ConnectionRefusedError):
+            await call_with_retry(func, breaker, budget, failures=(OSError,), max_retries=5)
+        assert func.calls == 2
+        assert budget.exhausted == 1
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_without_calling(self):
+        breaker = CircuitBreaker("db", failure_threshold=2)
+        func = Flaky(*[ConnectionRefusedError("refused")] * 5)
+
+        with pytest.raises(CircuitBreakerOpen):
+            await call_with_retry(func, breaker, RetryBudget(min_retries=10), failures=(OSError,),
+                                  max_retries=5)
+        assert func.calls == 2
+        assert breaker.state == CircuitBreaker.STATE_OPEN
+
+
+class TestOpenBreakerResponse:
+    """Tests for the HTTP answer while a breaker is open."""
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_is_503_with_retry_after(self):
+        app = create_app()
+        router = APIRouter()
+
+        @router.get("/breaker-test")
+        async def guarded():
+            raise CircuitBreakerOpen("Circuit breaker 'db' is open", retry_after=12.4)
+
+        app.include_router(router)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/breaker-test")
+            dependencies = await client.get("/health/dependencies")
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "12"
+        assert "'db' is open" in response.json()["detail"]
+        assert dependencies.status_code == 200
+        assert "dependencies" in dependencies.json()
+
+    @pytest.mark.asyncio
+    async def test_batch_and_legacy_routes_fail_fast_while_open(self, monkeypatch):
+        open_breaker = CircuitBreakerOpen("Circuit breaker 'rules' is open", retry_after=30)
+
+        class FakeConn:
+            async def fetch(self, *args):
+                return [{"id": i, "table_name": "orders", "rule_definition": {}} for i in (1, 2)]
+
+            async def close(self):
+                pass
+
+        async def fake_connect(dsn):
+            return FakeConn()
+
+        async def raise_open(*args, **kwargs):
+            raise open_breaker
+
+        batch_service = DataQualityRulesService("postgresql://unused")
+        monkeypatch.setattr(batch_service.pools, "connect", fake_connect)
+        monkeypatch.setattr(batch_service, "execute_rule", raise_open)
+        monkeypatch.setattr("app.routes.data_quality.get_service", lambda: batch_service)
+
+        legacy_service = RuleExecutionService("postgresql://unused")
+        monkeypatch.setattr(legacy_service, "execute_rule", raise_open)
+
+        async def fake_legacy_service():
+            return legacy_service
+
+        monkeypatch.setattr("app.api_routes.get_rule_execution_service", fake_legacy_service)
+        rule = {"rule_type": "NULL_CHECK", "table": "customers", "column": "city"}
+
+        async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+            batch = await client.post("/data-quality/rules/execute", json={"rule_ids": [1, 2]})
+            single = await client.post("/api/rules/execute", json=rule)
+            many = await client.post("/api/rules/execute", json=[rule, {**rule, "column": "fax"}])
+
+        for response in (batch, single, many):
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "30"
@@ -0,0 +1,129 @@
+"""
+Failure Export Test Suite
+Covers format handling and streaming helpers without a database.
+"""
+import asyncio
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.services.failure_export import (
+    EXPORT_FORMATS,
+    FailureExportService,
+    _ChunkSink,
+    _json_default,
+)
+
+
+class TestChunkSink:
+    """Tests for the file object the Parquet writer flushes into."""
+
+    def test_drain_returns_and_clears_written_bytes(self):
+        sink = _ChunkSink()
+        sink.write(b"PAR1")
+        sink.write(memoryview(b"data"))
+        assert sink.drain() == b"PAR1data"
+        assert sink.drain() == b""
+
+    def test_tell_counts_drained_bytes(self):
+        sink = _ChunkSink()
+        sink.write(b"abc")
+        sink.drain()
+        sink.write(b"de")
+        assert sink.tell() == 5
+
+
+class TestNdjsonEncoding:
+    """Tests for JSON encoding of PostgreSQL values."""
+
+    def test_encodes_non_json_types(self):
+        row = {
+            "order_date": date(2024, 1, 2),
+            "shipped_at": datetime(2024, 1, 3, 4, 5, 6),
+            "freight": Decimal("12.50"),
+            "photo": b"\x01\xff",
+        }
+        assert json.loads(json.dumps(row, default=_json_default)) == {
+            "order_date": "2024-01-02",
+            "shipped_at": "2024-01-03T04:05:06",
+            "freight": "12.50",
+            "photo": "01ff",
+        }
+
+
+class TestFormats:
+    """Tests for format selection."""
+
+    def test_media_types(self):
+        assert EXPORT_FORMATS["csv"] == "text/csv"
+        assert EXPORT_FORMATS["ndjson"] == "application/x-ndjson"
+        assert set(EXPORT_FORMATS) == {"csv", "ndjson", "parquet"}
+
+    def test_unknown_format_is_rejected(self):
+        service = FailureExportService("postgresql://unused")
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            service.stream("SELECT 1", "xlsx")
+
+
+class FakeCopyConnection:
+    """Writes COPY chunks until cancelled or out of chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    async def copy_from_query(self, sql, output, format, header):
+        for chunk in range(self.chunks):
+            await output(f'row {chunk}\n'.encode())
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeReadPools:
+    def __init__(self, conn=None, error=None):
+        self.conn = conn
+        self.error = error
+
+    async def connect_read(self, dsn):
+        if self.error:
+            raise self.error
+        return self.conn
+
+
+class TestCsvStream:
+    """Tests for the COPY-backed CSV stream."""
+
+    @pytest.mark.asyncio
+    async def test_streams_every_chunk(self):
+        conn = FakeCopyConnection(chunks=40)
+        service = FailureExportService("postgresql://unused", pools=FakeReadPools(conn))
+        chunks = [chunk async for chunk in service._stream_csv("SELECT 1")]
+        assert len(chunks) == 40
+        assert chunks[-1] == b'row 39\n'
+        assert conn.closed
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_with_full_queue_stops_the_copy(self):
+        conn = FakeCopyConnection(chunks=1000)
+        service = FailureExportService("postgresql://unused", pools=FakeReadPools(conn))
+        stream = service._stream_csv("SELECT 1")
+        assert await stream.__anext__() == b'row 0\n'
+        # Let the producer fill the queue and block on it
+        await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(stream.aclose(), timeout=1)
+        assert conn.closed
+
+    @pytest.mark.asyncio
+    async def test_connect_failure_is_raised(self):
+        pools = FakeReadPools(error=ConnectionRefusedError("replica down"))
+        service = FailureExportService("postgresql://unused", pools=pools)
+
+        async def consume():
+            return [chunk async for chunk in service._stream_csv("SELECT 1")]
+
+        with pytest.raises(ConnectionRefusedError, match="replica down"):
+            await asyncio.wait_for(consume(), timeout=1)
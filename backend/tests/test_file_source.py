@@ -0,0 +1,157 @@
+"""
+File Source Test Suite
+Covers chunk planning, mergeable statistics and profiling of local files.
+"""
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.main import create_app
+from app.services.file_source import (
+    ColumnStats,
+    DistinctSketch,
+    FileSourceService,
+    parse_csv_value,
+    plan_csv,
+)
+
+ORDERS_CSV = "order_id,customer_id,freight,ship_region\n" + "".join(
+    f"{i},C{i % 7},{i * 1.5},{'' if i % 4 == 0 else 'WA'}\n" for i in range(1, 201)
+)
+
+
+@pytest.fixture
+def file_root(tmp_path):
+    (tmp_path / "orders.csv").write_text(ORDERS_CSV)
+    (tmp_path / "notes.txt").write_text("not a data file")
+    return tmp_path
+
+
+class TestStatistics:
+    """Tests for values, sketches and merging."""
+
+    def test_parse_csv_value(self):
+        assert parse_csv_value("") is None
+        assert parse_csv_value("-42") == -42
+        assert parse_csv_value("1.5e3") == 1500.0
+        assert parse_csv_value("WA") == "WA"
+
+    def test_sketch_is_exact_below_k(self):
+        sketch = DistinctSketch(k=64)
+        for value in [1, 2, 2, "a", "a"]:
+            sketch.add(value)
+        assert sketch.estimate() == 3
+
+    def test_sketch_estimates_above_k(self):
+        left, right = DistinctSketch(k=512), DistinctSketch(k=512)
+        for i in range(30000):
+            left.add(i)
+            right.add(i + 20000)
+        left.merge(right)
+        assert abs(left.estimate() - 50000) < 50000 * 0.15
+
+    def test_merged_stats_match_single_pass(self):
+        whole, first, second = ColumnStats(), ColumnStats(), ColumnStats()
+        values = [3, None, 7.5, -1, None, 3]
+        whole.add(values)
+        first.add(values[:3])
+        second.add(values[3:])
+        first.merge(second)
+        assert (first.count, first.null_count, first.min_value, first.max_value) == \
+            (whole.count, whole.null_count, whole.min_value, whole.max_value) == (6, 2, -1, 7.5)
+        assert first.distinct.estimate() == 3
+        assert first.inferred_type() == "double precision"
+
+
+class TestChunkPlanning:
+    """Tests for splitting CSV files at line breaks."""
+
+    def test_ranges_cover_file_and_end_at_line_breaks(self, file_root):
+        path = file_root / "orders.csv"
+        header, ranges = plan_csv(path, chunk_bytes=100)
+        data = path.read_bytes()
+        assert header == ["order_id", "customer_id", "freight", "ship_region"]
+        assert ranges[0][0] == data.index(b"\n") + 1
+        assert ranges[-1][1] == len(data)
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        assert all(data[end - 1:end] == b"\n" for _, end in ranges)
+        assert len(ranges) > 1
+
+    def test_empty_file(self, tmp_path):
+        (tmp_path / "empty.csv").write_text("")
+        with pytest.raises(ValueError, match="empty"):
+            plan_csv(tmp_path / "empty.csv", chunk_bytes=100)
+
+
+class TestFileSourceService:
+    """Tests for file resolution and profiling."""
+
+    def test_lists_only_data_files(self, file_root):
+        files = FileSourceService(root=str(file_root)).list_files()
+        assert files == [{"name": "orders.csv", "format": "csv", "size_bytes": len(ORDERS_CSV)}]
+
+    @pytest.mark.parametrize("name,message", [
+        ("../orders.csv", "outside"),
+        ("notes.txt", "Unsupported file type"),
+        ("missing.csv", "not found"),
+    ])
+    def test_resolve_rejects(self, file_root, name, message):
+        with pytest.raises(ValueError, match=message):
+            FileSourceService(root=str(file_root)).resolve(name)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [1, 2])
+    async def test_profile_matches_table_profile_shape(self, file_root, workers):
+        service = FileSourceService(root=str(file_root), chunk_bytes=500, workers=workers)
+        profile = (await service.profile_file("orders.csv")).to_dict()
+
+        assert profile["row_count"] == 200 and profile["column_count"] == 4
+        columns = {c["column_name"]: c for c in profile["columns"]}
+        assert columns["order_id"]["data_type"] == "bigint"
+        assert columns["order_id"]["unique_count"] == 200
+        assert (columns["freight"]["min_value"], columns["freight"]["max_value"]) == (1.5, 300.0)
+        assert columns["customer_id"]["unique_count"] == 7
+        assert columns["customer_id"]["min_value"] is None
+        assert columns["ship_region"]["null_count"] == 50
+        assert columns["ship_region"]["null_percent"] == 25.0
+        # Samples come from the start of the file regardless of completion order
+        assert columns["order_id"]["sample_values"] == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_check_file(self, file_root):
+        pytest.importorskip("numpy")
+        from app.services.vectorized_engine import VectorizedRule
+
+        rules = [
+            VectorizedRule(rule_id=1, rule_type="null_check", column="ship_region"),
+            VectorizedRule(rule_id=2, rule_type="custom_sql", expression="freight < 150"),
+        ]
+        service = FileSourceService(root=str(file_root), chunk_bytes=500, workers=1)
+        nulls, freight = await service.check_file("orders.csv", rules)
+        assert (nulls.total_count, nulls.failed_count) == (200, 50)
+        assert freight.failed_count == 101
+        assert freight.failure_samples[0] == {"freight": 150.0}
+
+    @pytest.mark.asyncio
+    async def test_check_file_unknown_column(self, file_root):
+        pytest.importorskip("numpy")
+        from app.services.vectorized_engine import VectorizedRule
+
+        rule = VectorizedRule(rule_id=1, rule_type="custom_sql", expression="discount >= 0")
+        with pytest.raises(ValueError, match="discount"):
+            await FileSourceService(root=str(file_root)).check_file("orders.csv", [rule])
+
+    @pytest.mark.asyncio
+    async def test_routes_accept_files_in_subdirectories(self, file_root, monkeypatch):
+        (file_root / "2024").mkdir()
+        (file_root / "2024" / "orders.csv").write_text(ORDERS_CSV)
+        monkeypatch.setattr(settings, "FILE_SOURCE_DIR", str(file_root))
+        monkeypatch.setattr(settings, "FILE_SOURCE_WORKERS", 1)
+
+        async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+            listed = (await client.get("/data-profiling/files")).json()
+            response = await client.get("/data-profiling/files/2024/orders.csv/profile")
+
+        assert "2024/orders.csv" in [f["name"] for f in listed]
+        assert response.status_code == 200
+        assert response.json()["row_count"] == 200
@@ -0,0 +1,136 @@
+"""
+Index Advisor Test Suite
+Covers plan parsing and proposal building without a database.
+"""
+import pytest
+
+from app.services.index_advisor import (
+    IndexAdvisorService,
+    heuristic_cost,
+    index_statement,
+    partial_predicate,
+    referenced_columns,
+    walk_plan,
+)
+
+ORDER_DETAIL_COLUMNS = ["order_id", "product_id", "unit_price", "quantity", "discount"]
+
+
+class TestPlanParsing:
+    """Tests for extracting columns and predicates from plan nodes."""
+
+    def test_walk_plan_tracks_ancestors(self):
+        plan = {"Node Type": "Hash Join", "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "order_details"},
+            {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "orders"}]},
+        ]}
+        nodes = {n.get("Relation Name"): [a["Node Type"] for a in anc] for n, anc in walk_plan(plan)}
+        assert nodes["orders"] == ["Hash Join", "Hash"]
+        assert nodes["order_details"] == ["Hash Join"]
+
+    def test_referenced_columns_respects_alias(self):
+        condition = "(t.order_id = r.order_id)"
+        assert referenced_columns(condition, ORDER_DETAIL_COLUMNS, alias="t") == ["order_id"]
+        assert referenced_columns(condition, ORDER_DETAIL_COLUMNS, alias="x") == []
+
+    def test_referenced_columns_in_filter_order(self):
+        expression = "((quantity < 0) OR (unit_price < '0'::double precision))"
+        assert referenced_columns(expression, ORDER_DETAIL_COLUMNS) == ["quantity", "unit_price"]
+
+    def test_partial_predicate_strips_alias(self):
+        assert partial_predicate("(od.quantity < 0)", alias="od") == "(quantity < 0)"
+
+    @pytest.mark.parametrize("expression", [
+        "(order_date > $1)",
+        "(NOT (hashed SubPlan 1))",
+        "(shipped_date < now())",
+    ])
+    def test_partial_predicate_rejects_unsafe_filters(self, expression):
+        assert partial_predicate(expression) is None
+
+
+class TestProposals:
+    """Tests for CREATE INDEX statements and cost estimates."""
+
+    def test_partial_index_statement(self):
+        name, statement = index_statement("customers", ["region"], "(region IS NULL)")
+        assert name == "idx_dq_customers_region_partial"
+        assert statement == (
+            'CREATE INDEX CONCURRENTLY "idx_dq_customers_region_partial" '
+            'ON "customers" ("region") WHERE (region IS NULL)'
+        )
+
+    def test_index_name_fits_identifier_limit(self):
+        name, _ = index_statement("order_details", ["a" * 40, "b" * 40], "(x IS NULL)")
+        assert len(name) <= 63
+        assert name.endswith("_partial")
+
+    def test_plain_index_for_hypopg(self):
+        _, statement = index_statement("orders", ["customer_id"], concurrently=False)
+        assert statement == 'CREATE INDEX "idx_dq_orders_customer_id" ON "orders" ("customer_id")'
+
+    def test_selective_filter_is_much_cheaper(self):
+        assert heuristic_cost(1000.0, 10, 100000, with_filter=True) == pytest.approx(0.4)
+
+    def test_unselective_filter_never_costs_more(self):
+        assert heuristic_cost(1000.0, 90000, 100000, with_filter=True) == 1000.0
+
+    def test_group_key_index_halves_cost(self):
+        assert heuristic_cost(1000.0, 100000, 100000, with_filter=False) == 500.0
+
+    @pytest.mark.asyncio
+    async def test_advise_sql_rejects_writes(self):
+        advisor = IndexAdvisorService("postgresql://unused")
+        with pytest.raises(ValueError):
+            await advisor.advise_sql("orders", "DELETE FROM orders WHERE freight < 0")
+
+
+class FakeSavepoint:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Rolling back to the savepoint makes the transaction usable again
+        self.conn.aborted = False
+        return False
+
+
+class FakeHypopgConnection:
+    """Mimics a transaction that is aborted by any failed statement."""
+
+    def __init__(self, failing_explains=1):
+        self.failing_explains = failing_explains
+        self.aborted = False
+        self.statements = []
+
+    def transaction(self):
+        return FakeSavepoint(self)
+
+    async def execute(self, query, *args):
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted")
+        self.statements.append(query)
+
+    async def fetchval(self, query):
+        if self.failing_explains:
+            self.failing_explains -= 1
+            self.aborted = True
+            raise RuntimeError("could not plan")
+        return [{'Plan': {'Total Cost': 42.0}}]
+
+
+class TestHypotheticalCost:
+    """Tests for hypopg candidates inside a read-only transaction."""
+
+    @pytest.mark.asyncio
+    async def test_failing_candidate_does_not_abort_the_next(self):
+        advisor = IndexAdvisorService("postgresql://unused")
+        conn = FakeHypopgConnection(failing_explains=1)
+        sql = "SELECT * FROM order_details WHERE discount > 0.2"
+
+        assert await advisor._hypothetical_cost(conn, sql, "order_details", ["discount"], None) is None
+        assert await advisor._hypothetical_cost(conn, sql, "order_details", ["discount"], None) == 42.0
+        assert conn.statements.count('SELECT hypopg_reset()') == 2
@@ -0,0 +1,134 @@
+"""
+Schema Migration Test Suite
+Covers migration discovery and the runner's bookkeeping without a database.
+"""
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from app.db_config.migrations import MIGRATIONS_DIR, MigrationRunner, discover_migrations
+
+
+class FakeConnection:
+    def __init__(self, applied=None):
+        self.applied = applied or {}
+        self.statements = []
+        self.closed = False
+
+    async def execute(self, sql, *args):
+        self.statements.append(sql.strip())
+        if sql.strip().startswith('INSERT INTO schema_migrations'):
+            version, name, checksum = args
+            self.applied[version] = {'version': version, 'name': name, 'checksum': checksum,
+                                     'applied_at': datetime(2026, 1, 1)}
+
+    async def fetch(self, sql, *args):
+        return list(self.applied.values())
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePools:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def connect(self, dsn):
+        return self.conn
+
+
+@pytest.fixture
+def migrations_dir(tmp_path):
+    (tmp_path / "001_create_things.sql").write_text("CREATE TABLE IF NOT EXISTS things (id INT);")
+    (tmp_path / "002_convert_things.py").write_text(
+        "async def upgrade(conn):\n    await conn.execute('ALTER TABLE things ADD COLUMN x INT')\n"
+    )
+    (tmp_path / "README.md").write_text("not a migration")
+    return tmp_path
+
+
+class TestDiscovery:
+    """Tests for finding migration files."""
+
+    def test_sorted_by_version_and_ignores_other_files(self, migrations_dir):
+        (migrations_dir / "010_later.sql").write_text("SELECT 1;")
+        assert [m.version for m in discover_migrations(migrations_dir)] == [1, 2, 10]
+
+    def test_duplicate_versions_are_rejected(self, migrations_dir):
+        (migrations_dir / "002_other.sql").write_text("SELECT 1;")
+        with pytest.raises(ValueError, match="Duplicate migration version 2"):
+            discover_migrations(migrations_dir)
+
+    def test_repository_migrations_are_numbered_uniquely(self):
+        versions = [m.version for m in discover_migrations(MIGRATIONS_DIR)]
+        assert versions == sorted(set(versions))
+        assert versions[0] == 1
+
+
+class TestRunner:
+    """Tests for applying and recording migrations."""
+
+    @pytest.mark.asyncio
+    async def test_applies_pending_in_order_under_lock(self, migrations_dir):
+        conn = FakeConnection()
+        runner = MigrationRunner("postgresql://db", migrations_dir, pools=FakePools(conn))
+
+        assert await runner.migrate() == ["001_create_things", "002_convert_things"]
+        work = [s for s in conn.statements if 'schema_migrations' not in s]
+        assert work[0].startswith('SELECT pg_advisory_lock')
+        assert work[1:3] == ["CREATE TABLE IF NOT EXISTS things (id INT);",
+                             "ALTER TABLE things ADD COLUMN x INT"]
+        assert work[-1].startswith('SELECT pg_advisory_unlock')
+        assert sorted(conn.applied) == [1, 2]
+        assert conn.closed
+
+    @pytest.mark.asyncio
+    async def test_second_run_applies_nothing(self, migrations_dir):
+        conn = FakeConnection()
+        runner = MigrationRunner("postgresql://db", migrations_dir, pools=FakePools(conn))
+        await runner.migrate()
+        conn.statements.clear()
+
+        assert await runner.migrate() == []
+        assert not any('things' in s for s in conn.statements)
+
+    @pytest.mark.asyncio
+    async def test_modified_migration_is_reported_not_reapplied(self, migrations_dir, caplog):
+        conn = FakeConnection()
+        runner = MigrationRunner("postgresql://db", migrations_dir, pools=FakePools(conn))
+        await runner.migrate()
+        (migrations_dir / "001_create_things.sql").write_text("CREATE TABLE things (id BIGINT);")
+
+        with caplog.at_level(logging.WARNING):
+            assert await runner.migrate() == []
+        assert "001_create_things changed" in caplog.text
+        status = await runner.status()
+        assert [m['modified'] for m in status] == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_failed_migration_releases_lock(self, migrations_dir):
+        (migrations_dir / "003_broken.py").write_text(
+            "async def upgrade(conn):\n    raise RuntimeError('boom')\n"
+        )
+        conn = FakeConnection()
+        runner = MigrationRunner("postgresql://db", migrations_dir, pools=FakePools(conn))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await runner.migrate()
+        assert 3 not in conn.applied
+        assert conn.statements[-1].startswith('SELECT pg_advisory_unlock')
+        assert conn.closed
+
+    @pytest.mark.asyncio
+    async def test_status_lists_pending(self, migrations_dir):
+        runner = MigrationRunner("postgresql://db", migrations_dir, pools=FakePools(FakeConnection()))
+        status = await runner.status()
+        assert [(m['name'], m['applied_at']) for m in status] == [
+            ("001_create_things", None), ("002_convert_things", None)
+        ]
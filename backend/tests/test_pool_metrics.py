@@ -0,0 +1,215 @@
+"""
+Pool Metrics Test Suite
+Covers lease counters, the wait histogram, the resizable lease limit and the
+adaptive sizing decisions without a database.
+"""
+import asyncio
+
+import pytest
+
+from app.db_config.pool_metrics import LeaseLimit, PoolMetrics, next_lease_limit
+from app.db_config.pool_registry import DATABASE_LOAD_QUERY, PoolRegistry, StaleConnectionError
+
+
+class FakeConnection:
+    def __init__(self, db_load: float = 0.1):
+        self.db_load = db_load
+
+    async def fetchval(self, query, timeout=None):
+        return self.db_load if query == DATABASE_LOAD_QUERY else 1
+
+
+class FakePool:
+    def __init__(self, max_size: int = 8, db_load: float = 0.1):
+        self.max_size = max_size
+        self.db_load = db_load
+        self.block = None
+
+    async def acquire(self, timeout=None):
+        if self.block is not None:
+            await asyncio.wait_for(self.block.wait(), timeout)
+        return FakeConnection(self.db_load)
+
+    async def release(self, conn, timeout=None):
+        pass
+
+    async def close(self):
+        pass
+
+    def get_size(self):
+        return self.max_size
+
+    def get_idle_size(self):
+        return 0
+
+    def get_min_size(self):
+        return 2
+
+    def get_max_size(self):
+        return self.max_size
+
+
+def window(timeouts=0, avg_wait_ms=0.0, peak_in_use=8):
+    return {'acquires': 10, 'timeouts': timeouts, 'avg_wait_ms': avg_wait_ms, 'peak_in_use': peak_in_use}
+
+
+class TestPoolMetrics:
+    """Tests for lease counters and the wait histogram."""
+
+    def test_histogram_and_in_use(self):
+        metrics = PoolMetrics()
+        metrics.record_acquire(0.0004)
+        metrics.record_acquire(0.030)
+        metrics.record_acquire(20.0)
+        metrics.record_release()
+        stats = metrics.to_dict()
+        assert stats['acquires'] == 3 and stats['in_use'] == 2
+        assert stats['wait_histogram']['le_1ms'] == 1
+        assert stats['wait_histogram']['le_50ms'] == 1
+        assert stats['wait_histogram']['le_inf'] == 1
+
+    def test_window_covers_only_the_last_interval(self):
+        metrics = PoolMetrics()
+        metrics.record_acquire(0.1)
+        metrics.record_timeout()
+        first = metrics.window()
+        assert first['acquires'] == 1 and first['timeouts'] == 1
+        assert first['avg_wait_ms'] == pytest.approx(100.0)
+        # Still leased when the second interval began
+        metrics.record_release()
+        assert metrics.window()['peak_in_use'] == 1
+        assert metrics.window() == {'acquires': 0, 'timeouts': 0, 'avg_wait_ms': 0.0, 'peak_in_use': 0}
+
+
+class TestLeaseLimit:
+    """Tests for the resizable lease limit."""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_a_slot_and_times_out(self):
+        limit = LeaseLimit(1)
+        await limit.acquire()
+        with pytest.raises(asyncio.TimeoutError):
+            await limit.acquire(timeout=0.01)
+        assert limit.held == 1
+
+        waiter = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0)
+        limit.release()
+        await waiter
+        assert limit.held == 1
+
+    @pytest.mark.asyncio
+    async def test_growing_wakes_waiters_and_shrinking_lets_leases_finish(self):
+        limit = LeaseLimit(1)
+        await limit.acquire()
+        waiter = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0)
+        limit.resize(2)
+        await waiter
+        assert limit.held == 2
+
+        limit.resize(1)
+        limit.release()
+        with pytest.raises(asyncio.TimeoutError):
+            await limit.acquire(timeout=0.01)
+        limit.release()
+        await limit.acquire(timeout=0.01)
+
+
+class TestNextLeaseLimit:
+    """Tests for adaptive sizing decisions."""
+
+    def decide(self, current, win, db_load=0.1):
+        return next_lease_limit(current, win, db_load, lower=2, upper=20,
+                                wait_ms_high=50.0, db_load_high=0.8)
+
+    def test_grows_on_wait_or_timeouts(self):
+        assert self.decide(8, window(avg_wait_ms=120.0)) == 10
+        assert self.decide(8, window(timeouts=1)) == 10
+        assert self.decide(19, window(timeouts=3)) == 20
+
+    def test_shrinks_when_leases_stay_below_the_limit(self):
+        assert self.decide(8, window(peak_in_use=3)) == 7
+        assert self.decide(3, window(peak_in_use=0)) == 2
+
+    def test_database_load_wins_over_waiting(self):
+        assert self.decide(8, window(avg_wait_ms=500.0), db_load=0.9) == 7
+        assert self.decide(2, window(), db_load=0.9) == 2
+
+    def test_steady_pool_keeps_its_limit(self):
+        assert self.decide(8, window(avg_wait_ms=10.0, peak_in_use=8)) == 8
+
+
+class TestRegistryMetrics:
+    """Tests for metrics and lease limits recorded by the registry."""
+
+    @pytest.fixture
+    def registry(self):
+        registry = PoolRegistry(min_size=2, max_size=8, acquire_timeout=0.05)
+        registry._pools["postgresql://db"] = FakePool()
+        return registry
+
+    @pytest.mark.asyncio
+    async def test_leases_and_timeouts_are_counted(self, registry):
+        async with registry.acquire("postgresql://db"):
+            assert registry.stats()[0]['in_use'] == 1
+        registry._pools["postgresql://db"].block = asyncio.Event()
+        with pytest.raises(asyncio.TimeoutError):
+            await registry.connect("postgresql://db")
+        stats = registry.stats()[0]
+        assert (stats['acquires'], stats['in_use'], stats['timeouts']) == (1, 0, 1)
+        assert stats['lease_limit'] is None
+        # The timeout counts towards the breaker but is not retried
+        assert stats['circuit_breaker']['failure_count'] == 1
+        assert stats['retry_budget'] == {'calls_in_window': 2, 'retries_in_window': 0, 'exhausted': 0}
+
+    @pytest.mark.asyncio
+    async def test_adaptive_limit_shrinks_for_idle_pool(self, registry):
+        registry.start_adaptive_sizing(interval=3600)
+        try:
+            async with registry.acquire("postgresql://db"):
+                pass
+            assert registry.stats()[0]['lease_limit'] == 8
+            assert await registry.adapt("postgresql://db") == 7
+            assert registry._limits["postgresql://db"].held == 0
+        finally:
+            await registry.close_all()
+
+    @pytest.mark.asyncio
+    async def test_adaptive_limit_caps_leases(self, registry):
+        registry.start_adaptive_sizing(interval=3600)
+        try:
+            registry._limits["postgresql://db"] = limit = LeaseLimit(1)
+            held = await registry.connect("postgresql://db")
+            with pytest.raises(asyncio.TimeoutError):
+                await registry.connect("postgresql://db")
+            await held.close()
+            async with registry.acquire("postgresql://db"):
+                assert limit.held == 1
+        finally:
+            await registry.close_all()
+
+    @pytest.mark.asyncio
+    async def test_sizing_loop_survives_a_failing_dsn(self, registry):
+        registry._pools["postgresql://stale"] = FakePool()
+        registry.start_adaptive_sizing(interval=0.01)
+        adapted = []
+
+        async def adapt(dsn):
+            adapted.append(dsn)
+            if dsn == "postgresql://stale":
+                raise StaleConnectionError("Connection failed its health check")
+            return 8
+
+        registry.adapt = adapt
+        try:
+            async with registry.acquire("postgresql://stale"):
+                pass
+            async with registry.acquire("postgresql://db"):
+                pass
+            await asyncio.sleep(0.05)
+            assert not registry._adapt_task.done()
+            assert adapted.count("postgresql://stale") >= 2
+            assert adapted.count("postgresql://db") >= 2
+        finally:
+            await registry.close_all()
@@ -0,0 +1,464 @@
+"""
+Pool Registry Test Suite
+Covers connection leases, stale connection retries, pool switching, read
+replica routing and DSN redaction without a database.
+"""
+import asyncio
+
+import asyncpg
+import pytest
+
+from app.config import settings
+from app.db_config import database as database_module
+from app.db_config import state_store as state_store_module
+from app.db_config.database import DatabaseConnection, DynamicDatabaseManager
+from app.db_config.state_store import MemoryStateStore
+from app.db_config.pool_registry import (
+    REPLICA_LAG_QUERY, PoolRegistry, PooledConnection, StaleConnectionError, redact_dsn
+)
+from app.exceptions import CircuitBreakerOpen
+
+
+class FakeConnection:
+    def __init__(self, alive: bool = True, idle: bool = True, lag: float = 0.0):
+        self.alive = alive
+        self.idle = idle
+        self.lag = lag
+        self.verified = False
+        self.lag_checks = 0
+
+    def is_closed(self) -> bool:
+        return False
+
+    def needs_healthcheck(self, max_idle_seconds: float) -> bool:
+        return self.idle
+
+    def mark_verified(self) -> None:
+        self.verified = True
+
+    async def fetchval(self, query, timeout=None):
+        if not self.alive:
+            raise ConnectionResetError("server closed the connection")
+        if query == REPLICA_LAG_QUERY:
+            self.lag_checks += 1
+            return self.lag
+        return 1
+
+
+class FakePool:
+    def __init__(self, stale: int = 0, max_size: int = 3, target: str = "postgresql://db", lag: float = 0.0):
+        self.stale = stale
+        self.max_size = max_size
+        self.target = target
+        self.lag = lag
+        self.connections = []
+        self.acquired = 0
+        self.released = []
+        self.closed = False
+        self.terminated = False
+        self.in_use = asyncio.Event()
+        self.in_use.set()
+
+    def get_max_size(self) -> int:
+        return self.max_size
+
+    async def acquire(self, timeout=None):
+        if self.closed:
+            raise asyncpg.InterfaceError("pool is closing")
+        self.acquired += 1
+        if self.stale:
+            self.stale -= 1
+            raise StaleConnectionError("connection reset")
+        self.connections.append(FakeConnection(lag=self.lag))
+        return self.connections[-1]
+
+    async def release(self, conn, timeout=None):
+        self.released.append(conn)
+
+    async def close(self):
+        self.closed = True
+        # Like asyncpg, wait for leased connections to come back
+        await self.in_use.wait()
+
+    def terminate(self):
+        self.terminated = True
+
+
+def registry_with(pool: FakePool) -> PoolRegistry:
+    registry = PoolRegistry(min_size=1, max_size=pool.max_size)
+    registry._pools["postgresql://db"] = pool
+    return registry
+
+
+class TestPooledConnection:
+    """Tests for leases returned to the pool on close()."""
+
+    @pytest.mark.asyncio
+    async def test_close_releases_once(self):
+        pool, conn = FakePool(), FakeConnection()
+        lease = PooledConnection(pool, conn)
+        await lease.close()
+        await lease.close()
+        assert pool.released == [conn]
+        assert lease.is_closed()
+
+    @pytest.mark.asyncio
+    async def test_use_after_close_fails(self):
+        lease = PooledConnection(FakePool(), FakeConnection())
+        await lease.close()
+        with pytest.raises(asyncpg.InterfaceError):
+            await lease.fetchval("SELECT 1")
+
+    @pytest.mark.asyncio
+    async def test_delegates_to_connection(self):
+        lease = PooledConnection(FakePool(), FakeConnection())
+        assert await lease.fetchval("SELECT 1") == 1
+
+
+class TestConnect:
+    """Tests for leasing connections from the registry."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_existing_pool(self):
+        pool = FakePool()
+        registry = registry_with(pool)
+        assert await registry.get_pool("postgresql://db") is pool
+
+    @pytest.mark.asyncio
+    async def test_retries_stale_connections(self):
+        pool = FakePool(stale=2)
+        async with registry_with(pool).acquire("postgresql://db") as conn:
+            assert await conn.fetchval("SELECT 1") == 1
+        assert pool.acquired == 3
+        assert len(pool.released) == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_when_every_connection_is_stale(self):
+        pool = FakePool(stale=10, max_size=2)
+        with pytest.raises(asyncpg.InterfaceError):
+            await registry_with(pool).connect("postgresql://db")
+        assert pool.acquired == 3
+
+    @pytest.mark.asyncio
+    async def test_close_drops_pool(self):
+        pool = FakePool()
+        registry = registry_with(pool)
+        await registry.close_all()
+        assert pool.closed
+        assert registry.stats() == []
+
+
+class TestAcquireCircuitBreaker:
+    """Tests for failing fast while a database is unreachable."""
+
+    @pytest.mark.asyncio
+    async def test_refused_connections_open_the_breaker(self, monkeypatch):
+        registry = PoolRegistry(min_size=1, max_size=2)
+        attempts = []
+
+        async def refused(target):
+            attempts.append(target)
+            raise ConnectionRefusedError("connection refused")
+
+        async def no_sleep(delay):
+            pass
+
+        monkeypatch.setattr(registry, "_create_pool", refused)
+        monkeypatch.setattr("app.utils.retry.asyncio.sleep", no_sleep)
+        breaker = registry.breaker("postgresql://down")
+        breaker.failure_threshold = 3
+
+        with pytest.raises(ConnectionRefusedError):
+            await registry.connect("postgresql://down", max_retries=1)
+        assert len(attempts) == 2
+        with pytest.raises(ConnectionRefusedError):
+            await registry.connect("postgresql://down", max_retries=0)
+        with pytest.raises(CircuitBreakerOpen):
+            await registry.connect("postgresql://down")
+        assert len(attempts) == 3
+        assert breaker.transitions == {'CLOSED->OPEN': 1}
+        assert registry._metrics["postgresql://down"].errors == 2
+
+
+class TestHealthcheck:
+    """Tests for the pool setup hook."""
+
+    @pytest.mark.asyncio
+    async def test_recently_used_connection_is_not_pinged(self):
+        conn = FakeConnection(alive=False, idle=False)
+        await PoolRegistry()._healthcheck(conn)
+        assert not conn.verified
+
+    @pytest.mark.asyncio
+    async def test_idle_connection_is_pinged(self):
+        conn = FakeConnection()
+        await PoolRegistry()._healthcheck(conn)
+        assert conn.verified
+
+    @pytest.mark.asyncio
+    async def test_dead_connection_is_reported_stale(self):
+        with pytest.raises(StaleConnectionError):
+            await PoolRegistry()._healthcheck(FakeConnection(alive=False))
+
+
+class TestRedactDsn:
+    """Tests for hiding passwords in logs and stats."""
+
+    def test_password_is_hidden(self):
+        assert redact_dsn("postgresql://dqm:secret@db:5432/northwind") == \
+            "postgresql://dqm:***@db:5432/northwind"
+
+    def test_dsn_without_password_is_unchanged(self):
+        assert redact_dsn("postgresql://db/northwind") == "postgresql://db/northwind"
+
+
+class TestSwitch:
+    """Tests for repointing a pool at another database while in use."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        registry = registry_with(FakePool())
+        created = []
+
+        async def fake_create_pool(target):
+            created.append(FakePool(target=target))
+            return created[-1]
+
+        monkeypatch.setattr(registry, "_create_pool", fake_create_pool)
+        registry.created = created
+        return registry
+
+    @pytest.mark.asyncio
+    async def test_new_leases_use_new_pool_and_old_pool_drains(self, registry):
+        old = registry._pools["postgresql://db"]
+        old.in_use.clear()
+        leased = await registry.connect("postgresql://db")
+
+        await registry.switch("postgresql://db", "postgresql://replica")
+        new = registry.created[0]
+        assert registry.target("postgresql://db") == "postgresql://replica"
+        async with registry.acquire("postgresql://db"):
+            pass
+        assert new.released and not old.terminated
+
+        # The in-flight lease still finishes on the old pool, which then closes
+        await leased.close()
+        old.in_use.set()
+        await registry.close_all()
+        assert old.closed and len(old.released) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_switch_changes_nothing(self, registry):
+        old = registry._pools["postgresql://db"]
+
+        async def failing_prepare(conn):
+            raise RuntimeError("migration failed")
+
+        with pytest.raises(RuntimeError):
+            await registry.switch("postgresql://db", "postgresql://other", prepare=failing_prepare)
+        assert registry._pools["postgresql://db"] is old
+        assert registry.target("postgresql://db") == "postgresql://db"
+        assert registry.created[0].terminated
+
+    @pytest.mark.asyncio
+    async def test_switch_to_current_target_is_a_no_op(self, registry):
+        await registry.switch("postgresql://db", "postgresql://db")
+        assert registry.created == []
+
+    @pytest.mark.asyncio
+    async def test_stuck_old_pool_is_terminated(self, registry):
+        old = registry._pools["postgresql://db"]
+        old.in_use.clear()
+        registry.drain_timeout = 0.01
+        await registry.switch("postgresql://db", "postgresql://other")
+        await asyncio.gather(*registry._draining)
+        assert old.terminated
+
+    @pytest.mark.asyncio
+    async def test_lease_moves_to_replacement_of_closing_pool(self):
+        old, new = FakePool(), FakePool()
+        old.closed = True
+        registry = registry_with(old)
+
+        async def swapped(timeout=None):
+            registry._pools["postgresql://db"] = new
+            raise asyncpg.InterfaceError("pool is closing")
+
+        old.acquire = swapped
+        async with registry.acquire("postgresql://db"):
+            pass
+        assert new.acquired == 1
+
+
+class TestReadReplicas:
+    """Tests for routing read-only scans to healthy replicas."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        registry = registry_with(FakePool())
+        registry.replica_max_lag = 30.0
+        registry.replica_check_seconds = 60.0
+        unreachable = set()
+
+        async def fake_create_pool(target):
+            if target in unreachable:
+                raise ConnectionRefusedError("connection refused")
+            return FakePool(target=target)
+
+        monkeypatch.setattr(registry, "_create_pool", fake_create_pool)
+        registry.unreachable = unreachable
+        return registry
+
+    def add_replica(self, registry, dsn, lag=0.0):
+        registry._pools[dsn] = FakePool(target=dsn, lag=lag)
+        registry.set_replicas("postgresql://db", registry.replicas("postgresql://db") + [dsn])
+        return registry._pools[dsn]
+
+    @pytest.mark.asyncio
+    async def test_without_replicas_reads_use_primary(self, registry):
+        async with registry.acquire_read("postgresql://db"):
+            pass
+        assert registry._pools["postgresql://db"].acquired == 1
+
+    @pytest.mark.asyncio
+    async def test_healthy_replica_serves_reads_and_lag_is_cached(self, registry):
+        replica = self.add_replica(registry, "postgresql://replica1", lag=2.5)
+        for _ in range(3):
+            async with registry.acquire_read("postgresql://db"):
+                pass
+        assert replica.acquired == 3
+        assert registry._pools["postgresql://db"].acquired == 0
+        assert sum(c.lag_checks for c in replica.connections) == 1
+        assert registry.replica_stats()[0]['lag_seconds'] == 2.5
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back_to_primary(self, registry):
+        replica = self.add_replica(registry, "postgresql://replica1", lag=120.0)
+        async with registry.acquire_read("postgresql://db"):
+            pass
+        async with registry.acquire_read("postgresql://db"):
+            pass
+        assert registry._pools["postgresql://db"].acquired == 2
+        # Skipped without another lease until the health check is due
+        assert replica.acquired == 1 and len(replica.released) == 1
+
+        # A caller may accept more lag than the default
+        async with registry.acquire_read("postgresql://db", max_lag=300.0):
+            pass
+        assert replica.acquired == 2
+
+    @pytest.mark.asyncio
+    async def test_replica_that_has_not_replayed_is_unusable(self, registry):
+        self.add_replica(registry, "postgresql://replica1", lag=None)
+        async with registry.acquire_read("postgresql://db"):
+            pass
+        assert registry._pools["postgresql://db"].acquired == 1
+        assert registry.replica_stats()[0]['error']
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_is_skipped(self, registry):
+        registry.unreachable.add("postgresql://down")
+        registry.set_replicas("postgresql://db", ["postgresql://down"])
+        healthy = self.add_replica(registry, "postgresql://replica2")
+
+        async with registry.acquire_read("postgresql://db"):
+            pass
+        async with registry.acquire_read("postgresql://db"):
+            pass
+        assert healthy.acquired == 2
+        assert "connection refused" in registry.replica_stats()[0]['error']
+
+    @pytest.mark.asyncio
+    async def test_replicas_are_used_in_rotation(self, registry):
+        first = self.add_replica(registry, "postgresql://replica1")
+        second = self.add_replica(registry, "postgresql://replica2")
+        for _ in range(4):
+            async with registry.acquire_read("postgresql://db"):
+                pass
+        assert (first.acquired, second.acquired) == (2, 2)
+
+    @pytest.mark.asyncio
+    async def test_removed_replica_pool_is_drained(self, registry):
+        replica = self.add_replica(registry, "postgresql://replica1")
+        registry.set_replicas("postgresql://db", [])
+        await asyncio.gather(*registry._draining)
+        assert replica.closed
+        assert "postgresql://replica1" not in registry._pools
+        assert registry.replica_stats() == []
+
+
+class TestActiveConnection:
+    """Tests for switching the application database through the manager."""
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        monkeypatch.setattr(state_store_module, "_state_store", MemoryStateStore())
+        monkeypatch.setattr(database_module, "_applied_connection", "default")
+        manager = DynamicDatabaseManager(pools=PoolRegistry())
+        switched = []
+
+        async def fake_switch(dsn, target, prepare=None):
+            switched.append((dsn, target))
+
+        monkeypatch.setattr(manager.pools, "switch", fake_switch)
+        manager.switched = switched
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_switch_repoints_application_pool(self, manager):
+        await manager.add_connection(DatabaseConnection(name="analytics", host="db2", database="sales",
+                                                  username="u", password="p"))
+        await manager.set_active_connection("analytics")
+        assert manager.switched == [(settings.DATABASE_URL, "postgresql://u:p@db2:5432/sales")]
+        assert await manager.get_active_connection_name() == "analytics"
+
+    @pytest.mark.asyncio
+    async def test_removing_active_connection_switches_back(self, manager):
+        await manager.add_connection(DatabaseConnection(name="analytics", host="db2", database="sales",
+                                                  username="u", password="p"))
+        await manager.set_active_connection("analytics")
+        assert await manager.remove_connection("analytics")
+        assert manager.switched[-1] == (settings.DATABASE_URL, settings.DATABASE_URL)
+        assert await manager.get_active_connection_name() == "default"
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_and_non_postgres(self, manager):
+        await manager.add_connection(DatabaseConnection(name="local", host="", database="dq",
+                                                  username="", password="", db_type="sqlite"))
+        with pytest.raises(ValueError, match="not found"):
+            await manager.set_active_connection("missing")
+        with pytest.raises(ValueError, match="only PostgreSQL"):
+            await manager.set_active_connection("local")
+        assert manager.switched == []
+
+    @pytest.mark.asyncio
+    async def test_switch_moves_reads_to_connection_replicas(self, manager):
+        await manager.add_connection(DatabaseConnection(name="analytics", host="db2", database="sales",
+                                                  username="u", password="p",
+                                                  replica_urls=["postgresql://u:p@db2-ro:5432/sales"]))
+        await manager.set_active_connection("analytics")
+        assert manager.pools.replicas(settings.DATABASE_URL) == ["postgresql://u:p@db2-ro:5432/sales"]
+        await manager.set_active_connection("default")
+        assert manager.pools.replicas(settings.DATABASE_URL) == settings.DATABASE_REPLICA_URLS
+
+    @pytest.mark.asyncio
+    async def test_switch_is_shared_with_connections_routes(self, manager, monkeypatch):
+        from app.routes import connections
+
+        async def fake_switch(url, pools=None, replicas=None):
+            manager.switched.append((settings.DATABASE_URL, url))
+
+        monkeypatch.setattr(database_module, "switch_application_database", fake_switch)
+        await connections.save_connection(connections.ConnectionConfig(
+            name="analytics", host="db2", database="sales", username="u", password="p"
+        ))
+        await manager.set_active_connection("analytics")
+        assert (await connections.get_active_connection())["name"] == "analytics"
+        assert database_module._applied_connection == "analytics"
+
+        # A switch through /connections is what the manager reports as active
+        await connections.switch_connection("default")
+        assert await manager.get_active_connection_name() == "default"
+        assert [c["is_active"] for c in await manager.list_connections()] == [True, False]
+        assert manager.switched == [(settings.DATABASE_URL, "postgresql://u:p@db2:5432/sales"),
+                                    (settings.DATABASE_URL, settings.DATABASE_URL)]
@@ -0,0 +1,65 @@
+"""
+Quality Rollup Test Suite
+Covers rate derivation and the rollup upsert without a database.
+"""
+import json
+
+import pytest
+
+from app.services.quality_rollups import QualityRollupService, record_rollup, rollup_rates, rollup_upsert_sql
+
+
+def rollup_row(**overrides):
+    row = {
+        "scope_key": "completeness", "executions": 4, "passed_runs": 2, "failed_runs": 1,
+        "skipped_runs": 1, "total_count": 1000, "failed_count": 25,
+        "total_execution_time_ms": 90.0, "max_execution_time_ms": 50.0,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestRollupRates:
+    """Tests for pass rates derived from summed counters."""
+
+    def test_row_and_run_pass_rates(self):
+        rates = rollup_rates(rollup_row())
+        assert rates["pass_rate"] == 97.5
+        # Skipped runs are not evaluations
+        assert rates["run_pass_rate"] == 66.67
+        assert rates["avg_execution_time_ms"] == 30.0
+
+    def test_only_skipped_runs(self):
+        rates = rollup_rates(rollup_row(executions=2, passed_runs=0, failed_runs=0, skipped_runs=2,
+                                        total_count=0, failed_count=0, total_execution_time_ms=0))
+        assert rates["pass_rate"] == 100.0
+        assert rates["run_pass_rate"] is None
+        assert rates["avg_execution_time_ms"] is None
+
+
+class TestRollupWrites:
+    """Tests for the per-result upsert."""
+
+    def test_upsert_covers_all_scopes(self):
+        sql = rollup_upsert_sql("true")
+        for scope in ("'rule'", "'table'", "'dimension'"):
+            assert scope in sql
+        assert "ON CONFLICT (scope, scope_key, day) DO UPDATE" in sql
+
+    @pytest.mark.asyncio
+    async def test_record_rollup_targets_one_result(self):
+        class FakeConn:
+            async def execute(self, query, *args):
+                self.query, self.args = query, args
+
+        conn = FakeConn()
+        await record_rollup(conn, 42, "2026-10-18")
+        assert "r.id = $2 AND r.executed_at = $3" in conn.query
+        dimensions, result_id, executed_at = conn.args
+        assert json.loads(dimensions)["null_check"] == "completeness"
+        assert (result_id, executed_at) == (42, "2026-10-18")
+
+    @pytest.mark.asyncio
+    async def test_unknown_scope_rejected(self):
+        with pytest.raises(ValueError, match="Unsupported rollup scope"):
+            await QualityRollupService("postgresql://unused").get_trends(scope="column")
@@ -0,0 +1,187 @@
+"""
+Result Partition Test Suite
+Covers partition naming, premaking and retention selection without a database.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.services.result_partitions import (
+    DEFAULT_PARTITION,
+    ResultPartitionManager,
+    add_months,
+    ensure_results_partitioned,
+    expected_partitions,
+    expired_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+    purge_orphan_sample_sets,
+)
+
+
+class TestPartitionNaming:
+    """Tests for month arithmetic and partition names."""
+
+    def test_month_start(self):
+        assert month_start(datetime(2026, 10, 18, 13, 45, 1, 5)) == datetime(2026, 10, 1)
+
+    def test_add_months_crosses_years(self):
+        assert add_months(datetime(2026, 11, 1), 2) == datetime(2027, 1, 1)
+        assert add_months(datetime(2026, 1, 1), -1) == datetime(2025, 12, 1)
+
+    def test_name_round_trip(self):
+        name = partition_name(datetime(2026, 3, 1))
+        assert name == "data_quality_results_y2026m03"
+        assert partition_month(name) == datetime(2026, 3, 1)
+        assert partition_month(DEFAULT_PARTITION) is None
+
+    def test_expected_partitions_include_premade_months(self):
+        months = expected_partitions(datetime(2026, 12, 15), 2)
+        assert months == [datetime(2026, 12, 1), datetime(2027, 1, 1), datetime(2027, 2, 1)]
+
+
+class TestRetention:
+    """Tests for selecting partitions to compact and drop."""
+
+    NAMES = [
+        DEFAULT_PARTITION,
+        "data_quality_results_y2025m11",
+        "data_quality_results_y2025m09",
+        "data_quality_results_y2025m10",
+        "data_quality_results_y2026m10",
+    ]
+
+    def test_only_whole_months_before_cutoff_expire(self):
+        expired = expired_partitions(self.NAMES, datetime(2026, 10, 18), 12)
+        assert expired == ["data_quality_results_y2025m09"]
+
+    def test_zero_retention_keeps_everything(self):
+        assert expired_partitions(self.NAMES, datetime(2030, 1, 1), 0) == []
+
+
+class TestEnsurePartitioned:
+    """Tests for the no-op fast path."""
+
+    @pytest.mark.asyncio
+    async def test_no_ddl_when_partitions_exist(self):
+        now = datetime(2026, 10, 18)
+
+        class FakeConn:
+            def __init__(self):
+                self.queries = 0
+
+            async def fetchrow(self, query, *args):
+                self.queries += 1
+                names = [partition_name(m) for m in expected_partitions(now, 2)]
+                return {"relkind": "p", "partitions": names + [DEFAULT_PARTITION]}
+
+            def transaction(self):
+                raise AssertionError("fast path must not open a transaction")
+
+        conn = FakeConn()
+        assert await ensure_results_partitioned(conn, now, premake_months=2) == []
+        assert conn.queries == 1
+
+
+class TestRetentionDrops:
+    """Tests for dropping expired partitions."""
+
+    @pytest.mark.asyncio
+    async def test_rollups_exist_before_a_partition_is_dropped(self):
+        now = datetime(2026, 10, 18)
+        expired = partition_name(datetime(2025, 1, 1))
+        names = [partition_name(m) for m in expected_partitions(now, 2)]
+
+        class FakeTransaction:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        class FakeConn:
+            def __init__(self):
+                self.statements = []
+
+            async def fetchrow(self, query, *args):
+                return {"relkind": "p", "partitions": names + [DEFAULT_PARTITION, expired]}
+
+            async def fetchval(self, query, *args):
+                # Neither the rollup table nor root_cause_analysis exist yet
+                return False
+
+            async def execute(self, query, *args):
+                self.statements.append(" ".join(query.split()))
+                return "DELETE 0"
+
+            def transaction(self):
+                return FakeTransaction()
+
+            async def close(self):
+                pass
+
+        conn = FakeConn()
+
+        class FakePools:
+            async def connect(self, dsn):
+                return conn
+
+        manager = ResultPartitionManager("postgresql://x", retention_months=12, premake_months=2, pools=FakePools())
+        assert (await manager.run_maintenance(now))["dropped"] == [expired]
+        created = next(i for i, q in enumerate(conn.statements) if q.startswith("CREATE TABLE data_quality_rollups_daily"))
+        backfilled = next(i for i, q in enumerate(conn.statements) if q.startswith("INSERT INTO data_quality_rollups_daily"))
+        dropped = conn.statements.index(f"DROP TABLE {expired}")
+        assert created < backfilled < dropped
+
+
+class TestOrphanSampleSets:
+    """Tests for purging sample sets no result references."""
+
+    @pytest.mark.asyncio
+    async def test_purge_spares_referenced_and_recent_sets(self):
+        class FakeConn:
+            def __init__(self):
+                self.statements = []
+
+            async def execute(self, query, *args):
+                self.statements.append(" ".join(query.split()))
+                return "DELETE 3"
+
+        conn = FakeConn()
+        assert await purge_orphan_sample_sets(conn) == 3
+        statement = conn.statements[0]
+        assert statement.startswith("DELETE FROM failure_sample_sets")
+        assert "NOT EXISTS ( SELECT 1 FROM data_quality_results r WHERE r.failure_sample_hash = s.hash )" in statement
+        assert "s.created_at < CURRENT_TIMESTAMP - INTERVAL" in statement
+
+    @pytest.mark.asyncio
+    async def test_maintenance_purges_without_dropping_partitions(self):
+        now = datetime(2026, 10, 18)
+        names = [partition_name(m) for m in expected_partitions(now, 2)]
+
+        class FakeConn:
+            def __init__(self):
+                self.statements = []
+                self.closed = False
+
+            async def fetchrow(self, query, *args):
+                return {"relkind": "p", "partitions": names + [DEFAULT_PARTITION]}
+
+            async def execute(self, query, *args):
+                self.statements.append(query)
+                return "DELETE 0"
+
+            async def close(self):
+                self.closed = True
+
+        conn = FakeConn()
+
+        class FakePools:
+            async def connect(self, dsn):
+                return conn
+
+        manager = ResultPartitionManager("postgresql://x", retention_months=12, premake_months=2, pools=FakePools())
+        assert await manager.run_maintenance(now) == {"created": [], "dropped": []}
+        assert any("DELETE FROM failure_sample_sets" in q for q in conn.statements)
+        assert conn.closed
@@ -0,0 +1,513 @@
+"""
+Rule Execution Test Suite
+Covers the execution helpers of DataQualityRulesService and the legacy
+RuleExecutionService that run without a database.
+"""
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.db_config.pool_metrics import LeaseLimit
+from app.db_config.pool_registry import PoolRegistry
+from app.services import rule_execution_service
+from app.services.data_quality_rules import (
+    DataQualityRulesService,
+    RuleResult,
+    WatermarkWindow,
+    sample_set_hash,
+    summarize_explain,
+    topological_order,
+    wilson_interval,
+)
+
+
+@pytest.fixture
+def service():
+    return DataQualityRulesService("postgresql://unused")
+
+
+class TestWatermarkWindow:
+    """Tests for incremental execution windows."""
+
+    def test_first_run_bounded_by_high_watermark(self):
+        window = WatermarkWindow(column="order_date", column_type="date", high="1998-05-06")
+        clause, args = window.clause()
+        assert clause == '"order_date" <= $1::text::date'
+        assert args == ["1998-05-06"]
+
+    def test_incremental_run_uses_both_bounds(self):
+        window = WatermarkWindow(column="order_id", column_type="smallint", low="11000", high="11077")
+        clause, args = window.clause(qualifier="_dq.")
+        assert clause == '_dq."order_id" > $1::text::smallint AND _dq."order_id" <= $2::text::smallint'
+        assert args == ["11000", "11077"]
+
+    def test_empty_table_selects_nothing(self):
+        window = WatermarkWindow(column="order_id", column_type="integer")
+        assert window.clause() == ("FALSE", [])
+
+    def test_windowed_definition_wraps_rule_sql(self, service):
+        window = WatermarkWindow(column="order_id", column_type="integer", low="10", high="20")
+        query, args = service._windowed_definition("SELECT * FROM orders WHERE freight < 0;", window)
+        assert query.startswith("SELECT * FROM (SELECT * FROM orders WHERE freight < 0) AS _dq WHERE ")
+        assert args == ["10", "20"]
+
+    def test_windowed_definition_without_window(self, service):
+        assert service._windowed_definition("SELECT 1", None) == ("SELECT 1", [])
+
+
+class TestWatermarkBaseline:
+    """Tests for combining windowed counts with previous cumulative totals."""
+
+    def test_counts_are_cumulative(self, service):
+        result = RuleResult(rule_id=1, passed=True, total_count=10, failed_count=0)
+        window = WatermarkWindow(
+            column="order_id", column_type="integer", low="100", high="110",
+            previous_total=100, previous_failed=3
+        )
+        service._apply_watermark_baseline(result, window, "range_check", 0)
+        assert result.total_count == 110
+        assert result.failed_count == 3
+        assert result.passed is False
+        assert result.incremental is True
+        assert result.watermark == "110"
+
+    def test_threshold_rules_use_cumulative_percentage(self, service):
+        result = RuleResult(rule_id=1, passed=False, total_count=10, failed_count=2)
+        window = WatermarkWindow(
+            column="order_id", column_type="integer", low="100", high="110",
+            previous_total=190, previous_failed=2
+        )
+        service._apply_watermark_baseline(result, window, "null_check", 5)
+        assert result.failed_count == 4
+        assert result.passed is True
+
+    def test_full_refresh_is_not_incremental(self, service):
+        result = RuleResult(rule_id=1, passed=True, total_count=50, failed_count=0)
+        window = WatermarkWindow(column="order_id", column_type="integer", high="50")
+        service._apply_watermark_baseline(result, window, "range_check", 0)
+        assert result.total_count == 50
+        assert result.incremental is False
+        assert result.watermark == "50"
+
+    def test_rejects_unsafe_watermark_identifier(self, service):
+        with pytest.raises(ValueError):
+            service._validate_identifier('order_date"; DROP TABLE orders; --')
+
+
+class TestSampledExecution:
+    """Tests for approximate execution on table samples."""
+
+    def test_wilson_interval_contains_observed_rate(self):
+        low, high = wilson_interval(10, 1000)
+        assert low < 0.01 < high
+        assert 0 <= low and high <= 1
+
+    def test_wilson_interval_zero_failures_has_upper_bound(self):
+        low, high = wilson_interval(0, 500)
+        assert low == 0.0
+        assert 0 < high < 0.01
+
+    def test_wilson_interval_empty_sample(self):
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    def test_approximate_flag_in_result_dict(self):
+        result = RuleResult(
+            rule_id=1, passed=True, total_count=1000, failed_count=10,
+            is_approximate=True, sample_percent=1.0,
+            confidence_interval={"level": 0.95, "pass_rate_low": 98.2, "pass_rate_high": 99.5}
+        )
+        data = result.to_dict()
+        assert data["is_approximate"] is True
+        assert data["sample_percent"] == 1.0
+        assert data["confidence_interval"]["level"] == 0.95
+
+    @pytest.mark.asyncio
+    async def test_unique_check_cannot_be_sampled(self, service):
+        with pytest.raises(ValueError):
+            await service._execute_sampled(None, "unique_check", "customers", "customer_id", "", 0, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_invalid_execution_input_is_400_not_404(self, monkeypatch):
+        from app.main import create_app
+
+        class FakeService:
+            async def execute_rule(self, rule_id, **kwargs):
+                if rule_id == 9:
+                    raise ValueError("Rule 9 not found")
+                raise ValueError("Sampled execution is not supported for unique_check rules")
+
+        monkeypatch.setattr("app.routes.data_quality.get_service", lambda: FakeService())
+        async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+            missing = await client.post("/data-quality/rules/9/execute")
+            invalid = await client.post("/data-quality/rules/1/execute?mode=sampled")
+
+        assert missing.status_code == 404
+        assert invalid.status_code == 400
+        assert "unique_check" in invalid.json()["detail"]
+
+    def test_failing_rows_sql_for_null_check(self, service):
+        sql = service._failing_rows_sql("null_check", "customers", "region", "")
+        assert sql == 'SELECT * FROM "customers" WHERE "region" IS NULL'
+
+
+class TestRuleDependencies:
+    """Tests for dependency ordering and skipped results."""
+
+    def test_dependencies_come_first(self):
+        order = topological_order({3: [1, 2], 2: [1], 1: [], 4: []})
+        assert order.index(1) < order.index(2) < order.index(3)
+        assert set(order) == {1, 2, 3, 4}
+
+    def test_unknown_dependencies_are_ignored(self):
+        assert topological_order({5: [99]}) == [5]
+
+    def test_cycle_is_rejected(self):
+        with pytest.raises(ValueError, match="cycle"):
+            topological_order({1: [3], 2: [1], 3: [2], 4: []})
+
+    def test_self_dependency_is_rejected(self):
+        with pytest.raises(ValueError):
+            topological_order({1: [1]})
+
+    def test_skipped_result_status(self):
+        result = RuleResult(
+            rule_id=7, passed=False, total_count=0, failed_count=0,
+            skipped=True, blocked_by=[3]
+        )
+        data = result.to_dict()
+        assert data["status"] == "skipped"
+        assert data["blocked_by"] == [3]
+
+    def test_status_follows_passed(self):
+        assert RuleResult(rule_id=1, passed=True, total_count=1, failed_count=0).status == "passed"
+        assert RuleResult(rule_id=1, passed=False, total_count=1, failed_count=1).status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_rejects_self_dependency_before_querying(self, service):
+        with pytest.raises(ValueError):
+            await service._validate_dependencies(None, 4, [4])
+
+    @pytest.mark.asyncio
+    async def test_dag_runs_independent_branches_and_skips_downstream(self, service, monkeypatch):
+        # 1 fails -> 2 (depends on 1) and 3 (depends on 2) are skipped; 4 is independent
+        definitions = {1: {}, 2: {"depends_on": [1]}, 3: {"depends_on": [2]}, 4: {}}
+        executed, skipped = [], []
+
+        class FakeConn:
+            async def fetch(self, *args):
+                return [
+                    {"id": i, "table_name": "orders", "rule_definition": d}
+                    for i, d in definitions.items()
+                ]
+
+            async def close(self):
+                pass
+
+        async def fake_connect(dsn):
+            return FakeConn()
+
+        async def fake_execute(rule_id, **kwargs):
+            executed.append(rule_id)
+            await asyncio.sleep(0)
+            return RuleResult(rule_id=rule_id, passed=rule_id != 1, total_count=1,
+                              failed_count=int(rule_id == 1)).to_dict()
+
+        async def fake_skip(rule_id, blocked_by):
+            skipped.append(rule_id)
+            return RuleResult(rule_id=rule_id, passed=False, total_count=0, failed_count=0,
+                              skipped=True, blocked_by=blocked_by).to_dict()
+
+        monkeypatch.setattr(service.pools, "connect", fake_connect)
+        monkeypatch.setattr(service, "execute_rule", fake_execute)
+        monkeypatch.setattr(service, "_record_skipped", fake_skip)
+
+        batch = await service.execute_rules(rule_ids=[3, 4])
+        assert sorted(executed) == [1, 4]
+        assert skipped == [2, 3]
+        assert batch["summary"] == {"total": 4, "passed": 1, "failed": 1, "skipped": 2, "error": 0}
+        assert batch["order"].index(1) < batch["order"].index(2) < batch["order"].index(3)
+
+
+class TestLeaseUsage:
+    """Tests for the pool leases taken by rule execution."""
+
+    class FakeConn:
+        async def fetch(self, query, *args):
+            return [{"id": i, "table_name": "orders", "rule_definition": {}} for i in range(1, 5)]
+
+        async def fetchrow(self, query, rule_id):
+            return {"id": rule_id, "table_name": "orders", "column_name": "ship_region",
+                    "rule_type": "null_check", "rule_definition": {}}
+
+    class FakePool:
+        async def acquire(self, timeout=None):
+            return TestLeaseUsage.FakeConn()
+
+        async def release(self, conn, timeout=None):
+            pass
+
+        async def close(self):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_batch_fits_a_lease_limit_below_its_concurrency(self, monkeypatch):
+        dsn = "postgresql://db"
+        pools = PoolRegistry(min_size=2, max_size=8, acquire_timeout=0.5)
+        pools._pools[dsn] = self.FakePool()
+        pools.start_adaptive_sizing(interval=3600)
+        pools._limits[dsn] = limit = LeaseLimit(2)
+        service = DataQualityRulesService(dsn, pools)
+
+        async def fake_check(conn, rule_type, table, column, definition, threshold, window):
+            await asyncio.sleep(0.01)
+            return RuleResult(rule_id=None, passed=True, total_count=10, failed_count=0)
+
+        async def fake_store(conn, result, *args):
+            pass
+
+        monkeypatch.setattr(settings, "RULE_EXPLAIN_SAMPLE_RATE", 0)
+        monkeypatch.setattr(service, "_run_check", fake_check)
+        monkeypatch.setattr(service, "_compact_failure_samples", fake_store)
+        monkeypatch.setattr(service, "_store_result", fake_store)
+        try:
+            batch = await asyncio.wait_for(service.execute_rules(max_parallel=4), timeout=5)
+        finally:
+            await pools.close_all()
+
+        assert batch["summary"] == {"total": 4, "passed": 4, "failed": 0, "skipped": 0, "error": 0}
+        assert limit.held == 0
+
+
+class TestExecutionTelemetry:
+    """Tests for EXPLAIN summaries and telemetry fields."""
+
+    EXPLAIN_OUTPUT = [{
+        "Plan": {
+            "Node Type": "Hash Join",
+            "Actual Rows": 3,
+            "Actual Loops": 1,
+            "Shared Hit Blocks": 120,
+            "Shared Read Blocks": 45,
+            "Temp Read Blocks": 0,
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "order_details",
+                 "Actual Rows": 3, "Rows Removed by Filter": 2152, "Actual Loops": 1},
+                {"Node Type": "Hash", "Actual Rows": 830, "Actual Loops": 1, "Plans": [
+                    {"Node Type": "Index Scan", "Relation Name": "orders",
+                     "Actual Rows": 830, "Actual Loops": 1},
+                ]},
+            ],
+        },
+        "Planning Time": 0.4,
+        "Execution Time": 12.5,
+    }]
+
+    def test_summarize_explain(self):
+        stats = summarize_explain(self.EXPLAIN_OUTPUT)
+        assert stats["shared_hit_blocks"] == 120
+        assert stats["shared_read_blocks"] == 45
+        assert stats["execution_time_ms"] == 12.5
+        assert stats["rows_scanned"] == 3 + 2152 + 830
+        assert stats["seq_scans"] == ["order_details"]
+
+    def test_summarize_explain_accepts_json_text(self):
+        assert summarize_explain(json.dumps(self.EXPLAIN_OUTPUT))["planning_time_ms"] == 0.4
+
+    def test_telemetry_in_result_dict(self):
+        result = RuleResult(
+            rule_id=1, passed=True, total_count=500, failed_count=0,
+            execution_time_ms=42.0, rows_examined=500
+        )
+        data = result.to_dict()
+        assert data["execution_time_ms"] == 42.0
+        assert data["rows_examined"] == 500
+        assert data["explain_stats"] is None
+
+    @pytest.mark.asyncio
+    async def test_slow_rules_rejects_unknown_sort(self, service):
+        with pytest.raises(ValueError):
+            await service.get_slow_rules(sort_by="name; DROP TABLE data_quality_rules")
+
+
+class TestUniqueCheck:
+    """Tests for the server-side duplicate summary."""
+
+    def test_key_columns_split_and_validated(self, service):
+        assert service._key_columns("order_id, product_id") == ["order_id", "product_id"]
+        with pytest.raises(ValueError):
+            service._key_columns("order_id, product_id); DROP TABLE orders; --")
+        with pytest.raises(ValueError):
+            service._key_columns(" , ")
+
+    def test_summary_sql_aggregates_server_side(self, service):
+        sql = service._unique_check_sql("order_details", ["order_id", "product_id"])
+        assert 'GROUP BY "order_id", "product_id"' in sql
+        assert "FILTER (WHERE cnt > 1)" in sql
+        assert "LIMIT 5" in sql
+
+    def test_failing_rows_sql_for_composite_key(self, service):
+        sql = service._failing_rows_sql("unique_check", "order_details", "order_id,product_id", "")
+        assert sql.startswith('SELECT * FROM "order_details" WHERE ("order_id", "product_id") IN (')
+
+    @pytest.mark.asyncio
+    async def test_result_from_single_summary_row(self, service):
+        class FakeConn:
+            def __init__(self):
+                self.queries = 0
+
+            async def fetchrow(self, query, *args):
+                self.queries += 1
+                return {
+                    "total_count": 2155,
+                    "duplicate_groups": 2,
+                    "excess_rows": 5,
+                    "worst_groups": json.dumps([
+                        {"order_id": 10248, "product_id": 11, "cnt": 4},
+                        {"order_id": 10250, "product_id": 41, "cnt": 3},
+                    ]),
+                }
+
+        conn = FakeConn()
+        result = await service._execute_unique_check(conn, "order_details", "order_id, product_id")
+        assert conn.queries == 1
+        assert result.passed is False
+        assert result.total_count == 2155
+        assert result.failed_count == 5
+        assert result.failure_samples[0] == {"value": {"order_id": "10248", "product_id": "11"}, "count": 4}
+
+    @pytest.mark.asyncio
+    async def test_single_column_samples_keep_value_format(self, service):
+        class FakeConn:
+            async def fetchrow(self, query, *args):
+                return {"total_count": 10, "duplicate_groups": 0, "excess_rows": 0, "worst_groups": None}
+
+        result = await service._execute_unique_check(FakeConn(), "customers", "customer_id")
+        assert result.passed is True
+        assert result.failure_samples == []
+
+
+class TestCompactSamples:
+    """Tests for primary-key sample storage."""
+
+    class FakeConn:
+        def __init__(self, key_columns):
+            self.key_columns = key_columns
+            self.inserted = []
+
+        async def fetch(self, query, *args):
+            return [{"attname": k} for k in self.key_columns]
+
+        async def execute(self, query, *args):
+            self.inserted.append(args)
+
+    def test_hash_ignores_key_order_within_samples(self):
+        first = sample_set_hash("orders", ["order_id"], [{"order_id": 1, "x": 2}])
+        second = sample_set_hash("orders", ["order_id"], [{"x": 2, "order_id": 1}])
+        assert first == second
+        assert first != sample_set_hash("customers", ["order_id"], [{"order_id": 1, "x": 2}])
+
+    @pytest.mark.asyncio
+    async def test_inline_storage_is_default(self, service):
+        conn = self.FakeConn(["order_id"])
+        result = RuleResult(rule_id=1, passed=False, total_count=10, failed_count=1,
+                            failure_samples=[{"order_id": 1, "freight": None}])
+        await service._compact_failure_samples(conn, result, "orders")
+        assert result.failure_sample_hash is None
+        assert conn.inserted == []
+
+    @pytest.mark.asyncio
+    async def test_keys_storage_keeps_only_primary_keys(self, service, monkeypatch):
+        monkeypatch.setattr("app.services.data_quality_rules.settings.FAILURE_SAMPLE_STORAGE", "keys")
+        conn = self.FakeConn(["order_id", "product_id"])
+        samples = [{"order_id": 10248, "product_id": 11, "quantity": 0}]
+        result = RuleResult(rule_id=1, passed=False, total_count=10, failed_count=1,
+                            failure_samples=samples)
+        await service._compact_failure_samples(conn, result, "order_details")
+        digest, table, key_columns, stored = conn.inserted[0]
+        assert json.loads(key_columns) == ["order_id", "product_id"]
+        assert json.loads(stored) == [{"order_id": 10248, "product_id": 11}]
+        assert result.failure_sample_hash == digest
+        # The caller still gets the full rows of this run
+        assert result.failure_samples == samples
+
+    @pytest.mark.asyncio
+    async def test_samples_without_keys_are_stored_whole(self, service, monkeypatch):
+        monkeypatch.setattr("app.services.data_quality_rules.settings.FAILURE_SAMPLE_STORAGE", "keys")
+        conn = self.FakeConn(["customer_id"])
+        result = RuleResult(rule_id=1, passed=False, total_count=10, failed_count=2,
+                            failure_samples=[{"value": "ALFKI", "count": 2}])
+        await service._compact_failure_samples(conn, result, "customers")
+        _, _, key_columns, stored = conn.inserted[0]
+        assert json.loads(key_columns) == []
+        assert json.loads(stored) == [{"value": "ALFKI", "count": 2}]
+
+
+class TestLegacyBatchExecution:
+    """Tests for concurrent execution of ad-hoc rules on the shared executor."""
+
+    @staticmethod
+    def rule(column):
+        return {"rule_id": f"manual_NULL_CHECK_{column}", "rule_type": "NULL_CHECK",
+                "table_name": "customers", "column_name": column, "params": None}
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently_and_keeps_order(self, monkeypatch):
+        service = rule_execution_service.RuleExecutionService("postgresql://unused")
+        running, peak = 0, 0
+
+        async def fake_execute(**rule):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if rule["column_name"] == "fax":
+                raise ValueError("boom")
+            return rule_execution_service.RuleResult(
+                rule_id=rule["rule_id"], rule_type="NULL_CHECK", table="customers",
+                column=rule["column_name"], passed=True, violation_count=0,
+                sample_violations=None, execution_time_ms=1.0)
+
+        monkeypatch.setattr(service, "execute_rule", fake_execute)
+        columns = ["contact_name", "fax", "city", "region", "phone"]
+        results = await service.execute_rules([self.rule(c) for c in columns], max_parallel=2)
+
+        assert [r["column"] for r in results] == columns
+        assert peak == 2
+        assert results[1] == {"rule_id": "manual_NULL_CHECK_fax", "rule_type": "NULL_CHECK",
+                              "table": "customers", "column": "fax", "passed": False,
+                              "error": "boom"}
+        assert all(r["passed"] for i, r in enumerate(results) if i != 1)
+
+    @pytest.mark.asyncio
+    async def test_route_accepts_single_rule_or_list(self, monkeypatch):
+        from app.main import app
+
+        class FakeService:
+            async def execute_rule(self, **rule):
+                return rule_execution_service.RuleResult(
+                    rule_id=rule["rule_id"], rule_type=rule["rule_type"], table=rule["table_name"],
+                    column=rule["column_name"], passed=True, violation_count=0,
+                    sample_violations=None, execution_time_ms=1.0)
+
+            async def execute_rules(self, rules):
+                return [(await self.execute_rule(**rule)).to_dict() for rule in rules]
+
+        async def fake_get_service():
+            return FakeService()
+
+        monkeypatch.setattr("app.api_routes.get_rule_execution_service", fake_get_service)
+        single = {"rule_type": "NULL_CHECK", "table": "customers", "column": "city"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            one = await client.post("/api/rules/execute", json=single)
+            many = await client.post("/api/rules/execute", json=[single, {**single, "column": "fax"}])
+            empty = await client.post("/api/rules/execute", json=[])
+            blocked = await client.post("/api/rules/execute", json=[single, {**single, "table": "pg_user"}])
+
+        assert one.status_code == 200 and one.json()["column"] == "city"
+        assert many.status_code == 200 and [r["column"] for r in many.json()] == ["city", "fax"]
+        assert empty.status_code == 400
+        assert blocked.status_code == 400
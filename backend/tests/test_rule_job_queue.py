@@ -0,0 +1,65 @@
+"""
+Rule Job Queue Test Suite
+Covers retry backoff, producer validation and worker setup without a database.
+"""
+import pytest
+
+from app.services.rule_job_queue import RuleJobQueue, retry_delay
+from app.services.rule_scheduler import RuleScheduler
+from app.worker import RuleWorker, default_worker_id
+
+
+@pytest.fixture
+def queue():
+    return RuleJobQueue("postgresql://unused")
+
+
+class TestRetryDelay:
+    """Tests for exponential backoff between attempts."""
+
+    def test_delay_doubles_per_attempt(self):
+        for attempts, ceiling in [(1, 10), (2, 20), (3, 40), (4, 80)]:
+            delay = retry_delay(attempts, base_seconds=10, max_seconds=1000)
+            assert ceiling / 2 <= delay <= ceiling
+
+    def test_delay_is_capped(self):
+        assert retry_delay(30, base_seconds=10, max_seconds=60) <= 60
+
+    def test_delay_is_jittered(self):
+        delays = {retry_delay(5, base_seconds=10, max_seconds=1000) for _ in range(20)}
+        assert len(delays) > 1
+
+
+class TestEnqueueValidation:
+    """Tests for producer-side validation."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_mode(self, queue):
+        with pytest.raises(ValueError):
+            await queue.enqueue(1, execution_mode="turbo")
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_table(self, queue):
+        with pytest.raises(ValueError):
+            await queue.enqueue_table("pg_shadow")
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_status_filter(self, queue):
+        with pytest.raises(ValueError):
+            await queue.list_jobs(status="paused")
+
+
+class TestWorker:
+    """Tests for worker configuration."""
+
+    def test_worker_ids_are_unique(self):
+        assert default_worker_id() != default_worker_id()
+
+    def test_concurrency_is_at_least_one(self):
+        worker = RuleWorker("postgresql://unused", worker_id="w1", concurrency=0)
+        assert worker.concurrency == 1
+        assert worker.worker_id == "w1"
+
+    def test_scheduler_rejects_unknown_dispatch(self):
+        with pytest.raises(ValueError):
+            RuleScheduler("postgresql://unused", dispatch="kafka")
@@ -0,0 +1,119 @@
+"""
+Rule Scheduler Test Suite
+Covers cron parsing, fire-time computation and schedule validation.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.rule_scheduler import (
+    CronExpression,
+    RuleScheduler,
+    next_fire_time,
+)
+
+
+@pytest.fixture
+def scheduler():
+    return RuleScheduler("postgresql://unused", max_workers=2, poll_interval=1)
+
+
+class TestCronExpression:
+    """Tests for 5-field cron parsing and next fire times."""
+
+    def test_every_minute(self):
+        cron = CronExpression("* * * * *")
+        assert cron.next_after(datetime(2024, 1, 1, 10, 30, 15)) == datetime(2024, 1, 1, 10, 31)
+
+    def test_daily_rolls_over_to_next_day(self):
+        cron = CronExpression("0 2 * * *")
+        assert cron.next_after(datetime(2024, 1, 1, 2, 0)) == datetime(2024, 1, 2, 2, 0)
+        assert cron.next_after(datetime(2024, 1, 1, 1, 59)) == datetime(2024, 1, 1, 2, 0)
+
+    def test_steps_ranges_and_lists(self):
+        cron = CronExpression("*/15 9-17 * * 1-5")
+        assert cron.minutes == {0, 15, 30, 45}
+        assert cron.hours == set(range(9, 18))
+        # Saturday 2024-01-06 -> Monday 09:00
+        assert cron.next_after(datetime(2024, 1, 6, 12, 0)) == datetime(2024, 1, 8, 9, 0)
+
+    def test_sunday_as_seven(self):
+        cron = CronExpression("0 0 * * 7")
+        assert cron.weekdays == {0}
+        assert cron.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7)
+
+    def test_day_of_month_or_day_of_week(self):
+        cron = CronExpression("0 0 15 * 1")
+        # Monday 2024-01-08 comes before the 15th
+        assert cron.next_after(datetime(2024, 1, 2)) == datetime(2024, 1, 8)
+
+    def test_leap_day(self):
+        cron = CronExpression("0 0 29 2 *")
+        assert cron.next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+
+    def test_aliases(self):
+        assert CronExpression("@hourly").next_after(datetime(2024, 1, 1, 5, 5)) == datetime(2024, 1, 1, 6, 0)
+        assert CronExpression("@monthly").next_after(datetime(2024, 1, 31)) == datetime(2024, 2, 1)
+
+    @pytest.mark.parametrize("expression", [
+        "* * * *", "60 * * * *", "* 24 * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *",
+    ])
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(ValueError):
+            CronExpression(expression)
+
+    def test_impossible_date_never_fires(self):
+        with pytest.raises(ValueError):
+            CronExpression("0 0 31 2 *").next_after(datetime(2024, 1, 1))
+
+
+class TestFireTime:
+    """Tests for jitter and misfire handling."""
+
+    def test_jitter_stays_within_bounds(self):
+        cron = CronExpression("0 0 * * *")
+        midnight = datetime(2024, 1, 2)
+        for _ in range(50):
+            fire_at = next_fire_time(cron, datetime(2024, 1, 1, 12), jitter_seconds=120)
+            assert midnight <= fire_at <= midnight + timedelta(seconds=120)
+
+    def test_no_jitter(self):
+        cron = CronExpression("0 0 * * *")
+        assert next_fire_time(cron, datetime(2024, 1, 1, 12)) == datetime(2024, 1, 2)
+
+    def test_misfire_after_grace_period(self, scheduler):
+        schedule = {"next_run_at": datetime(2024, 1, 1, 0, 0), "misfire_grace_seconds": 300}
+        assert not scheduler._is_misfire(schedule, datetime(2024, 1, 1, 0, 4))
+        assert scheduler._is_misfire(schedule, datetime(2024, 1, 1, 0, 6))
+
+
+class TestScheduleValidation:
+    """Tests for schedule targets and options."""
+
+    @pytest.mark.asyncio
+    async def test_requires_exactly_one_target(self, scheduler):
+        with pytest.raises(ValueError):
+            await scheduler.create_schedule("0 0 * * *")
+        with pytest.raises(ValueError):
+            await scheduler.create_schedule("0 0 * * *", rule_id=1, table_name="orders")
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_table(self, scheduler):
+        with pytest.raises(ValueError):
+            await scheduler.create_schedule("0 0 * * *", table_name="pg_authid")
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_mode(self, scheduler):
+        with pytest.raises(ValueError):
+            await scheduler.create_schedule("0 0 * * *", rule_id=1, execution_mode="fast")
+
+    @pytest.mark.asyncio
+    async def test_run_pending_requires_start(self, scheduler):
+        with pytest.raises(RuntimeError):
+            await scheduler.run_pending()
+
+    def test_status_before_start(self, scheduler):
+        status = scheduler.status()
+        assert status["running"] is False
+        assert status["max_workers"] == 2
+        assert status["in_flight_rules"] == []
@@ -0,0 +1,35 @@
+"""
+Startup Test Suite
+Covers the application factory and keeps optional dependencies out of the
+import of app.main.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from app.main import create_app
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+LAZY_MODULES = ("chromadb", "jwt", "httpx", "sqlalchemy")
+
+
+class TestStartup:
+    """Tests for import cost and the application factory."""
+
+    def test_importing_app_does_not_load_optional_dependencies(self):
+        # A fresh interpreter: the test session itself has httpx loaded
+        code = (
+            "import sys, app.main, app.worker, app.database, app.services.database_service, "
+            "app.services.dama_service, app.services.azure_auth\n"
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True)
+        assert proc.stdout.strip() == ""
+
+    def test_create_app_builds_independent_apps(self):
+        first, second = create_app(), create_app()
+        assert first is not second
+        paths = set(first.openapi()["paths"])
+        assert {"/health", "/", "/database/pools"} <= paths
+        assert paths == set(second.openapi()["paths"])
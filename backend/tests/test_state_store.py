@@ -0,0 +1,183 @@
+"""
+State Store Test Suite
+Covers the memory and SQLite state stores and the state moved into them:
+legacy rules, saved connections, the cache and rate limits.
+"""
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.db_config import database as database_module
+from app.db_config import state_store as state_store_module
+from app.db_config.state_store import (
+    MemoryStateStore, SQLiteStateStore, create_state_store, state_dsn
+)
+from app.main import create_app
+from app.middleware.rate_limiting import RateLimiter
+from app.routes import connections
+from app.services.cache_service import CacheService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(state_store_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryStateStore()
+    else:
+        store = SQLiteStateStore(str(tmp_path / "state.db"))
+        yield store
+        if store._conn is not None:
+            store._conn.close()
+
+
+@pytest.fixture
+def shared_store(monkeypatch):
+    store = MemoryStateStore()
+    monkeypatch.setattr(state_store_module, "_state_store", store)
+    return store
+
+
+class TestStateStore:
+    """Tests common to every backend."""
+
+    @pytest.mark.asyncio
+    async def test_set_get_delete(self, store):
+        await store.set("ns", "a", {"x": [1, 2]})
+        assert await store.get("ns", "a") == {"x": [1, 2]}
+        assert await store.get("other", "a") is None
+        assert await store.delete("ns", "a")
+        assert not await store.delete("ns", "a")
+        assert await store.get("ns", "a") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_hidden(self, store, clock):
+        await store.set("ns", "short", 1, ttl_seconds=10)
+        await store.set("ns", "long", 2)
+        clock[0] += 11
+        assert await store.get("ns", "short") is None
+        assert await store.items("ns") == {"long": 2}
+
+    @pytest.mark.asyncio
+    async def test_clear_by_pattern(self, store):
+        for key in ("profile:a", "profile:b", "rules:a"):
+            await store.set("ns", key, True)
+        assert await store.clear("ns", "profile:*") == 2
+        assert list(await store.items("ns")) == ["rules:a"]
+
+    @pytest.mark.asyncio
+    async def test_counter_window_restarts_after_ttl(self, store, clock):
+        assert [await store.incr("ns", "ip", ttl_seconds=60) for _ in range(3)] == [1, 2, 3]
+        clock[0] += 61
+        assert await store.incr("ns", "ip", ttl_seconds=60) == 1
+        assert await store.incr("ns", "seq") == 1
+
+    @pytest.mark.asyncio
+    async def test_counts(self, store, clock):
+        await store.set("ns", "a", 1, ttl_seconds=5)
+        await store.set("ns", "b", 1)
+        clock[0] += 6
+        assert await store.counts("ns") == {"total": 2, "expired": 1}
+
+    @pytest.mark.asyncio
+    async def test_writes_purge_expired_entries(self, store, clock, monkeypatch):
+        monkeypatch.setattr(settings, "STATE_STORE_PURGE_INTERVAL_SECONDS", 0)
+        for client in ("10.0.0.1", "10.0.0.2"):
+            await store.incr("rate_limit", client, ttl_seconds=60)
+        await store.set("cache", "profile:orders", {"rows": 830}, ttl_seconds=30)
+        clock[0] += 61
+
+        await store.incr("rate_limit", "10.0.0.3", ttl_seconds=60)
+        assert await store.counts("rate_limit") == {"total": 1, "expired": 0}
+        assert await store.counts("cache") == {"total": 0, "expired": 0}
+
+
+class TestSharedBackends:
+    """Tests for state shared between processes."""
+
+    @pytest.mark.asyncio
+    async def test_sqlite_stores_on_one_file_share_state(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        first, second = SQLiteStateStore(path), SQLiteStateStore(path)
+        await first.set("connections", "analytics", {"host": "db2"})
+        assert await second.get("connections", "analytics") == {"host": "db2"}
+        assert await first.incr("sequences", "rules") == 1
+        assert await second.incr("sequences", "rules") == 2
+        await first.close()
+        await second.close()
+
+    def test_state_pool_is_separate_from_the_application_pool(self):
+        assert state_dsn("postgresql://u:p@db:5432/northwind") == (
+            "postgresql://u:p@db:5432/northwind?application_name=dqm-state"
+        )
+        assert "sslmode=require" in state_dsn("postgresql://db/x?sslmode=require")
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown state store 'redis'"):
+            create_state_store("redis")
+
+
+class TestStateUsers:
+    """Tests for the state moved into the store."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_is_counted_in_the_store(self):
+        store = MemoryStateStore()
+        workers = [RateLimiter(limit=2, period=60, store=store) for _ in range(2)]
+        assert await workers[0].allow("10.0.0.1")
+        assert await workers[1].allow("10.0.0.1")
+        assert not await workers[0].allow("10.0.0.1")
+        assert await workers[1].allow("10.0.0.2")
+
+    @pytest.mark.asyncio
+    async def test_cache_service(self, clock):
+        cache = CacheService(MemoryStateStore())
+        await cache.set("profile:customers", {"rows": 91}, ttl_seconds=30)
+        await cache.set("profile:orders", {"rows": 830}, ttl_seconds=120)
+        assert await cache.get("profile:customers") == {"rows": 91}
+        clock[0] += 60
+        assert await cache.get("profile:customers") is None
+        assert await cache.stats() == {"total_keys": 1, "expired_keys": 0, "active_keys": 1}
+        assert await cache.clear_pattern("profile:*") == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_rules_live_in_the_store(self, shared_store):
+        rule = {"name": "Nulls", "description": "No nulls", "condition": "x IS NOT NULL"}
+        async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+            created = [(await client.post("/api/rules", json=rule)).json()["id"] for _ in range(2)]
+            assert (await client.delete(f"/api/rules/{created[0]}")).status_code == 204
+            listed = (await client.get("/api/rules")).json()
+
+        assert created == [1, 2]
+        assert [r["id"] for r in listed] == [2]
+        assert list(await shared_store.items("legacy_rules")) == ["2"]
+
+    @pytest.mark.asyncio
+    async def test_workers_follow_a_connection_switch(self, shared_store, monkeypatch):
+        switched = []
+
+        async def fake_switch(dsn, pools=None, replicas=None):
+            switched.append((dsn, replicas))
+
+        monkeypatch.setattr(database_module, "switch_application_database", fake_switch)
+        monkeypatch.setattr(database_module, "_applied_connection", "default")
+        config = connections.ConnectionConfig(
+            name="analytics", host="db2", database="dw", username="u", password="p",
+            replica_urls=["postgresql://u:p@db2-replica/dw"]
+        )
+        await connections.save_connection(config)
+        # Another worker switched
+        await shared_store.set("connection_state", "active", "analytics")
+
+        await database_module.sync_active_connection()
+        await database_module.sync_active_connection()
+
+        assert switched == [("postgresql://u:p@db2:5432/dw", ["postgresql://u:p@db2-replica/dw"])]
+        assert (await connections.get_active_connection())["name"] == "analytics"
+        statuses = {c.name: c.is_active for c in await connections.list_connections()}
+        assert statuses == {"default": False, "analytics": True}
@@ -0,0 +1,173 @@
+"""
+Upload Gate Test Suite
+Covers streaming parsing, rule translation and duplicate tracking without a database.
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.services.upload_gate import (
+    BloomFilter,
+    DuplicateTracker,
+    UploadGate,
+    build_gate,
+    csv_records,
+)
+
+
+def rule(rule_id, rule_type, column, definition="", **config):
+    return {
+        "id": rule_id, "name": f"rule_{rule_id}", "column": column,
+        "rule_type": rule_type, "definition": definition, "config": config,
+    }
+
+
+ORDER_RULES = [
+    rule(1, "null_check", "ship_region"),
+    rule(2, "range_check", "freight", "SELECT * FROM orders WHERE freight < 0 OR freight > 500"),
+    rule(3, "pattern_check", "ship_postal_code",
+         "SELECT * FROM orders WHERE ship_postal_code IS NOT NULL AND ship_postal_code !~ '^[0-9]{5}$'"),
+    rule(4, "unique_check", "order_id"),
+    rule(5, "referential_check", "customer_id",
+         "SELECT t.* FROM orders t LEFT JOIN customers r ON t.customer_id = r.customers_id WHERE r.customers_id IS NULL"),
+]
+
+ORDERS_CSV = (
+    "order_id,customer_id,freight,ship_region,ship_postal_code\r\n"
+    "10248,VINET,32.38,,51100\r\n"
+    "10249,TOMSP,11.61,RJ,\r\n"
+    "10250,HANAR,-1,SP,05454-876\r\n"
+    '10248,"VICTE\nline two",900,WA,12209\r\n'
+)
+
+
+async def stream(data: bytes, size: int = 7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class TestRuleTranslation:
+    """Tests for turning stored SQL rules into gates."""
+
+    def test_range_comparisons(self):
+        gate = build_gate(rule(1, "range_check", "unit_price",
+                               'SELECT * FROM products WHERE "unit_price" NOT BETWEEN 0 AND 300;'))
+        assert gate.conditions == [("<", 0.0), (">", 300.0)]
+
+    def test_range_from_definition_bounds(self):
+        gate = build_gate(rule(1, "range_check", "quantity", "", min_value=1))
+        assert gate.conditions == [("<", 1.0)]
+
+    def test_case_insensitive_pattern(self):
+        gate = build_gate(rule(1, "pattern_check", "email",
+                               "SELECT * FROM customers WHERE email !~* '^[a-z]+@x\\.com$'"))
+        assert gate.evaluate({"email": "ANNA@X.COM"}) == (True, False)
+        assert gate.evaluate({"email": None}) == (False, False)
+
+    @pytest.mark.parametrize("definition", [
+        "SELECT * FROM orders WHERE freight < other_column",
+        "SELECT * FROM orders WHERE discount < 0",
+        "SELECT * FROM orders",
+    ])
+    def test_untranslatable_range(self, definition):
+        with pytest.raises(ValueError):
+            build_gate(rule(1, "range_check", "freight", definition))
+
+
+class TestDuplicateTracking:
+    """Tests for the exact set and its Bloom filter fallback."""
+
+    def test_exact_until_limit(self):
+        tracker = DuplicateTracker(max_keys=10, bloom_capacity=1000, error_rate=0.01)
+        assert [tracker.seen((v,)) for v in [1, 2, 1]] == [False, False, True]
+        assert not tracker.approximate
+
+    def test_switches_to_bloom_filter(self):
+        tracker = DuplicateTracker(max_keys=100, bloom_capacity=5000, error_rate=0.01)
+        for value in range(101):
+            tracker.seen((value,))
+        assert tracker.approximate
+        assert tracker.seen((5,))  # keys seen before the switch are kept
+
+        false_positives = sum(tracker.seen((value,)) for value in range(1000, 5000))
+        assert false_positives < 4000 * 0.03
+
+    def test_bloom_sizing(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        assert bloom.size == 9586 and bloom.hashes == 7
+
+
+class TestStreaming:
+    """Tests for incremental parsing and end-of-stream verdicts."""
+
+    @pytest.mark.asyncio
+    async def test_quoted_line_breaks_across_chunks(self):
+        headers = []
+        records = [r async for r in csv_records(stream(ORDERS_CSV.encode(), 5), on_header=headers.append)]
+        assert headers[0][0] == "order_id"
+        assert len(records) == 4
+        assert records[3]["customer_id"] == "VICTE\nline two"
+        assert records[0]["ship_region"] is None
+
+    @pytest.mark.asyncio
+    async def test_csv_verdicts(self):
+        report = await UploadGate(ORDER_RULES, "csv").run(stream(ORDERS_CSV.encode()))
+        results = {r["rule_id"]: r for r in report["results"]}
+
+        assert report["rows"] == 4 and report["passed"] is False
+        assert (results[1]["failed_count"], results[1]["passed"]) == (1, False)
+        assert results[2]["failed_count"] == 2
+        assert results[3]["total_count"] == 3 and results[3]["failed_count"] == 1
+        assert results[4]["failure_samples"] == [{"value": "10248"}]
+        assert report["unsupported"][0]["rule_id"] == 5
+
+    @pytest.mark.asyncio
+    async def test_missing_csv_column_is_unsupported(self):
+        gate = UploadGate([rule(1, "null_check", "ship_country")], "csv")
+        report = await gate.run(stream(ORDERS_CSV.encode()))
+        assert report["results"] == []
+        assert "ship_country" in report["unsupported"][0]["reason"]
+
+    @pytest.mark.asyncio
+    async def test_ndjson_missing_keys_are_null(self):
+        body = "\n".join(json.dumps(r) for r in [
+            {"order_id": 1, "freight": 10, "ship_region": "WA"},
+            {"order_id": 2, "freight": "n/a"},
+        ]).encode()
+        report = await UploadGate(ORDER_RULES[:2], "ndjson").run(stream(body))
+        results = {r["rule_id"]: r for r in report["results"]}
+        assert results[1]["failed_count"] == 1
+        assert results[2]["failed_count"] == 1  # non-numeric value
+
+    @pytest.mark.asyncio
+    async def test_malformed_rows(self):
+        with pytest.raises(ValueError, match="Line 2 has 1 fields"):
+            await UploadGate(ORDER_RULES, "csv").run(stream(b"order_id,freight\n1\n"))
+        with pytest.raises(ValueError, match="not a JSON object"):
+            await UploadGate(ORDER_RULES, "ndjson").run(stream(b"[1, 2]\n"))
+        with pytest.raises(ValueError, match="quoted field"):
+            await UploadGate(ORDER_RULES, "csv").run(stream(b'order_id\n"1\n'))
+
+
+class TestValidateUploadRoute:
+    """Tests for the streaming upload endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_streams_body_through_gate(self):
+        from app.main import app
+
+        with patch(
+            "app.services.data_quality_rules.DataQualityRulesService.get_table_rules",
+            new=AsyncMock(return_value=ORDER_RULES[:1]),
+        ):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.post(
+                    "/data-quality/tables/orders/validate-upload?format=csv",
+                    content=stream(ORDERS_CSV.encode()),
+                )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["table_name"] == "orders" and body["rows"] == 4
+        assert body["results"][0]["failed_count"] == 1
@@ -0,0 +1,144 @@
+"""
+Vectorized Engine Test Suite
+Covers expression validation and batch evaluation (the latter needs numpy).
+"""
+import re
+from decimal import Decimal
+
+import pytest
+
+from app.services.vectorized_engine import (
+    VectorizedRule,
+    VectorizedRuleEngine,
+    compile_expression,
+)
+
+
+class TestCompileExpression:
+    """Tests for the row predicate subset."""
+
+    def test_collects_referenced_columns(self):
+        _, columns = compile_expression("unit_price * quantity * (1 - discount) >= 0 and notnull(order_id)")
+        assert columns == {"unit_price", "quantity", "discount", "order_id"}
+
+    @pytest.mark.parametrize("expression", [
+        "__import__('os').system('true')",
+        "unit_price.real > 0",
+        "[x for x in quantity]",
+        "lambda: 1",
+        "matches(postal_code, 5)",
+        "isin(country, ['DE', region])",
+    ])
+    def test_rejects_unsupported_syntax(self, expression):
+        with pytest.raises(ValueError):
+            compile_expression(expression)
+
+    def test_invalid_regex_is_rejected(self):
+        with pytest.raises(Exception):
+            compile_expression("matches(postal_code, '[0-9')")
+
+    def test_null_rules_need_only_a_column(self):
+        rule = VectorizedRule(rule_id=1, rule_type="null_check", column="region")
+        assert rule.columns == {"region"}
+
+    def test_other_rules_need_an_expression(self):
+        with pytest.raises(ValueError, match="need an expression"):
+            VectorizedRule(rule_id=1, rule_type="custom_sql", column="region")
+
+
+class FakeCursor:
+    def __init__(self, rows, batch):
+        self.rows = rows
+
+    async def fetch(self, n):
+        batch, self.rows = self.rows[:n], self.rows[n:]
+        return batch
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def transaction(self, **kwargs):
+        return FakeTransaction()
+
+    async def cursor(self, query):
+        self.query = query
+        columns = re.findall(r'"(\w+)"', query.split(' FROM ')[0])
+        return FakeCursor([{c: row[c] for c in columns} for row in self.rows], 0)
+
+
+ORDER_DETAILS = [
+    {"order_id": 1, "unit_price": Decimal("10.00"), "quantity": 5, "discount": 0.0, "region": "WA"},
+    {"order_id": 2, "unit_price": Decimal("-1.00"), "quantity": 2, "discount": 0.1, "region": None},
+    {"order_id": 3, "unit_price": None, "quantity": 1, "discount": 0.0, "region": "SP"},
+    {"order_id": 4, "unit_price": Decimal("8.50"), "quantity": 0, "discount": 0.3, "region": "RJ"},
+]
+
+
+class TestEvaluation:
+    """Tests for batch evaluation of several rules in one scan."""
+
+    @pytest.mark.asyncio
+    async def test_rules_share_one_scan(self):
+        pytest.importorskip("numpy")
+        rules = [
+            VectorizedRule(rule_id=1, rule_type="custom_sql",
+                           expression="unit_price * quantity * (1 - discount) >= 0"),
+            VectorizedRule(rule_id=2, rule_type="null_check", column="region", threshold=30),
+            VectorizedRule(rule_id=3, rule_type="custom_sql",
+                           expression="isin(discount, [0, 0.05, 0.1]) and matches(region, '^[A-Z]{2}$')"),
+        ]
+        conn = FakeConn(ORDER_DETAILS)
+        price, region, discount = await VectorizedRuleEngine(batch_size=3).evaluate_table(
+            conn, "order_details", rules
+        )
+        assert conn.query == 'SELECT "discount", "quantity", "region", "unit_price" FROM "order_details"'
+
+        # NULL unit_price evaluates to NULL and passes, like WHERE NOT (...)
+        assert (price.total_count, price.failed_count) == (4, 1)
+        assert price.failure_samples == [{"discount": 0.1, "quantity": 2, "region": None,
+                                          "unit_price": Decimal("-1.00")}]
+        assert region.failed_count == 1 and region.passed
+        # Row 2 has a NULL region: NULL and true -> NULL, so only the 0.3 discount fails
+        assert discount.failed_count == 1
+        assert discount.failure_samples[0]["discount"] == 0.3
+
+    @pytest.mark.asyncio
+    async def test_division_by_zero_is_null(self):
+        pytest.importorskip("numpy")
+        rule = VectorizedRule(rule_id=1, rule_type="custom_sql", expression="unit_price / quantity < 9")
+        [result] = await VectorizedRuleEngine().evaluate_table(FakeConn(ORDER_DETAILS), "order_details", [rule])
+        # 10/5 and -1/2 pass, NULL price and x/0 are NULL
+        assert result.failed_count == 0
+
+    @pytest.mark.asyncio
+    async def test_bigint_keys_and_decimals_stay_exact(self):
+        pytest.importorskip("numpy")
+        rows = [
+            {"order_id": 2 ** 53 + 1, "unit_price": Decimal("0.10"), "discount": 0.05},
+            {"order_id": 2 ** 53, "unit_price": Decimal("0.20"), "discount": 0.1},
+        ]
+        rules = [
+            # As float64 both ids would equal 2**53 and pass
+            VectorizedRule(rule_id=1, rule_type="custom_sql", expression="order_id != 9007199254740992"),
+            # 0.1 * 3 is 0.30000000000000004 in floats
+            VectorizedRule(rule_id=2, rule_type="custom_sql", expression="unit_price * 3 == 0.3"),
+            VectorizedRule(rule_id=3, rule_type="custom_sql", expression="isin(unit_price, [0.1, 0.3])"),
+            VectorizedRule(rule_id=4, rule_type="custom_sql", expression="unit_price * (1 - discount) < 1"),
+        ]
+        ids, price, listed, mixed = await VectorizedRuleEngine().evaluate_table(
+            FakeConn(rows), "order_details", rules
+        )
+        assert ids.failed_count == 1
+        assert price.failed_count == 1 and price.failure_samples[0]["unit_price"] == Decimal("0.20")
+        assert listed.failed_count == 1
+        assert mixed.failed_count == 0
@@ -0,0 +1,112 @@
+"""
+Startup Warm-up Test Suite
+Covers the warm-up steps, their failure handling and the readiness endpoint.
+"""
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import create_app
+from app.services.warmup import StartupWarmup
+
+
+class FakeProfiling:
+    def __init__(self, tables=("customers", "orders")):
+        self.tables = list(tables)
+        self.calls = []
+
+    async def get_tables(self):
+        self.calls.append('tables')
+        return self.tables
+
+    async def get_columns(self, table_name):
+        self.calls.append(f'columns:{table_name}')
+        return [{'column_name': 'id'}, {'column_name': 'name'}]
+
+    async def get_stored_results(self):
+        self.calls.append('profiles')
+        return [{'table_name': t} for t in self.tables]
+
+
+class FakeRules:
+    def __init__(self, error=None, delay=0.0):
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def get_all_rules(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [{'id': 1}, {'id': 2}, {'id': 3}]
+
+
+class TestStartupWarmup:
+    """Tests for the background warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_runs_every_step_once_per_connection(self):
+        profiling, rules = FakeProfiling(), FakeRules()
+        warmup = StartupWarmup(profiling, rules, connections=3, timeout=5)
+        assert not warmup.ready
+
+        warmup.start()
+        await warmup.wait()
+
+        assert warmup.ready
+        assert {'columns:customers', 'columns:orders'} <= set(profiling.calls)
+        assert profiling.calls.count('profiles') == 3
+        assert rules.calls == 3
+        steps = warmup.status()['steps']
+        assert steps['schema']['items'] == 4
+        assert steps['rules']['items'] == 3
+        assert steps['profiles']['items'] == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_step_is_reported_and_others_still_run(self):
+        profiling = FakeProfiling()
+        warmup = StartupWarmup(profiling, FakeRules(error=RuntimeError("rules table missing")),
+                               connections=1, timeout=5)
+        warmup.start()
+        await warmup.wait()
+
+        status = warmup.status()
+        assert status['ready']
+        assert status['steps']['rules'] == {'error': 'rules table missing', 'ms': status['steps']['rules']['ms']}
+        assert 'items' in status['steps']['profiles']
+
+    @pytest.mark.asyncio
+    async def test_reports_ready_after_timeout(self):
+        warmup = StartupWarmup(FakeProfiling(), FakeRules(delay=10), connections=1, timeout=0.05)
+        warmup.start()
+        await warmup.wait()
+
+        assert warmup.ready
+        assert 'rules' not in warmup.steps
+        assert warmup.status()['elapsed_seconds'] < 5
+
+    @pytest.mark.asyncio
+    async def test_readiness_endpoint_waits_for_warmup(self):
+        app = create_app()
+        rules = FakeRules(delay=0.2)
+        app.state.warmup = StartupWarmup(FakeProfiling(), rules, connections=1, timeout=5)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            app.state.warmup.start()
+            response = await client.get("/ready")
+            assert response.status_code == 503
+            assert response.json()['status'] == 'warming_up'
+
+            await app.state.warmup.wait()
+            response = await client.get("/ready")
+            assert response.status_code == 200
+            assert response.json()['warmup']['steps']['rules']['items'] == 3
+
+    @pytest.mark.asyncio
+    async def test_readiness_without_warmup(self):
+        async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+            response = await client.get("/ready")
+        assert response.status_code == 200
+        assert response.json() == {'status': 'ready', 'warmup': None}
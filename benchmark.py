@@ -2,15 +2,28 @@
 Performance Benchmark: LOCAL AI vs Expert AI DQM Applications
 Generated by RTX 5090 (Qwen2.5-Coder-32B-AWQ)
 Compares response times across key endpoints
+
+Also checks the backend's import time (python -X importtime) against a
+budget, so slow imports that delay worker boot and test collection are caught:
+
+    python benchmark.py --import-only --import-budget-ms 1000
 """
 import asyncio
 import argparse
 import json
 import statistics
+import subprocess
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Any
 import httpx
 
+BACKEND_DIR = Path(__file__).resolve().parent / "backend"
+
+# Optional dependencies loaded on first use; importing the app must not pull them in
+LAZY_MODULES = ("chromadb", "jwt", "httpx", "sqlalchemy")
+
 
 class BenchmarkResults:
     """Store and analyze benchmark results."""
@@ -148,6 +161,58 @@ async def run_benchmarks(iterations: int) -> Dict[str, Any]:
     return results
 
 
+def measure_import_time(module: str = "app.main", runs: int = 3) -> Dict[str, Any]:
+    """Import `module` in fresh interpreters under -X importtime; keeps the fastest run."""
+    best: Dict[str, Any] = {}
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=BACKEND_DIR, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed: {proc.stderr.strip().splitlines()[-1]}")
+
+        cumulative_us: Dict[str, int] = {}
+        for line in proc.stderr.splitlines():
+            # "import time: <self us> | <cumulative us> | <indented module>"
+            fields = line.removeprefix("import time:").split("|")
+            if len(fields) != 3 or not fields[1].strip().isdigit():
+                continue
+            cumulative_us[fields[2].strip()] = int(fields[1])
+
+        total_ms = cumulative_us[module] / 1000
+        if not best or total_ms < best["total_ms"]:
+            slowest = sorted(
+                (name for name in cumulative_us if name.startswith("app.") and name != module),
+                key=cumulative_us.get, reverse=True
+            )[:10]
+            best = {
+                "module": module,
+                "total_ms": round(total_ms, 1),
+                "lazy_modules_loaded": [
+                    m for m in LAZY_MODULES
+                    if any(name == m or name.startswith(m + ".") for name in cumulative_us)
+                ],
+                "slowest_app_modules": {name: round(cumulative_us[name] / 1000, 1) for name in slowest},
+            }
+    return best
+
+
+def check_import_budget(budget_ms: float, module: str = "app.main") -> Dict[str, Any]:
+    """Measure the import time of `module` and print it against the budget."""
+    result = measure_import_time(module)
+    result["budget_ms"] = budget_ms
+    result["within_budget"] = result["total_ms"] <= budget_ms and not result["lazy_modules_loaded"]
+
+    print(f"\nImport time of {module}: {result['total_ms']:.1f}ms (budget {budget_ms:.0f}ms)")
+    for name, ms in result["slowest_app_modules"].items():
+        print(f"  {name:<45} {ms:>8.1f}ms")
+    if result["lazy_modules_loaded"]:
+        print(f"  Loaded at import but should be lazy: {', '.join(result['lazy_modules_loaded'])}")
+    print(f"  {'OK' if result['within_budget'] else 'OVER BUDGET'}")
+    return result
+
+
 def print_comparison_table(results: Dict[str, Any]):
     """Print formatted comparison table."""
     print("\n" + "=" * 100)
@@ -201,14 +266,29 @@ async def main():
         default="benchmark_results.json",
         help="Output JSON file (default: benchmark_results.json)"
     )
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=1000.0,
+        help="Maximum import time of app.main in milliseconds (default: 1000)"
+    )
+    parser.add_argument(
+        "--import-only",
+        action="store_true",
+        help="Only run the import-time check; exit status 1 when over budget"
+    )
     args = parser.parse_args()
 
+    if args.import_only:
+        return 0 if check_import_budget(args.import_budget_ms)["within_budget"] else 1
+
     print(f"DQM Performance Benchmark")
     print(f"Iterations: {args.iterations}")
     print(f"Output: {args.output}")
 
     # Run benchmarks
     results = await run_benchmarks(args.iterations)
+    import_time = check_import_budget(args.import_budget_ms)
 
     # Add metadata
     output = {
@@ -217,7 +297,8 @@ async def main():
             "iterations": args.iterations,
             "generated_by": "RTX 5090 (Qwen2.5-Coder-32B-AWQ)"
         },
-        "results": results
+        "results": results,
+        "import_time": import_time
     }
 
     # Save to file
@@ -227,7 +308,8 @@ async def main():
 
     # Print comparison
     print_comparison_table(results)
+    return 0 if import_time["within_budget"] else 1
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(asyncio.run(main()))
@@ -323,7 +323,7 @@ function DataQualityRules({ apiBase }) {
             </thead>
             <tbody>
               {filteredResults.slice(0, 10).map(r => (
-                <tr key={r.id} className={r.passed ? 'passed' : 'failed'}>
+                <tr key={r.id} className={r.status === 'skipped' ? 'skipped' : r.passed ? 'passed' : 'failed'}>
                   <td>{r.rule_name}</td>
                   <td className="table-column">{r.table_name}.{r.column_name}</td>
                   <td>
@@ -331,8 +331,14 @@ function DataQualityRules({ apiBase }) {
                       {r.dama_dimension || 'accuracy'}
                     </span>
                   </td>
-                  <td>{r.passed ? 'PASS' : 'FAIL'}</td>
-                  <td>{r.pass_rate}%</td>
+                  <td>{r.status === 'skipped' ? 'SKIP' : r.passed ? 'PASS' : 'FAIL'}</td>
+                  <td
+                    title={r.is_approximate && r.confidence_interval
+                      ? `Estimated from a ${r.sample_percent}% sample (95% CI ${r.confidence_interval.pass_rate_low}%–${r.confidence_interval.pass_rate_high}%)`
+                      : ''}
+                  >
+                    {r.is_approximate ? '≈' : ''}{r.pass_rate}%
+                  </td>
                   <td>{new Date(r.executed_at).toLocaleString()}</td>
                 </tr>
               ))}